@@ -7,6 +7,7 @@ from fastapi import Depends, HTTPException, Request, status
 
 from app.api.dependencies.database import require_database
 from app.repositories import api_keys as api_key_repo
+from app.services.api_key_usage import api_key_usage_recorder
 
 
 async def _resolve_api_key_record(request: Request, record: dict) -> dict:
@@ -62,7 +63,7 @@ async def _resolve_api_key_record(request: Request, record: dict) -> dict:
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="API key not permitted from this IP address",
             )
-    await api_key_repo.record_api_key_usage(record["id"], source_ip or "unknown")
+    await api_key_usage_recorder.record(record["id"], source_ip or "unknown")
     request.state.api_key_id = record["id"]
     return record
 
@@ -20,6 +20,7 @@ from app.schemas.scheduler import (
     ScheduledTaskRunResponse,
     ScheduledTaskCalendarEventResponse,
     ScheduledTaskUpdate,
+    WebhookDeliveryStatsResponse,
     WebhookEventAttemptResponse,
     WebhookEventResponse,
     WebhookEventsBulkDeleteResponse,
@@ -241,6 +242,15 @@ async def list_webhook_events(
     return [WebhookEventResponse.model_validate(event) for event in events]
 
 
+@router.get("/webhooks/stats", response_model=WebhookDeliveryStatsResponse)
+async def get_webhook_delivery_stats(
+    _: None = Depends(require_database),
+    __: dict[str, Any] = Depends(require_super_admin),
+) -> WebhookDeliveryStatsResponse:
+    queue = await webhook_events_repo.count_outgoing_events_by_status()
+    return WebhookDeliveryStatsResponse(queue=queue, **webhook_monitor.delivery_stats())
+
+
 @router.get(
     "/webhooks/{event_id}/attempts", response_model=list[WebhookEventAttemptResponse]
 )
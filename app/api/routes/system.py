@@ -1,9 +1,18 @@
 from fastapi import APIRouter, Depends, Request, status
 
 from app.api.dependencies.auth import require_super_admin
+from app.core.config import get_settings
+from app.core.database import db
+from app.core.query_profiler import recent_flagged_profiles
+from app.core.reference_cache import reference_cache
+from app.repositories import scheduler_jobs as scheduler_jobs_repo
 from app.services import audit as audit_service
 from app.services import demo_seeding as demo_seeding_service
+from app.services import http_clients
+from app.services import rate_governor
 from app.services.realtime import refresh_notifier
+from app.services.scheduler import scheduler_service
+from app.services.tray_relay import tray_relay
 
 router = APIRouter(prefix="/api/system", tags=["System"])
 
@@ -34,6 +43,80 @@ async def trigger_refresh(
     }
 
 
+@router.get("/database/pools", status_code=status.HTTP_200_OK)
+async def get_database_pool_stats(
+    current_user: dict = Depends(require_super_admin),
+) -> dict[str, dict]:
+    """Return live connection pool and cache usage for this worker process."""
+
+    return {
+        "pools": db.pool_stats(),
+        "sql_cache": db.sql_cache_stats(),
+        "reference_cache": reference_cache.stats(),
+    }
+
+
+@router.get("/database/query-profiles", status_code=status.HTTP_200_OK)
+async def get_flagged_query_profiles(
+    current_user: dict = Depends(require_super_admin),
+) -> dict[str, list[dict]]:
+    """Return recent requests flagged for repeating a database statement."""
+
+    return {"profiles": recent_flagged_profiles()}
+
+
+@router.get("/tray/delivery", status_code=status.HTTP_200_OK)
+async def get_tray_delivery_stats(
+    current_user: dict = Depends(require_super_admin),
+) -> dict[str, dict]:
+    """Return tray device message delivery counters for this worker process."""
+
+    return {"delivery": tray_relay.stats()}
+
+
+@router.get("/scheduler/queue", status_code=status.HTTP_200_OK)
+async def get_scheduler_queue_stats(
+    current_user: dict = Depends(require_super_admin),
+) -> dict[str, object]:
+    """Return the scheduler mode, queued runs and this process's command slots.
+
+    ``jobs`` and ``commands`` come from the shared ``scheduler_jobs`` queue in
+    external mode.  ``process_slots`` describes only the web process that
+    answered, which runs nothing in external mode.
+    """
+
+    mode = get_settings().scheduler_mode
+    jobs: dict[str, int] = {}
+    commands: dict[str, dict[str, int]] = {}
+    if mode == "external":
+        jobs = await scheduler_jobs_repo.count_jobs_by_status()
+        commands = await scheduler_jobs_repo.count_outstanding_jobs_by_command()
+    return {
+        "mode": mode,
+        "jobs": jobs,
+        "commands": commands,
+        "process_slots": scheduler_service.command_stats(),
+    }
+
+
+@router.get("/http-clients", status_code=status.HTTP_200_OK)
+async def get_http_client_stats(
+    current_user: dict = Depends(require_super_admin),
+) -> dict[str, dict[str, int]]:
+    """Return outbound request and connection reuse counts per integration."""
+
+    return http_clients.client_stats()
+
+
+@router.get("/rate-governor", status_code=status.HTTP_200_OK)
+async def get_rate_governor_stats(
+    current_user: dict = Depends(require_super_admin),
+) -> dict[str, object]:
+    """Return outbound API rate policies and throttle waits per integration."""
+
+    return rate_governor.governor_stats()
+
+
 @router.get("/demo/status", status_code=status.HTTP_200_OK)
 async def get_demo_status(
     current_user: dict = Depends(require_super_admin),
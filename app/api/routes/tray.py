@@ -79,9 +79,11 @@ from app.services import tacticalrmm as tacticalrmm_service
 from app.services import tickets as tickets_service
 from app.services import syncro as syncro_service
 from app.services import tray as tray_service
+from app.services.tray_relay import TrayDelivery
 from app.services import tray_ticket_questions as tq_service
 from app.services import asset_importer
 from app.services.sanitization import sanitize_rich_text
+from app.services.tray_heartbeats import tray_heartbeat_recorder
 from app.security.encryption import decrypt_secret, encrypt_secret
 from app.repositories import tray_ticket_questions as tq_repo
 from app.repositories import network_devices as network_devices_repo
@@ -587,7 +589,7 @@ async def heartbeat(
     device: dict = Depends(get_current_tray_device),
 ) -> JSONResponse:
     client_ip = payload.last_ip or (request.client.host if request.client else None)
-    await tray_repo.update_device_heartbeat(
+    await tray_heartbeat_recorder.record(
         int(device["id"]),
         console_user=payload.console_user,
         last_ip=client_ip,
@@ -1674,7 +1676,7 @@ async def start_device_chat(
             updated_at=sent_at,
         )
 
-    delivered = await tray_service.send_to_device(
+    result = await tray_service.send_to_device(
         device_uid,
         {
             "type": "chat_open",
@@ -1690,8 +1692,9 @@ async def start_device_chat(
         command="chat_open",
         payload_json=json.dumps({"room_id": int(room["id"])}),
         initiated_by_user_id=int(current_user["id"]),
-        status="delivered" if delivered else "queued",
+        status=result.value,
     )
+    delivered = result is TrayDelivery.DELIVERED
 
     await audit_service.log_action(
         action="tray_chat_start",
@@ -2253,17 +2256,17 @@ async def push_notification_to_device(
         "type": "show_notification",
         "payload": {"title": title, "body": notification_body},
     }
-    delivered = await tray_service.send_to_device(device_uid, payload)
+    result = await tray_service.send_to_device(device_uid, payload)
     await tray_repo.log_command(
         device_id=int(device["id"]),
         command="show_notification",
         payload_json=json.dumps(payload),
         initiated_by_user_id=int(current_user["id"]),
-        status="delivered" if delivered else "queued",
+        status=result.value,
     )
     return JSONResponse(
         {
-            "delivered": delivered,
+            "delivered": result is TrayDelivery.DELIVERED,
         }
     )
 
@@ -23,6 +23,7 @@ from app.core.logging import log_error, log_info
 from app.repositories import invoices as invoice_repo
 from app.repositories import users as user_repo
 from app.security.session import session_manager
+from app.services import http_clients
 from app.services import modules as modules_service
 from app.services import audit as audit_service
 
@@ -133,7 +134,7 @@ async def _fetch_xero_invoice(invoice_id: str) -> dict[str, Any] | None:
     if not tenant_id:
         raise RuntimeError("Xero tenant ID is not configured")
     access_token = await modules_service.acquire_xero_access_token()
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_clients.client("xero") as client:
         response = await client.get(
             f"https://api.xero.com/api.xro/2.0/Invoices/{normalized_invoice_id}",
             headers={
@@ -316,7 +317,7 @@ async def list_tenants() -> dict[str, Any]:
         access_token = await modules_service.acquire_xero_access_token()
         
         # Fetch tenant connections
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.client("xero") as client:
             connections_response = await client.get(
                 "https://api.xero.com/connections",
                 headers={
@@ -473,7 +474,7 @@ async def xero_callback(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_clients.client("xero") as client:
             response = await client.post(
                 token_url,
                 data=data,
@@ -511,7 +512,7 @@ async def xero_callback(
     # Fetch tenant connections to get tenant_id
     tenant_id = None
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_clients.client("xero") as client:
             connections_response = await client.get(
                 "https://api.xero.com/connections",
                 headers={
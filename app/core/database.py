@@ -1,8 +1,14 @@
 from __future__ import annotations
 
-from contextlib import asynccontextmanager
+import asyncio
+import time
+from contextlib import aclosing, asynccontextmanager, contextmanager, suppress
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import AsyncIterator, Iterable, Any
+from typing import AsyncIterator, Iterable, Iterator, Any
+from urllib.parse import unquote, urlsplit
 import re
 
 import aiomysql
@@ -10,12 +16,241 @@ import aiosqlite
 from loguru import logger
 
 from .config import get_settings
+from .migration_baseline import MigrationBaseline, load_baseline, manifest_hash
+from .query_profiler import current_profile, record_query
+
+
+# Upper bound on distinct statements kept per placeholder style.  Statements
+# are overwhelmingly static literals in the repositories; dynamically built
+# ``IN (...)`` lists add a long tail that the LRU policy evicts.
+_ADAPTED_SQL_CACHE_SIZE = 2048
+_NAMED_PLACEHOLDER_PATTERN = re.compile(r":(\w+)")
+
+
+@lru_cache(maxsize=_ADAPTED_SQL_CACHE_SIZE)
+def _rewrite_named_placeholders(sql: str) -> str:
+    return _NAMED_PLACEHOLDER_PATTERN.sub(r"%(\1)s", sql)
+
+
+@lru_cache(maxsize=_ADAPTED_SQL_CACHE_SIZE)
+def _rewrite_positional_placeholders(sql: str) -> str:
+    if "'" not in sql and '"' not in sql and "--" not in sql and "/*" not in sql:
+        # Fast path when no obvious quotes or comments are present anywhere in
+        # the statement. This intentionally errs on the side of safety and may
+        # skip the fast path when these tokens appear inside identifiers or
+        # other text, falling back to the slower but safer parser below.
+        return sql.replace("?", "%s")
+
+    # Only replace placeholders that are not inside quoted string literals.
+    result_chars: list[str] = []
+    in_single_quote = False
+    in_double_quote = False
+    in_line_comment = False
+    in_block_comment = False
+    length = len(sql)
+    i = 0
+
+    while i < length:
+        char = sql[i]
+        next_char = sql[i + 1] if i + 1 < length else ""
+
+        if not in_single_quote and not in_double_quote and not in_block_comment:
+            if not in_line_comment and char == "-" and next_char == "-":
+                in_line_comment = True
+                result_chars.append(char)
+                result_chars.append(next_char)
+                i += 2
+                continue
+            if not in_line_comment and char == "/" and next_char == "*":
+                in_block_comment = True
+                result_chars.append(char)
+                result_chars.append(next_char)
+                i += 2
+                continue
+
+        if in_line_comment:
+            result_chars.append(char)
+            i += 1
+            if char == "\n":
+                in_line_comment = False
+            continue
+
+        if in_block_comment:
+            result_chars.append(char)
+            i += 1
+            if char == "*" and next_char == "/":
+                result_chars.append(next_char)
+                i += 1
+                in_block_comment = False
+            continue
+
+        if (in_single_quote or in_double_quote) and char == "\\":
+            result_chars.append(char)
+            if next_char:
+                result_chars.append(next_char)
+                i += 2
+                continue
+            i += 1
+            continue
+
+        if char == "'" and not in_double_quote:
+            result_chars.append(char)
+            if in_single_quote and next_char == "'":
+                # Doubled single quote representing a literal quote in SQL strings.
+                result_chars.append(next_char)
+                i += 2
+                continue
+            in_single_quote = not in_single_quote
+            i += 1
+            continue
+
+        if char == '"' and not in_single_quote:
+            result_chars.append(char)
+            if in_double_quote and next_char == '"':
+                # Doubled double quote representing a literal quote in identifiers.
+                result_chars.append(next_char)
+                i += 2
+                continue
+            in_double_quote = not in_double_quote
+            i += 1
+            continue
+
+        if char == "?" and not in_single_quote and not in_double_quote:
+            result_chars.append("%s")
+            i += 1
+            continue
+
+        result_chars.append(char)
+        i += 1
+
+    return "".join(result_chars)
+
+
+# Marks tasks that currently hold the SQLite writer connection through
+# ``Database.acquire`` so nested ``execute`` calls run inline instead of
+# queueing behind the writer task (which would deadlock on the write lock).
+_sqlite_writer_held: ContextVar[bool] = ContextVar("sqlite_writer_held", default=False)
+
+
+# Which MySQL pool queries in the current task should use.  Request handlers
+# run on the default "request" pool; scheduler jobs, queued background tasks
+# and anything inside ``acquire_lock`` switch to the "background" pool so long
+# syncs cannot starve interactive traffic of connections.
+_pool_role: ContextVar[str] = ContextVar("db_pool_role", default="request")
+
+
+@dataclass(slots=True)
+class _ReadConsistency:
+    """Whether reads in the current request must see its own writes."""
+
+    wrote: bool = False
+    force_primary: bool = False
+
+
+# Read-your-writes state for replica routing.  ``Database.consistency_scope``
+# installs one shared object per request so writes made in tasks the request
+# spawns still pin its later reads to the primary; outside a scope the first
+# write creates one for the current task.
+_read_consistency: ContextVar[_ReadConsistency | None] = ContextVar(
+    "db_read_consistency", default=None
+)
+
+
+def _replica_connection_kwargs(url: str, settings: Any) -> dict[str, Any]:
+    """Translate a ``mysql://`` replica DSN into ``aiomysql`` connection kwargs."""
+
+    parsed = urlsplit(url)
+    return {
+        "host": parsed.hostname,
+        "port": parsed.port or 3306,
+        "user": unquote(parsed.username) if parsed.username else settings.database_user,
+        "password": (
+            unquote(parsed.password) if parsed.password is not None else settings.database_password
+        ),
+        "db": unquote(parsed.path.lstrip("/")) or settings.database_name,
+    }
+
+
+@dataclass(slots=True)
+class PoolStats:
+    """Acquisition counters for one connection pool."""
+
+    acquisitions: int = 0
+    contended: int = 0
+    in_use: int = 0
+    waiting: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    def record_wait(self, waited: float) -> None:
+        self.acquisitions += 1
+        self.total_wait_seconds += waited
+        if waited > self.max_wait_seconds:
+            self.max_wait_seconds = waited
+
+    def as_dict(self) -> dict[str, Any]:
+        average = self.total_wait_seconds / self.acquisitions if self.acquisitions else 0.0
+        return {
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "avg_wait_ms": round(average * 1000, 3),
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            "total_wait_ms": round(self.total_wait_seconds * 1000, 3),
+        }
+
+
+@contextmanager
+def _profiled(sql: str) -> Iterator[None]:
+    """Report the statement to the active query profile, if there is one."""
+
+    if current_profile() is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_query(sql, started)
+
+
+# Single-row record of the migration set a completed run brought the database
+# up to, so later boots can skip the migration walk (and its lock).
+_MIGRATION_MANIFEST_TABLE_SQL = (
+    "CREATE TABLE IF NOT EXISTS migration_manifest ("
+    "id INTEGER PRIMARY KEY, "
+    "manifest_hash VARCHAR(64) NOT NULL, "
+    "applied_count INTEGER NOT NULL)"
+)
+
+
+@dataclass(slots=True)
+class _SQLiteWrite:
+    """A write statement queued for the SQLite writer task."""
+
+    sql: str
+    params: tuple | list | dict
+    future: asyncio.Future[tuple[int, int]]
 
 
 class Database:
     def __init__(self) -> None:
         self._pool: aiomysql.Pool | None = None
+        self._background_pool: aiomysql.Pool | None = None
+        self._replica_pools: list[aiomysql.Pool] = []
+        self._replica_cursor = 0
+        self._pool_stats: dict[str, PoolStats] = {
+            "request": PoolStats(),
+            "background": PoolStats(),
+        }
         self._sqlite_conn: aiosqlite.Connection | None = None
+        self._sqlite_readers: list[aiosqlite.Connection] = []
+        self._sqlite_read_queue: asyncio.Queue[aiosqlite.Connection] | None = None
+        self._sqlite_write_queue: asyncio.Queue[_SQLiteWrite] | None = None
+        self._sqlite_write_lock: asyncio.Lock | None = None
+        self._sqlite_writer_task: asyncio.Task[None] | None = None
+        self._sqlite_loop: asyncio.AbstractEventLoop | None = None
         self._settings = get_settings()
         self._use_sqlite = self._should_use_sqlite()
 
@@ -122,38 +357,431 @@ class Database:
         if self._use_sqlite:
             logger.info("Connecting to SQLite database")
             db_path = self._get_sqlite_path()
-            self._sqlite_conn = await aiosqlite.connect(str(db_path))
-            self._sqlite_conn.row_factory = aiosqlite.Row
-            # Enable foreign keys in SQLite
-            await self._sqlite_conn.execute("PRAGMA foreign_keys = ON")
+            self._sqlite_conn = await self._open_sqlite_connection(db_path)
+            # WAL lets the read connections below keep serving queries while
+            # the writer holds a transaction open; NORMAL sync is durable
+            # across application crashes in WAL mode and avoids an fsync on
+            # every commit.
+            await self._sqlite_conn.execute("PRAGMA journal_mode = WAL")
+            await self._sqlite_conn.execute("PRAGMA synchronous = NORMAL")
             await self._sqlite_conn.commit()
+            for _ in range(max(1, self._settings.sqlite_read_pool_size)):
+                reader = await self._open_sqlite_connection(db_path)
+                await reader.execute("PRAGMA query_only = ON")
+                self._sqlite_readers.append(reader)
+            self._ensure_sqlite_runtime()
         else:
             logger.info("Connecting to MySQL at {host}", host=self._settings.database_host)
-            self._pool = await aiomysql.create_pool(
-                host=self._settings.database_host,
-                user=self._settings.database_user,
-                password=self._settings.database_password,
-                db=self._settings.database_name,
-                autocommit=True,
-                minsize=1,
-                maxsize=10,
-                pool_recycle=600,
-                init_command="SET time_zone = '+00:00'",
+            self._pool = await self._create_mysql_pool(
+                self._settings.database_pool_min_size,
+                self._settings.database_pool_max_size,
+            )
+            if self._settings.database_background_pool_max_size > 0:
+                self._background_pool = await self._create_mysql_pool(
+                    self._settings.database_background_pool_min_size,
+                    self._settings.database_background_pool_max_size,
+                )
+            await self._connect_replicas()
+
+    async def _connect_replicas(self) -> None:
+        urls = [
+            url.strip() for url in self._settings.database_replica_urls.split(",") if url.strip()
+        ]
+        for url in urls:
+            target = _replica_connection_kwargs(url, self._settings)
+            try:
+                pool = await self._create_mysql_pool(
+                    self._settings.database_replica_pool_min_size,
+                    self._settings.database_replica_pool_max_size,
+                    **target,
+                )
+            except Exception as exc:  # pragma: no cover - depends on replica availability
+                # A missing replica only costs read capacity; the primary
+                # still serves everything.
+                logger.warning(
+                    "Read replica unavailable; reads stay on the primary",
+                    host=target["host"],
+                    error=str(exc),
+                )
+                continue
+            self._pool_stats.setdefault(f"replica-{len(self._replica_pools)}", PoolStats())
+            self._replica_pools.append(pool)
+            logger.info("Connected to MySQL read replica at {host}", host=target["host"])
+
+    async def _create_mysql_pool(
+        self, minsize: int, maxsize: int, **target: Any
+    ) -> aiomysql.Pool:
+        minsize = max(0, minsize)
+        connection = {
+            "host": self._settings.database_host,
+            "user": self._settings.database_user,
+            "password": self._settings.database_password,
+            "db": self._settings.database_name,
+        }
+        connection.update(target)
+        return await aiomysql.create_pool(
+            **connection,
+            autocommit=True,
+            minsize=minsize,
+            maxsize=max(1, minsize, maxsize),
+            pool_recycle=self._settings.database_pool_recycle_seconds,
+            init_command="SET time_zone = '+00:00'",
+        )
+
+    @staticmethod
+    @contextmanager
+    def background() -> Iterator[None]:
+        """Route queries issued inside the block to the background pool.
+
+        The choice is carried in a context variable, so tasks spawned inside
+        the block inherit it.  Without a dedicated background pool (or on
+        SQLite) this is a no-op.
+        """
+
+        token = _pool_role.set("background")
+        try:
+            yield
+        finally:
+            _pool_role.reset(token)
+
+    @staticmethod
+    @contextmanager
+    def consistency_scope() -> Iterator[None]:
+        """Share read-your-writes state across the tasks of one unit of work.
+
+        Request middleware wraps each request in this scope: once anything in
+        the request writes, its remaining reads go to the primary instead of a
+        possibly lagging replica.
+        """
+
+        token = _read_consistency.set(_ReadConsistency())
+        try:
+            yield
+        finally:
+            _read_consistency.reset(token)
+
+    @staticmethod
+    @contextmanager
+    def primary() -> Iterator[None]:
+        """Send reads issued inside the block to the primary."""
+
+        state = _read_consistency.get()
+        if state is None:
+            state = _ReadConsistency()
+            token = _read_consistency.set(state)
+        else:
+            token = None
+        previous = state.force_primary
+        state.force_primary = True
+        try:
+            yield
+        finally:
+            state.force_primary = previous
+            if token is not None:
+                _read_consistency.reset(token)
+
+    @staticmethod
+    def _note_write() -> None:
+        state = _read_consistency.get()
+        if state is None:
+            _read_consistency.set(_ReadConsistency(wrote=True))
+        else:
+            state.wrote = True
+
+    def _select_replica(self) -> tuple[aiomysql.Pool, PoolStats] | None:
+        """Pick a replica for a read, or ``None`` when it must use the primary.
+
+        Only request-pool reads are routed: scheduler jobs and other
+        background work are the writers replicas lag behind, so they keep
+        reading from the primary.
+        """
+
+        if not self._replica_pools or _pool_role.get() == "background":
+            return None
+        state = _read_consistency.get()
+        if state is not None and (state.wrote or state.force_primary):
+            return None
+        index = self._replica_cursor % len(self._replica_pools)
+        self._replica_cursor = index + 1
+        return self._replica_pools[index], self._pool_stats[f"replica-{index}"]
+
+    @asynccontextmanager
+    async def _read_connection(self) -> AsyncIterator[Any]:
+        """Acquire a MySQL connection for a read, preferring a replica."""
+
+        replica = self._select_replica()
+        conn = None
+        if replica is not None:
+            pool, stats = replica
+            try:
+                conn = await self._acquire_from_pool(pool, stats)
+            except aiomysql.OperationalError as exc:
+                logger.warning("Read replica unavailable; using the primary", error=str(exc))
+        if conn is None:
+            # ``_acquire`` rather than ``acquire``: a read must not mark the
+            # request as having written and pin it to the primary.
+            async with self._acquire() as primary_conn:
+                yield primary_conn
+            return
+        try:
+            yield conn
+        finally:
+            self._release_to_pool(pool, stats, conn)
+
+    def _select_pool(self, role: str | None = None) -> tuple[aiomysql.Pool | None, PoolStats]:
+        role = role or _pool_role.get()
+        if role == "background" and self._background_pool is not None:
+            return self._background_pool, self._pool_stats["background"]
+        return self._pool, self._pool_stats["request"]
+
+    async def _acquire_from_pool(self, pool: aiomysql.Pool, stats: PoolStats) -> Any:
+        if pool.freesize == 0 and pool.size >= pool.maxsize:
+            stats.contended += 1
+        stats.waiting += 1
+        started = time.perf_counter()
+        try:
+            conn = await pool.acquire()
+        finally:
+            stats.waiting -= 1
+        stats.record_wait(time.perf_counter() - started)
+        stats.in_use += 1
+        return conn
+
+    def _release_to_pool(self, pool: aiomysql.Pool, stats: PoolStats, conn: Any) -> None:
+        stats.in_use -= 1
+        pool.release(conn)
+
+    def pool_stats(self) -> dict[str, dict[str, Any]]:
+        """Return live connection pool statistics keyed by pool name."""
+
+        if self._use_sqlite:
+            readers = self._pool_stats["request"].as_dict()
+            readers["size"] = len(self._sqlite_readers)
+            queue = self._sqlite_write_queue
+            return {
+                "sqlite_readers": readers,
+                "sqlite_writer": {"queued_writes": queue.qsize() if queue else 0},
+            }
+
+        stats: dict[str, dict[str, Any]] = {}
+        pools = [("request", self._pool), ("background", self._background_pool)]
+        pools.extend(
+            (f"replica-{index}", pool) for index, pool in enumerate(self._replica_pools)
+        )
+        for name, pool in pools:
+            if pool is None:
+                continue
+            entry = self._pool_stats[name].as_dict()
+            entry.update(
+                size=pool.size,
+                free=pool.freesize,
+                minsize=pool.minsize,
+                maxsize=pool.maxsize,
             )
+            stats[name] = entry
+        return stats
+
+    async def _open_sqlite_connection(self, db_path: Path) -> aiosqlite.Connection:
+        busy_timeout_ms = max(0, self._settings.sqlite_busy_timeout_ms)
+        conn = await aiosqlite.connect(str(db_path), timeout=busy_timeout_ms / 1000)
+        conn.row_factory = aiosqlite.Row
+        # Enable foreign keys in SQLite
+        await conn.execute("PRAGMA foreign_keys = ON")
+        await conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+        await conn.commit()
+        return conn
+
+    def _ensure_sqlite_runtime(self) -> None:
+        """Bind the SQLite reader pool and writer task to the running loop.
+
+        The aiosqlite connections run on their own threads and survive event
+        loop changes, but queues, locks and the writer task belong to the loop
+        that created them.  Tests (and ``manage.py`` commands) may drive the
+        shared ``db`` from several ``asyncio.run`` calls, so the runtime is
+        rebuilt whenever the running loop differs from the one it was created
+        on.
+        """
+
+        loop = asyncio.get_running_loop()
+        task = self._sqlite_writer_task
+        if self._sqlite_loop is loop and task is not None and not task.done():
+            return
+        if self._sqlite_loop is not loop:
+            self._sqlite_loop = loop
+            self._sqlite_write_lock = asyncio.Lock()
+            self._sqlite_read_queue = asyncio.Queue()
+            for reader in self._sqlite_readers:
+                self._sqlite_read_queue.put_nowait(reader)
+            self._sqlite_write_queue = asyncio.Queue()
+        self._sqlite_writer_task = loop.create_task(
+            self._run_sqlite_writer(self._sqlite_write_queue),
+            name="sqlite-writer",
+        )
+
+    async def _run_sqlite_writer(self, queue: asyncio.Queue[_SQLiteWrite]) -> None:
+        """Drain queued writes, grouping whatever is waiting into one commit."""
+
+        batch_size = max(1, self._settings.sqlite_write_batch_size)
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            lock = self._sqlite_write_lock
+            assert lock is not None
+            async with lock:
+                await self._apply_sqlite_write_batch(batch)
+
+    async def _apply_sqlite_write_batch(self, batch: list[_SQLiteWrite]) -> None:
+        conn = self._sqlite_conn
+        pending = [write for write in batch if not write.future.done()]
+        if not pending:
+            return
+        if conn is None:
+            error = RuntimeError("SQLite database not initialised")
+            for write in pending:
+                write.future.set_exception(error)
+            return
+
+        results: list[tuple[int, int] | BaseException] = []
+        try:
+            # Commit anything left open by callers using ``acquire()`` directly
+            # so the batch starts from a clean transaction state, matching the
+            # commit-after-every-statement behaviour they relied on.
+            if conn.in_transaction:
+                await conn.commit()
+            await conn.execute("BEGIN IMMEDIATE")
+            if len(pending) == 1:
+                write = pending[0]
+                async with conn.execute(write.sql, write.params) as cursor:
+                    results.append((int(cursor.rowcount or 0), int(cursor.lastrowid or 0)))
+            else:
+                # Savepoints isolate each statement so one failing write does
+                # not roll back the unrelated writes sharing its transaction.
+                for write in pending:
+                    await conn.execute("SAVEPOINT sqlite_write")
+                    try:
+                        async with conn.execute(write.sql, write.params) as cursor:
+                            result = (int(cursor.rowcount or 0), int(cursor.lastrowid or 0))
+                    except Exception as exc:
+                        await conn.execute("ROLLBACK TO SAVEPOINT sqlite_write")
+                        await conn.execute("RELEASE SAVEPOINT sqlite_write")
+                        results.append(exc)
+                        continue
+                    await conn.execute("RELEASE SAVEPOINT sqlite_write")
+                    results.append(result)
+            await conn.commit()
+        except Exception as exc:
+            with suppress(Exception):
+                await conn.rollback()
+            for write in pending:
+                if not write.future.done():
+                    write.future.set_exception(exc)
+            return
+
+        for write, result in zip(pending, results):
+            if write.future.done():
+                continue
+            if isinstance(result, BaseException):
+                write.future.set_exception(result)
+            else:
+                write.future.set_result(result)
+
+    async def _sqlite_write(self, sql: str, params: tuple | dict | None) -> tuple[int, int]:
+        """Run a write on the SQLite writer connection.
+
+        Returns ``(rowcount, lastrowid)`` once the statement's transaction has
+        committed.
+        """
+
+        if not self._sqlite_conn:
+            raise RuntimeError("SQLite database not initialised")
+        if _sqlite_writer_held.get():
+            # Already inside ``acquire()``: the writer lock is ours, so run the
+            # statement inline on the same connection.
+            cursor = await self._sqlite_conn.execute(sql, params or ())
+            await self._sqlite_conn.commit()
+            return int(cursor.rowcount or 0), int(cursor.lastrowid or 0)
+        self._ensure_sqlite_runtime()
+        assert self._sqlite_write_queue is not None
+        future: asyncio.Future[tuple[int, int]] = asyncio.get_running_loop().create_future()
+        self._sqlite_write_queue.put_nowait(_SQLiteWrite(sql, params or (), future))
+        return await future
+
+    @asynccontextmanager
+    async def _sqlite_reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read-only SQLite connection from the pool."""
+
+        if not self._sqlite_conn:
+            raise RuntimeError("SQLite database not initialised")
+        self._ensure_sqlite_runtime()
+        assert self._sqlite_read_queue is not None
+        queue = self._sqlite_read_queue
+        stats = self._pool_stats["request"]
+        if queue.empty():
+            stats.contended += 1
+        stats.waiting += 1
+        started = time.perf_counter()
+        try:
+            conn = await queue.get()
+        finally:
+            stats.waiting -= 1
+        stats.record_wait(time.perf_counter() - started)
+        stats.in_use += 1
+        try:
+            yield conn
+        finally:
+            stats.in_use -= 1
+            queue.put_nowait(conn)
 
     async def disconnect(self) -> None:
         if self._sqlite_conn:
             logger.info("Disconnecting from SQLite database")
+            await self._stop_sqlite_writer()
+            for reader in self._sqlite_readers:
+                with suppress(Exception):
+                    await reader.close()
+            self._sqlite_readers = []
             await self._sqlite_conn.close()
             self._sqlite_conn = None
             logger.info("SQLite database disconnected successfully")
         elif self._pool:
             logger.info("Disconnecting from MySQL database")
-            self._pool.close()
-            await self._pool.wait_closed()
+            for pool in (self._pool, self._background_pool, *self._replica_pools):
+                if pool is None:
+                    continue
+                pool.close()
+                await pool.wait_closed()
             self._pool = None
+            self._background_pool = None
+            self._replica_pools = []
             logger.info("MySQL database disconnected successfully")
 
+    async def _stop_sqlite_writer(self) -> None:
+        task = self._sqlite_writer_task
+        queue = self._sqlite_write_queue
+        same_loop = self._sqlite_loop is asyncio.get_running_loop()
+        self._sqlite_writer_task = None
+        self._sqlite_write_queue = None
+        self._sqlite_read_queue = None
+        self._sqlite_write_lock = None
+        self._sqlite_loop = None
+        if not same_loop:
+            # The writer belonged to a loop that has already gone away.
+            return
+        if task is not None and not task.done():
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        if queue is not None:
+            error = RuntimeError("SQLite database disconnected")
+            while not queue.empty():
+                write = queue.get_nowait()
+                if not write.future.done():
+                    write.future.set_exception(error)
+
     def is_connected(self) -> bool:
         return self._pool is not None or self._sqlite_conn is not None
 
@@ -162,78 +790,97 @@ class Database:
         """Acquire a database connection.
         
         For MySQL, this returns a connection from the pool.
-        For SQLite, this returns the single connection.
+        For SQLite, this returns the writer connection, holding the write lock
+        so queued writes from the writer task cannot interleave with the
+        caller's statements.
+
+        Connections handed out here always come from the primary and are
+        assumed to write, so later reads in the same request skip replicas.
         """
+        self._note_write()
+        async with self._acquire() as conn:
+            yield conn
+
+    @asynccontextmanager
+    async def _acquire(self) -> AsyncIterator[Any]:
         if self._use_sqlite:
             if not self._sqlite_conn:
                 raise RuntimeError("SQLite database not initialised")
-            yield self._sqlite_conn
+            if _sqlite_writer_held.get():
+                yield self._sqlite_conn
+                return
+            self._ensure_sqlite_runtime()
+            assert self._sqlite_write_lock is not None
+            async with self._sqlite_write_lock:
+                token = _sqlite_writer_held.set(True)
+                try:
+                    yield self._sqlite_conn
+                finally:
+                    _sqlite_writer_held.reset(token)
         else:
-            if not self._pool:
+            pool, stats = self._select_pool()
+            if not pool:
                 raise RuntimeError("Database pool not initialised")
-            conn = await self._pool.acquire()
+            conn = await self._acquire_from_pool(pool, stats)
             try:
                 yield conn
             finally:
-                self._pool.release(conn)
+                self._release_to_pool(pool, stats, conn)
 
     async def execute(self, sql: str, params: tuple | dict | None = None) -> None:
-        if self._use_sqlite:
-            if not self._sqlite_conn:
-                raise RuntimeError("SQLite database not initialised")
-            await self._sqlite_conn.execute(sql, params or ())
-            await self._sqlite_conn.commit()
-        else:
-            async with self.acquire() as conn:
-                async with conn.cursor() as cursor:
-                    adapted_sql, adapted_params = self._adapt_params_for_mysql(sql, params)
-                    await cursor.execute(adapted_sql, adapted_params)
+        self._note_write()
+        with _profiled(sql):
+            if self._use_sqlite:
+                await self._sqlite_write(sql, params)
+            else:
+                async with self.acquire() as conn:
+                    async with conn.cursor() as cursor:
+                        adapted_sql, adapted_params = self._adapt_params_for_mysql(sql, params)
+                        await cursor.execute(adapted_sql, adapted_params)
 
     async def execute_rowcount(self, sql: str, params: tuple | dict | None = None) -> int:
-        if self._use_sqlite:
-            if not self._sqlite_conn:
-                raise RuntimeError("SQLite database not initialised")
-            cursor = await self._sqlite_conn.execute(sql, params or ())
-            await self._sqlite_conn.commit()
-            return int(cursor.rowcount or 0)
-        else:
-            async with self.acquire() as conn:
-                async with conn.cursor() as cursor:
-                    adapted_sql, adapted_params = self._adapt_params_for_mysql(sql, params)
-                    await cursor.execute(adapted_sql, adapted_params)
-                    return int(cursor.rowcount or 0)
+        self._note_write()
+        with _profiled(sql):
+            if self._use_sqlite:
+                rowcount, _ = await self._sqlite_write(sql, params)
+                return rowcount
+            else:
+                async with self.acquire() as conn:
+                    async with conn.cursor() as cursor:
+                        adapted_sql, adapted_params = self._adapt_params_for_mysql(sql, params)
+                        await cursor.execute(adapted_sql, adapted_params)
+                        return int(cursor.rowcount or 0)
 
     async def execute_returning_lastrowid(
         self, sql: str, params: tuple | dict | None = None
     ) -> int:
-        if self._use_sqlite:
-            if not self._sqlite_conn:
-                raise RuntimeError("SQLite database not initialised")
-            cursor = await self._sqlite_conn.execute(sql, params or ())
-            await self._sqlite_conn.commit()
-            return cursor.lastrowid if cursor.lastrowid else 0
-        else:
-            async with self.acquire() as conn:
-                async with conn.cursor() as cursor:
-                    adapted_sql, adapted_params = self._adapt_params_for_mysql(sql, params)
-                    await cursor.execute(adapted_sql, adapted_params)
-                    last_row_id = cursor.lastrowid
-            return int(last_row_id) if last_row_id is not None else 0
+        self._note_write()
+        with _profiled(sql):
+            if self._use_sqlite:
+                _, last_row_id = await self._sqlite_write(sql, params)
+                return last_row_id
+            else:
+                async with self.acquire() as conn:
+                    async with conn.cursor() as cursor:
+                        adapted_sql, adapted_params = self._adapt_params_for_mysql(sql, params)
+                        await cursor.execute(adapted_sql, adapted_params)
+                        last_row_id = cursor.lastrowid
+                return int(last_row_id) if last_row_id is not None else 0
 
     async def fetch_one(self, sql: str, params: tuple | dict | None = None):
-        if self._use_sqlite:
-            if not self._sqlite_conn:
-                raise RuntimeError("SQLite database not initialised")
-            cursor = await self._sqlite_conn.execute(sql, params or ())
-            row = await cursor.fetchone()
-            # Convert sqlite3.Row to dict
-            return dict(row) if row else None
-        else:
-            async with self.acquire() as conn:
-                async with conn.cursor(aiomysql.DictCursor) as cursor:
-                    adapted_sql, adapted_params = self._adapt_params_for_mysql(sql, params)
-                    await cursor.execute(adapted_sql, adapted_params)
-                    return await cursor.fetchone()
+        with _profiled(sql):
+            if self._use_sqlite:
+                async with self._sqlite_reader() as conn:
+                    async with conn.execute(sql, params or ()) as cursor:
+                        row = await cursor.fetchone()
+                # Convert sqlite3.Row to dict
+                return dict(row) if row else None
+            else:
+                async with self._read_connection() as conn:
+                    async with conn.cursor(aiomysql.DictCursor) as cursor:
+                        adapted_sql, adapted_params = self._adapt_params_for_mysql(sql, params)
+                        await cursor.execute(adapted_sql, adapted_params)
+                        return await cursor.fetchone()
 
     async def fetch_many(self, sql: str, size: int, params: tuple | dict | None = None):
         """Execute ``sql`` and return at most ``size`` rows.
@@ -244,45 +891,115 @@ class Database:
         """
         if size <= 0:
             raise ValueError("size must be a positive integer")
-        if self._use_sqlite:
-            if not self._sqlite_conn:
-                raise RuntimeError("SQLite database not initialised")
-            cursor = await self._sqlite_conn.execute(sql, params or ())
-            rows = await cursor.fetchmany(size)
-            return [dict(row) for row in rows]
-        else:
-            async with self.acquire() as conn:
-                async with conn.cursor(aiomysql.DictCursor) as cursor:
-                    adapted_sql, adapted_params = self._adapt_params_for_mysql(sql, params)
-                    await cursor.execute(adapted_sql, adapted_params)
-                    return list(await cursor.fetchmany(size))
+        with _profiled(sql):
+            if self._use_sqlite:
+                async with self._sqlite_reader() as conn:
+                    async with conn.execute(sql, params or ()) as cursor:
+                        rows = await cursor.fetchmany(size)
+                return [dict(row) for row in rows]
+            else:
+                async with self._read_connection() as conn:
+                    async with conn.cursor(aiomysql.DictCursor) as cursor:
+                        adapted_sql, adapted_params = self._adapt_params_for_mysql(sql, params)
+                        await cursor.execute(adapted_sql, adapted_params)
+                        return list(await cursor.fetchmany(size))
 
     async def fetch_all(self, sql: str, params: tuple | dict | None = None):
-        if self._use_sqlite:
-            if not self._sqlite_conn:
-                raise RuntimeError("SQLite database not initialised")
-            cursor = await self._sqlite_conn.execute(sql, params or ())
-            rows = await cursor.fetchall()
-            # Convert sqlite3.Row objects to dicts
-            return [dict(row) for row in rows]
-        else:
-            async with self.acquire() as conn:
-                async with conn.cursor(aiomysql.DictCursor) as cursor:
+        with _profiled(sql):
+            if self._use_sqlite:
+                async with self._sqlite_reader() as conn:
+                    async with conn.execute(sql, params or ()) as cursor:
+                        rows = await cursor.fetchall()
+                # Convert sqlite3.Row objects to dicts
+                return [dict(row) for row in rows]
+            else:
+                async with self._read_connection() as conn:
+                    async with conn.cursor(aiomysql.DictCursor) as cursor:
+                        adapted_sql, adapted_params = self._adapt_params_for_mysql(sql, params)
+                        await cursor.execute(adapted_sql, adapted_params)
+                        return await cursor.fetchall()
+
+    async def stream_batches(
+        self,
+        sql: str,
+        params: tuple | dict | None = None,
+        *,
+        batch_size: int = 500,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield the rows of ``sql`` in lists of at most ``batch_size``.
+
+        MySQL uses an unbuffered server-side cursor and SQLite fetches
+        incrementally, so only one batch is held in memory at a time.  The
+        connection stays checked out until the generator finishes; wrap
+        partial consumers in ``contextlib.aclosing`` so it is returned
+        promptly.
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer")
+        with _profiled(sql):
+            if self._use_sqlite:
+                async with self._sqlite_reader() as conn:
+                    async with conn.execute(sql, params or ()) as cursor:
+                        while True:
+                            rows = await cursor.fetchmany(batch_size)
+                            if not rows:
+                                break
+                            yield [dict(row) for row in rows]
+                return
+            async with self._read_connection() as conn:
+                cursor = await conn.cursor(aiomysql.SSDictCursor)
+                completed = False
+                try:
                     adapted_sql, adapted_params = self._adapt_params_for_mysql(sql, params)
                     await cursor.execute(adapted_sql, adapted_params)
-                    return await cursor.fetchall()
+                    while True:
+                        rows = await cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        yield list(rows)
+                    completed = True
+                finally:
+                    if completed:
+                        await cursor.close()
+                    else:
+                        # Closing an unbuffered cursor early would read and
+                        # discard every remaining row; dropping the connection
+                        # is cheaper and the pool replaces it.
+                        conn.close()
+
+    async def stream(
+        self,
+        sql: str,
+        params: tuple | dict | None = None,
+        *,
+        batch_size: int = 500,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield the rows of ``sql`` one at a time in constant memory.
+
+        See :meth:`stream_batches`; ``batch_size`` controls how many rows are
+        fetched from the database per round trip.
+        """
+        async with aclosing(self.stream_batches(sql, params, batch_size=batch_size)) as batches:
+            async for batch in batches:
+                for row in batch:
+                    yield row
 
     def _adapt_params_for_mysql(
         self, sql: str, params: tuple | list | dict | None
     ) -> tuple[str, tuple | list | dict | None]:
-        """Translate SQLite-style positional (`?`) or named (`:name`) params to MySQL format."""
+        """Translate SQLite-style positional (`?`) or named (`:name`) params to MySQL format.
+
+        The rewritten SQL depends only on the statement text and the parameter
+        style, so it is memoised in a bounded LRU cache; repositories pass the
+        same literal statements on every call and skip the rewrite entirely
+        after the first one.
+        """
 
         if params is None:
             return sql, params
 
         if isinstance(params, dict):
-            adapted_sql = re.sub(r":(\w+)", r"%(\1)s", sql)
-            return adapted_sql, params
+            return _rewrite_named_placeholders(sql), params
 
         # aiomysql uses the "format" paramstyle (`%s` placeholders). When a query
         # was authored with SQLite-style positional placeholders (`?`) and is
@@ -292,106 +1009,22 @@ class Database:
         # positional `?` placeholders with `%s` for MySQL while leaving existing
         # `%`-style placeholders untouched.
         if isinstance(params, (tuple, list)) and "?" in sql:
-            placeholder_count = sql.count("?")
-            if (
-                placeholder_count == len(params)
-                and "'" not in sql
-                and '"' not in sql
-                and "--" not in sql
-                and "/*" not in sql
-            ):
-                # Fast path when placeholder count matches parameter count and no
-                # obvious quotes or comments are present anywhere in the statement.
-                # This intentionally errs on the side of safety and may skip the fast
-                # path when these tokens appear inside identifiers or other text,
-                # falling back to the slower but safer parser below.
-                return sql.replace("?", "%s"), params
-
-            # Only replace placeholders that are not inside quoted string literals.
-            result_chars: list[str] = []
-            in_single_quote = False
-            in_double_quote = False
-            in_line_comment = False
-            in_block_comment = False
-            length = len(sql)
-            i = 0
-
-            while i < length:
-                char = sql[i]
-                next_char = sql[i + 1] if i + 1 < length else ""
-
-                if not in_single_quote and not in_double_quote and not in_block_comment:
-                    if not in_line_comment and char == "-" and next_char == "-":
-                        in_line_comment = True
-                        result_chars.append(char)
-                        result_chars.append(next_char)
-                        i += 2
-                        continue
-                    if not in_line_comment and char == "/" and next_char == "*":
-                        in_block_comment = True
-                        result_chars.append(char)
-                        result_chars.append(next_char)
-                        i += 2
-                        continue
+            return _rewrite_positional_placeholders(sql), params
 
-                if in_line_comment:
-                    result_chars.append(char)
-                    i += 1
-                    if char == "\n":
-                        in_line_comment = False
-                    continue
-
-                if in_block_comment:
-                    result_chars.append(char)
-                    i += 1
-                    if char == "*" and next_char == "/":
-                        result_chars.append(next_char)
-                        i += 1
-                        in_block_comment = False
-                    continue
-
-                if (in_single_quote or in_double_quote) and char == "\\":
-                    result_chars.append(char)
-                    if next_char:
-                        result_chars.append(next_char)
-                        i += 2
-                        continue
-                    i += 1
-                    continue
-
-                if char == "'" and not in_double_quote:
-                    result_chars.append(char)
-                    if in_single_quote and next_char == "'":
-                        # Doubled single quote representing a literal quote in SQL strings.
-                        result_chars.append(next_char)
-                        i += 2
-                        continue
-                    in_single_quote = not in_single_quote
-                    i += 1
-                    continue
-
-                if char == '"' and not in_single_quote:
-                    result_chars.append(char)
-                    if in_double_quote and next_char == '"':
-                        # Doubled double quote representing a literal quote in identifiers.
-                        result_chars.append(next_char)
-                        i += 2
-                        continue
-                    in_double_quote = not in_double_quote
-                    i += 1
-                    continue
-
-                if char == "?" and not in_single_quote and not in_double_quote:
-                    result_chars.append("%s")
-                    i += 1
-                    continue
-
-                result_chars.append(char)
-                i += 1
+        return sql, params
 
-            return "".join(result_chars), params
+    @staticmethod
+    def sql_cache_stats() -> dict[str, int]:
+        """Return hit/miss counters for the adapted-SQL caches."""
 
-        return sql, params
+        named = _rewrite_named_placeholders.cache_info()
+        positional = _rewrite_positional_placeholders.cache_info()
+        return {
+            "hits": named.hits + positional.hits,
+            "misses": named.misses + positional.misses,
+            "size": named.currsize + positional.currsize,
+            "maxsize": (named.maxsize or 0) + (positional.maxsize or 0),
+        }
 
     def _get_migrations_dir(self) -> Path:
         return Path(__file__).resolve().parent.parent.parent / "migrations"
@@ -402,6 +1035,7 @@ class Database:
             await conn.execute(
                 "CREATE TABLE IF NOT EXISTS migrations (name VARCHAR(255) PRIMARY KEY)"
             )
+            await conn.execute(_MIGRATION_MANIFEST_TABLE_SQL)
             await conn.commit()
         else:
             async with conn.cursor() as cursor:
@@ -410,6 +1044,7 @@ class Database:
                     await cursor.execute(
                         "CREATE TABLE IF NOT EXISTS migrations (name VARCHAR(255) PRIMARY KEY)"
                     )
+                    await cursor.execute(_MIGRATION_MANIFEST_TABLE_SQL)
                 finally:
                     await cursor.execute("SET sql_notes = 1")
 
@@ -506,8 +1141,102 @@ class Database:
                     (path.name,),
                 )
 
-    async def run_migrations(self) -> None:
-        """Run all pending migrations."""
+    async def _migrations_up_to_date(self, expected_hash: str) -> bool:
+        """Return True when the stored manifest matches ``expected_hash``.
+
+        The applied count guards against rows being deleted from
+        ``migrations`` by hand to force a re-run.  Any error (for example the
+        table not existing yet) falls back to the full walk.
+        """
+        try:
+            row = await self.fetch_one(
+                """
+                SELECT manifest_hash, applied_count,
+                    (SELECT COUNT(*) FROM migrations) AS current_count
+                FROM migration_manifest
+                WHERE id = 1
+                """
+            )
+        except Exception:
+            return False
+        if not row:
+            return False
+        return row["manifest_hash"] == expected_hash and int(row["applied_count"]) == int(
+            row["current_count"]
+        )
+
+    async def _record_migration_manifest(
+        self, conn: Any, expected_hash: str, applied_count: int
+    ) -> None:
+        params = (expected_hash, applied_count)
+        if self._use_sqlite:
+            await conn.execute(
+                "REPLACE INTO migration_manifest (id, manifest_hash, applied_count) "
+                "VALUES (1, ?, ?)",
+                params,
+            )
+            await conn.commit()
+        else:
+            async with conn.cursor() as cursor:
+                await cursor.execute(
+                    "REPLACE INTO migration_manifest (id, manifest_hash, applied_count) "
+                    "VALUES (1, %s, %s)",
+                    params,
+                )
+
+    async def _is_empty_database(self, conn: Any) -> bool:
+        """Return True when only the migration bookkeeping tables exist."""
+        if self._use_sqlite:
+            cursor = await conn.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' "
+                "AND name NOT IN ('migrations', 'migration_manifest') "
+                "AND name NOT LIKE 'sqlite_%'"
+            )
+            row = await cursor.fetchone()
+        else:
+            async with conn.cursor() as cursor:
+                await cursor.execute(
+                    "SELECT COUNT(*) FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE() "
+                    "AND TABLE_NAME NOT IN ('migrations', 'migration_manifest')"
+                )
+                row = await cursor.fetchone()
+        return not row or int(row[0]) == 0
+
+    async def _apply_baseline(self, conn: Any, baseline: MigrationBaseline) -> None:
+        """Load a squashed baseline and mark its migrations as applied."""
+        started = time.perf_counter()
+        sql = baseline.read_sql()
+        names = [(name,) for name in baseline.migrations]
+        if self._use_sqlite:
+            await conn.executescript(sql)
+            await conn.executemany("INSERT INTO migrations (name) VALUES (?)", names)
+            await conn.commit()
+        else:
+            async with conn.cursor() as cursor:
+                await cursor.execute("SET sql_notes = 0")
+                try:
+                    for statement in self._split_sql_statements(sql):
+                        await cursor.execute(statement)
+                finally:
+                    await cursor.execute("SET sql_notes = 1")
+                await cursor.executemany("INSERT INTO migrations (name) VALUES (%s)", names)
+        logger.info(
+            "Applied {backend} migration baseline covering {count} migrations in {seconds:.2f}s",
+            backend=baseline.backend,
+            count=len(names),
+            seconds=time.perf_counter() - started,
+        )
+
+    async def run_migrations(self, *, use_baseline: bool | None = None) -> None:
+        """Run all pending migrations.
+
+        When the stored manifest hash matches the migration files on disk the
+        run returns without taking the migration lock.  Empty databases load
+        the committed baseline for their backend (unless ``use_baseline`` is
+        false or ``MIGRATION_BASELINE_ENABLED`` is off) and then apply only
+        the migrations added since it was generated.
+        """
         # For MySQL, ensure database exists
         if not self._use_sqlite:
             temp_conn = await aiomysql.connect(
@@ -536,6 +1265,17 @@ class Database:
             logger.warning("No migrations directory found at {path}", path=str(migrations_dir))
             return
 
+        manifest = sorted(path.name for path in migrations_dir.glob("*.sql"))
+        expected_hash = manifest_hash(manifest)
+        if await self._migrations_up_to_date(expected_hash):
+            logger.debug(
+                "Migrations up to date ({count} files); skipping migration walk",
+                count=len(manifest),
+            )
+            return
+        if use_baseline is None:
+            use_baseline = self._settings.migration_baseline_enabled
+
         lock_name = f"{self._settings.database_name or 'myportal'}_migration_lock"
         lock_timeout = getattr(self._settings, "migration_lock_timeout", 60)
         lock_acquired = False
@@ -571,12 +1311,23 @@ class Database:
                         applied_rows = await cursor.fetchall()
                     applied = {row["name"] for row in applied_rows}
 
+                if use_baseline and not applied and await self._is_empty_database(conn):
+                    baseline = load_baseline(
+                        migrations_dir, "sqlite" if self._use_sqlite else "mysql"
+                    )
+                    if baseline and set(baseline.migrations) <= set(manifest):
+                        await self._apply_baseline(conn, baseline)
+                        applied = set(baseline.migrations)
+
                 # Apply pending migrations
                 for path in sorted(migrations_dir.glob("*.sql")):
                     if path.name in applied:
                         continue
                     await self._apply_migration_file(conn, path)
+                    applied.add(path.name)
                     logger.info("Applied migration {name}", name=path.name)
+
+                await self._record_migration_manifest(conn, expected_hash, len(applied))
             finally:
                 if lock_acquired and not self._use_sqlite:
                     async with conn.cursor() as cursor:
@@ -680,6 +1431,10 @@ class Database:
         
         For SQLite: Always returns True as SQLite is single-threaded and
         doesn't support distributed locking.
+
+        The lock connection comes from the background pool, and queries issued
+        while the lock is held are routed there too, so scheduler jobs that
+        hold a lock for their whole run do not consume request connections.
         
         When the database is not initialized, yields True to allow operations
         to proceed. This is for testing convenience and doesn't provide actual
@@ -696,7 +1451,8 @@ class Database:
             yield True
             return
 
-        conn = await self._pool.acquire()
+        pool, stats = self._select_pool("background")
+        conn = await self._acquire_from_pool(pool, stats)
         lock_acquired = False
         try:
             async with conn.cursor() as cursor:
@@ -704,7 +1460,8 @@ class Database:
                 result = await cursor.fetchone()
                 lock_acquired = bool(result and result[0] == 1)
 
-            yield lock_acquired
+            with self.background():
+                yield lock_acquired
         finally:
             if lock_acquired:
                 try:
@@ -718,7 +1475,7 @@ class Database:
                         lock=lock_name,
                         error=str(exc),
                     )
-            self._pool.release(conn)
+            self._release_to_pool(pool, stats, conn)
 
 
 db = Database()
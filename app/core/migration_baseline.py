@@ -0,0 +1,153 @@
+"""Squashed migration baselines and the applied-migrations manifest hash.
+
+A baseline is a schema-and-data dump taken after applying every migration in
+``migrations/`` to an empty database.  Fresh databases load it in one step and
+record the migrations it covers instead of replaying each file; anything newer
+than the baseline is then applied normally.  Baselines are per backend
+(``migrations/baseline/mysql.sql`` / ``sqlite.sql``) because the SQLite schema
+is produced by translating the MySQL migrations.  Regenerate them with
+``scripts/generate_migration_baseline.py``.
+
+The manifest hash identifies the set of migration files on disk.  Once a run
+has applied them all it is stored in ``migration_manifest`` so later boots can
+compare one row against the directory listing and skip the migration walk.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+BASELINE_DIRNAME = "baseline"
+
+# Bookkeeping tables are recreated by the runner and never part of a dump.
+_EXCLUDED_TABLES = frozenset({"migrations", "migration_manifest"})
+
+_SQLITE_EXCLUDED_STATEMENT = re.compile(
+    r'^(?:CREATE TABLE (?:IF NOT EXISTS )?"?(?:migrations|migration_manifest)"?\s*\('
+    r'|INSERT INTO "?(?:migrations|migration_manifest)"?\s)',
+    re.IGNORECASE,
+)
+_DEFINER_CLAUSE = re.compile(r"\s+DEFINER=`[^`]*`@`[^`]*`")
+_AUTO_INCREMENT_CLAUSE = re.compile(r"\s+AUTO_INCREMENT=\d+")
+
+
+def manifest_hash(names: Iterable[str]) -> str:
+    """Return the hash identifying a set of migration file names."""
+
+    return hashlib.sha256("\n".join(sorted(names)).encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class MigrationBaseline:
+    backend: str
+    migrations: tuple[str, ...]
+    sql_path: Path
+
+    def read_sql(self) -> str:
+        return self.sql_path.read_text(encoding="utf-8")
+
+
+def baseline_paths(migrations_dir: Path, backend: str) -> tuple[Path, Path]:
+    directory = migrations_dir / BASELINE_DIRNAME
+    return directory / f"{backend}.sql", directory / f"{backend}.json"
+
+
+def load_baseline(migrations_dir: Path, backend: str) -> MigrationBaseline | None:
+    """Return the committed baseline for ``backend`` if one exists and is readable."""
+
+    sql_path, manifest_path = baseline_paths(migrations_dir, backend)
+    if not sql_path.exists() or not manifest_path.exists():
+        return None
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        names = tuple(str(name) for name in manifest["migrations"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if not names or manifest.get("hash") != manifest_hash(names):
+        return None
+    return MigrationBaseline(backend=backend, migrations=names, sql_path=sql_path)
+
+
+def write_baseline(
+    migrations_dir: Path, backend: str, names: Iterable[str], sql: str
+) -> tuple[Path, Path]:
+    """Write a baseline dump and the manifest of migrations it contains."""
+
+    ordered = sorted(names)
+    sql_path, manifest_path = baseline_paths(migrations_dir, backend)
+    sql_path.parent.mkdir(parents=True, exist_ok=True)
+    sql_path.write_text(sql, encoding="utf-8")
+    manifest = {
+        "backend": backend,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "hash": manifest_hash(ordered),
+        "migrations": ordered,
+    }
+    manifest_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return sql_path, manifest_path
+
+
+async def dump_sqlite(conn: Any) -> str:
+    """Dump an aiosqlite connection's schema and data, minus bookkeeping tables."""
+
+    lines = ["-- Generated by scripts/generate_migration_baseline.py; do not edit."]
+    async for statement in conn.iterdump():
+        if _SQLITE_EXCLUDED_STATEMENT.match(statement):
+            continue
+        lines.append(statement)
+    return "\n".join(lines) + "\n"
+
+
+async def dump_mysql(conn: Any) -> str:
+    """Dump an aiomysql connection's tables, rows, views and triggers."""
+
+    lines = [
+        "-- Generated by scripts/generate_migration_baseline.py; do not edit.",
+        "SET FOREIGN_KEY_CHECKS = 0;",
+    ]
+    async with conn.cursor() as cursor:
+        await cursor.execute("SHOW FULL TABLES")
+        listing = await cursor.fetchall()
+        tables = sorted(
+            row[0] for row in listing if row[1] == "BASE TABLE" and row[0] not in _EXCLUDED_TABLES
+        )
+        views = sorted(row[0] for row in listing if row[1] == "VIEW")
+
+        for table in tables:
+            await cursor.execute(f"SHOW CREATE TABLE `{table}`")
+            create_sql = (await cursor.fetchone())[1]
+            lines.append(_AUTO_INCREMENT_CLAUSE.sub("", create_sql) + ";")
+
+            await cursor.execute(
+                """
+                SELECT COLUMN_NAME FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+                  AND EXTRA NOT LIKE %s
+                ORDER BY ORDINAL_POSITION
+                """,
+                (table, "%GENERATED%"),
+            )
+            columns = [row[0] for row in await cursor.fetchall()]
+            column_list = ", ".join(f"`{column}`" for column in columns)
+            await cursor.execute(f"SELECT {column_list} FROM `{table}`")
+            for row in await cursor.fetchall():
+                values = ", ".join(conn.escape(value) for value in row)
+                lines.append(f"INSERT INTO `{table}` ({column_list}) VALUES ({values});")
+
+        for view in views:
+            await cursor.execute(f"SHOW CREATE VIEW `{view}`")
+            lines.append(_DEFINER_CLAUSE.sub("", (await cursor.fetchone())[1]) + ";")
+
+        await cursor.execute("SHOW TRIGGERS")
+        triggers = sorted(row[0] for row in await cursor.fetchall())
+        for trigger in triggers:
+            await cursor.execute(f"SHOW CREATE TRIGGER `{trigger}`")
+            lines.append(_DEFINER_CLAUSE.sub("", (await cursor.fetchone())[2]) + ";")
+
+    lines.append("SET FOREIGN_KEY_CHECKS = 1;")
+    return "\n".join(lines) + "\n"
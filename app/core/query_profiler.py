@@ -0,0 +1,142 @@
+"""Per-request database query profiling with repeated-statement detection.
+
+``RequestLoggingMiddleware`` opens a :class:`QueryProfile` for every logged
+request.  ``Database`` reports each statement it runs through
+:func:`record_query`, which is a no-op when no profile is active, so code
+outside a request (scheduler jobs, startup) pays nothing unless it opts in via
+:func:`profile_queries`.
+
+Statements are grouped by *shape*: the SQL with literals and placeholder lists
+collapsed, so ``SELECT ... WHERE id = %s`` issued once per ticket shows up as
+one shape with a high count.  Profiles whose most repeated shape exceeds the
+configured threshold are flagged as likely N+1 patterns, logged, and kept in a
+small in-memory ring buffer for the system API.
+"""
+from __future__ import annotations
+
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Iterator
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\?|:\w+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Only the most recent flagged profiles are retained; this is a debugging aid,
+# not a metrics store.
+_RECENT_FLAGGED_LIMIT = 50
+
+_current_profile: ContextVar["QueryProfile | None"] = ContextVar(
+    "query_profile", default=None
+)
+_recent_flagged: deque[dict[str, Any]] = deque(maxlen=_RECENT_FLAGGED_LIMIT)
+
+
+@lru_cache(maxsize=2048)
+def normalise_sql(sql: str) -> str:
+    """Return the statement shape used to group repeated queries."""
+
+    shape = _STRING_LITERAL.sub("?", sql)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _WHITESPACE.sub(" ", shape).strip()
+    return _PLACEHOLDER_LIST.sub("(?)", shape)
+
+
+@dataclass(slots=True)
+class StatementStats:
+    count: int = 0
+    total_seconds: float = 0.0
+
+
+@dataclass(slots=True)
+class QueryProfile:
+    """Statement counts and timings gathered for one request or job."""
+
+    label: str
+    request_id: str | None = None
+    statements: dict[str, StatementStats] = field(default_factory=dict)
+    query_count: int = 0
+    total_seconds: float = 0.0
+    closed: bool = False
+
+    def record(self, sql: str, duration: float) -> None:
+        if self.closed:
+            return
+        shape = normalise_sql(sql)
+        stats = self.statements.get(shape)
+        if stats is None:
+            stats = self.statements[shape] = StatementStats()
+        stats.count += 1
+        stats.total_seconds += duration
+        self.query_count += 1
+        self.total_seconds += duration
+
+    def repeated_statements(self, threshold: int) -> list[dict[str, Any]]:
+        """Return shapes executed more than ``threshold`` times, worst first."""
+
+        repeated = [
+            {
+                "sql": shape,
+                "count": stats.count,
+                "total_ms": round(stats.total_seconds * 1000, 2),
+            }
+            for shape, stats in self.statements.items()
+            if stats.count > threshold
+        ]
+        repeated.sort(key=lambda entry: entry["count"], reverse=True)
+        return repeated
+
+    def summary(self, threshold: int) -> dict[str, Any]:
+        return {
+            "label": self.label,
+            "request_id": self.request_id,
+            "query_count": self.query_count,
+            "distinct_statements": len(self.statements),
+            "db_time_ms": round(self.total_seconds * 1000, 2),
+            "repeated": self.repeated_statements(threshold),
+        }
+
+
+def current_profile() -> QueryProfile | None:
+    return _current_profile.get()
+
+
+def record_query(sql: str, started: float) -> None:
+    """Attribute a statement that began at ``started`` to the active profile."""
+
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(sql, time.perf_counter() - started)
+
+
+@contextmanager
+def profile_queries(label: str, *, request_id: str | None = None) -> Iterator[QueryProfile]:
+    """Collect statements issued inside the block (and tasks it spawns)."""
+
+    profile = QueryProfile(label=label, request_id=request_id)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        # Background tasks spawned by the request inherit the profile; closing
+        # it stops their later queries being attributed to this request.
+        profile.closed = True
+        _current_profile.reset(token)
+
+
+def remember_flagged(summary: dict[str, Any]) -> None:
+    _recent_flagged.appendleft(summary)
+
+
+def recent_flagged_profiles() -> list[dict[str, Any]]:
+    """Return the most recent profiles flagged for repeated statements."""
+
+    return list(_recent_flagged)
@@ -0,0 +1,298 @@
+"""Shared in-process cache for slow-changing reference data.
+
+Ticket statuses, integration modules, notification event settings, labour
+types and site settings are read on most requests and by many scheduler jobs
+but change only when an administrator edits them.  Repositories read them
+through :data:`reference_cache`, grouped into *namespaces* (one per table),
+and every repository write invalidates its namespace.
+
+Invalidations are shared between workers through Redis when it is configured:
+
+* each namespace has a version stamp (``reference-cache:version:<namespace>``)
+  that writers increment, and
+* the new version is published on the ``reference-cache:invalidate`` channel,
+  the same pub/sub transport :class:`~app.services.realtime.RefreshNotifier`
+  uses, so other workers drop the namespace within about a second.
+
+Subscribers also compare the stored version stamps periodically, so an
+invalidation missed while the subscription was reconnecting is still picked up.
+Entries additionally expire after ``REFERENCE_CACHE_TTL_SECONDS``, which bounds
+staleness between workers when Redis is not configured.
+
+The cache is inactive until :meth:`ReferenceCache.start` runs at application
+startup; before then (and in scripts) reads go straight to the database.
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import secrets
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from redis.exceptions import RedisError
+
+from app.core.database import db
+from app.core.logging import log_warning
+
+T = TypeVar("T")
+
+_CHANNEL = "reference-cache:invalidate"
+_VERSION_KEY_PREFIX = "reference-cache:version:"
+# How often subscribers re-read the version stamps as a safety net for
+# invalidation messages lost while the pub/sub connection was down.
+_VERSION_CHECK_INTERVAL_SECONDS = 30.0
+# Entries kept per namespace.  Keyed namespaces such as sessions grow with
+# the number of distinct keys, so the least recently used entries are
+# evicted beyond this.
+_MAX_ENTRIES_PER_NAMESPACE = 10_000
+
+# Compiled per-user permission snapshots (see app.services.permission_snapshots).
+# Every role, membership, user permission and company write invalidates it.
+PERMISSION_SNAPSHOTS = "permission_snapshots"
+# Validated session records keyed by token hash (see app.repositories.auth).
+# Session writes other than sliding-expiry touches invalidate it.
+USER_SESSIONS = "user_sessions"
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    value: Any
+    expires_at: float
+
+
+class ReferenceCache:
+    """Per-process cache of reference data with cross-worker invalidation."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, dict[Hashable, _CacheEntry]] = {}
+        # Bumped on every local invalidation so a load that started before it
+        # cannot store the value it read.
+        self._generations: dict[str, int] = {}
+        self._versions: dict[str, int] = {}
+        self._enabled = False
+        self._ttl_seconds = 60.0
+        self._redis: Redis | None = None
+        self._pubsub: PubSub | None = None
+        self._listener_task: asyncio.Task[None] | None = None
+        self._node_id = secrets.token_hex(8)
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    async def start(
+        self,
+        *,
+        redis_client: Redis | None = None,
+        ttl_seconds: float = 60.0,
+    ) -> None:
+        """Enable caching and, with Redis, subscribe to invalidations."""
+
+        self._ttl_seconds = float(ttl_seconds)
+        self._redis = redis_client
+        if redis_client is not None and self._listener_task is None:
+            # Subscribe before enabling so a worker that cannot hear other
+            # workers' invalidations never serves cached values.
+            self._pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            await self._pubsub.subscribe(_CHANNEL)
+            self._listener_task = asyncio.create_task(self._listen_for_invalidations())
+        self._enabled = True
+
+    async def stop(self) -> None:
+        """Disable caching and release the Redis subscription."""
+
+        self._enabled = False
+        self.clear()
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener_task
+            self._listener_task = None
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe(_CHANNEL)
+            except Exception:  # pragma: no cover - defensive cleanup
+                pass
+            try:
+                await self._pubsub.close()
+            except Exception:  # pragma: no cover - defensive cleanup
+                pass
+            self._pubsub = None
+        self._redis = None
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        key: Hashable,
+        loader: Callable[[], Awaitable[T]],
+        *,
+        ttl_seconds: float | None = None,
+        cache_none: bool = True,
+    ) -> T:
+        """Return the cached value for ``key`` or load and cache it.
+
+        Callers receive their own copy, so mutating a returned record never
+        changes what other callers see.  ``ttl_seconds`` overrides the
+        configured expiry for this entry; ``0`` bypasses the cache.  With
+        ``cache_none=False`` a ``None`` result is not stored, for lookups
+        keyed by client-supplied values.
+        """
+
+        ttl = self._ttl_seconds if ttl_seconds is None else float(ttl_seconds)
+        if not self._enabled or ttl <= 0:
+            return await loader()
+        entries = self._entries.get(namespace, {})
+        entry = entries.get(key)
+        now = time.monotonic()
+        if entry is not None:
+            if entry.expires_at > now:
+                self._hits += 1
+                # Keep recently used entries at the end for eviction order.
+                entries[key] = entries.pop(key)
+                return copy.deepcopy(entry.value)
+            entries.pop(key, None)
+
+        self._misses += 1
+        generation = self._generations.get(namespace, 0)
+        # Reload from the primary: a replica that has not caught up with the
+        # write that caused the invalidation would be cached until expiry.
+        with db.primary():
+            value = await loader()
+        if value is None and not cache_none:
+            return value
+        if self._enabled and self._generations.get(namespace, 0) == generation:
+            entries = self._entries.setdefault(namespace, {})
+            if len(entries) >= _MAX_ENTRIES_PER_NAMESPACE:
+                self._evict(entries, now)
+            entries[key] = _CacheEntry(
+                value=copy.deepcopy(value),
+                expires_at=now + ttl,
+            )
+        return value
+
+    async def invalidate(self, namespace: str) -> None:
+        """Drop ``namespace`` here and tell every other worker to drop it."""
+
+        self._drop(namespace)
+        self._invalidations += 1
+        if self._redis is None:
+            return
+        try:
+            version = int(await self._redis.incr(_VERSION_KEY_PREFIX + namespace))
+            self._versions[namespace] = version
+            envelope = {"source": self._node_id, "namespace": namespace, "version": version}
+            await self._redis.publish(_CHANNEL, json.dumps(envelope))
+        except RedisError as exc:
+            log_warning(
+                "Failed to publish reference cache invalidation",
+                namespace=namespace,
+                error=str(exc),
+            )
+
+    def clear(self) -> None:
+        for namespace in list(self._entries):
+            self._drop(namespace)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self._enabled,
+            "shared": self._redis is not None,
+            "hits": self._hits,
+            "misses": self._misses,
+            "invalidations": self._invalidations,
+            "entries": {
+                namespace: len(entries) for namespace, entries in sorted(self._entries.items())
+            },
+        }
+
+    @staticmethod
+    def _evict(entries: dict[Hashable, _CacheEntry], now: float) -> None:
+        """Purge expired entries, then the least recently used beyond the cap."""
+
+        for key in [key for key, entry in entries.items() if entry.expires_at <= now]:
+            del entries[key]
+        while len(entries) >= _MAX_ENTRIES_PER_NAMESPACE:
+            del entries[next(iter(entries))]
+
+    def _drop(self, namespace: str) -> None:
+        self._entries.pop(namespace, None)
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def _apply_remote_version(self, namespace: str, version: int) -> None:
+        if self._versions.get(namespace) != version:
+            self._versions[namespace] = version
+            self._drop(namespace)
+
+    async def _check_versions(self) -> None:
+        if self._redis is None:
+            return
+        namespaces = sorted(set(self._entries) | set(self._versions))
+        if not namespaces:
+            return
+        values = await self._redis.mget([_VERSION_KEY_PREFIX + name for name in namespaces])
+        for namespace, value in zip(namespaces, values):
+            if value is None:
+                continue
+            try:
+                version = int(value)
+            except (TypeError, ValueError):
+                continue
+            if namespace not in self._versions:
+                # First sighting: adopt the stamp without discarding entries.
+                self._versions[namespace] = version
+                continue
+            self._apply_remote_version(namespace, version)
+
+    def _handle_message(self, data: Any) -> None:
+        if isinstance(data, bytes):
+            try:
+                data = data.decode("utf-8")
+            except UnicodeDecodeError:
+                return
+        try:
+            envelope = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if not isinstance(envelope, dict) or envelope.get("source") == self._node_id:
+            return
+        namespace = envelope.get("namespace")
+        version = envelope.get("version")
+        if isinstance(namespace, str) and isinstance(version, int):
+            self._apply_remote_version(namespace, version)
+
+    async def _listen_for_invalidations(self) -> None:
+        if self._pubsub is None:
+            return
+        next_check = 0.0
+        while True:
+            try:
+                if time.monotonic() >= next_check:
+                    await self._check_versions()
+                    next_check = time.monotonic() + _VERSION_CHECK_INTERVAL_SECONDS
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+            except asyncio.CancelledError:
+                break
+            except Exception as exc:  # pragma: no cover - defensive logging
+                log_warning("Reference cache subscriber error", error=str(exc))
+                await asyncio.sleep(1.0)
+                continue
+            if not message:
+                await asyncio.sleep(0.05)
+                continue
+            data = message.get("data")
+            if data:
+                self._handle_message(data)
+
+
+reference_cache = ReferenceCache()
@@ -0,0 +1,66 @@
+"""JSON response class used as the application's default response class.
+
+:class:`FastJSONResponse` serialises with ``orjson`` when it is installed and
+falls back to the standard library encoder otherwise.  Both paths convert
+``datetime``/``date``/``time`` values to ISO 8601 strings (naive datetimes are
+treated as UTC, matching how the database stores them) and ``Decimal`` values
+to numbers, so handlers can return database rows without converting them
+first.
+"""
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional runtime dependency fallback
+    orjson = None
+
+_ORJSON_OPTIONS = (
+    orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+)
+
+
+def _default(value: Any) -> Any:
+    """Convert values neither encoder handles natively."""
+
+    if isinstance(value, Decimal):
+        if value == value.to_integral():
+            return int(value)
+        return float(value)
+    if isinstance(value, datetime):
+        target = value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+        return target.isoformat()
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serialisable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialise ``content`` to UTF-8 JSON bytes."""
+
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` that serialises with orjson when available."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
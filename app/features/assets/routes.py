@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import csv
+import io
+from contextlib import aclosing
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal, InvalidOperation
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Request, status
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse
 
 from app.core.logging import log_info
 from app.repositories import asset_custom_fields as asset_custom_fields_repo
@@ -51,6 +54,31 @@ _ASSET_TABLE_COLUMNS: list[dict[str, str]] = [
 ]
 
 
+def _clean_text(value: Any) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return str(value)
+    text = str(value).strip()
+    return text or None
+
+
+def _format_number(value: Any) -> tuple[str | None, str]:
+    if value is None:
+        return None, ""
+    if isinstance(value, str) and not value.strip():
+        return None, ""
+    try:
+        decimal_value = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        text = _clean_text(value)
+        return text, text or ""
+    display = format(decimal_value.normalize(), "f")
+    if "." in display:
+        display = display.rstrip("0").rstrip(".")
+    return display or "0", str(decimal_value)
+
+
 def _main():
     from app import main as main_module
 
@@ -106,29 +134,6 @@ async def assets_page(request: Request):
     rows = await asset_repo.list_company_assets(company_id)
     field_definitions = await asset_custom_fields_repo.list_field_definitions()
 
-    def _clean_text(value: Any) -> str | None:
-        if value is None:
-            return None
-        if isinstance(value, (int, float)):
-            return str(value)
-        text = str(value).strip()
-        return text or None
-
-    def _format_number(value: Any) -> tuple[str | None, str]:
-        if value is None:
-            return None, ""
-        if isinstance(value, str) and not value.strip():
-            return None, ""
-        try:
-            decimal_value = Decimal(str(value))
-        except (InvalidOperation, ValueError):
-            text = _clean_text(value)
-            return text, text or ""
-        display = format(decimal_value.normalize(), "f")
-        if "." in display:
-            display = display.rstrip("0").rstrip(".")
-        return display or "0", str(decimal_value)
-
     def _parse_iso(value: str | None) -> datetime | None:
         if not value:
             return None
@@ -602,6 +607,121 @@ async def configure_network_scanner(request: Request, device_id: int):
     return RedirectResponse(url="/devices", status_code=status.HTTP_303_SEE_OTHER)
 
 
+_NUMERIC_EXPORT_COLUMNS = frozenset({"ram_gb", "approx_age", "performance_score"})
+_CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_safe(value: str) -> str:
+    """Neutralise spreadsheet formula injection, matching the in-page export."""
+    text = " ".join(value.split())
+    if text.startswith(_CSV_FORMULA_PREFIXES):
+        return f"'{text}"
+    return text
+
+
+def _asset_export_value(key: str, row: dict[str, Any], field_type: str | None) -> str:
+    value = row.get(key)
+    if field_type == "checkbox":
+        if value is None:
+            return ""
+        return "Yes" if value else "No"
+    if key in _NUMERIC_EXPORT_COLUMNS:
+        display, _ = _format_number(value)
+        return display or ""
+    if key == "last_sync":
+        return _main()._to_iso(value) or ""
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return _clean_text(value) or ""
+
+
+@router.get("/assets/export.csv")
+async def export_assets_csv(request: Request, columns: str | None = Query(default=None)):
+    """Stream the company's assets as CSV without loading them all into memory.
+
+    ``columns`` is an optional comma-separated list of column keys, letting the
+    page export only the columns the user has chosen to show.
+    """
+    main_module = _main()
+    user, membership, _company, company_id, redirect = await _load_asset_context(request)
+    if redirect:
+        return redirect
+    if not main_module._membership_menu_can(user, membership, "menu.assets", write=True):
+        raise HTTPException(status_code=403, detail="Asset write access required")
+
+    field_definitions = await asset_custom_fields_repo.list_field_definitions()
+    available = list(_ASSET_TABLE_COLUMNS) + [
+        {
+            "key": f"cf_{field_def['id']}",
+            "label": field_def["display_name"] or field_def["name"],
+            "field_type": field_def["field_type"],
+        }
+        for field_def in field_definitions
+    ]
+    if columns:
+        requested = {key.strip() for key in columns.split(",") if key.strip()}
+        selected = [column for column in available if column["key"] in requested]
+    else:
+        selected = available
+    if not selected:
+        raise HTTPException(status_code=400, detail="No asset columns selected")
+
+    custom_field_ids = {
+        int(column["key"][3:]) for column in selected if column["key"].startswith("cf_")
+    }
+    include_tray = any(column["key"] == "tray_agent_synced" for column in selected)
+
+    async def _rows():
+        buf = io.StringIO()
+        writer = csv.writer(buf, quoting=csv.QUOTE_ALL)
+        # Excel needs the BOM to read the file as UTF-8.
+        buf.write("\ufeff")
+        writer.writerow([column["label"] for column in selected])
+        async with aclosing(asset_repo.stream_company_assets(company_id)) as batches:
+            async for batch in batches:
+                asset_ids = [int(row["id"]) for row in batch if row.get("id")]
+                cf_values = (
+                    await asset_custom_fields_repo.get_all_asset_field_values(asset_ids)
+                    if custom_field_ids
+                    else {}
+                )
+                tray_devices = (
+                    await tray_repo.list_active_devices_by_asset_ids(asset_ids)
+                    if include_tray
+                    else {}
+                )
+                for row in batch:
+                    record = dict(row)
+                    asset_id = record.get("id")
+                    record["tray_agent_synced"] = asset_id in tray_devices
+                    for field_id, value in cf_values.get(asset_id, {}).items():
+                        record[f"cf_{field_id}"] = value
+                    writer.writerow(
+                        [
+                            _csv_safe(
+                                _asset_export_value(
+                                    column["key"], record, column.get("field_type")
+                                )
+                            )
+                            for column in selected
+                        ]
+                    )
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        if buf.tell():
+            yield buf.getvalue()
+
+    filename = f"assets-{datetime.now(timezone.utc).strftime('%Y-%m-%d-%H-%M-%S')}.csv"
+    return StreamingResponse(
+        _rows(),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get("/assets/{asset_id}", response_class=RedirectResponse)
 async def asset_detail_page(request: Request, asset_id: int):
     user, _membership, _, company_id, redirect = await _load_asset_context(request)
@@ -57,7 +57,7 @@ async def handle_m365_mail_auth_callback(
         "code_verifier": code_verifier,
         "scope": main_module.m365_mail_service.DELEGATED_MAIL_SCOPE,
     }
-    async with main_module.httpx.AsyncClient(timeout=30) as client:
+    async with main_module.http_clients.client("m365") as client:
         token_response = await client.post(token_endpoint, data=token_data)
     if token_response.status_code != 200:
         main_module.log_error(
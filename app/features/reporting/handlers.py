@@ -8,6 +8,7 @@ from datetime import datetime, timezone
 from typing import Any
 
 from fastapi import HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from starlette.datastructures import FormData
 
 from app.security.flash import flash_redirect
@@ -15,6 +16,13 @@ from app.security.flash import flash_redirect
 
 _REPORTING_SLUG_RE = re.compile(r"^[A-Za-z0-9_-]+$")
 
+# Export formats streamed from the database cursor: format -> (exporter, media type).
+_STREAMED_EXPORT_FORMATS: dict[str, tuple[str, str]] = {
+    "csv": ("stream_csv", "text/csv; charset=utf-8"),
+    "json": ("stream_json", "application/json"),
+    "xml": ("stream_xml", "application/xml; charset=utf-8"),
+}
+
 
 def _main():
     from app import main as main_module
@@ -243,10 +251,53 @@ async def reporting_export(request: Request, report_id: int, format: str = Query
             detail="Unsupported export format.",
         )
 
+    company_id = getattr(request.state, "active_company_id", None)
+    base_filename = (record.get("slug") or f"report-{record['id']}")
+    audit_metadata: dict[str, Any] = {"slug": record.get("slug"), "format": fmt}
+
+    if fmt in _STREAMED_EXPORT_FORMATS:
+        # CSV, JSON and XML are written straight from the database cursor so
+        # large reports never sit in memory.  Pull the first row before
+        # responding so validation errors still surface as a 400.
+        rows = reporting_service.stream_query_with_context(
+            record["sql_query"], company_id=company_id
+        )
+        try:
+            first_row = await anext(rows, None)
+        except reporting_service.ReportingQueryError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+        except Exception:
+            await rows.aclose()
+            raise
+
+        await audit_service.record(
+            action="reporting.report.export",
+            request=request,
+            user_id=user.get("id"),
+            entity_type="reporting_query",
+            entity_id=int(record["id"]),
+            metadata={**audit_metadata, "streamed": True},
+        )
+
+        async def _all_rows():
+            if first_row is None:
+                return
+            yield first_row
+            async for row in rows:
+                yield row
+
+        columns = list(first_row.keys()) if first_row else []
+        exporter, media_type = _STREAMED_EXPORT_FORMATS[fmt]
+        return StreamingResponse(
+            getattr(reporting_service, exporter)(columns, _all_rows()),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{base_filename}.{fmt}"'},
+        )
+
     try:
         result = await reporting_service.run_query_with_context(
             record["sql_query"],
-            company_id=getattr(request.state, "active_company_id", None),
+            company_id=company_id,
         )
     except reporting_service.ReportingQueryError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
@@ -257,34 +308,12 @@ async def reporting_export(request: Request, report_id: int, format: str = Query
         user_id=user.get("id"),
         entity_type="reporting_query",
         entity_id=int(record["id"]),
-        metadata={"slug": record.get("slug"), "format": fmt, "row_count": result["row_count"]},
+        metadata={**audit_metadata, "row_count": result["row_count"]},
     )
 
-    base_filename = (record.get("slug") or f"report-{record['id']}")
     columns = result["columns"]
     rows = result["rows"]
 
-    if fmt == "csv":
-        body = reporting_service.export_csv(columns, rows)
-        return Response(
-            content=body,
-            media_type="text/csv; charset=utf-8",
-            headers={"Content-Disposition": f'attachment; filename="{base_filename}.csv"'},
-        )
-    if fmt == "json":
-        body = reporting_service.export_json(columns, rows)
-        return Response(
-            content=body,
-            media_type="application/json",
-            headers={"Content-Disposition": f'attachment; filename="{base_filename}.json"'},
-        )
-    if fmt == "xml":
-        body = reporting_service.export_xml(columns, rows)
-        return Response(
-            content=body,
-            media_type="application/xml; charset=utf-8",
-            headers={"Content-Disposition": f'attachment; filename="{base_filename}.xml"'},
-        )
     # PDF
     try:
         from weasyprint import HTML  # type: ignore
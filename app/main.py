@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import csv
 import hashlib
+import io
 import json
 import math
 import random
@@ -43,6 +45,7 @@ from fastapi.responses import (
     JSONResponse,
     PlainTextResponse,
     RedirectResponse,
+    StreamingResponse,
 )
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
@@ -108,6 +111,8 @@ from app.core.config import get_settings, get_templates_config
 from app.core.database import db
 from app.core.features import init_registry
 from app.core.plugin_loader import get_plugin_loader, init_plugin_loader
+from app.core.reference_cache import reference_cache
+from app.core.responses import FastJSONResponse
 from app.core.logging import configure_logging, log_error, log_info, log_warning
 from loguru import logger
 from app.repositories import audit_logs as audit_repo
@@ -161,6 +166,7 @@ from app.schemas.staff_onboarding_workflows import (
 )
 from app.security.cache_control import CacheControlMiddleware
 from app.security.client_ip import get_client_ip
+from app.security.compression import CompressionMiddleware
 from app.security.csrf import CSRFMiddleware
 from app.security.encryption import decrypt_secret, encrypt_secret
 from app.security.flash import flash_redirect, set_flash
@@ -183,6 +189,16 @@ from app.services import change_log as change_log_service
 from app.services import cron_calendar as cron_calendar_service
 from app.services import company_domains
 from app.services import company_access
+from app.services.permission_snapshots import get_request_snapshot
+from app.services.api_key_usage import api_key_usage_recorder
+from app.services.tray_heartbeats import tray_heartbeat_recorder
+from app.services.tray_relay import tray_relay
+from app.services.static_assets import (
+    FingerprintedStaticFiles,
+    StaticManifest,
+    build_static_manifest,
+    load_static_manifest,
+)
 from app.services import dashboard as dashboard_service
 from app.services import email as email_service
 from app.services import m365_mail as m365_mail_service
@@ -206,6 +222,7 @@ from app.services import tickets as tickets_service
 from app.services import rag_index as rag_index_service
 from app.services import ticket_attachments as attachments_service
 from app.services import template_variables
+from app.services import http_clients
 from app.services import webhook_monitor
 from app.services import xero as xero_service
 from app.services import issues as issues_service
@@ -537,6 +554,7 @@ app = FastAPI(
     docs_url=None,
     openapi_url=None,
     openapi_tags=tags_metadata,
+    default_response_class=FastJSONResponse if settings.fast_json_responses else JSONResponse,
 )
 
 
@@ -556,9 +574,82 @@ async def _start_refresh_notifier() -> None:
         logger.error("Failed to initialise refresh notifier", error=str(exc))
 
 
+@app.on_event("startup")
+async def _start_tray_relay() -> None:
+    try:
+        await tray_relay.start(
+            redis_client=get_redis_client(),
+            presence_ttl_seconds=settings.tray_presence_ttl_seconds,
+            ack_timeout_seconds=settings.tray_relay_ack_timeout_seconds,
+        )
+    except Exception as exc:  # pragma: no cover - defensive logging
+        logger.error("Failed to initialise tray relay", error=str(exc))
+
+
+@app.on_event("startup")
+async def _start_reference_cache() -> None:
+    if not settings.reference_cache_enabled:
+        return
+    try:
+        await reference_cache.start(
+            redis_client=get_redis_client(),
+            ttl_seconds=settings.reference_cache_ttl_seconds,
+        )
+    except Exception as exc:  # pragma: no cover - defensive logging
+        logger.error("Failed to initialise reference data cache", error=str(exc))
+
+
+@app.on_event("startup")
+async def _start_static_manifest_build() -> None:
+    if not settings.static_fingerprinting_enabled:
+        return
+    global _static_manifest_task
+    # Loaded or built in the background: ``static_url`` keeps using the
+    # version query string until the manifest is ready.
+    _static_manifest_task = asyncio.create_task(_build_static_manifest())
+
+
+def _load_or_build_static_manifest() -> StaticManifest:
+    manifest = load_static_manifest(templates_config.static_path, templates_config.static_build_path)
+    if manifest is not None:
+        return manifest
+    return build_static_manifest(templates_config.static_path, templates_config.static_build_path)
+
+
+async def _build_static_manifest() -> None:
+    global _static_manifest
+    try:
+        _static_manifest = await asyncio.to_thread(_load_or_build_static_manifest)
+    except Exception as exc:  # pragma: no cover - defensive logging
+        logger.error("Failed to build static asset manifest", error=str(exc))
+
+
+@app.on_event("startup")
+async def _start_api_key_usage_recorder() -> None:
+    api_key_usage_recorder.start(flush_interval_seconds=settings.api_key_usage_flush_seconds)
+
+
+@app.on_event("startup")
+async def _start_tray_heartbeat_recorder() -> None:
+    tray_heartbeat_recorder.start(flush_interval_seconds=settings.tray_heartbeat_flush_seconds)
+
+
 @app.on_event("shutdown")
 async def _shutdown_integrations() -> None:
+    if _static_manifest_task is not None and not _static_manifest_task.done():
+        _static_manifest_task.cancel()
+        await asyncio.gather(_static_manifest_task, return_exceptions=True)
     await refresh_notifier.stop()
+    await tray_relay.stop()
+    await reference_cache.stop()
+    try:
+        await api_key_usage_recorder.stop()
+    except Exception as exc:  # pragma: no cover - defensive logging
+        logger.error("Failed to flush API key usage", error=str(exc))
+    try:
+        await tray_heartbeat_recorder.stop()
+    except Exception as exc:  # pragma: no cover - defensive logging
+        logger.error("Failed to flush tray heartbeats", error=str(exc))
     await close_redis_client()
 
 SWAGGER_UI_PATH = settings.swagger_ui_url or "/docs"
@@ -840,6 +931,16 @@ app.add_middleware(
     get_module_settings=_get_plausible_module_settings,
 )
 
+# Added last so it wraps every other middleware and encodes the final body.
+if settings.response_compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.response_compression_min_size,
+        session_cookie=(
+            None if settings.response_compression_session_html else settings.session_cookie_name
+        ),
+    )
+
 templates = Jinja2Templates(directory=str(templates_config.template_path))
 
 
@@ -865,12 +966,22 @@ def _is_tray_agent_outdated(agent_version: str | None, latest_version: str | Non
     return _parse_tray_agent_version(agent_version) < _parse_tray_agent_version(latest_version)
 
 
+_static_manifest: StaticManifest | None = None
+_static_manifest_task: asyncio.Task[None] | None = None
+
+
 def _static_url(path: str) -> str:
     """Generate cache-busted URL for static files.
     
-    Appends version query string to force browsers (especially Edge) to fetch
-    new versions when files change, preventing stale cached content.
+    Resolves to the content-hashed copy from the static manifest so browsers
+    only fetch files that changed.  Until the manifest is built (or for files
+    outside it) appends the version query string instead, preventing stale
+    cached content.
     """
+    if _static_manifest is not None and path.startswith("/static/") and "?" not in path:
+        hashed = _static_manifest.hashed_path(path[len("/static/"):])
+        if hashed:
+            return f"/static/{hashed}"
     if _APP_VERSION:
         separator = "&" if "?" in path else "?"
         return f"{path}{separator}v={_APP_VERSION}"
@@ -995,19 +1106,39 @@ async def pwa_service_worker() -> FileResponse:
     return response
 
 
-app.mount("/static", StaticFiles(directory=str(templates_config.static_path)), name="static")
+if settings.static_fingerprinting_enabled:
+    app.mount(
+        "/static",
+        FingerprintedStaticFiles(
+            directory=str(templates_config.static_path),
+            build_directory=str(templates_config.static_build_path),
+        ),
+        name="static",
+    )
+else:
+    app.mount("/static", StaticFiles(directory=str(templates_config.static_path)), name="static")
 
 
 @app.websocket("/ws/refresh")
 async def refresh_updates(websocket: WebSocket) -> None:
     """Maintain a websocket connection for realtime refresh notifications."""
 
-    await refresh_notifier.connect(websocket)
+    user_id: int | None = None
+    try:
+        session = await session_manager.load_session(websocket)  # type: ignore[arg-type]
+    except Exception as exc:  # pragma: no cover - defensive logging
+        log_warning("Unable to load session for refresh websocket", error=str(exc))
+        session = None
+    if session is not None:
+        user_id = session.user_id
+    await refresh_notifier.connect(websocket, user_id=user_id)
     try:
         while True:
-            # Keep the connection open and consume incoming messages so we
-            # detect client disconnects promptly.
-            await websocket.receive_text()
+            # Consume incoming messages so we detect client disconnects
+            # promptly; subscribe/unsubscribe messages update the topics this
+            # connection receives.
+            message = await websocket.receive_text()
+            await refresh_notifier.handle_client_message(websocket, message)
     except WebSocketDisconnect:
         pass
     finally:
@@ -1047,7 +1178,7 @@ async def tray_device_socket(websocket: WebSocket, device_uid: str) -> None:
         return
 
     await websocket.accept()
-    tray_service.register_connection(device_uid, websocket)
+    await tray_service.register_connection(device_uid, websocket)
     await tray_service.deliver_queued_commands(device)
     try:
         while True:
@@ -1061,7 +1192,7 @@ async def tray_device_socket(websocket: WebSocket, device_uid: str) -> None:
             if msg_type == "pong":
                 continue
             if msg_type == "heartbeat":
-                await tray_repo.update_device_heartbeat(
+                await tray_heartbeat_recorder.record(
                     int(device["id"]),
                     console_user=message.get("console_user"),
                     last_ip=(websocket.client.host if websocket.client else None),
@@ -1071,7 +1202,7 @@ async def tray_device_socket(websocket: WebSocket, device_uid: str) -> None:
             # Other inbound message types (chat_message, env_snapshot, etc.)
             # are handled by feature-specific services in follow-up phases.
     finally:
-        tray_service.unregister_connection(device_uid, websocket)
+        await tray_service.unregister_connection(device_uid, websocket)
 
 
 # MCP WebSocket endpoint (only enabled if MCP_ENABLED is true)
@@ -1231,23 +1362,14 @@ async def _is_helpdesk_technician(user: Mapping[str, Any], request: Request | No
         cached = getattr(request.state, "is_helpdesk_technician", None)
         if cached is not None:
             return bool(cached)
-    user_id = user.get("id")
     try:
-        user_id_int = int(user_id)
-    except (TypeError, ValueError):
+        snapshot = await get_request_snapshot(request, user)
+        result = snapshot.has_permission(HELPDESK_PERMISSION_KEY) or snapshot.has_permission(
+            "helpdesk.technician"
+        )
+    except Exception as exc:  # pragma: no cover - defensive fallback for tests without DB
+        log_error("Failed to determine helpdesk technician role", error=str(exc))
         result = False
-    else:
-        try:
-            result = await membership_repo.user_has_permission(
-                user_id_int, HELPDESK_PERMISSION_KEY
-            )
-            if not result:
-                result = await membership_repo.user_has_permission(
-                    user_id_int, "helpdesk.technician"
-                )
-        except Exception as exc:  # pragma: no cover - defensive fallback for tests without DB
-            log_error("Failed to determine helpdesk technician role", error=str(exc))
-            result = False
     if request is not None:
         request.state.is_helpdesk_technician = bool(result)
     return bool(result)
@@ -1271,19 +1393,12 @@ async def _has_admin_technician_access(user: Mapping[str, Any], request: Request
         cached = getattr(request.state, "has_admin_technician_access", None)
         if cached is not None:
             return bool(cached)
-    user_id = user.get("id")
     try:
-        user_id_int = int(user_id)
-    except (TypeError, ValueError):
+        snapshot = await get_request_snapshot(request, user)
+        result = snapshot.has_permission("company.switch_all")
+    except Exception as exc:  # pragma: no cover - defensive fallback for tests without DB
+        log_error("Failed to determine admin technician access", error=str(exc))
         result = False
-    else:
-        try:
-            result = await membership_repo.user_has_permission(
-                user_id_int, "company.switch_all"
-            )
-        except Exception as exc:  # pragma: no cover - defensive fallback for tests without DB
-            log_error("Failed to determine admin technician access", error=str(exc))
-            result = False
     if request is not None:
         request.state.has_admin_technician_access = bool(result)
     return bool(result)
@@ -1298,29 +1413,14 @@ async def _has_issue_tracker_access(user: Mapping[str, Any], request: Request |
         cached = getattr(request.state, "has_issue_tracker_access", None)
         if cached is not None:
             return bool(cached)
-    user_id = user.get("id")
     try:
-        user_id_int = int(user_id)
-    except (TypeError, ValueError):
+        snapshot = await get_request_snapshot(request, user)
+        result = snapshot.has_permission(ISSUE_TRACKER_PERMISSION_KEY) or (
+            snapshot.has_direct_issue_access
+        )
+    except Exception as exc:  # pragma: no cover - defensive fallback for tests without DB
+        log_error("Failed to determine issue tracker access", error=str(exc))
         result = False
-    else:
-        try:
-            result = await membership_repo.user_has_permission(
-                user_id_int, ISSUE_TRACKER_PERMISSION_KEY
-            )
-        except Exception as exc:  # pragma: no cover - defensive fallback for tests without DB
-            log_error("Failed to determine issue tracker access", error=str(exc))
-            result = False
-        if not result:
-            try:
-                assignments = await user_company_repo.list_companies_for_user(user_id_int)
-            except Exception as exc:  # pragma: no cover - defensive fallback for tests without DB
-                log_error(
-                    "Failed to evaluate direct issue tracker access",
-                    error=str(exc),
-                )
-                assignments = []
-            result = any(bool(assignment.get("can_manage_issues")) for assignment in assignments)
     if request is not None:
         request.state.has_issue_tracker_access = bool(result)
     return bool(result)
@@ -1335,19 +1435,12 @@ async def _has_marketing_access(user: Mapping[str, Any], request: Request | None
         cached = getattr(request.state, "has_marketing_access", None)
         if cached is not None:
             return bool(cached)
-    user_id = user.get("id")
     try:
-        user_id_int = int(user_id)
-    except (TypeError, ValueError):
+        snapshot = await get_request_snapshot(request, user)
+        result = snapshot.has_permission(MARKETING_PERMISSION_KEY)
+    except Exception as exc:  # pragma: no cover - defensive fallback for tests without DB
+        log_error("Failed to determine marketing access", error=str(exc))
         result = False
-    else:
-        try:
-            result = await membership_repo.user_has_permission(
-                user_id_int, MARKETING_PERMISSION_KEY
-            )
-        except Exception as exc:  # pragma: no cover - defensive fallback for tests without DB
-            log_error("Failed to determine marketing access", error=str(exc))
-            result = False
     if request is not None:
         request.state.has_marketing_access = bool(result)
     return bool(result)
@@ -1994,17 +2087,12 @@ async def _has_menu_page_access(request: Request, user: Mapping[str, Any], key:
         return True
 
     membership = getattr(request.state, "active_membership", None)
-    active_company_id = getattr(request.state, "active_company_id", None) or user.get("company_id")
-    if membership is None and active_company_id is not None:
+    if membership is None:
         try:
-            membership = await user_company_repo.get_user_company(int(user["id"]), int(active_company_id))
-        except (TypeError, ValueError):
-            membership = None
+            membership = (await get_request_snapshot(request, user)).membership
         except Exception as exc:  # pragma: no cover - defensive fallback for tests without DB
             log_error("Failed to load active membership for menu access", error=str(exc))
             membership = None
-        if membership is not None:
-            request.state.active_membership = membership
 
     membership_data = membership or {}
     is_helpdesk_technician = await _is_helpdesk_technician(user, request)
@@ -2044,6 +2132,65 @@ def _membership_menu_can(user: dict[str, Any], membership: dict[str, Any] | None
     return _menu_can(menu_access, key, write=write)
 
 
+async def _load_impersonator_profile(request: Request, impersonator_user_id: int) -> dict[str, Any] | None:
+    cached_impersonator = getattr(request.state, "impersonator_profile", None)
+    if cached_impersonator and int(cached_impersonator.get("id", 0)) == impersonator_user_id:
+        return cached_impersonator
+    try:
+        impersonator_user = await user_repo.get_user_by_id(impersonator_user_id)
+    except Exception as exc:  # pragma: no cover - defensive logging
+        log_error("Failed to load impersonator user context", error=str(exc))
+        return None
+    request.state.impersonator_profile = impersonator_user
+    return impersonator_user
+
+
+async def _load_module_lookup(request: Request) -> dict[str, Any]:
+    module_lookup = getattr(request.state, "module_lookup", None)
+    if module_lookup is not None:
+        return module_lookup
+    try:
+        module_list = await modules_service.list_modules()
+    except Exception as exc:  # pragma: no cover - defensive logging
+        log_error("Failed to load integration modules for context", error=str(exc))
+        module_list = []
+    module_lookup = {module.get("slug"): module for module in module_list if module.get("slug")}
+    request.state.module_lookup = module_lookup
+    return module_lookup
+
+
+async def _load_cart_summary(session: SessionData | None) -> dict[str, Any]:
+    cart_summary = {"item_count": 0, "total_quantity": 0, "subtotal": Decimal("0")}
+    if session:
+        try:
+            cart_summary = await cart_repo.summarise_cart(session.id)
+        except Exception as exc:  # pragma: no cover - defensive logging
+            log_error("Failed to summarise cart", error=str(exc))
+    return cart_summary
+
+
+async def _count_unread_notifications(user: Mapping[str, Any]) -> int:
+    user_id = user.get("id")
+    if user_id is None:
+        return 0
+    try:
+        return await notifications_repo.count_notifications(
+            user_id=int(user_id),
+            read_state="unread",
+        )
+    except Exception as exc:  # pragma: no cover - defensive logging
+        log_error("Failed to count unread notifications", error=str(exc))
+        return 0
+
+
+async def _count_active_detections(company_id: int) -> int:
+    try:
+        return await defender_repo.active_detection_count(company_id)
+    except Exception as exc:  # pragma: no cover - defensive fallback
+        log_error("Failed to count active Defender detections", error=str(exc))
+        return 0
+
+
 async def _build_base_context(
     request: Request,
     user: dict[str, Any],
@@ -2051,246 +2198,241 @@ async def _build_base_context(
     extra: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
     session = await session_manager.load_session(request)
-    impersonator_user = None
     impersonation_started_at = None
     is_impersonating = False
     if session and session.impersonator_user_id is not None:
         is_impersonating = True
         impersonation_started_at = session.impersonation_started_at
-        cached_impersonator = getattr(request.state, "impersonator_profile", None)
-        if cached_impersonator and int(cached_impersonator.get("id", 0)) == session.impersonator_user_id:
-            impersonator_user = cached_impersonator
-        else:
-            try:
-                impersonator_user = await user_repo.get_user_by_id(session.impersonator_user_id)
-            except Exception as exc:  # pragma: no cover - defensive logging
-                log_error("Failed to load impersonator user context", error=str(exc))
-                impersonator_user = None
-            else:
-                request.state.impersonator_profile = impersonator_user
-    available_companies = getattr(request.state, "available_companies", None)
-    if available_companies is None:
-        available_companies = await company_access.list_accessible_companies(user)
-        request.state.available_companies = available_companies
     active_company_id = getattr(request.state, "active_company_id", None)
     if active_company_id is None and session:
         active_company_id = session.active_company_id
         request.state.active_company_id = active_company_id
-    active_company = None
-    for company in available_companies:
-        if company.get("company_id") == active_company_id:
-            active_company = company
-            break
-    membership = None
-    if active_company_id is not None:
-        membership = await user_company_repo.get_user_company(user["id"], int(active_company_id))
-        request.state.active_membership = membership
+    # Lookups that do not depend on the user's permissions run while the
+    # permission snapshot loads, so the page waits for the slowest query
+    # rather than the sum of them.
+    impersonator_task = (
+        asyncio.ensure_future(_load_impersonator_profile(request, session.impersonator_user_id))
+        if is_impersonating
+        else None
+    )
+    module_task = asyncio.ensure_future(_load_module_lookup(request))
+    cart_task = asyncio.ensure_future(_load_cart_summary(session))
+    unread_task = (
+        asyncio.ensure_future(_count_unread_notifications(user))
+        if "notification_unread_count" not in (extra or {})
+        else None
+    )
+    loads = [
+        task
+        for task in (impersonator_task, module_task, cart_task, unread_task)
+        if task is not None
+    ]
+    try:
+        # One compiled snapshot answers the company switcher, the active
+        # membership and every permission check below.
+        snapshot = await get_request_snapshot(request, user)
+        available_companies = getattr(request.state, "available_companies", None)
+        if available_companies is None:
+            available_companies = snapshot.accessible_companies
+            request.state.available_companies = available_companies
+        active_company = None
+        for company in available_companies:
+            if company.get("company_id") == active_company_id:
+                active_company = company
+                break
+        membership = None
+        if active_company_id is not None:
+            membership = snapshot.membership
+            request.state.active_membership = membership
 
-    membership_data = membership or {}
-    is_super_admin = bool(user.get("is_super_admin"))
-    staff_permission_level = int(membership_data.get("staff_permission") or 0)
-    is_helpdesk_technician = await _is_helpdesk_technician(user, request)
-    has_admin_technician_access = await _has_admin_technician_access(user, request)
-    has_issue_tracker_access = await _has_issue_tracker_access(user, request)
-    has_marketing_access = await _has_marketing_access(user, request)
-    menu_access = _build_menu_access_map(
-        is_super_admin=is_super_admin,
-        membership_data=membership_data,
-        is_helpdesk_technician=is_helpdesk_technician,
-        has_issue_tracker_access=has_issue_tracker_access,
-        has_marketing_access=has_marketing_access,
-    )
+        membership_data = membership or {}
+        is_super_admin = bool(user.get("is_super_admin"))
+        staff_permission_level = int(membership_data.get("staff_permission") or 0)
+        is_helpdesk_technician = await _is_helpdesk_technician(user, request)
+        has_admin_technician_access = await _has_admin_technician_access(user, request)
+        has_issue_tracker_access = await _has_issue_tracker_access(user, request)
+        has_marketing_access = await _has_marketing_access(user, request)
+        menu_access = _build_menu_access_map(
+            is_super_admin=is_super_admin,
+            membership_data=membership_data,
+            is_helpdesk_technician=is_helpdesk_technician,
+            has_issue_tracker_access=has_issue_tracker_access,
+            has_marketing_access=has_marketing_access,
+        )
 
-    def _has_permission(flag: str) -> bool:
-        return bool(membership_data.get(flag))
+        def _has_permission(flag: str) -> bool:
+            return bool(membership_data.get(flag))
     
-    # Check BCP permissions - use new continuity.access permission system
-    can_view_bcp = is_super_admin or _has_permission("can_view_bcp")
-    can_edit_bcp = is_super_admin
-    if not is_super_admin and active_company_id is not None:
-        user_id = user.get("id")
-        if user_id:
-            try:
-                # Also check legacy bcp:edit permission for backward compatibility
-                can_edit_bcp = await membership_repo.user_has_permission(int(user_id), "bcp:edit")
-            except Exception as exc:  # pragma: no cover - defensive fallback
-                log_error("Failed to check BCP edit permissions", error=str(exc))
-                can_edit_bcp = False
-
-    permission_flags = {
-        "can_access_shop": _menu_can(menu_access, "menu.shop") or is_super_admin or _has_permission("can_access_shop"),
-        "can_access_cart": is_super_admin or _has_permission("can_access_cart"),
-        "can_access_orders": _menu_can(menu_access, "menu.orders") or is_super_admin or _has_permission("can_access_orders"),
-        "can_access_quotes": _menu_can(menu_access, "menu.quotes") or is_super_admin or _has_permission("can_access_quotes"),
-        "can_access_forms": _menu_can(menu_access, "menu.forms") or is_super_admin or _has_permission("can_access_forms"),
-        "can_manage_assets": _menu_can(menu_access, "menu.assets", write=True) or is_super_admin or _has_permission("can_manage_assets"),
-        "can_manage_licenses": _menu_can(menu_access, "menu.m365.licenses", write=True) or is_super_admin or _has_permission("can_manage_licenses"),
-        "can_manage_invoices": _menu_can(menu_access, "menu.invoices", write=True) or is_super_admin or _has_permission("can_manage_invoices"),
-        "can_manage_staff": (
-            is_super_admin
-            or (
-                _menu_can(menu_access, "menu.staff")
-                and (_has_permission("can_manage_staff") or staff_permission_level > 0)
-            )
-        ),
-        "can_manage_issues": _menu_can(menu_access, "menu.issues", write=True) or has_issue_tracker_access,
-        "can_view_compliance": _menu_can(menu_access, "menu.compliance") or is_super_admin or _has_permission("can_view_compliance"),
-        "can_view_bcp": _menu_can(menu_access, "menu.continuity") or can_view_bcp,
-        "can_edit_bcp": can_edit_bcp,
-        "can_view_m365_best_practices": _menu_can(menu_access, "menu.m365.best_practices") or is_super_admin or _has_permission("can_view_m365_best_practices"),
-        "can_view_compliance_checks": _menu_can(menu_access, "menu.compliance_checks") or is_super_admin or _has_permission("can_view_compliance_checks"),
-        "can_manage_compliance_checks": _menu_can(menu_access, "menu.compliance_checks.library", write=True) or is_super_admin or _has_permission("can_manage_compliance_checks"),
-        "can_view_m365_user_mailboxes": _menu_can(menu_access, "menu.m365.user_mailboxes") or is_super_admin or _has_permission("can_view_m365_user_mailboxes"),
-        "can_view_m365_shared_mailboxes": _menu_can(menu_access, "menu.m365.shared_mailboxes") or is_super_admin or _has_permission("can_view_m365_shared_mailboxes"),
-        "can_access_chat": _menu_can(menu_access, "menu.chat") or is_super_admin or _has_permission("can_access_chat"),
-        "can_access_marketing": _menu_can(menu_access, "menu.marketing") or has_marketing_access,
-        "can_manage_subscriptions": _menu_can(menu_access, "menu.subscriptions", write=True),
-        "can_access_reports": _menu_can(menu_access, "menu.reports"),
-        "can_access_reporting": _menu_can(menu_access, "menu.reporting"),
-        "can_access_admin_company": _menu_can(menu_access, "menu.admin.company"),
-        "menu_access": menu_access,
-        "menu_permission_catalogue": catalogue_for_api(),
-    }
+        # Check BCP permissions - use new continuity.access permission system
+        can_view_bcp = is_super_admin or _has_permission("can_view_bcp")
+        can_edit_bcp = is_super_admin
+        if not is_super_admin and active_company_id is not None:
+            # Also check legacy bcp:edit permission for backward compatibility
+            can_edit_bcp = snapshot.has_permission("bcp:edit")
+
+        permission_flags = {
+            "can_access_shop": _menu_can(menu_access, "menu.shop") or is_super_admin or _has_permission("can_access_shop"),
+            "can_access_cart": is_super_admin or _has_permission("can_access_cart"),
+            "can_access_orders": _menu_can(menu_access, "menu.orders") or is_super_admin or _has_permission("can_access_orders"),
+            "can_access_quotes": _menu_can(menu_access, "menu.quotes") or is_super_admin or _has_permission("can_access_quotes"),
+            "can_access_forms": _menu_can(menu_access, "menu.forms") or is_super_admin or _has_permission("can_access_forms"),
+            "can_manage_assets": _menu_can(menu_access, "menu.assets", write=True) or is_super_admin or _has_permission("can_manage_assets"),
+            "can_manage_licenses": _menu_can(menu_access, "menu.m365.licenses", write=True) or is_super_admin or _has_permission("can_manage_licenses"),
+            "can_manage_invoices": _menu_can(menu_access, "menu.invoices", write=True) or is_super_admin or _has_permission("can_manage_invoices"),
+            "can_manage_staff": (
+                is_super_admin
+                or (
+                    _menu_can(menu_access, "menu.staff")
+                    and (_has_permission("can_manage_staff") or staff_permission_level > 0)
+                )
+            ),
+            "can_manage_issues": _menu_can(menu_access, "menu.issues", write=True) or has_issue_tracker_access,
+            "can_view_compliance": _menu_can(menu_access, "menu.compliance") or is_super_admin or _has_permission("can_view_compliance"),
+            "can_view_bcp": _menu_can(menu_access, "menu.continuity") or can_view_bcp,
+            "can_edit_bcp": can_edit_bcp,
+            "can_view_m365_best_practices": _menu_can(menu_access, "menu.m365.best_practices") or is_super_admin or _has_permission("can_view_m365_best_practices"),
+            "can_view_compliance_checks": _menu_can(menu_access, "menu.compliance_checks") or is_super_admin or _has_permission("can_view_compliance_checks"),
+            "can_manage_compliance_checks": _menu_can(menu_access, "menu.compliance_checks.library", write=True) or is_super_admin or _has_permission("can_manage_compliance_checks"),
+            "can_view_m365_user_mailboxes": _menu_can(menu_access, "menu.m365.user_mailboxes") or is_super_admin or _has_permission("can_view_m365_user_mailboxes"),
+            "can_view_m365_shared_mailboxes": _menu_can(menu_access, "menu.m365.shared_mailboxes") or is_super_admin or _has_permission("can_view_m365_shared_mailboxes"),
+            "can_access_chat": _menu_can(menu_access, "menu.chat") or is_super_admin or _has_permission("can_access_chat"),
+            "can_access_marketing": _menu_can(menu_access, "menu.marketing") or has_marketing_access,
+            "can_manage_subscriptions": _menu_can(menu_access, "menu.subscriptions", write=True),
+            "can_access_reports": _menu_can(menu_access, "menu.reports"),
+            "can_access_reporting": _menu_can(menu_access, "menu.reporting"),
+            "can_access_admin_company": _menu_can(menu_access, "menu.admin.company"),
+            "menu_access": menu_access,
+            "menu_permission_catalogue": catalogue_for_api(),
+        }
 
-    module_lookup = getattr(request.state, "module_lookup", None)
-    if module_lookup is None:
-        try:
-            module_list = await modules_service.list_modules()
-        except Exception as exc:  # pragma: no cover - defensive logging
-            log_error("Failed to load integration modules for context", error=str(exc))
-            module_list = []
-        module_lookup = {module.get("slug"): module for module in module_list if module.get("slug")}
-        request.state.module_lookup = module_lookup
-    
-    # Cache Plausible module for middleware use
-    plausible_module = (module_lookup or {}).get("plausible")
-    if plausible_module:
-        # Store in function attribute for middleware to access
-        _get_plausible_module_settings._cached_module = plausible_module
-
-    # Get Plausible analytics configuration for app-wide tracking
-    plausible_config = {"enabled": False}
-    if plausible_module and plausible_module.get("enabled"):
-        plausible_settings = plausible_module.get("settings") or {}
-        base_url = str(plausible_settings.get("base_url") or "").strip().rstrip("/")
-        site_domain = str(plausible_settings.get("site_domain") or "").strip()
-        track_pageviews = bool(plausible_settings.get("track_pageviews"))
-        pepper = str(plausible_settings.get("pepper") or "").strip()
-        send_pii = bool(plausible_settings.get("send_pii"))
+        detection_task = None
+        if (
+            "defender_detection_count" not in (extra or {})
+            and active_company_id is not None
+            and (is_super_admin or _menu_can(menu_access, "menu.defender"))
+        ):
+            detection_task = asyncio.ensure_future(_count_active_detections(int(active_company_id)))
+            loads.append(detection_task)
+
+        module_lookup = await module_task
+        impersonator_user = await impersonator_task if impersonator_task is not None else None
+
+        # Cache Plausible module for middleware use
+        plausible_module = (module_lookup or {}).get("plausible")
+        if plausible_module:
+            # Store in function attribute for middleware to access
+            _get_plausible_module_settings._cached_module = plausible_module
+
+        # Get Plausible analytics configuration for app-wide tracking
+        plausible_config = {"enabled": False}
+        if plausible_module and plausible_module.get("enabled"):
+            plausible_settings = plausible_module.get("settings") or {}
+            base_url = str(plausible_settings.get("base_url") or "").strip().rstrip("/")
+            site_domain = str(plausible_settings.get("site_domain") or "").strip()
+            track_pageviews = bool(plausible_settings.get("track_pageviews"))
+            pepper = str(plausible_settings.get("pepper") or "").strip()
+            send_pii = bool(plausible_settings.get("send_pii"))
         
-        # Validate base_url and site_domain to prevent injection attacks
-        # base_url must be a valid HTTPS URL
-        # site_domain must be a valid domain name (alphanumeric, dots, hyphens)
-        valid_base_url = False
-        valid_site_domain = False
+            # Validate base_url and site_domain to prevent injection attacks
+            # base_url must be a valid HTTPS URL
+            # site_domain must be a valid domain name (alphanumeric, dots, hyphens)
+            valid_base_url = False
+            valid_site_domain = False
         
-        if base_url:
-            try:
-                from urllib.parse import urlparse
-                parsed = urlparse(base_url)
-                # Must be https or http, have a netloc, and no suspicious characters
-                if parsed.scheme in ("https", "http") and parsed.netloc and not any(c in base_url for c in ["<", ">", '"', "'"]):
-                    valid_base_url = True
-            except Exception:
-                pass
+            if base_url:
+                try:
+                    from urllib.parse import urlparse
+                    parsed = urlparse(base_url)
+                    # Must be https or http, have a netloc, and no suspicious characters
+                    if parsed.scheme in ("https", "http") and parsed.netloc and not any(c in base_url for c in ["<", ">", '"', "'"]):
+                        valid_base_url = True
+                except Exception:
+                    pass
         
-        if site_domain:
-            # Domain must only contain alphanumeric, dots, hyphens, underscores and optional port
-            # No spaces, quotes, or HTML-like characters
-            if re.match(r"^[A-Za-z0-9._-]+(?::\d+)?$", site_domain) and not any(
-                c in site_domain for c in ["<", ">", '"', "'"]
-            ):
-                valid_site_domain = True
+            if site_domain:
+                # Domain must only contain alphanumeric, dots, hyphens, underscores and optional port
+                # No spaces, quotes, or HTML-like characters
+                if re.match(r"^[A-Za-z0-9._-]+(?::\d+)?$", site_domain) and not any(
+                    c in site_domain for c in ["<", ">", '"', "'"]
+                ):
+                    valid_site_domain = True
         
-        if valid_base_url and valid_site_domain:
-            plausible_config = {
-                "enabled": True,
-                "base_url": base_url,
-                "site_domain": site_domain,
-                "track_pageviews": track_pageviews,
-            }
+            if valid_base_url and valid_site_domain:
+                plausible_config = {
+                    "enabled": True,
+                    "base_url": base_url,
+                    "site_domain": site_domain,
+                    "track_pageviews": track_pageviews,
+                }
             
-            # Add hashed user ID for client-side tracking if pageview tracking enabled
-            if track_pageviews and user and user.get("id"):
-                from app.security.plausible_tracking import hash_user_id_for_plausible
+                # Add hashed user ID for client-side tracking if pageview tracking enabled
+                if track_pageviews and user and user.get("id"):
+                    from app.security.plausible_tracking import hash_user_id_for_plausible
                 
-                user_id = user.get("id")
-                # Hash user ID for privacy using shared utility
-                hashed_user_id = hash_user_id_for_plausible(user_id, pepper, send_pii)
+                    user_id = user.get("id")
+                    # Hash user ID for privacy using shared utility
+                    hashed_user_id = hash_user_id_for_plausible(user_id, pepper, send_pii)
                 
-                plausible_config["hashed_user_id"] = hashed_user_id
-
-    context: dict[str, Any] = {
-        "request": request,
-        "app_name": settings.app_name,
-        "current_year": datetime.utcnow().year,
-        "user": user,
-        "current_user": user,
-        "available_companies": available_companies,
-        "active_company": active_company,
-        "active_company_id": active_company_id,
-        "active_membership": membership,
-        "csrf_token": session.csrf_token if session else None,
-        "staff_permission": staff_permission_level,
-        "is_super_admin": is_super_admin,
-        "is_helpdesk_technician": is_helpdesk_technician,
-        "has_admin_technician_access": has_admin_technician_access,
-        "is_company_admin": is_super_admin or _menu_can(menu_access, "menu.admin.company"),
-        "integration_modules": module_lookup,
-        # Normalised, read-only-by-convention feature map for templates.  Keep
-        # integration_modules above for callers which need module metadata.
-        "module_enabled": {
-            slug: bool(module.get("enabled"))
-            for slug, module in (module_lookup or {}).items()
-        },
-        "enabled_module_slugs": frozenset(
-            slug
-            for slug, module in (module_lookup or {}).items()
-            if bool(module.get("enabled"))
-        ),
-        "syncro_module_enabled": bool((module_lookup or {}).get("syncro", {}).get("enabled")),
-        "enable_auto_refresh": bool(settings.enable_auto_refresh),
-        "matrix_chat_enabled": settings.matrix_enabled,
-        "is_impersonating": is_impersonating,
-        "impersonator_user": impersonator_user,
-        "impersonation_started_at": impersonation_started_at,
-        "has_issue_tracker_access": has_issue_tracker_access,
-        "can_access_tickets": _menu_can(menu_access, "menu.tickets"),
-        "can_access_all_tickets": _menu_can(menu_access, "menu.tickets", write=True),
-        "plausible_config": plausible_config,
-    }
-    context.update(permission_flags)
-    if extra:
-        context.update(extra)
-
-    cart_summary = {"item_count": 0, "total_quantity": 0, "subtotal": Decimal("0")}
-    if session:
-        try:
-            cart_summary = await cart_repo.summarise_cart(session.id)
-        except Exception as exc:  # pragma: no cover - defensive logging
-            log_error("Failed to summarise cart", error=str(exc))
-    context["cart_summary"] = cart_summary
-    if "notification_unread_count" not in context:
-        unread_count = 0
-        user_id = user.get("id")
-        if user_id is not None:
-            try:
-                unread_count = await notifications_repo.count_notifications(
-                    user_id=int(user_id),
-                    read_state="unread",
-                )
-            except Exception as exc:  # pragma: no cover - defensive logging
-                log_error("Failed to count unread notifications", error=str(exc))
-        context["notification_unread_count"] = unread_count
-    if "defender_detection_count" not in context:
-        detection_count = 0
-        if active_company_id is not None and (is_super_admin or _menu_can(menu_access, "menu.defender")):
-            try:
-                detection_count = await defender_repo.active_detection_count(int(active_company_id))
-            except Exception as exc:  # pragma: no cover - defensive fallback
-                log_error("Failed to count active Defender detections", error=str(exc))
-        context["defender_detection_count"] = detection_count
-    return context
+                    plausible_config["hashed_user_id"] = hashed_user_id
+
+        context: dict[str, Any] = {
+            "request": request,
+            "app_name": settings.app_name,
+            "current_year": datetime.utcnow().year,
+            "user": user,
+            "current_user": user,
+            "available_companies": available_companies,
+            "active_company": active_company,
+            "active_company_id": active_company_id,
+            "active_membership": membership,
+            "csrf_token": session.csrf_token if session else None,
+            "staff_permission": staff_permission_level,
+            "is_super_admin": is_super_admin,
+            "is_helpdesk_technician": is_helpdesk_technician,
+            "has_admin_technician_access": has_admin_technician_access,
+            "is_company_admin": is_super_admin or _menu_can(menu_access, "menu.admin.company"),
+            "integration_modules": module_lookup,
+            # Normalised, read-only-by-convention feature map for templates.  Keep
+            # integration_modules above for callers which need module metadata.
+            "module_enabled": {
+                slug: bool(module.get("enabled"))
+                for slug, module in (module_lookup or {}).items()
+            },
+            "enabled_module_slugs": frozenset(
+                slug
+                for slug, module in (module_lookup or {}).items()
+                if bool(module.get("enabled"))
+            ),
+            "syncro_module_enabled": bool((module_lookup or {}).get("syncro", {}).get("enabled")),
+            "enable_auto_refresh": bool(settings.enable_auto_refresh),
+            "matrix_chat_enabled": settings.matrix_enabled,
+            "is_impersonating": is_impersonating,
+            "impersonator_user": impersonator_user,
+            "impersonation_started_at": impersonation_started_at,
+            "has_issue_tracker_access": has_issue_tracker_access,
+            "can_access_tickets": _menu_can(menu_access, "menu.tickets"),
+            "can_access_all_tickets": _menu_can(menu_access, "menu.tickets", write=True),
+            "plausible_config": plausible_config,
+        }
+        context.update(permission_flags)
+        if extra:
+            context.update(extra)
+
+        context["cart_summary"] = await cart_task
+        if unread_task is not None:
+            context["notification_unread_count"] = await unread_task
+        if "defender_detection_count" not in context:
+            context["defender_detection_count"] = (
+                await detection_task if detection_task is not None else 0
+            )
+        return context
+    except BaseException:
+        # Lookups still in flight would keep their pool connections and log
+        # "Task exception was never retrieved" once the page has failed.
+        for task in loads:
+            task.cancel()
+        await asyncio.gather(*loads, return_exceptions=True)
+        raise
 
 
 async def _build_public_context(
@@ -2915,6 +3057,8 @@ async def on_shutdown() -> None:
     await feature_registry.unload_all()
     await modules_service.stop_xero_token_keepalive()
     await scheduler_service.stop()
+    await webhook_monitor.close_delivery_pool()
+    await http_clients.close_clients()
     await db.disconnect()
     log_info("Application shutdown")
 
@@ -4670,7 +4814,7 @@ async def m365_callback(request: Request, code: str | None = None, state: str |
             "grant_type": "authorization_code", "code": code, "redirect_uri": redirect_uri,
             "code_verifier": verifier, "scope": user_m365_contacts_service.CONTACTS_SCOPE,
         }
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_clients.client("m365") as client:
             token_response = await client.post(
                 "https://login.microsoftonline.com/organizations/oauth2/v2.0/token", data=token_data
             )
@@ -4775,7 +4919,7 @@ async def m365_callback(request: Request, code: str | None = None, state: str |
                 "redirect_uri": redirect_uri,
                 "scope": m365_service.DISCOVER_SCOPE,
             }
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_clients.client("m365") as client:
             token_response = await client.post(token_endpoint, data=token_data)
         if token_response.status_code != 200:
             log_error(
@@ -4884,7 +5028,7 @@ async def m365_callback(request: Request, code: str | None = None, state: str |
                 "redirect_uri": redirect_uri,
                 "scope": m365_service.PROVISION_SCOPE,
             }
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_clients.client("m365") as client:
             token_response = await client.post(token_endpoint, data=token_data)
         if token_response.status_code != 200:
             log_error(
@@ -5005,7 +5149,7 @@ async def m365_callback(request: Request, code: str | None = None, state: str |
                     "redirect_uri": redirect_uri,
                     "scope": m365_service.PROVISION_SCOPE,
                 }
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_clients.client("m365") as client:
             token_response = await client.post(token_endpoint, data=token_data)
         if token_response.status_code != 200:
             log_error(
@@ -5169,7 +5313,7 @@ async def m365_callback(request: Request, code: str | None = None, state: str |
         "redirect_uri": redirect_uri,
         "scope": m365_service.CONNECT_SCOPE,
     }
-    async with httpx.AsyncClient(timeout=30) as client:
+    async with http_clients.client("m365") as client:
         response = await client.post(token_endpoint, data=data)
     if response.status_code != 200:
         log_error(
@@ -7515,27 +7659,16 @@ async def admin_audit_logs(
     limit = max(1, min(limit, 500))
     offset = max(0, int(offset))
 
-    def _parse_filter_dt(value: str | None):
-        if not value:
-            return None
-        try:
-            return datetime.fromisoformat(value.replace("Z", "+00:00"))
-        except ValueError:
-            return None
-
-    since_dt = _parse_filter_dt(since)
-    until_dt = _parse_filter_dt(until)
-
-    filter_kwargs = dict(
-        entity_type=entity_type or None,
+    filter_kwargs = _audit_log_filter_kwargs(
+        entity_type=entity_type,
         entity_id=entity_id,
         user_id=user_id,
-        action=(action or "").strip() or None,
-        request_id=(request_id or "").strip() or None,
-        ip_address=(ip_address or "").strip() or None,
-        since=since_dt,
-        until=until_dt,
-        search=(search or "").strip() or None,
+        action=action,
+        request_id=request_id,
+        ip_address=ip_address,
+        since=since,
+        until=until,
+        search=search,
     )
     logs = await audit_repo.list_audit_logs(
         **filter_kwargs,
@@ -7582,6 +7715,118 @@ async def admin_audit_logs(
     return await _render_template("admin/audit_logs.html", request, current_user, extra=extra)
 
 
+_AUDIT_EXPORT_COLUMNS: tuple[str, ...] = (
+    "id",
+    "created_at",
+    "user_id",
+    "user_email",
+    "action",
+    "entity_type",
+    "entity_id",
+    "previous_value",
+    "new_value",
+    "metadata",
+    "ip_address",
+    "request_id",
+)
+
+
+def _audit_log_filter_kwargs(
+    *,
+    entity_type: str | None,
+    entity_id: int | None,
+    user_id: int | None,
+    action: str | None,
+    request_id: str | None,
+    ip_address: str | None,
+    since: str | None,
+    until: str | None,
+    search: str | None,
+) -> dict[str, Any]:
+    def _parse_filter_dt(value: str | None):
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+    return dict(
+        entity_type=entity_type or None,
+        entity_id=entity_id,
+        user_id=user_id,
+        action=(action or "").strip() or None,
+        request_id=(request_id or "").strip() or None,
+        ip_address=(ip_address or "").strip() or None,
+        since=_parse_filter_dt(since),
+        until=_parse_filter_dt(until),
+        search=(search or "").strip() or None,
+    )
+
+
+@app.get("/admin/audit-logs/export.csv")
+async def admin_audit_logs_export(
+    request: Request,
+    entity_type: str | None = None,
+    entity_id: int | None = None,
+    user_id: int | None = None,
+    action: str | None = None,
+    request_id: str | None = None,
+    ip_address: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    search: str | None = None,
+):
+    """Stream every audit log matching the page filters as CSV."""
+
+    current_user, redirect = await _require_super_admin_page(request)
+    if redirect:
+        return redirect
+
+    filter_kwargs = _audit_log_filter_kwargs(
+        entity_type=entity_type,
+        entity_id=entity_id,
+        user_id=user_id,
+        action=action,
+        request_id=request_id,
+        ip_address=ip_address,
+        since=since,
+        until=until,
+        search=search,
+    )
+
+    def _cell(key: str, value: Any) -> Any:
+        if value is None:
+            return ""
+        if key == "created_at":
+            return _to_iso(value) or ""
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, default=str, sort_keys=True)
+        return value
+
+    async def _rows():
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(_AUDIT_EXPORT_COLUMNS)
+        pending = 0
+        async for log in audit_repo.stream_audit_logs(**filter_kwargs):
+            writer.writerow([_cell(key, log.get(key)) for key in _AUDIT_EXPORT_COLUMNS])
+            pending += 1
+            if pending >= 200:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+                pending = 0
+        yield buf.getvalue()
+
+    filename = f"audit-logs-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}.csv"
+    return StreamingResponse(
+        _rows(),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 def _build_audit_diff_rows(previous: Any, current: Any) -> list[dict[str, Any]]:
     """Convert previous/new JSON snapshots into a per-field table for the UI.
 
@@ -2,14 +2,18 @@ from __future__ import annotations
 
 from collections.abc import Iterable, Sequence
 from datetime import date, datetime, timezone
+from functools import partial
 from typing import Any
 
 PermissionMapping = Sequence[dict[str, Any]]
 
 from app.core.database import db
 from app.core.logging import log_info
+from app.core.reference_cache import reference_cache
 from app.security.api_keys import GeneratedApiKey, generate_api_key, hash_api_key
 
+_CACHE_NAMESPACE = "api_keys"
+
 
 def _to_utc(dt: datetime | str | None) -> datetime | None:
     """Normalise database datetime values to timezone-aware UTC datetimes."""
@@ -202,6 +206,7 @@ async def get_api_key_with_usage(api_key_id: int) -> dict[str, Any] | None:
 async def delete_api_key(api_key_id: int) -> None:
     log_info("Deleting API key", api_key_id=api_key_id)
     await db.execute("DELETE FROM api_keys WHERE id = %s", (api_key_id,))
+    await reference_cache.invalidate(_CACHE_NAMESPACE)
     log_info("API key deleted successfully", api_key_id=api_key_id)
 
 
@@ -210,6 +215,7 @@ async def update_api_key_expiry(api_key_id: int, expiry_date: date | None) -> No
         "UPDATE api_keys SET expiry_date = %s WHERE id = %s",
         (expiry_date, api_key_id),
     )
+    await reference_cache.invalidate(_CACHE_NAMESPACE)
 
 
 async def update_api_key(
@@ -232,6 +238,7 @@ async def update_api_key(
         )
     if permissions is not None:
         await _replace_api_key_permissions(api_key_id, permissions)
+    await reference_cache.invalidate(_CACHE_NAMESPACE)
     updated = await get_api_key_with_usage(api_key_id)
     if not updated:
         raise RuntimeError(f"Failed to load API key {api_key_id} after update")
@@ -239,7 +246,21 @@ async def update_api_key(
 
 
 async def get_api_key_record(api_key_value: str) -> dict[str, Any] | None:
+    """Return the enabled, unexpired key matching ``api_key_value``.
+
+    Resolved records are cached until a key is edited or deleted, so repeated
+    calls from an integration skip the three lookups.  Unknown keys are not
+    cached: the value comes from the client, and caching misses would let
+    random keys evict valid entries.
+    """
+
     hashed = hash_api_key(api_key_value)
+    return await reference_cache.get_or_load(
+        _CACHE_NAMESPACE, hashed, partial(_load_api_key_record, hashed), cache_none=False
+    )
+
+
+async def _load_api_key_record(hashed: str) -> dict[str, Any] | None:
     row = await db.fetch_one(
         """
         SELECT *
@@ -278,6 +299,53 @@ async def record_api_key_usage(api_key_id: int, ip_address: str) -> None:
     )
 
 
+async def apply_api_key_usage(entries: Sequence[tuple[int, str, int, datetime]]) -> None:
+    """Add aggregated usage counts in bulk.
+
+    ``entries`` holds ``(api_key_id, ip_address, usage_count, last_used_at)``
+    tuples, one per key and source address.
+    """
+
+    if not entries:
+        return
+    key_ids = sorted({entry[0] for entry in entries})
+    placeholders = ", ".join(["%s"] * len(key_ids))
+    rows = await db.fetch_all(
+        f"SELECT id FROM api_keys WHERE id IN ({placeholders})",
+        tuple(key_ids),
+    )
+    # Skip keys deleted since their calls were counted; their usage rows
+    # would violate the foreign key and fail the whole batch.
+    existing = {int(row["id"]) for row in rows}
+    entries = [entry for entry in entries if entry[0] in existing]
+    if not entries:
+        return
+    last_used: dict[int, datetime] = {}
+    for api_key_id, _ip_address, _count, used_at in entries:
+        if api_key_id not in last_used or used_at > last_used[api_key_id]:
+            last_used[api_key_id] = used_at
+    async with db.acquire() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.executemany(
+                """
+                INSERT INTO api_key_usage (api_key_id, ip_address, usage_count, last_used_at)
+                VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    usage_count = usage_count + VALUES(usage_count),
+                    last_used_at = GREATEST(COALESCE(last_used_at, VALUES(last_used_at)), VALUES(last_used_at))
+                """,
+                list(entries),
+            )
+            await cursor.executemany(
+                """
+                UPDATE api_keys
+                SET last_used_at = GREATEST(COALESCE(last_used_at, %s), %s)
+                WHERE id = %s
+                """,
+                [(used_at, used_at, api_key_id) for api_key_id, used_at in sorted(last_used.items())],
+            )
+
+
 async def _fetch_usage_by_key(key_ids: Iterable[int]) -> dict[int, list[dict[str, Any]]]:
     ids = list(key_ids)
     if not ids:
@@ -1,46 +1,53 @@
 from __future__ import annotations
 
 from datetime import date, datetime, time, timezone
-from typing import Any
+from typing import Any, AsyncIterator
 
 from app.core.database import db
 
 
+_COMPANY_ASSETS_SQL = """
+    SELECT
+        id,
+        company_id,
+        name,
+        type,
+        machine_type,
+        serial_number,
+        status,
+        os_name,
+        cpu_name,
+        ram_gb,
+        hdd_size,
+        last_sync,
+        motherboard_manufacturer,
+        form_factor,
+        last_user,
+        approx_age,
+        performance_score,
+        warranty_status,
+        warranty_end_date,
+        syncro_asset_id,
+        tactical_asset_id,
+        mac_address
+    FROM assets
+    WHERE company_id = %s
+    ORDER BY name ASC, id ASC
+"""
+
+
 async def list_company_assets(company_id: int) -> list[dict[str, Any]]:
-    rows = await db.fetch_all(
-        """
-        SELECT
-            id,
-            company_id,
-            name,
-            type,
-            machine_type,
-            serial_number,
-            status,
-            os_name,
-            cpu_name,
-            ram_gb,
-            hdd_size,
-            last_sync,
-            motherboard_manufacturer,
-            form_factor,
-            last_user,
-            approx_age,
-            performance_score,
-            warranty_status,
-            warranty_end_date,
-            syncro_asset_id,
-            tactical_asset_id,
-            mac_address
-        FROM assets
-        WHERE company_id = %s
-        ORDER BY name ASC, id ASC
-        """,
-        (company_id,),
-    )
+    rows = await db.fetch_all(_COMPANY_ASSETS_SQL, (company_id,))
     return list(rows or [])
 
 
+def stream_company_assets(
+    company_id: int, *, batch_size: int = 500
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield a company's assets in batches, in the same order as ``list_company_assets``."""
+    return db.stream_batches(_COMPANY_ASSETS_SQL, (company_id,), batch_size=batch_size)
+
+
 async def get_asset_by_id(asset_id: int) -> dict[str, Any] | None:
     return await db.fetch_one(
         "SELECT * FROM assets WHERE id = %s",
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import json
+from contextlib import aclosing
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, AsyncIterator
 
 from app.core.database import db
 
@@ -41,20 +42,18 @@ async def create_audit_log(
     )
 
 
-async def list_audit_logs(
+def _build_filters(
     *,
-    entity_type: str | None = None,
-    entity_id: int | None = None,
-    user_id: int | None = None,
-    action: str | None = None,
-    request_id: str | None = None,
-    ip_address: str | None = None,
-    since: datetime | None = None,
-    until: datetime | None = None,
-    search: str | None = None,
-    limit: int = 200,
-    offset: int = 0,
-) -> list[dict[str, Any]]:
+    entity_type: str | None,
+    entity_id: int | None,
+    user_id: int | None,
+    action: str | None,
+    request_id: str | None,
+    ip_address: str | None,
+    since: datetime | None,
+    until: datetime | None,
+    search: str | None,
+) -> tuple[str, list[Any]]:
     clauses: list[str] = []
     params: list[Any] = []
     if entity_type:
@@ -88,6 +87,34 @@ async def list_audit_logs(
         like_value = f"%{search}%"
         params.extend([like_value, like_value, like_value])
     where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, params
+
+
+async def list_audit_logs(
+    *,
+    entity_type: str | None = None,
+    entity_id: int | None = None,
+    user_id: int | None = None,
+    action: str | None = None,
+    request_id: str | None = None,
+    ip_address: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    search: str | None = None,
+    limit: int = 200,
+    offset: int = 0,
+) -> list[dict[str, Any]]:
+    where, params = _build_filters(
+        entity_type=entity_type,
+        entity_id=entity_id,
+        user_id=user_id,
+        action=action,
+        request_id=request_id,
+        ip_address=ip_address,
+        since=since,
+        until=until,
+        search=search,
+    )
     params.append(int(limit))
     params.append(int(offset))
     rows = await db.fetch_all(
@@ -118,39 +145,17 @@ async def count_audit_logs(
     until: datetime | None = None,
     search: str | None = None,
 ) -> int:
-    clauses: list[str] = []
-    params: list[Any] = []
-    if entity_type:
-        clauses.append("al.entity_type = %s")
-        params.append(entity_type)
-    if entity_id is not None:
-        clauses.append("al.entity_id = %s")
-        params.append(entity_id)
-    if user_id is not None:
-        clauses.append("al.user_id = %s")
-        params.append(user_id)
-    if action:
-        clauses.append("al.action LIKE %s")
-        params.append(f"%{action}%")
-    if request_id:
-        clauses.append("al.request_id = %s")
-        params.append(request_id)
-    if ip_address:
-        clauses.append("al.ip_address = %s")
-        params.append(ip_address)
-    if since is not None:
-        clauses.append("al.created_at >= %s")
-        params.append(since)
-    if until is not None:
-        clauses.append("al.created_at <= %s")
-        params.append(until)
-    if search:
-        clauses.append(
-            "(al.action LIKE %s OR al.entity_type LIKE %s OR u.email LIKE %s)"
-        )
-        like_value = f"%{search}%"
-        params.extend([like_value, like_value, like_value])
-    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    where, params = _build_filters(
+        entity_type=entity_type,
+        entity_id=entity_id,
+        user_id=user_id,
+        action=action,
+        request_id=request_id,
+        ip_address=ip_address,
+        since=since,
+        until=until,
+        search=search,
+    )
     row = await db.fetch_one(
         """
         SELECT COUNT(*) AS total
@@ -165,6 +170,50 @@ async def count_audit_logs(
     return int(row.get("total") or 0)
 
 
+async def stream_audit_logs(
+    *,
+    entity_type: str | None = None,
+    entity_id: int | None = None,
+    user_id: int | None = None,
+    action: str | None = None,
+    request_id: str | None = None,
+    ip_address: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    search: str | None = None,
+    batch_size: int = 500,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield every matching audit log, newest first, without buffering the result."""
+
+    where, params = _build_filters(
+        entity_type=entity_type,
+        entity_id=entity_id,
+        user_id=user_id,
+        action=action,
+        request_id=request_id,
+        ip_address=ip_address,
+        since=since,
+        until=until,
+        search=search,
+    )
+    rows = db.stream(
+        """
+        SELECT al.*, u.email AS user_email
+        FROM audit_logs AS al
+        LEFT JOIN users AS u ON u.id = al.user_id
+        """
+        + where
+        + """
+        ORDER BY al.created_at DESC
+        """,
+        tuple(params),
+        batch_size=batch_size,
+    )
+    async with aclosing(rows):
+        async for row in rows:
+            yield _normalise(row)
+
+
 async def list_distinct_actions(limit: int = 200) -> list[str]:
     """Return the most recent distinct ``action`` values for filter UIs."""
 
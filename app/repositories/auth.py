@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import hashlib
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Any, Optional
 
+from app.core.config import get_settings
 from app.core.database import db
 from app.core.logging import log_info
+from app.core.reference_cache import USER_SESSIONS, reference_cache
 from app.security.encryption import decrypt_secret, encrypt_secret
 
 
@@ -80,8 +83,7 @@ async def create_session(
     return await get_session_by_token(session_token)
 
 
-async def get_session_by_token(token: str) -> Optional[dict[str, Any]]:
-    token_hash = _hash_session_token(token)
+async def _load_session_by_token(token: str, token_hash: str) -> Optional[dict[str, Any]]:
     row = await db.fetch_one(
         "SELECT * FROM user_sessions WHERE session_token = %s OR session_token = %s",
         (token_hash, token),
@@ -89,6 +91,21 @@ async def get_session_by_token(token: str) -> Optional[dict[str, Any]]:
     return row
 
 
+async def get_session_by_token(token: str) -> Optional[dict[str, Any]]:
+    token_hash = _hash_session_token(token)
+    # Every authenticated request validates its session here, so records are
+    # reused for a few seconds; session writes other than expiry touches
+    # invalidate them.  Unknown tokens are not cached: the key comes from the
+    # client's cookie.
+    return await reference_cache.get_or_load(
+        USER_SESSIONS,
+        token_hash,
+        partial(_load_session_by_token, token, token_hash),
+        ttl_seconds=get_settings().session_cache_ttl_seconds,
+        cache_none=False,
+    )
+
+
 async def get_session_by_id(session_id: int) -> Optional[dict[str, Any]]:
     row = await db.fetch_one(
         "SELECT * FROM user_sessions WHERE id = %s",
@@ -147,6 +164,13 @@ async def update_session(
     params.append(session_id)
     sql = f"UPDATE user_sessions SET {', '.join(updates)} WHERE id = %s"
     await db.execute(sql, tuple(params))
+    # Sliding-expiry touches leave cached records valid: a cached copy only
+    # carries an older expiry, which the next touch moves forward again.
+    touch_only = all(
+        column.startswith(("last_seen_at ", "expires_at ")) for column in updates
+    )
+    if not touch_only:
+        await reference_cache.invalidate(USER_SESSIONS)
 
 
 async def deactivate_session(session_id: int) -> None:
@@ -5,6 +5,7 @@ from typing import Any, Iterable, List, Optional, Sequence
 
 from app.core.database import db
 from app.core.logging import log_info
+from app.core.reference_cache import PERMISSION_SNAPSHOTS, USER_SESSIONS, reference_cache
 from app.services.company_domains import normalise_email_domains
 
 
@@ -210,6 +211,8 @@ async def create_company(**data: Any) -> dict[str, Any]:
     )
     if not company_id:
         raise RuntimeError("Failed to create company")
+    # Company switchers list every company for super admins and technicians.
+    await reference_cache.invalidate(PERMISSION_SNAPSHOTS)
     row = await db.fetch_one(
         "SELECT * FROM companies WHERE id = %s", (company_id,)
     )
@@ -241,6 +244,7 @@ async def update_company(company_id: int, **updates: Any) -> dict[str, Any]:
     columns = ", ".join(f"{column} = %s" for column in updates.keys())
     params = list(updates.values()) + [company_id]
     await db.execute(f"UPDATE companies SET {columns} WHERE id = %s", tuple(params))
+    await reference_cache.invalidate(PERMISSION_SNAPSHOTS)
     updated = await get_company_by_id(company_id)
     if not updated:
         raise ValueError("Company not found after update")
@@ -294,12 +298,15 @@ async def delete_company(company_id: int) -> None:
         "DELETE FROM staff_requests WHERE company_id = %s", (company_id,)
     )
     await db.execute("DELETE FROM companies WHERE id = %s", (company_id,))
+    await reference_cache.invalidate(PERMISSION_SNAPSHOTS)
+    await reference_cache.invalidate(USER_SESSIONS)
     log_info("Company deleted successfully", company_id=company_id)
 
 
 async def archive_company(company_id: int) -> dict[str, Any]:
     """Archive a company by setting archived = 1."""
     await db.execute("UPDATE companies SET archived = 1 WHERE id = %s", (company_id,))
+    await reference_cache.invalidate(PERMISSION_SNAPSHOTS)
     updated = await get_company_by_id(company_id)
     if not updated:
         raise ValueError("Company not found after archiving")
@@ -309,6 +316,7 @@ async def archive_company(company_id: int) -> dict[str, Any]:
 async def unarchive_company(company_id: int) -> dict[str, Any]:
     """Unarchive a company by setting archived = 0."""
     await db.execute("UPDATE companies SET archived = 0 WHERE id = %s", (company_id,))
+    await reference_cache.invalidate(PERMISSION_SNAPSHOTS)
     updated = await get_company_by_id(company_id)
     if not updated:
         raise ValueError("Company not found after unarchiving")
@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import Any, List, Optional
 
 from app.core.database import db
+from app.core.reference_cache import PERMISSION_SNAPSHOTS, reference_cache
 from app.repositories import users as user_repo
 from app.repositories import user_permissions as user_permissions_repo
 from app.security.menu_permissions import compact_menu_permissions, menu_permissions_to_legacy
@@ -130,6 +131,7 @@ async def create_membership(
             joined_at,
         ),
     )
+    await reference_cache.invalidate(PERMISSION_SNAPSHOTS)
     created = await get_membership_by_company_user(company_id, user_id)
     if not created:
         raise RuntimeError("Failed to create membership")
@@ -158,6 +160,7 @@ async def update_membership(membership_id: int, **updates: Any) -> dict[str, Any
     params.append(membership_id)
     sql = f"UPDATE company_memberships SET {', '.join(columns)} WHERE id = %s"
     await db.execute(sql, tuple(params))
+    await reference_cache.invalidate(PERMISSION_SNAPSHOTS)
     updated = await get_membership_by_id(membership_id)
     if not updated:
         raise ValueError("Membership not found after update")
@@ -166,6 +169,7 @@ async def update_membership(membership_id: int, **updates: Any) -> dict[str, Any
 
 async def delete_membership(membership_id: int) -> None:
     await db.execute("DELETE FROM company_memberships WHERE id = %s", (membership_id,))
+    await reference_cache.invalidate(PERMISSION_SNAPSHOTS)
 
 
 async def get_first_membership_with_permission(user_id: int, permission: str) -> Optional[dict[str, Any]]:
@@ -208,6 +212,25 @@ async def user_has_permission(user_id: int, permission: str) -> bool:
     return False
 
 
+async def list_effective_permissions(user_id: int) -> set[str]:
+    """Return every legacy permission name ``user_id`` holds.
+
+    This is the union of the role permissions and user-specific permissions of
+    all active memberships, i.e. the set :func:`user_has_permission` matches
+    against (without the super admin short-circuit).
+    """
+
+    permissions: set[str] = set()
+    memberships = await list_memberships_for_user(user_id, status="active")
+    for membership in memberships:
+        permissions |= _legacy_permission_set(membership.get("permissions") or [])
+        company_id = membership.get("company_id")
+        if company_id:
+            user_permissions = await user_permissions_repo.list_user_permissions(user_id, company_id)
+            permissions |= _legacy_permission_set(user_permissions)
+    return permissions
+
+
 async def list_users_with_permission(permission: str) -> List[dict[str, Any]]:
     rows = await db.fetch_all(
         """
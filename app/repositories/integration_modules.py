@@ -2,12 +2,16 @@ from __future__ import annotations
 
 import json
 from datetime import datetime, timezone
+from functools import partial
 from typing import Any
 
 from app.core.database import db
+from app.core.reference_cache import reference_cache
 
 ModuleRecord = dict[str, Any]
 
+_CACHE_NAMESPACE = "integration_modules"
+
 
 def _serialise(value: Any) -> str:
     if value is None:
@@ -51,6 +55,10 @@ def _normalise_module(row: dict[str, Any]) -> ModuleRecord:
 
 
 async def list_modules() -> list[ModuleRecord]:
+    return await reference_cache.get_or_load(_CACHE_NAMESPACE, "all", _load_modules)
+
+
+async def _load_modules() -> list[ModuleRecord]:
     rows = await db.fetch_all(
         """
         SELECT *
@@ -62,6 +70,10 @@ async def list_modules() -> list[ModuleRecord]:
 
 
 async def get_module(slug: str) -> ModuleRecord | None:
+    return await reference_cache.get_or_load(_CACHE_NAMESPACE, slug, partial(_load_module, slug))
+
+
+async def _load_module(slug: str) -> ModuleRecord | None:
     row = await db.fetch_one(
         "SELECT * FROM integration_modules WHERE slug = %s",
         (slug,),
@@ -99,6 +111,7 @@ async def upsert_module(
             _serialise(settings),
         ),
     )
+    await reference_cache.invalidate(_CACHE_NAMESPACE)
     return await get_module(slug)
 
 
@@ -136,4 +149,5 @@ async def update_module(
         f"UPDATE integration_modules SET {', '.join(assignments)} WHERE slug = %s",
         tuple(params),
     )
+    await reference_cache.invalidate(_CACHE_NAMESPACE)
     return await get_module(slug)
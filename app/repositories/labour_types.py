@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+from functools import partial
 from typing import Any, Sequence
 
 import aiomysql
 
 from app.core.database import db
+from app.core.reference_cache import reference_cache
 
 LabourTypeRecord = dict[str, Any]
 
+_CACHE_NAMESPACE = "labour_types"
+
 
 def _normalise_record(row: dict[str, Any]) -> LabourTypeRecord:
     record = dict(row)
@@ -22,6 +26,10 @@ def _normalise_record(row: dict[str, Any]) -> LabourTypeRecord:
 
 
 async def list_labour_types() -> list[LabourTypeRecord]:
+    return await reference_cache.get_or_load(_CACHE_NAMESPACE, "all", _load_labour_types)
+
+
+async def _load_labour_types() -> list[LabourTypeRecord]:
     rows = await db.fetch_all(
         """
         SELECT id, code, name, rate, is_default, created_at, updated_at
@@ -33,6 +41,12 @@ async def list_labour_types() -> list[LabourTypeRecord]:
 
 
 async def get_labour_type(labour_type_id: int) -> LabourTypeRecord | None:
+    return await reference_cache.get_or_load(
+        _CACHE_NAMESPACE, ("id", labour_type_id), partial(_load_labour_type, labour_type_id)
+    )
+
+
+async def _load_labour_type(labour_type_id: int) -> LabourTypeRecord | None:
     row = await db.fetch_one(
         """
         SELECT id, code, name, rate, is_default, created_at, updated_at
@@ -47,6 +61,12 @@ async def get_labour_type(labour_type_id: int) -> LabourTypeRecord | None:
 
 
 async def get_labour_type_by_code(code: str) -> LabourTypeRecord | None:
+    return await reference_cache.get_or_load(
+        _CACHE_NAMESPACE, ("code", code.lower()), partial(_load_labour_type_by_code, code)
+    )
+
+
+async def _load_labour_type_by_code(code: str) -> LabourTypeRecord | None:
     row = await db.fetch_one(
         """
         SELECT id, code, name, rate, is_default, created_at, updated_at
@@ -62,6 +82,12 @@ async def get_labour_type_by_code(code: str) -> LabourTypeRecord | None:
 
 async def get_default_labour_type() -> LabourTypeRecord | None:
     """Get the default labour type."""
+    return await reference_cache.get_or_load(
+        _CACHE_NAMESPACE, "default", _load_default_labour_type
+    )
+
+
+async def _load_default_labour_type() -> LabourTypeRecord | None:
     row = await db.fetch_one(
         """
         SELECT id, code, name, rate, is_default, created_at, updated_at
@@ -83,6 +109,7 @@ async def create_labour_type(*, code: str, name: str, rate: float | None = None)
         """,
         (code, name, rate),
     )
+    await reference_cache.invalidate(_CACHE_NAMESPACE)
     if labour_type_id:
         record = await get_labour_type(int(labour_type_id))
         if record:
@@ -126,6 +153,7 @@ async def update_labour_type(
             """,
             tuple(params),
         )
+        await reference_cache.invalidate(_CACHE_NAMESPACE)
     return await get_labour_type(labour_type_id)
 
 
@@ -134,6 +162,7 @@ async def delete_labour_type(labour_type_id: int) -> None:
         "DELETE FROM ticket_labour_types WHERE id = %s",
         (labour_type_id,),
     )
+    await reference_cache.invalidate(_CACHE_NAMESPACE)
 
 
 async def replace_labour_types(definitions: Sequence[dict[str, Any]]) -> list[LabourTypeRecord]:
@@ -240,4 +269,5 @@ async def replace_labour_types(definitions: Sequence[dict[str, Any]]) -> list[La
             except Exception:
                 await conn.rollback()
                 raise
+    await reference_cache.invalidate(_CACHE_NAMESPACE)
     return await list_labour_types()
@@ -621,3 +621,70 @@ async def bulk_get_consent_status(
             result[cid] = "up_to_date"
 
     return result
+
+
+async def get_delta_link(company_id: int, resource: str) -> dict[str, Any] | None:
+    """Return the stored Graph delta link and last full sync time for a resource."""
+    row = await db.fetch_one(
+        """
+        SELECT delta_link, full_synced_at, updated_at
+        FROM m365_delta_links
+        WHERE company_id = %s AND resource = %s
+        """,
+        (company_id, resource),
+    )
+    if not row:
+        return None
+    record = dict(row)
+    for key in ("full_synced_at", "updated_at"):
+        value = record.get(key)
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        if isinstance(value, datetime):
+            record[key] = value.replace(tzinfo=None)
+    return record
+
+
+async def save_delta_link(
+    *,
+    company_id: int,
+    resource: str,
+    delta_link: str,
+    full_sync: bool,
+) -> None:
+    """Store the delta link a sync finished at.
+
+    ``full_sync`` also records the run as the latest full reconcile;
+    incremental runs only move the link forward.
+    """
+    now = datetime.utcnow()
+    if full_sync:
+        await db.execute(
+            """
+            INSERT INTO m365_delta_links
+                (company_id, resource, delta_link, full_synced_at, updated_at)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                delta_link = VALUES(delta_link),
+                full_synced_at = VALUES(full_synced_at),
+                updated_at = VALUES(updated_at)
+            """,
+            (company_id, resource, delta_link, now, now),
+        )
+        return
+    await db.execute(
+        """
+        UPDATE m365_delta_links
+           SET delta_link = %s, updated_at = %s
+         WHERE company_id = %s AND resource = %s
+        """,
+        (delta_link, now, company_id, resource),
+    )
+
+
+async def delete_delta_links(company_id: int) -> None:
+    """Forget every stored delta link for a company."""
+    await db.execute(
+        "DELETE FROM m365_delta_links WHERE company_id = %s",
+        (company_id,),
+    )
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import json
+from functools import partial
 from typing import Any, Iterable, Mapping
 
 from app.core.database import db
+from app.core.reference_cache import reference_cache
+
+_CACHE_NAMESPACE = "notification_event_settings"
 
 
 def _coerce_bool(value: Any, *, default: bool = False) -> bool:
@@ -114,6 +118,10 @@ def _row_to_dict(row: Mapping[str, Any]) -> dict[str, Any]:
 
 
 async def list_settings() -> list[dict[str, Any]]:
+    return await reference_cache.get_or_load(_CACHE_NAMESPACE, "all", _load_settings)
+
+
+async def _load_settings() -> list[dict[str, Any]]:
     rows = await db.fetch_all(
         """
         SELECT
@@ -140,6 +148,12 @@ async def get_setting(event_type: str) -> dict[str, Any] | None:
     cleaned = (event_type or "").strip()
     if not cleaned:
         return None
+    return await reference_cache.get_or_load(
+        _CACHE_NAMESPACE, cleaned, partial(_load_setting, cleaned)
+    )
+
+
+async def _load_setting(cleaned: str) -> dict[str, Any] | None:
     row = await db.fetch_one(
         """
         SELECT
@@ -244,6 +258,7 @@ async def upsert_setting(event_type: str, values: Mapping[str, Any]) -> dict[str
         """,
         params,
     )
+    await reference_cache.invalidate(_CACHE_NAMESPACE)
 
     refreshed = await get_setting(cleaned)
     if not refreshed:
@@ -255,9 +270,10 @@ async def delete_missing(event_types: Iterable[str]) -> None:
     identifiers = [str(item).strip() for item in event_types if str(item).strip()]
     if not identifiers:
         await db.execute("DELETE FROM notification_event_settings")
-        return
-    placeholders = ", ".join(["%s"] * len(identifiers))
-    await db.execute(
-        f"DELETE FROM notification_event_settings WHERE event_type NOT IN ({placeholders})",
-        tuple(identifiers),
-    )
+    else:
+        placeholders = ", ".join(["%s"] * len(identifiers))
+        await db.execute(
+            f"DELETE FROM notification_event_settings WHERE event_type NOT IN ({placeholders})",
+            tuple(identifiers),
+        )
+    await reference_cache.invalidate(_CACHE_NAMESPACE)
@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import Any, Optional
 
 from app.core.database import db
+from app.core.reference_cache import PERMISSION_SNAPSHOTS, reference_cache
 from app.security.menu_permissions import compact_menu_permissions, menu_permissions_to_legacy
 
 
@@ -67,6 +68,7 @@ async def update_role(role_id: int, **updates: Any) -> dict[str, Any]:
     params.append(role_id)
     sql = f"UPDATE roles SET {', '.join(columns)} WHERE id = %s"
     await db.execute(sql, tuple(params))
+    await reference_cache.invalidate(PERMISSION_SNAPSHOTS)
     updated = await get_role_by_id(role_id)
     if not updated:
         raise ValueError("Role not found after update")
@@ -75,6 +77,7 @@ async def update_role(role_id: int, **updates: Any) -> dict[str, Any]:
 
 async def delete_role(role_id: int) -> None:
     await db.execute("DELETE FROM roles WHERE id = %s", (role_id,))
+    await reference_cache.invalidate(PERMISSION_SNAPSHOTS)
 
 
 def _normalise(row: dict[str, Any]) -> dict[str, Any]:
@@ -0,0 +1,287 @@
+"""Durable queue of scheduler runs for ``SCHEDULER_MODE=external``.
+
+The scheduler process inserts one row per trigger fire and worker processes
+claim rows under a lease.  ``pending_key`` holds the ``job_key`` while a run
+is queued or running, so the unique index keeps at most one outstanding run
+per scheduled task or system job however many scheduler processes enqueue it.
+A run whose lease expires (the worker died) is claimed again until it has
+used ``max_attempts``.  Claimed jobs carry ``resumed`` when an earlier
+worker had already started them.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import aiomysql
+
+from app.core.database import db
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+
+
+def _utc_now_naive() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _normalise_job(row: dict[str, Any] | None) -> dict[str, Any] | None:
+    if not row:
+        return None
+    job = dict(row)
+    job["force_restart"] = bool(job.get("force_restart"))
+    if job.get("task_id") is not None:
+        job["task_id"] = int(job["task_id"])
+    return job
+
+
+async def enqueue_job(
+    job_key: str,
+    *,
+    task_id: int | None = None,
+    force_restart: bool = False,
+    now: datetime | None = None,
+) -> bool:
+    """Queue a run of ``job_key``.
+
+    Returns ``False`` when a run of the same key is already queued or
+    running; that run covers this fire.
+    """
+
+    now = now or _utc_now_naive()
+    insert = "INSERT OR IGNORE" if db.is_sqlite() else "INSERT IGNORE"
+    inserted = await db.execute_rowcount(
+        f"""
+        {insert} INTO scheduler_jobs
+            (job_key, pending_key, task_id, force_restart, status, attempts, available_at, created_at)
+        VALUES (?, ?, ?, ?, 'queued', 0, ?, ?)
+        """,
+        (job_key, job_key, task_id, 1 if force_restart else 0, now, now),
+    )
+    return bool(inserted)
+
+
+async def _fail_exhausted_jobs(now: datetime, max_attempts: int) -> None:
+    await db.execute(
+        """
+        UPDATE scheduler_jobs
+        SET status = 'failed', pending_key = NULL, lease_until = NULL, finished_at = ?,
+            error = 'Lease expired after the final attempt'
+        WHERE status = 'running' AND lease_until < ? AND attempts >= ?
+        """,
+        (now, now, max_attempts),
+    )
+
+
+async def claim_jobs(
+    *,
+    worker_identity: str,
+    limit: int,
+    lease_seconds: int,
+    max_attempts: int = 3,
+    now: datetime | None = None,
+) -> list[dict[str, Any]]:
+    """Claim up to ``limit`` queued runs, or runs whose lease expired."""
+
+    if limit <= 0:
+        return []
+    now = now or _utc_now_naive()
+    lease_until = now + timedelta(seconds=lease_seconds)
+    await _fail_exhausted_jobs(now, max_attempts)
+
+    if db.is_sqlite():
+        candidates = await db.fetch_all(
+            """
+            SELECT *
+            FROM scheduler_jobs
+            WHERE (status = 'queued' AND available_at <= ?)
+               OR (status = 'running' AND lease_until < ?)
+            ORDER BY available_at ASC, id ASC
+            LIMIT ?
+            """,
+            (now, now, limit),
+        )
+        claimed: list[dict[str, Any]] = []
+        for row in candidates:
+            changed = await db.execute_rowcount(
+                """
+                UPDATE scheduler_jobs
+                SET status = 'running', lease_owner = ?, lease_until = ?,
+                    attempts = attempts + 1, started_at = ?
+                WHERE id = ?
+                  AND (status = 'queued' OR (status = 'running' AND lease_until < ?))
+                """,
+                (worker_identity, lease_until, now, row["id"], now),
+            )
+            if changed:
+                job = dict(row)
+                job.update(
+                    status=STATUS_RUNNING,
+                    lease_owner=worker_identity,
+                    lease_until=lease_until,
+                    attempts=int(row.get("attempts") or 0) + 1,
+                    started_at=now,
+                    resumed=row.get("started_at") is not None,
+                )
+                claimed.append(_normalise_job(job))
+        return claimed
+
+    async with db.acquire() as conn:
+        await conn.begin()
+        try:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(
+                    """
+                    SELECT *
+                    FROM scheduler_jobs
+                    WHERE (status = 'queued' AND available_at <= %s)
+                       OR (status = 'running' AND lease_until < %s)
+                    ORDER BY available_at ASC, id ASC
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                    """,
+                    (now, now, limit),
+                )
+                rows = list(await cursor.fetchall())
+                if not rows:
+                    await conn.commit()
+                    return []
+                ids = [row["id"] for row in rows]
+                placeholders = ", ".join(["%s"] * len(ids))
+                await cursor.execute(
+                    f"""
+                    UPDATE scheduler_jobs
+                    SET status = 'running', lease_owner = %s, lease_until = %s,
+                        attempts = attempts + 1, started_at = %s
+                    WHERE id IN ({placeholders})
+                    """,
+                    (worker_identity, lease_until, now, *ids),
+                )
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            raise
+    claimed = []
+    for row in rows:
+        job = dict(row)
+        job.update(
+            status=STATUS_RUNNING,
+            lease_owner=worker_identity,
+            lease_until=lease_until,
+            attempts=int(row.get("attempts") or 0) + 1,
+            started_at=now,
+            resumed=row.get("started_at") is not None,
+        )
+        claimed.append(_normalise_job(job))
+    return claimed
+
+
+async def extend_lease(
+    job_id: int,
+    worker_identity: str,
+    *,
+    lease_seconds: int,
+    now: datetime | None = None,
+) -> bool:
+    """Push the lease of a running job forward; ``False`` if it was lost."""
+
+    now = now or _utc_now_naive()
+    return bool(
+        await db.execute_rowcount(
+            """
+            UPDATE scheduler_jobs SET lease_until = ?
+            WHERE id = ? AND lease_owner = ? AND status = 'running'
+            """,
+            (now + timedelta(seconds=lease_seconds), job_id, worker_identity),
+        )
+    )
+
+
+async def finish_job(
+    job_id: int,
+    worker_identity: str,
+    *,
+    status: str,
+    error: str | None = None,
+    now: datetime | None = None,
+) -> bool:
+    """Record the outcome of a claimed job and free its key for the next run."""
+
+    now = now or _utc_now_naive()
+    return bool(
+        await db.execute_rowcount(
+            """
+            UPDATE scheduler_jobs
+            SET status = ?, pending_key = NULL, lease_until = NULL, finished_at = ?, error = ?
+            WHERE id = ? AND lease_owner = ? AND status = 'running'
+            """,
+            (status, now, error, job_id, worker_identity),
+        )
+    )
+
+
+async def release_job(
+    job_id: int,
+    worker_identity: str,
+    *,
+    now: datetime | None = None,
+) -> bool:
+    """Hand a claimed job back to the queue without using up an attempt.
+
+    Used when a worker shuts down mid-run.
+    """
+
+    now = now or _utc_now_naive()
+    return bool(
+        await db.execute_rowcount(
+            """
+            UPDATE scheduler_jobs
+            SET status = 'queued', lease_owner = NULL, lease_until = NULL, available_at = ?,
+                attempts = CASE WHEN attempts > 0 THEN attempts - 1 ELSE 0 END
+            WHERE id = ? AND lease_owner = ? AND status = 'running'
+            """,
+            (now, job_id, worker_identity),
+        )
+    )
+
+
+async def prune_finished_jobs(*, older_than: datetime) -> int:
+    return await db.execute_rowcount(
+        """
+        DELETE FROM scheduler_jobs
+        WHERE status IN ('succeeded', 'failed') AND finished_at < ?
+        """,
+        (older_than,),
+    )
+
+
+async def count_jobs_by_status() -> dict[str, int]:
+    rows = await db.fetch_all(
+        "SELECT status, COUNT(*) AS total FROM scheduler_jobs GROUP BY status"
+    )
+    return {str(row["status"]): int(row["total"]) for row in rows}
+
+
+async def count_outstanding_jobs_by_command() -> dict[str, dict[str, int]]:
+    """Queued and running runs per task command across every worker.
+
+    System jobs have no task and are reported under their job key.
+    """
+
+    rows = await db.fetch_all(
+        """
+        SELECT COALESCE(t.command, j.job_key) AS command, j.status, COUNT(*) AS total
+        FROM scheduler_jobs AS j
+        LEFT JOIN scheduled_tasks AS t ON t.id = j.task_id
+        WHERE j.status IN (?, ?)
+        GROUP BY COALESCE(t.command, j.job_key), j.status
+        """,
+        (STATUS_QUEUED, STATUS_RUNNING),
+    )
+    counts: dict[str, dict[str, int]] = {}
+    for row in rows:
+        entry = counts.setdefault(str(row["command"]), {STATUS_QUEUED: 0, STATUS_RUNNING: 0})
+        entry[str(row["status"])] = int(row["total"])
+    return counts
@@ -1,20 +1,39 @@
 """Repository for global site settings (single-row configuration table)."""
 from __future__ import annotations
 
+from functools import partial
 from typing import Any, Mapping
 
 from app.core.database import db
+from app.core.reference_cache import reference_cache
 
+_CACHE_NAMESPACE = "site_settings"
 
-async def get_pdf_cover_image() -> str | None:
-    """Return the stored path for the PDF cover image, or ``None`` if unset."""
+
+async def _get_setting(column: str) -> Any:
+    """Return one site_settings column through the reference data cache.
+
+    ``next_ticket_number`` is deliberately read directly: it is a counter
+    advanced by ticket creation, not configuration.
+    """
+    return await reference_cache.get_or_load(
+        _CACHE_NAMESPACE, column, partial(_load_setting, column)
+    )
+
+
+async def _load_setting(column: str) -> Any:
     row = await db.fetch_one(
-        "SELECT pdf_cover_image FROM site_settings WHERE id = 1",
+        f"SELECT {column} FROM site_settings WHERE id = 1",
         (),
     )
     if row is None:
         return None
-    value = row.get("pdf_cover_image") if isinstance(row, Mapping) else row["pdf_cover_image"]
+    return row.get(column) if isinstance(row, Mapping) else row[column]
+
+
+async def get_pdf_cover_image() -> str | None:
+    """Return the stored path for the PDF cover image, or ``None`` if unset."""
+    value = await _get_setting("pdf_cover_image")
     return str(value) if value else None
 
 
@@ -37,49 +56,24 @@ async def set_pdf_cover_image(path: str | None) -> None:
             "UPDATE site_settings SET pdf_cover_image = %s WHERE id = 1",
             (path,),
         )
+    await reference_cache.invalidate(_CACHE_NAMESPACE)
 
 
 async def get_tray_icon_path() -> str | None:
     """Return the stored path for the custom tray icon, or ``None`` if unset."""
-    row = await db.fetch_one(
-        "SELECT tray_icon_path FROM site_settings WHERE id = 1",
-        (),
-    )
-    if row is None:
-        return None
-    value = row.get("tray_icon_path") if isinstance(row, Mapping) else row["tray_icon_path"]
+    value = await _get_setting("tray_icon_path")
     return str(value) if value else None
 
 
 async def get_tray_icon_tooltip_name() -> str | None:
     """Return the custom tray icon tooltip display name, or ``None`` if unset."""
-    row = await db.fetch_one(
-        "SELECT tray_icon_tooltip_name FROM site_settings WHERE id = 1",
-        (),
-    )
-    if row is None:
-        return None
-    value = (
-        row.get("tray_icon_tooltip_name")
-        if isinstance(row, Mapping)
-        else row["tray_icon_tooltip_name"]
-    )
+    value = await _get_setting("tray_icon_tooltip_name")
     return str(value) if value else None
 
 
 async def get_tray_update_trmm_script_id() -> int | None:
     """Return the Tactical RMM script ID used for tray update requests."""
-    row = await db.fetch_one(
-        "SELECT tray_update_trmm_script_id FROM site_settings WHERE id = 1",
-        (),
-    )
-    if row is None:
-        return None
-    value: Any = (
-        row.get("tray_update_trmm_script_id")
-        if isinstance(row, Mapping)
-        else row["tray_update_trmm_script_id"]
-    )
+    value: Any = await _get_setting("tray_update_trmm_script_id")
     try:
         script_id = int(value)
     except (TypeError, ValueError):
@@ -106,6 +100,7 @@ async def set_tray_icon_path(path: str | None) -> None:
             "UPDATE site_settings SET tray_icon_path = %s WHERE id = 1",
             (path,),
         )
+    await reference_cache.invalidate(_CACHE_NAMESPACE)
 
 
 async def set_tray_icon_tooltip_name(name: str | None) -> None:
@@ -124,6 +119,7 @@ async def set_tray_icon_tooltip_name(name: str | None) -> None:
             "UPDATE site_settings SET tray_icon_tooltip_name = %s WHERE id = 1",
             (name,),
         )
+    await reference_cache.invalidate(_CACHE_NAMESPACE)
 
 
 async def set_tray_update_trmm_script_id(script_id: int | None) -> None:
@@ -145,6 +141,7 @@ async def set_tray_update_trmm_script_id(script_id: int | None) -> None:
             "UPDATE site_settings SET tray_update_trmm_script_id = %s WHERE id = 1",
             (value,),
         )
+    await reference_cache.invalidate(_CACHE_NAMESPACE)
 
 
 async def get_next_ticket_number() -> int | None:
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import re
+from functools import partial
 from typing import Any, Sequence
 
 import aiomysql
 
 from app.core.database import db
+from app.core.reference_cache import reference_cache
 
 DEFAULT_STATUS_DEFINITIONS: list[dict[str, str]] = [
     {"tech_status": "open", "tech_label": "Open", "public_status": "Open"},
@@ -16,6 +18,7 @@ DEFAULT_STATUS_DEFINITIONS: list[dict[str, str]] = [
 ]
 
 _SLUG_PATTERN = re.compile(r"[^a-z0-9]+")
+_CACHE_NAMESPACE = "ticket_statuses"
 
 
 def slugify_status_label(value: str) -> str:
@@ -49,6 +52,10 @@ def _normalise_row(row: dict[str, Any]) -> dict[str, Any]:
 
 
 async def list_statuses() -> list[dict[str, Any]]:
+    return await reference_cache.get_or_load(_CACHE_NAMESPACE, "all", _load_statuses)
+
+
+async def _load_statuses() -> list[dict[str, Any]]:
     rows = await db.fetch_all(
         "SELECT tech_status, tech_label, public_status, is_default, hide_from_technicians, hide_from_admins FROM ticket_statuses ORDER BY tech_label ASC"
     )
@@ -87,12 +94,19 @@ async def ensure_default_statuses() -> list[dict[str, str]]:
             except Exception:
                 await conn.rollback()
                 raise
+    await reference_cache.invalidate(_CACHE_NAMESPACE)
     return await list_statuses()
 
 
 async def status_exists(slug: str) -> bool:
     if not slug:
         return False
+    return await reference_cache.get_or_load(
+        _CACHE_NAMESPACE, ("exists", slug), partial(_load_status_exists, slug)
+    )
+
+
+async def _load_status_exists(slug: str) -> bool:
     row = await db.fetch_one(
         "SELECT 1 FROM ticket_statuses WHERE tech_status = %s",
         (slug,),
@@ -225,12 +239,19 @@ async def replace_statuses(definitions: Sequence[dict[str, Any]]) -> list[dict[s
                 await conn.rollback()
                 raise
 
+    await reference_cache.invalidate(_CACHE_NAMESPACE)
     return await list_statuses()
 
 
 async def get_status_definition(slug: str) -> dict[str, Any] | None:
     if not slug:
         return None
+    return await reference_cache.get_or_load(
+        _CACHE_NAMESPACE, ("definition", slug), partial(_load_status_definition, slug)
+    )
+
+
+async def _load_status_definition(slug: str) -> dict[str, Any] | None:
     row = await db.fetch_one(
         "SELECT tech_status, tech_label, public_status, is_default, hide_from_technicians, hide_from_admins FROM ticket_statuses WHERE tech_status = %s",
         (slug,),
@@ -240,6 +261,10 @@ async def get_status_definition(slug: str) -> dict[str, Any] | None:
 
 async def get_default_status() -> dict[str, Any] | None:
     """Get the default status definition."""
+    return await reference_cache.get_or_load(_CACHE_NAMESPACE, "default", _load_default_status)
+
+
+async def _load_default_status() -> dict[str, Any] | None:
     row = await db.fetch_one(
         "SELECT tech_status, tech_label, public_status, is_default, hide_from_technicians, hide_from_admins FROM ticket_statuses WHERE is_default = 1",
     )
@@ -9,7 +9,7 @@ used by other repositories such as :mod:`app.repositories.chat`.
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Sequence
 
 from app.core.database import db
 
@@ -274,6 +274,42 @@ async def update_device_heartbeat(
     )
 
 
+_HEARTBEAT_BATCH_SIZE = 200
+
+
+async def apply_device_heartbeats(
+    entries: Sequence[tuple[int, datetime, str | None, str | None, str | None]],
+) -> None:
+    """Write coalesced heartbeats with one multi-row ``UPDATE`` per batch.
+
+    ``entries`` holds ``(device_id, last_seen_utc, console_user, last_ip,
+    agent_version)`` tuples, one per device.  As in
+    :func:`update_device_heartbeat`, ``None`` keeps the stored value.
+    """
+
+    placeholder = "?" if db.is_sqlite() else "%s"
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    for start in range(0, len(entries), _HEARTBEAT_BATCH_SIZE):
+        batch = entries[start : start + _HEARTBEAT_BATCH_SIZE]
+        when_clause = " ".join([f"WHEN {placeholder} THEN {placeholder}"] * len(batch))
+        id_list = ", ".join([placeholder] * len(batch))
+        params: list[Any] = []
+        for column in range(1, 5):
+            for entry in batch:
+                params.extend((entry[0], entry[column]))
+        params.append(now)
+        params.extend(entry[0] for entry in batch)
+        await db.execute(
+            f"UPDATE tray_devices SET "
+            f"last_seen_utc = CASE id {when_clause} END, "
+            f"console_user = COALESCE(CASE id {when_clause} END, console_user), "
+            f"last_ip = COALESCE(CASE id {when_clause} END, last_ip), "
+            f"agent_version = COALESCE(CASE id {when_clause} END, agent_version), "
+            f"updated_at = {placeholder} WHERE id IN ({id_list})",
+            tuple(params),
+        )
+
+
 async def link_device_to_asset(device_id: int, asset_id: int | None) -> None:
     placeholder = "?" if db.is_sqlite() else "%s"
     await db.execute(
@@ -483,6 +519,16 @@ async def mark_command_delivered(command_id: int, *, error: str | None = None) -
     )
 
 
+async def mark_command_unconfirmed(command_id: int) -> None:
+    """Take a command out of the queue after a send nobody acknowledged."""
+
+    placeholder = "?" if db.is_sqlite() else "%s"
+    await db.execute(
+        f"UPDATE tray_command_log SET status = 'unconfirmed' WHERE id = {placeholder}",
+        (command_id,),
+    )
+
+
 # ---------------------------------------------------------------------------
 # Diagnostics (Phase 5)
 # ---------------------------------------------------------------------------
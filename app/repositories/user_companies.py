@@ -5,6 +5,7 @@ from contextlib import suppress
 from typing import Any, List, Optional
 
 from app.core.database import db
+from app.core.reference_cache import PERMISSION_SNAPSHOTS, reference_cache
 from app.repositories import companies as company_repo
 from app.repositories import company_memberships as membership_repo
 from app.repositories import roles as role_repo
@@ -457,6 +458,7 @@ async def assign_user_to_company(
             1 if is_admin else 0,
         ),
     )
+    await reference_cache.invalidate(PERMISSION_SNAPSHOTS)
     await _ensure_company_membership(company_id, user_id)
 
 
@@ -540,6 +542,7 @@ async def update_permission(
         f"UPDATE user_companies SET {field} = %s WHERE user_id = %s AND company_id = %s",
         (1 if value else 0, user_id, company_id),
     )
+    await reference_cache.invalidate(PERMISSION_SNAPSHOTS)
 
 
 async def update_staff_permission(
@@ -558,6 +561,7 @@ async def update_staff_permission(
             company_id,
         ),
     )
+    await reference_cache.invalidate(PERMISSION_SNAPSHOTS)
 
 
 async def remove_assignment(*, user_id: int, company_id: int) -> None:
@@ -565,4 +569,5 @@ async def remove_assignment(*, user_id: int, company_id: int) -> None:
         "DELETE FROM user_companies WHERE user_id = %s AND company_id = %s",
         (user_id, company_id),
     )
+    await reference_cache.invalidate(PERMISSION_SNAPSHOTS)
     await _suspend_company_membership(company_id, user_id)
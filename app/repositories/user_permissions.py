@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Any, Optional
 
 from app.core.database import db
+from app.core.reference_cache import PERMISSION_SNAPSHOTS, reference_cache
 
 
 async def list_user_permissions(user_id: int, company_id: int) -> list[str]:
@@ -49,6 +50,7 @@ async def add_user_permission(
         """,
         (user_id, company_id, permission, now, created_by),
     )
+    await reference_cache.invalidate(PERMISSION_SNAPSHOTS)
     result = await get_user_permission(user_id, company_id, permission)
     if not result:
         raise RuntimeError("Failed to create user permission")
@@ -64,6 +66,7 @@ async def remove_user_permission(user_id: int, company_id: int, permission: str)
         """,
         (user_id, company_id, permission),
     )
+    await reference_cache.invalidate(PERMISSION_SNAPSHOTS)
 
 
 async def set_user_permissions(
@@ -103,3 +106,4 @@ async def clear_user_permissions(user_id: int, company_id: int) -> None:
         """,
         (user_id, company_id),
     )
+    await reference_cache.invalidate(PERMISSION_SNAPSHOTS)
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import json
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Mapping
+from urllib.parse import urlsplit
+
+import aiomysql
 
 from app.core.database import db
 
@@ -185,6 +188,135 @@ async def list_due_events(limit: int = 25) -> list[dict[str, Any]]:
     return [_normalise_event(row) for row in rows]
 
 
+def target_host(url: Any) -> str:
+    """Return the lower-cased host an outgoing event is delivered to."""
+
+    return (urlsplit(str(url or "")).hostname or "").lower()
+
+
+# Candidate rows scanned per claimable slot when claiming with a per-host cap,
+# so a backlog for one busy host does not hide other hosts' due events.
+_CLAIM_SCAN_FACTOR = 4
+
+
+async def claim_due_events(
+    limit: int = 25,
+    *,
+    per_host: int | None = None,
+    held: Mapping[str, int] | None = None,
+) -> list[dict[str, Any]]:
+    """Move up to ``limit`` due outgoing events to ``in_progress`` and return them.
+
+    With ``per_host`` no host ends up with more than that many claimed
+    events, counting the ``held`` events per host the caller is still
+    delivering; events over the cap stay pending for a later claim.
+
+    MySQL claims the batch with ``FOR UPDATE SKIP LOCKED`` so concurrent
+    monitors take disjoint rows; SQLite claims row by row with a guarded
+    update.  A claimed event that is never finished is picked up by
+    :func:`list_stalled_events` once its ``updated_at`` ages out.
+    """
+
+    if limit <= 0:
+        return []
+    now = _utcnow()
+    scan = limit if per_host is None else limit * _CLAIM_SCAN_FACTOR
+    hosts = dict(held or {})
+
+    def _has_room(row: dict[str, Any]) -> bool:
+        return per_host is None or hosts.get(target_host(row.get("target_url")), 0) < per_host
+
+    def _take(row: dict[str, Any]) -> None:
+        host = target_host(row.get("target_url"))
+        hosts[host] = hosts.get(host, 0) + 1
+
+    if db.is_sqlite():
+        candidates = await db.fetch_all(
+            """
+            SELECT *
+            FROM webhook_events
+            WHERE status = 'pending'
+              AND direction = 'outgoing'
+              AND (next_attempt_at IS NULL OR next_attempt_at <= %s)
+            ORDER BY created_at ASC
+            LIMIT %s
+            """,
+            (now, scan),
+        )
+        claimed: list[dict[str, Any]] = []
+        for row in candidates:
+            if len(claimed) >= limit:
+                break
+            if not _has_room(row):
+                continue
+            changed = await db.execute_rowcount(
+                """
+                UPDATE webhook_events
+                SET status = 'in_progress', updated_at = %s
+                WHERE id = %s AND status = 'pending'
+                """,
+                (now, row["id"]),
+            )
+            if changed:
+                _take(row)
+                claimed.append(_normalise_event({**row, "status": "in_progress", "updated_at": now}))
+        return claimed
+
+    rows: list[dict[str, Any]] = []
+    async with db.acquire() as conn:
+        await conn.begin()
+        try:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(
+                    """
+                    SELECT *
+                    FROM webhook_events
+                    WHERE status = 'pending'
+                      AND direction = 'outgoing'
+                      AND (next_attempt_at IS NULL OR next_attempt_at <= %s)
+                    ORDER BY created_at ASC
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                    """,
+                    (now, scan),
+                )
+                for row in await cursor.fetchall():
+                    if len(rows) >= limit:
+                        break
+                    if _has_room(row):
+                        _take(row)
+                        rows.append(row)
+                if rows:
+                    placeholders = ", ".join(["%s"] * len(rows))
+                    await cursor.execute(
+                        f"""
+                        UPDATE webhook_events
+                        SET status = 'in_progress', updated_at = %s
+                        WHERE id IN ({placeholders})
+                        """,
+                        (now, *(row["id"] for row in rows)),
+                    )
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            raise
+    return [
+        _normalise_event({**row, "status": "in_progress", "updated_at": now}) for row in rows
+    ]
+
+
+async def count_outgoing_events_by_status() -> dict[str, int]:
+    rows = await db.fetch_all(
+        """
+        SELECT status, COUNT(*) AS total
+        FROM webhook_events
+        WHERE direction = 'outgoing'
+        GROUP BY status
+        """
+    )
+    return {str(row["status"]): int(row["total"]) for row in rows}
+
+
 async def list_stalled_events(timeout_seconds: int = 600) -> list[dict[str, Any]]:
     """Find webhook events stuck in 'in_progress' status beyond the timeout threshold."""
     now = _utcnow()
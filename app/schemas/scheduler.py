@@ -162,3 +162,18 @@ class RunTaskResponse(BaseModel):
 class WebhookEventsBulkDeleteResponse(BaseModel):
     status: Literal["failed", "succeeded"]
     deleted: int
+
+
+class WebhookDeliveryStatsResponse(BaseModel):
+    queue: dict[str, int]
+    in_flight: dict[str, int] = Field(serialization_alias="inFlight")
+    delivered: int
+    failed_attempts: int = Field(serialization_alias="failedAttempts")
+    request_ms: dict[str, float] | None = Field(default=None, serialization_alias="requestMs")
+    queue_lag_seconds: dict[str, float] | None = Field(
+        default=None, serialization_alias="queueLagSeconds"
+    )
+
+    model_config = {
+        "populate_by_name": True,
+    }
@@ -4,8 +4,8 @@ import secrets
 from typing import Iterable
 
 from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import get_settings
 from app.core.logging import log_warning
@@ -21,22 +21,37 @@ DEFAULT_EXEMPT_PREFIXES = (
 )
 
 
-class CSRFMiddleware(BaseHTTPMiddleware):
+class CSRFMiddleware:
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         *,
         manager: SessionManager | None = None,
         exempt_paths: Iterable[str] | None = None,
     ) -> None:
-        super().__init__(app)
+        self.app = app
         self._session_manager = manager or session_manager
         self._exempt_paths = tuple(exempt_paths or ())
         self._settings = get_settings()
 
-    async def dispatch(self, request: Request, call_next):
-        if not self._settings.enable_csrf:
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._settings.enable_csrf:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope, receive)
+        response = await self._validate(request)
+        if response is not None:
+            await response(scope, receive, send)
+            return
+        if hasattr(request, "_body"):
+            # The form was read to find the token; replay the buffered body so
+            # downstream handlers still receive the payload.
+            receive = _replay_body(request._body, receive)
+        await self.app(scope, receive, send)
+
+    async def _validate(self, request: Request) -> JSONResponse | None:
+        """Return an error response when the request fails CSRF validation."""
 
         # API clients that authenticate with bearer tokens or API keys are not
         # vulnerable to CSRF because browsers will not automatically attach
@@ -54,14 +69,14 @@ class CSRFMiddleware(BaseHTTPMiddleware):
             or bool(request.headers.get("x-api-key"))
         )
         if has_token_auth and not has_session_cookie:
-            return await call_next(request)
+            return None
 
         if request.method.upper() in SAFE_METHODS:
-            return await call_next(request)
+            return None
 
         path = request.url.path
         if any(path.startswith(prefix) for prefix in (*DEFAULT_EXEMPT_PREFIXES, *self._exempt_paths)):
-            return await call_next(request)
+            return None
 
         header_token = (
             request.headers.get("X-CSRF-Token")
@@ -76,14 +91,16 @@ class CSRFMiddleware(BaseHTTPMiddleware):
             )
             if should_check_form:
                 try:
-                    # BaseHTTPMiddleware consumes the request stream the first time it is read.
-                    # Populate the cached body so downstream handlers still receive the payload.
+                    # Buffer the body before parsing so it can be replayed downstream.
                     await request.body()
                     form = await request.form()
                 except Exception:  # pragma: no cover - fall back to header validation on parse errors
                     form = None
                 if form and "_csrf" in form:
                     header_token = form.get("_csrf")
+                if form is not None:
+                    # Downstream handlers parse their own copy of the replayed body.
+                    await form.close()
 
         session = await self._session_manager.load_session(request, allow_inactive=False)
         if not session:
@@ -108,4 +125,19 @@ class CSRFMiddleware(BaseHTTPMiddleware):
             )
             return JSONResponse(status_code=403, content={"detail": "CSRF token mismatch"})
 
-        return await call_next(request)
+        return None
+
+
+def _replay_body(body: bytes, receive: Receive) -> Receive:
+    """Return a receive callable that yields ``body`` once, then defers to ``receive``."""
+
+    replayed = False
+
+    async def replay() -> Message:
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
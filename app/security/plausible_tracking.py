@@ -13,9 +13,9 @@ import os
 from typing import Callable
 
 import httpx
-from fastapi import Request, Response
+from fastapi import Request
 from loguru import logger
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from typing import Any
 
 from app.security.session import session_manager
@@ -61,7 +61,7 @@ def hash_user_id_for_plausible(user_id: int, pepper: str | None, send_pii: bool
     return f"hash_{h.hexdigest()[:16]}"
 
 
-class PlausibleTrackingMiddleware(BaseHTTPMiddleware):
+class PlausibleTrackingMiddleware:
     """Middleware to send authenticated pageview events to Plausible Analytics.
     
     This middleware:
@@ -73,7 +73,7 @@ class PlausibleTrackingMiddleware(BaseHTTPMiddleware):
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         *,
         exempt_paths: tuple[str, ...] = (),
         get_module_settings: Callable[[], dict[str, Any]] | None = None,
@@ -85,34 +85,48 @@ class PlausibleTrackingMiddleware(BaseHTTPMiddleware):
             exempt_paths: Tuple of path prefixes to exclude from tracking
             get_module_settings: Optional callable to get Plausible module settings
         """
-        super().__init__(app)
+        self.app = app
         self.exempt_paths = exempt_paths
         self.get_module_settings = get_module_settings
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process the request and send tracking event if applicable."""
-        # Process the request first
-        response = await call_next(request)
-        
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Skip tracking for exempt paths (e.g., static files, health checks, API endpoints)
-        path = request.url.path
+        path = scope["path"]
         if any(path.startswith(prefix) for prefix in self.exempt_paths):
-            return response
+            await self.app(scope, receive, send)
+            return
         
         # Skip tracking for non-GET requests (only track pageviews)
-        if request.method != "GET":
-            return response
+        if scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        status_code: int | None = None
+
+        async def send_capturing_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        # Process the request first; the event is sent once the response is complete
+        await self.app(scope, receive, send_capturing_status)
         
         # Skip tracking for non-successful responses
-        if response.status_code >= 400:
-            return response
+        if status_code is None or status_code >= 400:
+            return
         
         # Only track authenticated users
+        request = Request(scope, receive)
         session = await session_manager.load_session(request)
         if not session or not session.user_id:
-            return response
+            return
         
-        # Send tracking event asynchronously (don't block response)
         try:
             await self._send_pageview_event(request, session.user_id)
         except Exception as exc:
@@ -122,8 +136,6 @@ class PlausibleTrackingMiddleware(BaseHTTPMiddleware):
                 error=str(exc),
                 path=path,
             )
-        
-        return response
 
     async def _send_pageview_event(self, request: Request, user_id: int) -> None:
         """Send a custom pageview event to Plausible.
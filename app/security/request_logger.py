@@ -5,47 +5,75 @@ from typing import Iterable
 from uuid import uuid4
 
 from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.config import get_settings
+from app.core.database import db
 from app.core.logging import (
     TRAY_HEARTBEAT_PATH,
     log_debug,
     log_error,
     log_info,
+    log_warning,
     reset_request_context,
     set_request_context,
 )
 from app.core.log_redaction import redact_headers
+from app.core.query_profiler import QueryProfile, profile_queries, remember_flagged
 from app.security.client_ip import get_client_ip
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """Middleware to log all HTTP requests and responses."""
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         *,
         exempt_paths: Iterable[str] | None = None,
+        profile_queries: bool | None = None,
+        repeat_threshold: int | None = None,
     ) -> None:
-        super().__init__(app)
+        self.app = app
         self.exempt_paths = tuple(exempt_paths or ())
+        settings = get_settings()
+        self.profile_queries = (
+            settings.query_profiler_enabled if profile_queries is None else profile_queries
+        )
+        self.repeat_threshold = (
+            settings.query_profiler_repeat_threshold
+            if repeat_threshold is None
+            else repeat_threshold
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
+        request = Request(scope)
+        path = scope["path"]
         request_id = request.headers.get("x-request-id") or str(uuid4())
         request.state.request_id = request_id
+        status_code = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
 
         # Skip logging for exempt paths (e.g., static files) but still bind the
         # request id into the response so callers can correlate any errors.
         if any(path.startswith(prefix) for prefix in self.exempt_paths):
             tokens = set_request_context(request_id=request_id, route=path)
             try:
-                response = await call_next(request)
+                await self.app(scope, receive, send_with_request_id)
             finally:
                 reset_request_context(tokens)
-            response.headers["X-Request-ID"] = request_id
-            return response
+            return
 
         # Get client IP in a proxy-aware way that honours TRUSTED_PROXIES.
         client_ip = get_client_ip(request, default="unknown")
@@ -69,9 +97,17 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             headers=redact_headers(dict(request.headers)),
         )
 
-        # Process request
+        # Process request, counting the database statements it issues.  The
+        # consistency scope keeps reads on the primary once the request writes.
+        # Both cover the whole response, including any streamed body.
+        profile: QueryProfile | None = None
         try:
-            response = await call_next(request)
+            with db.consistency_scope():
+                if self.profile_queries:
+                    with profile_queries(path, request_id=request_id) as profile:
+                        await self.app(scope, receive, send_with_request_id)
+                else:
+                    await self.app(scope, receive, send_with_request_id)
         except Exception as exc:  # pragma: no cover - defensive logging
             duration = time.time() - start_time
             log_error(
@@ -88,23 +124,52 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         duration = time.time() - start_time
 
         # Log response
-        if path == TRAY_HEARTBEAT_PATH and response.status_code < 500:
+        if path == TRAY_HEARTBEAT_PATH and status_code < 500:
             log_function = log_debug
         else:
-            log_function = log_error if response.status_code >= 500 else log_info
+            log_function = log_error if status_code >= 500 else log_info
         message = (
             "Request completed with server error"
-            if response.status_code >= 500
+            if status_code >= 500
             else "Request completed"
         )
 
+        query_fields: dict[str, float | int] = {}
+        if profile is not None:
+            query_fields = {
+                "db_queries": profile.query_count,
+                "db_time_ms": round(profile.total_seconds * 1000, 2),
+            }
+
         log_function(
             message,
             method=request.method,
-            status_code=response.status_code,
+            status_code=status_code,
             duration_ms=round(duration * 1000, 2),
+            **query_fields,
         )
 
-        response.headers["X-Request-ID"] = request_id
+        if profile is not None:
+            self._report_repeated_statements(request, profile)
+
         reset_request_context(tokens)
-        return response
+
+    def _report_repeated_statements(self, request: Request, profile: QueryProfile) -> None:
+        """Warn about statement shapes repeated often enough to suggest N+1 queries."""
+
+        repeated = profile.repeated_statements(self.repeat_threshold)
+        if not repeated:
+            return
+        summary = profile.summary(self.repeat_threshold)
+        summary["method"] = request.method
+        remember_flagged(summary)
+        worst = repeated[0]
+        log_warning(
+            "Request repeated a database statement",
+            event="request.repeated_query",
+            method=request.method,
+            db_queries=profile.query_count,
+            repeat_count=worst["count"],
+            repeat_sql=worst["sql"][:500],
+            repeated_shapes=len(repeated),
+        )
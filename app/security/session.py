@@ -12,6 +12,9 @@ from app.repositories import auth as auth_repo
 from app.security.client_ip import get_client_ip
 from app.security.encryption import decrypt_secret, encrypt_secret
 
+# Upper bound on the per-worker record of recent session touches.
+_MAX_TRACKED_TOUCHES = 10_000
+
 
 @dataclass
 class SessionData:
@@ -37,6 +40,11 @@ class SessionManager:
         self.session_cookie_name = self._settings.session_cookie_name
         self.csrf_cookie_name = f"{self.session_cookie_name}_csrf"
         self.session_ttl = timedelta(hours=12)
+        self.touch_interval = timedelta(seconds=self._settings.session_touch_interval_seconds)
+        # Session id -> time this worker last wrote its sliding expiry. Cached
+        # session records can predate that write, so without this every request
+        # served from the cache would touch the session again.
+        self._recent_touches: dict[int, datetime] = {}
 
     def _is_secure(self) -> bool:
         return self._settings.environment.lower() == "production"
@@ -105,13 +113,17 @@ class SessionManager:
             await auth_repo.update_session(record["id"], is_active=False)
             return None
         session = self._map_session(record)
-        await auth_repo.update_session(
-            session.id,
-            last_seen_at=now,
-            expires_at=now + self.session_ttl,
-        )
-        session.expires_at = now + self.session_ttl
-        session.last_seen_at = now
+        last_touch = max(session.last_seen_at, self._recent_touches.get(session.id, session.last_seen_at))
+        if now - last_touch >= self.touch_interval:
+            await auth_repo.update_session(
+                session.id,
+                last_seen_at=now,
+                expires_at=now + self.session_ttl,
+            )
+            self._remember_touch(session.id, now)
+            last_touch = now
+        session.expires_at = last_touch + self.session_ttl
+        session.last_seen_at = last_touch
         request.state.session = session
         request.state.active_company_id = session.active_company_id
         if session.impersonator_user_id is not None:
@@ -142,6 +154,16 @@ class SessionManager:
         await auth_repo.update_session(session.id, active_company_id=company_id)
         session.active_company_id = company_id
 
+    def _remember_touch(self, session_id: int, touched_at: datetime) -> None:
+        if len(self._recent_touches) >= _MAX_TRACKED_TOUCHES:
+            cutoff = touched_at - self.touch_interval
+            self._recent_touches = {
+                key: value for key, value in self._recent_touches.items() if value > cutoff
+            }
+            if len(self._recent_touches) >= _MAX_TRACKED_TOUCHES:
+                self._recent_touches.clear()
+        self._recent_touches[session_id] = touched_at
+
     def hydrate_session(self, record: dict[str, Any]) -> SessionData:
         """Create session data from a database record without mutating state."""
         return self._map_session(record)
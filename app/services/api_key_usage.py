@@ -0,0 +1,101 @@
+"""Aggregated API key usage accounting.
+
+Every authenticated API call used to write its usage inline: an upsert into
+``api_key_usage`` and an ``UPDATE api_keys``.  :class:`ApiKeyUsageRecorder`
+instead counts calls per (key, source IP) in memory and writes the totals in
+bulk every ``API_KEY_USAGE_FLUSH_SECONDS``.  Each worker flushes its own
+counts and the upsert adds to the stored totals, so counts stay exact across
+workers; only ``last_used_at`` lags by up to one flush interval.
+
+The recorder is inactive until :meth:`ApiKeyUsageRecorder.start` runs at
+application startup; before then (and in scripts) usage is written inline.
+"""
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.core.logging import log_error
+from app.repositories import api_keys as api_key_repo
+
+
+@dataclass(slots=True)
+class _UsageCounter:
+    count: int
+    last_used_at: datetime
+
+
+class ApiKeyUsageRecorder:
+    """Accumulate API key usage in memory and flush it periodically."""
+
+    def __init__(self) -> None:
+        self._pending: dict[tuple[int, str], _UsageCounter] = {}
+        self._flush_interval = 0.0
+        self._task: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self, *, flush_interval_seconds: float) -> None:
+        if self._task is not None or flush_interval_seconds <= 0:
+            return
+        self._flush_interval = float(flush_interval_seconds)
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write any counts still pending."""
+
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    async def record(self, api_key_id: int, ip_address: str) -> None:
+        """Count one call made with ``api_key_id`` from ``ip_address``."""
+
+        if self._task is None:
+            await api_key_repo.record_api_key_usage(api_key_id, ip_address)
+            return
+        now = datetime.utcnow()
+        counter = self._pending.get((api_key_id, ip_address))
+        if counter is None:
+            self._pending[(api_key_id, ip_address)] = _UsageCounter(count=1, last_used_at=now)
+        else:
+            counter.count += 1
+            counter.last_used_at = now
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            entries = [
+                (api_key_id, ip_address, counter.count, counter.last_used_at)
+                for (api_key_id, ip_address), counter in pending.items()
+            ]
+            try:
+                await api_key_repo.apply_api_key_usage(entries)
+            except Exception as exc:  # pragma: no cover - depends on database availability
+                log_error("Failed to flush API key usage", error=str(exc), entries=len(entries))
+                # Keep the counts for the next attempt.
+                for key, counter in pending.items():
+                    current = self._pending.get(key)
+                    if current is None:
+                        self._pending[key] = counter
+                    else:
+                        current.count += counter.count
+                        current.last_used_at = max(current.last_used_at, counter.last_used_at)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
+
+
+api_key_usage_recorder = ApiKeyUsageRecorder()
@@ -8,6 +8,7 @@ from collections.abc import Awaitable, Callable
 from typing import Any, TypeVar
 from uuid import uuid4
 
+from app.core.database import db
 from app.core.logging import log_error
 
 T = TypeVar("T")
@@ -40,6 +41,12 @@ def queue_background_task(
     resolved_task_id = task_id or uuid4().hex
 
     async def _execute() -> T:
+        # Background work runs on the background connection pool so it cannot
+        # starve the request that queued it (or any other) of connections.
+        with db.background():
+            return await _run()
+
+    async def _run() -> T:
         try:
             awaitable = task_factory()
         except Exception as exc:  # pragma: no cover - defensive guard
@@ -0,0 +1,199 @@
+"""Long-lived, per-integration HTTP connection pools.
+
+Integrations build an ``httpx.AsyncClient`` for each call, which used to
+mean a fresh DNS lookup, TCP connection and TLS handshake every time.
+:func:`client` still returns a short-lived client, so call sites keep their
+own base URL, headers, auth and timeout, but its transport hands requests
+to a connection pool shared by every client of that integration.  Closing
+the client leaves the pool open; :func:`close_clients` closes the pools on
+shutdown.
+
+Pools belong to the event loop they were created on, so a worker process
+or a test running its own loop gets its own pools.  HTTP/2 is used for
+profiles that enable it when the optional ``h2`` package is installed.
+
+Every request is admitted by :mod:`app.services.rate_governor`, and
+idempotent requests the server throttles are resent once its
+``Retry-After`` has passed.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import inspect
+import weakref
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from app.services import rate_governor
+
+__all__ = ["ClientProfile", "client", "transport", "close_clients", "client_stats"]
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True, slots=True)
+class ClientProfile:
+    timeout: float | httpx.Timeout = 30.0
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 60.0
+    http2: bool = False
+    # Connection failures only; a request that reached the server is never resent.
+    retries: int = 2
+
+
+_THROTTLE_STATUSES = frozenset({429, 503})
+# Only requests without side effects are resent after the server throttles.
+_RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+_MAX_THROTTLE_RETRIES = 3
+_MAX_RETRY_WAIT_SECONDS = 60.0
+
+_INTEGRATION_TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+
+DEFAULT_PROFILE = ClientProfile()
+
+PROFILES: dict[str, ClientProfile] = {
+    "m365": ClientProfile(max_connections=40, max_keepalive_connections=20, http2=True),
+    "xero": ClientProfile(max_connections=10, max_keepalive_connections=5),
+    "syncro": ClientProfile(max_connections=10, max_keepalive_connections=5),
+    "tacticalrmm": ClientProfile(timeout=_INTEGRATION_TIMEOUT, max_connections=10),
+    "huntress": ClientProfile(max_connections=10, max_keepalive_connections=5),
+    "hudu": ClientProfile(max_connections=10, max_keepalive_connections=5),
+    "trello": ClientProfile(timeout=_INTEGRATION_TIMEOUT, max_connections=10),
+    "matrix": ClientProfile(max_connections=10, max_keepalive_connections=5),
+    "smtp2go": ClientProfile(max_connections=5, max_keepalive_connections=2),
+    "solidtime": ClientProfile(max_connections=5, max_keepalive_connections=2),
+    "ollama": ClientProfile(timeout=_INTEGRATION_TIMEOUT, max_connections=5),
+    "ntfy": ClientProfile(timeout=_INTEGRATION_TIMEOUT, max_connections=5),
+    "sms_gateway": ClientProfile(timeout=_INTEGRATION_TIMEOUT, max_connections=5),
+    "password_pusher": ClientProfile(timeout=_INTEGRATION_TIMEOUT, max_connections=5),
+    "webhooks": ClientProfile(timeout=10.0, max_connections=50, max_keepalive_connections=20),
+}
+
+
+@dataclass(slots=True)
+class _PoolStats:
+    requests: int = 0
+    connections_opened: int = 0
+    tls_handshakes: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "tls_handshakes": self.tls_handshakes,
+            "reused": max(0, self.requests - self.connections_opened),
+        }
+
+
+_pools: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, httpx.AsyncHTTPTransport]] = (
+    weakref.WeakKeyDictionary()
+)
+_stats: dict[str, _PoolStats] = {}
+
+
+def _profile(name: str) -> ClientProfile:
+    return PROFILES.get(name, DEFAULT_PROFILE)
+
+
+def _build_pool(profile: ClientProfile) -> httpx.AsyncHTTPTransport:
+    return httpx.AsyncHTTPTransport(
+        http2=profile.http2 and _HTTP2_AVAILABLE,
+        retries=profile.retries,
+        limits=httpx.Limits(
+            max_connections=profile.max_connections,
+            max_keepalive_connections=profile.max_keepalive_connections,
+            keepalive_expiry=profile.keepalive_expiry,
+        ),
+    )
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """Forwards to a shared pool under the rate governor and counts connection reuse."""
+
+    def __init__(self, name: str, pool: httpx.AsyncHTTPTransport) -> None:
+        self._name = name
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = _stats.setdefault(self._name, _PoolStats())
+        caller_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                stats.connections_opened += 1
+            elif event_name == "connection.start_tls.complete":
+                stats.tls_handshakes += 1
+            if caller_trace is not None:
+                result = caller_trace(event_name, info)
+                if inspect.isawaitable(result):
+                    await result
+
+        request.extensions["trace"] = trace
+        tenant = rate_governor.tenant_key(self._name, request)
+        attempt = 0
+        while True:
+            await rate_governor.acquire(self._name, tenant)
+            stats.requests += 1
+            response = await self._pool.handle_async_request(request)
+            if response.status_code not in _THROTTLE_STATUSES:
+                return response
+            retry_after = rate_governor.retry_after_seconds(response.headers)
+            if retry_after is None and response.status_code != 429:
+                return response
+            delay = await rate_governor.defer(self._name, tenant, retry_after)
+            if (
+                delay is None
+                or delay > _MAX_RETRY_WAIT_SECONDS
+                or request.method not in _RETRY_METHODS
+                or attempt >= _MAX_THROTTLE_RETRIES
+            ):
+                return response
+            # acquire() waits out the block before the request is resent.
+            await response.aclose()
+            attempt += 1
+
+    async def aclose(self) -> None:
+        # The pool outlives the client; close_clients() closes it.
+        return None
+
+
+def transport(name: str) -> httpx.AsyncBaseTransport:
+    """Return a transport backed by ``name``'s pool on the running loop."""
+
+    pools = _pools.setdefault(asyncio.get_running_loop(), {})
+    pool = pools.get(name)
+    if pool is None:
+        pool = pools[name] = _build_pool(_profile(name))
+    return _SharedTransport(name, pool)
+
+
+def client(name: str, **kwargs: Any) -> httpx.AsyncClient:
+    """Build a client for integration ``name`` over its shared pool.
+
+    ``kwargs`` are passed to :class:`httpx.AsyncClient`; ``timeout`` defaults
+    to the integration's profile.  TLS verification and proxies belong to
+    the pool, so callers needing different settings build their own client.
+    """
+
+    kwargs.setdefault("timeout", _profile(name).timeout)
+    return httpx.AsyncClient(transport=transport(name), **kwargs)
+
+
+async def close_clients() -> None:
+    """Close every pool created on the running loop."""
+
+    pools = _pools.pop(asyncio.get_running_loop(), None) or {}
+    for pool in pools.values():
+        with suppress(Exception):  # pragma: no cover - defensive cleanup
+            await pool.aclose()
+
+
+def client_stats() -> dict[str, dict[str, int]]:
+    """Request and connection counts per integration since the process started."""
+
+    return {name: stats.as_dict() for name, stats in sorted(_stats.items())}
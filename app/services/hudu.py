@@ -8,6 +8,7 @@ import httpx
 from app.services.module_gate import require_module_enabled
 
 from app.core.logging import log_error, log_info
+from app.services import http_clients
 from app.services import modules as modules_service
 
 
@@ -81,7 +82,7 @@ async def search_companies(name: str) -> list[dict[str, Any]]:
     params = {"name": name}
 
     await require_module_enabled("hudu")
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_clients.client("hudu") as client:
         response = await client.get(url, headers=_make_headers(api_key), params=params)
         _raise_for_status(response)
 
@@ -109,7 +110,7 @@ async def get_company_url(hudu_id: str) -> str | None:
 
     try:
         url = f"{base_url}/api/v1/companies/{hudu_id}"
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.client("hudu") as client:
             response = await client.get(url, headers=_make_headers(api_key))
         if response.status_code == 404:
             return None
@@ -175,7 +176,7 @@ async def create_person(
 
     body = {"person": person_payload}
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_clients.client("hudu") as client:
         response = await client.post(url, headers=_make_headers(api_key), json=body)
         _raise_for_status(response)
 
@@ -224,7 +225,7 @@ async def create_asset_password(
 
     body = {"asset_password": pw_payload}
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_clients.client("hudu") as client:
         response = await client.post(endpoint, headers=_make_headers(api_key), json=body)
         _raise_for_status(response, password_access=True)
 
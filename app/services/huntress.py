@@ -26,6 +26,7 @@ from app.core.config import get_settings
 from app.core.logging import log_error, log_info
 from app.repositories import companies as company_repo
 from app.repositories import huntress as huntress_repo
+from app.services import http_clients
 from app.services import modules as modules_service
 
 
@@ -109,7 +110,8 @@ async def is_module_enabled() -> bool:
 
 
 def _client(credentials: Mapping[str, str]) -> httpx.AsyncClient:
-    return httpx.AsyncClient(
+    return http_clients.client(
+        "huntress",
         base_url=credentials["base_url"],
         auth=(credentials["api_key"], credentials["api_secret"]),
         timeout=REQUEST_TIMEOUT,
@@ -118,13 +120,14 @@ def _client(credentials: Mapping[str, str]) -> httpx.AsyncClient:
 
 
 def _oauth_token_client() -> httpx.AsyncClient:
-    return httpx.AsyncClient(timeout=REQUEST_TIMEOUT)
+    return http_clients.client("huntress", timeout=REQUEST_TIMEOUT)
 
 
 def _bearer_client(
     credentials: Mapping[str, str], access_token: str
 ) -> httpx.AsyncClient:
-    return httpx.AsyncClient(
+    return http_clients.client(
+        "huntress",
         base_url=credentials["base_url"],
         timeout=REQUEST_TIMEOUT,
         headers={
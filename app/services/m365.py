@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import contextlib
 import csv
 import hashlib
 import io
@@ -12,6 +13,7 @@ import secrets
 import shutil
 import string
 import tempfile
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
 from typing import Any
 from urllib.parse import quote, unquote, urlsplit
@@ -29,13 +31,18 @@ from app.repositories import m365 as m365_repo
 from app.repositories import staff as staff_repo
 from app.repositories import staff_custom_fields as staff_custom_fields_repo
 from app.security.encryption import decrypt_secret, encrypt_secret
+from app.services import http_clients
 from app.services import modules as modules_service
+from app.services import rate_governor
 
 
 _GRAPH_SCOPE = "https://graph.microsoft.com/.default"
 _GRAPH_ALLOWED_HOSTS = frozenset({"graph.microsoft.com"})
 _GRAPH_API_VERSIONS = frozenset({"v1.0", "beta"})
 _GRAPH_MIN_PATH_SEGMENTS = 3
+# Largest /users page Graph serves (the default is 100).  Pages that select
+# signInActivity are capped at 120 by Graph regardless.
+_GRAPH_USERS_PAGE_SIZE = 999
 _GRAPH_OBJECT_ID_PATTERN = re.compile(
     r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
 )
@@ -759,6 +766,8 @@ async def upsert_credentials(
 
 async def delete_credentials(company_id: int) -> None:
     await m365_repo.delete_credentials(company_id)
+    # Delta links belong to the disconnected tenant.
+    await m365_repo.delete_delta_links(company_id)
 
 
 async def _exchange_token(
@@ -789,7 +798,7 @@ async def _exchange_token(
         }
 
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_clients.client("m365") as client:
             response = await client.post(token_endpoint, data=data)
     except httpx.TimeoutException as exc:
         raise M365Error(
@@ -1029,7 +1038,7 @@ async def _exo_invoke_command(
         "Content-Type": "application/json; charset=utf-8",
     }
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_clients.client("m365") as client:
             response = await client.post(url, headers=headers, json=payload)
     except httpx.DecodingError as exc:
         raise M365Error(
@@ -1074,7 +1083,7 @@ async def _graph_get(
     if extra_headers:
         req_headers.update(extra_headers)
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_clients.client("m365") as client:
             response = await client.get(url, headers=req_headers)
     except httpx.TimeoutException as exc:
         raise M365Error(
@@ -1240,7 +1249,9 @@ async def create_offboarded_staff_export_site(company_id: int) -> dict[str, Any]
     )
 
 
-async def _graph_get_all(access_token: str, url: str) -> list[dict[str, Any]]:
+async def _graph_get_all(
+    access_token: str, url: str, *, batch: "_GraphBatch | None" = None
+) -> list[dict[str, Any]]:
     """GET a Microsoft Graph collection endpoint, following ``@odata.nextLink`` pagination.
 
     Many Graph list endpoints (e.g. conditionalAccessPolicies,
@@ -1248,15 +1259,208 @@ async def _graph_get_all(access_token: str, url: str) -> list[dict[str, Any]]:
     ``@odata.nextLink`` property pointing to the next page.  Callers that only
     fetch the first page may miss resources and produce incorrect results.  This
     helper transparently fetches all pages and returns the combined ``value`` list.
+
+    Pass ``batch`` to send the page requests through a shared :class:`_GraphBatch`.
     """
     items: list[dict[str, Any]] = []
     while url:
-        data = await _graph_get(access_token, url)
+        if batch is not None:
+            data = await batch.get(url)
+        else:
+            data = await _graph_get(access_token, url)
         items.extend(data.get("value", []))
         url = data.get("@odata.nextLink")
     return items
 
 
+_GRAPH_BATCH_SIZE = 20
+_GRAPH_BATCH_CONCURRENCY = 4
+_GRAPH_BATCH_MAX_ATTEMPTS = 4
+_GRAPH_BATCH_RETRY_STATUSES = frozenset({429, 503, 504})
+
+
+def _graph_batch_target(url: str) -> tuple[str, str]:
+    """Split an absolute Graph URL into its API version and batch-relative URL."""
+    _validate_graph_url(url)
+    parts = urlsplit(url)
+    version, _, path = parts.path.lstrip("/").partition("/")
+    relative = f"/{path}?{parts.query}" if parts.query else f"/{path}"
+    return version, relative
+
+
+class _GraphBatchItem:
+    __slots__ = ("version", "url", "headers", "future", "attempts")
+
+    def __init__(
+        self,
+        version: str,
+        url: str,
+        headers: dict[str, str],
+        future: asyncio.Future[dict[str, Any]],
+    ) -> None:
+        self.version = version
+        self.url = url
+        self.headers = headers
+        self.future = future
+        self.attempts = 0
+
+
+class _GraphBatch:
+    """Coalesce concurrent Graph GETs into JSON ``$batch`` requests.
+
+    Tasks await :meth:`get` as they would :func:`_graph_get`.  Requests queued
+    while the event loop is busy are sent together, up to 20 per batch and a
+    few batches at a time.  Items Graph throttles are queued again after their
+    ``Retry-After``; any other failed item raises :class:`M365Error` in its own
+    caller only.  The requests are independent reads, so batches carry no
+    ``dependsOn`` ordering and Graph runs them in parallel.
+    """
+
+    def __init__(self, access_token: str) -> None:
+        self._access_token = access_token
+        self._pending: list[_GraphBatchItem] = []
+        self._flush_scheduled = False
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._semaphore = asyncio.Semaphore(_GRAPH_BATCH_CONCURRENCY)
+
+    async def __aenter__(self) -> "_GraphBatch":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def get(
+        self, url: str, *, headers: dict[str, str] | None = None
+    ) -> dict[str, Any]:
+        version, relative_url = _graph_batch_target(url)
+        loop = asyncio.get_running_loop()
+        item = _GraphBatchItem(version, relative_url, dict(headers or {}), loop.create_future())
+        self._pending.append(item)
+        if len(self._pending) >= _GRAPH_BATCH_SIZE:
+            self._flush()
+        elif not self._flush_scheduled:
+            # Runs after the other ready tasks have queued their requests.
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+        return await item.future
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, []
+        by_version: dict[str, list[_GraphBatchItem]] = {}
+        for item in pending:
+            by_version.setdefault(item.version, []).append(item)
+        for version, items in by_version.items():
+            for start in range(0, len(items), _GRAPH_BATCH_SIZE):
+                task = asyncio.create_task(
+                    self._send(version, items[start : start + _GRAPH_BATCH_SIZE])
+                )
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _post(self, version: str, body: dict[str, Any]) -> dict[str, Any]:
+        url = f"https://graph.microsoft.com/{version}/$batch"
+        for attempt in range(1, _GRAPH_BATCH_MAX_ATTEMPTS + 1):
+            try:
+                return await _graph_post(self._access_token, url, body)
+            except M365Error as exc:
+                if (
+                    exc.http_status not in _GRAPH_BATCH_RETRY_STATUSES
+                    or attempt == _GRAPH_BATCH_MAX_ATTEMPTS
+                ):
+                    raise
+                # A 429 has already paused this tenant in the rate governor.
+                if exc.http_status != 429:
+                    await asyncio.sleep(2**attempt)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    async def _send(self, version: str, items: list[_GraphBatchItem]) -> None:
+        requests: list[dict[str, Any]] = []
+        for index, item in enumerate(items):
+            request: dict[str, Any] = {"id": str(index), "method": "GET", "url": item.url}
+            if item.headers:
+                request["headers"] = item.headers
+            requests.append(request)
+        body = {"requests": requests}
+        try:
+            async with self._semaphore:
+                payload = await self._post(version, body)
+            throttled, retry_delay = self._resolve(items, payload)
+        except Exception as exc:  # noqa: BLE001 - surfaced to every waiting caller
+            for item in items:
+                if not item.future.done():
+                    item.future.set_exception(
+                        exc if isinstance(exc, M365Error) else M365Error(str(exc))
+                    )
+            return
+
+        if throttled:
+            log_info(
+                "Microsoft Graph throttled batch requests; retrying",
+                count=len(throttled),
+                retry_after=retry_delay,
+            )
+            await asyncio.sleep(retry_delay)
+            self._pending.extend(throttled)
+            self._flush()
+
+    def _resolve(
+        self, items: list[_GraphBatchItem], payload: dict[str, Any]
+    ) -> tuple[list[_GraphBatchItem], float]:
+        """Settle each caller's future and return the items to retry with their delay."""
+        responses = {
+            str(response.get("id")): response
+            for response in payload.get("responses") or []
+            if isinstance(response, dict)
+        }
+        throttled: list[_GraphBatchItem] = []
+        retry_delay = 0.0
+        for index, item in enumerate(items):
+            if item.future.done():
+                continue
+            response = responses.get(str(index))
+            if response is None:
+                item.future.set_exception(
+                    M365Error("Microsoft Graph batch response omitted a request")
+                )
+                continue
+            status = int(response.get("status") or 0)
+            response_body = response.get("body")
+            if 200 <= status < 300:
+                item.future.set_result(response_body if isinstance(response_body, dict) else {})
+                continue
+            if status in _GRAPH_BATCH_RETRY_STATUSES and item.attempts + 1 < _GRAPH_BATCH_MAX_ATTEMPTS:
+                item.attempts += 1
+                headers = {
+                    str(key).lower(): str(value)
+                    for key, value in (response.get("headers") or {}).items()
+                }
+                delay = rate_governor.retry_after_seconds(headers)
+                retry_delay = max(retry_delay, 2.0**item.attempts if delay is None else delay)
+                throttled.append(item)
+                continue
+            graph_error_code: str | None = None
+            if isinstance(response_body, dict):
+                code_value = (response_body.get("error") or {}).get("code")
+                if isinstance(code_value, str):
+                    graph_error_code = code_value
+            log_error(
+                "Microsoft Graph batch request failed",
+                url=item.url,
+                status=status,
+                graph_error_code=graph_error_code,
+            )
+            item.future.set_exception(
+                M365Error(
+                    f"Microsoft Graph request failed ({status})",
+                    http_status=status,
+                    graph_error_code=graph_error_code,
+                )
+            )
+        return throttled, retry_delay
+
+
 def _graph_path_segment(value: Any) -> str:
     """Encode a dynamic Microsoft Graph path value as one safe URL segment."""
     return quote(str(value).strip(), safe="")
@@ -1317,7 +1521,7 @@ async def _graph_post(
     _validate_graph_url(url)
     headers = {"Authorization": f"Bearer {access_token}"}
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_clients.client("m365") as client:
             response = await client.post(url, headers=headers, json=payload)
     except httpx.TimeoutException as exc:
         raise M365Error(
@@ -1436,7 +1640,7 @@ async def _graph_patch(
         "Content-Type": "application/json",
     }
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_clients.client("m365") as client:
             response = await client.patch(url, headers=headers, json=payload)
     except httpx.TimeoutException as exc:
         raise M365Error(
@@ -1481,7 +1685,7 @@ async def _graph_delete(access_token: str, url: str) -> None:
     _validate_graph_url(url)
     headers = {"Authorization": f"Bearer {access_token}"}
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_clients.client("m365") as client:
             response = await client.delete(url, headers=headers)
     except httpx.TimeoutException as exc:
         raise M365Error(
@@ -2390,13 +2594,95 @@ async def clear_company_pkce_client_id(company_id: int) -> None:
     log_info("Cleared per-company M365 PKCE client ID", company_id=company_id)
 
 
+async def _get_or_create_licensed_staff(
+    company_id: int, email: str, user: dict[str, Any]
+) -> dict[str, Any]:
+    """Return the staff record for a licensed Graph user, creating it if missing."""
+    sign_in_activity = user.get("signInActivity") or {}
+    last_sign_in_str = sign_in_activity.get("lastSignInDateTime")
+    last_sign_in = parse_graph_datetime(last_sign_in_str)
+    account_enabled = bool(user.get("accountEnabled", True))
+    staff = await staff_repo.get_staff_by_company_and_email(company_id, email)
+    if not staff:
+        first = (user.get("givenName") or "").strip() or "Unknown"
+        last = (user.get("surname") or "").strip() or user.get("displayName") or ""
+        return await staff_repo.create_staff(
+            company_id=company_id,
+            first_name=first or "Unknown",
+            last_name=last or "",
+            email=email,
+            mobile_phone=None,
+            date_onboarded=None,
+            date_offboarded=None,
+            enabled=account_enabled,
+            is_ex_staff=not account_enabled,
+            street=None,
+            city=None,
+            state=None,
+            postcode=None,
+            country=None,
+            department=None,
+            job_title=None,
+            org_company=None,
+            manager_name=None,
+            account_action="Onboarded" if account_enabled else "Offboarded",
+            syncro_contact_id=None,
+            source="m365",
+            m365_last_sign_in=last_sign_in,
+        )
+    if last_sign_in is not None:
+        await staff_repo.update_m365_last_sign_in(int(staff["id"]), last_sign_in)
+    return staff
+
+
+async def _apply_license_changes(
+    *,
+    company_id: int,
+    users: list[dict[str, Any]],
+    assignments: list[tuple[int, str]],
+) -> None:
+    """Relink changed users to the synced licences matching their assigned SKUs."""
+    for user in users:
+        email = (
+            (user.get("mail") or user.get("userPrincipalName") or "")
+            .strip()
+            .lower()
+        )
+        if not email:
+            continue
+        held = {
+            str(assigned.get("skuId") or "").lower()
+            for assigned in user.get("assignedLicenses") or []
+        }
+        if any(sku_id.lower() in held for _, sku_id in assignments):
+            staff = await _get_or_create_licensed_staff(company_id, email, user)
+        else:
+            staff = await staff_repo.get_staff_by_company_and_email(company_id, email)
+            if not staff:
+                continue
+        staff_id = int(staff["id"])
+        for license_id, sku_id in assignments:
+            if sku_id.lower() in held:
+                await license_repo.link_staff_to_license(staff_id, license_id)
+            else:
+                await license_repo.bulk_unlink_staff(license_id, [staff_id])
+
+
 async def _sync_staff_assignments(
     *,
     company_id: int,
     license_id: int,
     access_token: str,
     sku_id: str,
+    batch: _GraphBatch | None = None,
+    staff_lock: asyncio.Lock | None = None,
 ) -> None:
+    """Link the staff holding ``sku_id`` to the licence and unlink the rest.
+
+    ``sync_company_licenses`` runs this for every SKU at once: page requests
+    go through the shared ``batch`` and ``staff_lock`` serialises the staff
+    writes, so a user holding several licences is only created once.
+    """
     # Filtering by assignedLicenses is an advanced OData query that requires
     # the ConsistencyLevel: eventual header and $count=true parameter.
     # Without these, Microsoft Graph returns a 400 Bad Request.
@@ -2412,71 +2698,49 @@ async def _sync_staff_assignments(
         "https://graph.microsoft.com/v1.0/users?"
         f"$filter=assignedLicenses/any(x:x/skuId eq {sku_id})&"
         "$select=id,displayName,mail,userPrincipalName,givenName,surname,signInActivity,accountEnabled&"
-        "$count=true"
+        f"$count=true&$top={_GRAPH_USERS_PAGE_SIZE}"
     )
     consistency_headers = {"ConsistencyLevel": "eventual"}
+    lock = staff_lock or contextlib.nullcontext()
     assigned_emails: set[str] = set()
-    try:
-        while url:
-            payload = await _graph_get(
-                access_token,
-                url,
-                extra_headers=consistency_headers,
+
+    async def _fetch_page(page_url: str) -> dict[str, Any]:
+        if batch is not None:
+            return await batch.get(page_url, headers=consistency_headers)
+        return await _graph_get(
+            access_token,
+            page_url,
+            extra_headers=consistency_headers,
+        )
+
+    async def _link_users(users: list[dict[str, Any]]) -> None:
+        for user in users:
+            email = (
+                (user.get("mail") or user.get("userPrincipalName") or "")
+                .strip()
+                .lower()
             )
-            for user in payload.get("value", []):
-                email = (
-                    (user.get("mail") or user.get("userPrincipalName") or "")
-                    .strip()
-                    .lower()
-                )
-                if not email:
-                    continue
-                sign_in_activity = user.get("signInActivity") or {}
-                last_sign_in_str = sign_in_activity.get("lastSignInDateTime")
-                last_sign_in = parse_graph_datetime(last_sign_in_str)
-                account_enabled = bool(user.get("accountEnabled", True))
-                staff = await staff_repo.get_staff_by_company_and_email(company_id, email)
-                if not staff:
-                    first = (user.get("givenName") or "").strip() or "Unknown"
-                    last = (
-                        (user.get("surname") or "").strip() or user.get("displayName") or ""
-                    )
-                    created = await staff_repo.create_staff(
-                        company_id=company_id,
-                        first_name=first or "Unknown",
-                        last_name=last or "",
-                        email=email,
-                        mobile_phone=None,
-                        date_onboarded=None,
-                        date_offboarded=None,
-                        enabled=account_enabled,
-                        is_ex_staff=not account_enabled,
-                        street=None,
-                        city=None,
-                        state=None,
-                        postcode=None,
-                        country=None,
-                        department=None,
-                        job_title=None,
-                        org_company=None,
-                        manager_name=None,
-                        account_action="Onboarded" if account_enabled else "Offboarded",
-                        syncro_contact_id=None,
-                        source="m365",
-                        m365_last_sign_in=last_sign_in,
-                    )
-                    staff = created
-                elif last_sign_in is not None:
-                    await staff_repo.update_m365_last_sign_in(
-                        int(staff["id"]), last_sign_in
-                    )
-                assigned_emails.add(email)
-                await license_repo.link_staff_to_license(int(staff["id"]), license_id)
-            url = payload.get("@odata.nextLink")
+            if not email:
+                continue
+            staff = await _get_or_create_licensed_staff(company_id, email, user)
+            assigned_emails.add(email)
+            await license_repo.link_staff_to_license(int(staff["id"]), license_id)
+
+    async def _link_all_pages(page_url: str | None) -> None:
+        while page_url:
+            payload = await _fetch_page(page_url)
+            async with lock:
+                await _link_users(payload.get("value", []))
+            page_url = payload.get("@odata.nextLink")
+
+    try:
+        await _link_all_pages(url)
     except M365Error as exc:
         if exc.http_status == 403 and exc.graph_error_code == _NON_PREMIUM_ERROR_CODE:
             # signInActivity requires Azure AD Premium P1/P2.  Retry without it
             # so that non-premium tenants can still sync licence assignments.
+            # Users without signInActivity are created with
+            # m365_last_sign_in=None and existing sign-in times are kept.
             log_info(
                 "M365 tenant does not have premium licence; "
                 "retrying _sync_staff_assignments without signInActivity",
@@ -2484,72 +2748,24 @@ async def _sync_staff_assignments(
                 license_id=license_id,
                 sku_id=sku_id,
             )
-            url = (
+            assigned_emails.clear()
+            await _link_all_pages(
                 "https://graph.microsoft.com/v1.0/users?"
                 f"$filter=assignedLicenses/any(x:x/skuId eq {sku_id})&"
                 "$select=id,displayName,mail,userPrincipalName,givenName,surname,accountEnabled&"
-                "$count=true"
+                f"$count=true&$top={_GRAPH_USERS_PAGE_SIZE}"
             )
-            assigned_emails = set()
-            while url:
-                payload = await _graph_get(
-                    access_token,
-                    url,
-                    extra_headers=consistency_headers,
-                )
-                for user in payload.get("value", []):
-                    email = (
-                        (user.get("mail") or user.get("userPrincipalName") or "")
-                        .strip()
-                        .lower()
-                    )
-                    if not email:
-                        continue
-                    account_enabled = bool(user.get("accountEnabled", True))
-                    staff = await staff_repo.get_staff_by_company_and_email(company_id, email)
-                    if not staff:
-                        first = (user.get("givenName") or "").strip() or "Unknown"
-                        last = (
-                            (user.get("surname") or "").strip() or user.get("displayName") or ""
-                        )
-                        created = await staff_repo.create_staff(
-                            company_id=company_id,
-                            first_name=first or "Unknown",
-                            last_name=last or "",
-                            email=email,
-                            mobile_phone=None,
-                            date_onboarded=None,
-                            date_offboarded=None,
-                            enabled=account_enabled,
-                            is_ex_staff=not account_enabled,
-                            street=None,
-                            city=None,
-                            state=None,
-                            postcode=None,
-                            country=None,
-                            department=None,
-                            job_title=None,
-                            org_company=None,
-                            manager_name=None,
-                            account_action="Onboarded" if account_enabled else "Offboarded",
-                            syncro_contact_id=None,
-                            source="m365",
-                            m365_last_sign_in=None,
-                        )
-                        staff = created
-                    assigned_emails.add(email)
-                    await license_repo.link_staff_to_license(int(staff["id"]), license_id)
-                url = payload.get("@odata.nextLink")
         else:
             raise
 
-    current_staff = await license_repo.list_staff_for_license(license_id)
-    to_unlink = [
-        int(member["id"])
-        for member in current_staff
-        if member.get("email") and member["email"].lower() not in assigned_emails
-    ]
-    await license_repo.bulk_unlink_staff(license_id, to_unlink)
+    async with lock:
+        current_staff = await license_repo.list_staff_for_license(license_id)
+        to_unlink = [
+            int(member["id"])
+            for member in current_staff
+            if member.get("email") and member["email"].lower() not in assigned_emails
+        ]
+        await license_repo.bulk_unlink_staff(license_id, to_unlink)
 
 
 def _coerce_optional_bool(value: Any) -> bool | None:
@@ -2580,7 +2796,13 @@ def _parse_subscription_date(value: str | None) -> date | None:
         return None
 
 
-async def sync_company_licenses(company_id: int) -> None:
+async def sync_company_licenses(company_id: int, *, incremental: bool = False) -> None:
+    """Sync the tenant's subscribed SKUs into licences and link their staff.
+
+    With ``incremental`` (scheduled runs) only the users Graph reports as
+    changed since the previous run are relinked; see :func:`get_changed_users`
+    for when the run falls back to relinking every SKU in full.
+    """
     log_info("M365 starting license synchronisation", company_id=company_id)
     access_token = await acquire_access_token(company_id, force_client_credentials=True)
     try:
@@ -2694,6 +2916,8 @@ async def sync_company_licenses(company_id: int) -> None:
         )
 
     synced_skus: set[str] = set()
+    assignments: list[tuple[int, str]] = []
+    created_license = False
     for sku in payload.get("value", []):
         part_number = str(sku.get("skuPartNumber") or "").strip()
         sku_id = sku.get("skuId")
@@ -2757,6 +2981,7 @@ async def sync_company_licenses(company_id: int) -> None:
                 auto_renew=api_auto_renew,
             )
             license_id = created["id"]
+            created_license = True
             await license_repo.record_usage_if_changed(
                 license_id=int(license_id),
                 count=int(created["count"]),
@@ -2765,11 +2990,51 @@ async def sync_company_licenses(company_id: int) -> None:
         if part_number:
             synced_skus.add(part_number)
         if sku_id:
-            await _sync_staff_assignments(
-                company_id=company_id,
-                license_id=int(license_id),
-                access_token=access_token,
-                sku_id=str(sku_id),
+            assignments.append((int(license_id), str(sku_id)))
+
+    # A new licence has no linked staff yet, so it is always filled in full.
+    changes = (
+        await get_changed_users(company_id, LICENSE_DELTA_RESOURCE)
+        if incremental and not created_license
+        else None
+    )
+    if changes is not None:
+        await _apply_license_changes(
+            company_id=company_id, users=changes.users, assignments=assignments
+        )
+        await save_directory_delta(
+            company_id, LICENSE_DELTA_RESOURCE, changes.delta_link, full_sync=False
+        )
+    else:
+        delta_link = (
+            await start_directory_delta(company_id, LICENSE_DELTA_RESOURCE)
+            if incremental
+            else None
+        )
+        # Staff assignments for every SKU are fetched together so their Graph
+        # page requests share $batch calls instead of running one SKU at a time.
+        staff_lock = asyncio.Lock()
+        async with _GraphBatch(access_token) as batch:
+            results = await asyncio.gather(
+                *(
+                    _sync_staff_assignments(
+                        company_id=company_id,
+                        license_id=license_id,
+                        access_token=access_token,
+                        sku_id=sku_id,
+                        batch=batch,
+                        staff_lock=staff_lock,
+                    )
+                    for license_id, sku_id in assignments
+                ),
+                return_exceptions=True,
+            )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        if delta_link:
+            await save_directory_delta(
+                company_id, LICENSE_DELTA_RESOURCE, delta_link, full_sync=True
             )
     today = date.today()
     m365_managed_sku_cache: dict[str, bool] = {}
@@ -2899,7 +3164,8 @@ async def get_all_users(
         "https://graph.microsoft.com/v1.0/users?"
         "$select=id,displayName,mail,userPrincipalName,givenName,surname,"
         "mobilePhone,businessPhones,streetAddress,city,state,postalCode,country,"
-        "department,jobTitle,signInActivity,accountEnabled"
+        "department,jobTitle,signInActivity,accountEnabled&"
+        f"$top={_GRAPH_USERS_PAGE_SIZE}"
     )
     users: list[dict[str, Any]] = []
     try:
@@ -2926,7 +3192,8 @@ async def get_all_users(
                 "https://graph.microsoft.com/v1.0/users?"
                 "$select=id,displayName,mail,userPrincipalName,givenName,surname,"
                 "mobilePhone,businessPhones,streetAddress,city,state,postalCode,country,"
-                "department,jobTitle,accountEnabled"
+                "department,jobTitle,accountEnabled&"
+                f"$top={_GRAPH_USERS_PAGE_SIZE}"
             )
             users = []
             while url:
@@ -2938,6 +3205,152 @@ async def get_all_users(
     return users
 
 
+# Scheduled syncs each keep their own Graph delta link so a run replays the
+# directory changes made since that sync last ran.
+STAFF_DELTA_RESOURCE = "users:staff"
+LICENSE_DELTA_RESOURCE = "users:licenses"
+# users/delta only reports changes to the selected properties.
+_DELTA_USER_FIELDS: dict[str, str] = {
+    STAFF_DELTA_RESOURCE: (
+        "id,displayName,mail,userPrincipalName,givenName,surname,"
+        "mobilePhone,businessPhones,streetAddress,city,state,postalCode,country,"
+        "department,jobTitle,accountEnabled"
+    ),
+    LICENSE_DELTA_RESOURCE: (
+        "id,displayName,mail,userPrincipalName,givenName,surname,"
+        "accountEnabled,assignedLicenses"
+    ),
+}
+
+
+@dataclass(slots=True)
+class DirectoryChanges:
+    """Users changed since a stored delta link and the link to resume from."""
+
+    users: list[dict[str, Any]]
+    delta_link: str
+
+
+def _delta_full_sync_due(record: dict[str, Any]) -> bool:
+    hours = get_settings().m365_delta_full_sync_hours
+    full_synced_at = record.get("full_synced_at")
+    if hours <= 0 or not isinstance(full_synced_at, datetime):
+        return True
+    return datetime.utcnow() - full_synced_at >= timedelta(hours=hours)
+
+
+async def start_directory_delta(company_id: int, resource: str) -> str | None:
+    """Return a delta link for the directory as it is now.
+
+    Taken before a full sync, so changes made while it runs are replayed by
+    the next incremental run.  Returns ``None`` when Graph refuses the
+    request; the next scheduled run then syncs in full again.
+    """
+    access_token = await acquire_access_token(company_id, force_client_credentials=True)
+    url = (
+        "https://graph.microsoft.com/v1.0/users/delta?"
+        f"$select={_DELTA_USER_FIELDS[resource]}&$deltatoken=latest"
+    )
+    try:
+        payload = await _graph_get(access_token, url)
+    except M365Error as exc:
+        log_warning(
+            "M365 could not start a directory delta; the next sync runs in full",
+            company_id=company_id,
+            resource=resource,
+            error=str(exc),
+        )
+        return None
+    delta_link = payload.get("@odata.deltaLink")
+    return str(delta_link) if delta_link else None
+
+
+async def get_changed_users(company_id: int, resource: str) -> DirectoryChanges | None:
+    """Return the users changed since ``resource``'s stored delta link.
+
+    ``None`` tells the caller to sync in full: no link is stored, the last
+    full sync is older than ``M365_DELTA_FULL_SYNC_HOURS``, Graph rejected
+    the link (expired links answer ``410``), or users were deleted, which
+    only a full listing reconciles.  Delta responses carry just the changed
+    properties, so each changed user is read again in full over ``$batch``.
+    """
+    record = await m365_repo.get_delta_link(company_id, resource)
+    if not record or _delta_full_sync_due(record):
+        return None
+    access_token = await acquire_access_token(company_id, force_client_credentials=True)
+    url: str | None = record["delta_link"]
+    delta_link: str | None = None
+    changed_ids: list[str] = []
+    try:
+        while url:
+            payload = await _graph_get(access_token, url)
+            for user in payload.get("value", []):
+                if "@removed" in user:
+                    log_info(
+                        "M365 directory delta reported removed users; syncing in full",
+                        company_id=company_id,
+                        resource=resource,
+                    )
+                    return None
+                if user.get("id"):
+                    changed_ids.append(str(user["id"]))
+            url = payload.get("@odata.nextLink")
+            delta_link = payload.get("@odata.deltaLink") or delta_link
+    except M365Error as exc:
+        log_warning(
+            "M365 directory delta failed; syncing in full",
+            company_id=company_id,
+            resource=resource,
+            error=str(exc),
+        )
+        return None
+    if not delta_link:
+        return None
+
+    select = _DELTA_USER_FIELDS[resource]
+    async with _GraphBatch(access_token) as batch:
+        results = await asyncio.gather(
+            *(
+                batch.get(
+                    f"https://graph.microsoft.com/v1.0/users/{_graph_path_segment(user_id)}"
+                    f"?$select={select}"
+                )
+                for user_id in dict.fromkeys(changed_ids)
+            ),
+            return_exceptions=True,
+        )
+    users: list[dict[str, Any]] = []
+    for result in results:
+        if isinstance(result, BaseException):
+            log_warning(
+                "M365 could not read a changed user; syncing in full",
+                company_id=company_id,
+                resource=resource,
+                error=str(result),
+            )
+            return None
+        users.append(result)
+    log_info(
+        "M365 directory delta read",
+        company_id=company_id,
+        resource=resource,
+        changed=len(users),
+    )
+    return DirectoryChanges(users=users, delta_link=str(delta_link))
+
+
+async def save_directory_delta(
+    company_id: int, resource: str, delta_link: str, *, full_sync: bool
+) -> None:
+    """Store the delta link the next scheduled sync of ``resource`` resumes from."""
+    await m365_repo.save_delta_link(
+        company_id=company_id,
+        resource=resource,
+        delta_link=delta_link,
+        full_sync=full_sync,
+    )
+
+
 def _generate_m365_password(length: int = 16) -> str:
     """Generate a cryptographically random password that meets M365 complexity requirements.
 
@@ -3809,7 +4222,9 @@ async def ensure_service_principal_for_app(
     }
 
 
-async def _count_forwarding_rules(access_token: str, user_id: str) -> int:
+async def _count_forwarding_rules(
+    access_token: str, user_id: str, *, batch: _GraphBatch | None = None
+) -> int:
     """Return the number of inbox message rules that forward or redirect mail.
 
     Queries the ``/mailFolders/inbox/messageRules`` endpoint for the given user
@@ -3826,7 +4241,7 @@ async def _count_forwarding_rules(access_token: str, user_id: str) -> int:
         "/mailFolders/inbox/messageRules"
     )
     try:
-        rules = await _graph_get_all(access_token, url)
+        rules = await _graph_get_all(access_token, url, batch=batch)
     except M365Error as exc:
         if exc.http_status == 403:
             raise
@@ -3844,7 +4259,7 @@ async def _count_forwarding_rules(access_token: str, user_id: str) -> int:
 
 
 async def _get_user_mail_enabled_groups(
-    access_token: str, user_id: str
+    access_token: str, user_id: str, *, batch: _GraphBatch | None = None
 ) -> list[dict[str, Any]]:
     """Return mail-enabled group memberships for a user.
 
@@ -3857,7 +4272,7 @@ async def _get_user_mail_enabled_groups(
         "?$select=id,displayName,mail,mailEnabled"
     )
     try:
-        groups = await _graph_get_all(access_token, url)
+        groups = await _graph_get_all(access_token, url, batch=batch)
     except M365Error:
         return []
     return [g for g in groups if g.get("mailEnabled") and g.get("mail")]
@@ -4048,7 +4463,7 @@ async def _fetch_mailbox_usage_report(access_token: str) -> list[dict[str, Any]]
         "Accept": "text/csv",
     }
     try:
-        async with httpx.AsyncClient(timeout=30, follow_redirects=False) as client:
+        async with http_clients.client("m365", follow_redirects=False) as client:
             response = await client.get(csv_report_url, headers=headers)
             if response.status_code not in (302, 303, 307, 308):
                 log_error(
@@ -4442,7 +4857,7 @@ async def _exo_get_mailbox_permission(
         "Content-Type": "application/json; charset=utf-8",
     }
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_clients.client("m365") as client:
             response = await client.post(url, headers=headers, json=payload)
     except httpx.DecodingError as exc:
         log_warning(
@@ -4615,7 +5030,7 @@ async def _exo_get_archive_mailbox_size(
         "Content-Type": "application/json; charset=utf-8",
     }
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_clients.client("m365") as client:
             response = await client.post(url, headers=headers, json=payload)
     except httpx.DecodingError as exc:
         log_warning(
@@ -4769,6 +5184,56 @@ async def _fetch_exo_mailbox_permissions(
     return members_by_mailbox
 
 
+async def _fetch_mailbox_user_details(
+    access_token: str, users: list[dict[str, Any]]
+) -> tuple[list[int], list[list[dict[str, Any]]]]:
+    """Return forwarding-rule counts and mail-enabled groups for each user.
+
+    Both per-user lookups are sent through one :class:`_GraphBatch`, so a
+    tenant costs a request per 20 lookups instead of two sequential requests
+    per user.  The first user's rules are checked on their own: a 403 there
+    means the ``MailboxSettings.Read`` permission is missing, and the rules of
+    the remaining users are skipped instead of repeating N failing calls.
+
+    The returned lists are aligned with ``users``.
+    """
+    forwarding_counts = [0] * len(users)
+    rules_permission_denied = False
+
+    async def _count(index: int, batch: _GraphBatch) -> None:
+        nonlocal rules_permission_denied
+        if rules_permission_denied:
+            return
+        try:
+            forwarding_counts[index] = await _count_forwarding_rules(
+                access_token, users[index]["id"], batch=batch
+            )
+        except M365Error as exc:
+            if exc.http_status != 403:
+                raise
+            if not rules_permission_denied:
+                rules_permission_denied = True
+                log_warning(
+                    "Skipping forwarding-rule checks for all mailboxes – "
+                    "the enterprise app is missing the MailboxSettings.Read "
+                    "permission. Re-provision the enterprise app to grant "
+                    "the required permissions.",
+                )
+
+    if not users:
+        return [], []
+    async with _GraphBatch(access_token) as batch:
+        await _count(0, batch)
+        results = await asyncio.gather(
+            *(_count(index, batch) for index in range(1, len(users))),
+            *(
+                _get_user_mail_enabled_groups(access_token, user["id"], batch=batch)
+                for user in users
+            ),
+        )
+    return forwarding_counts, list(results[len(users) - 1 :])
+
+
 async def sync_mailboxes(company_id: int) -> int:
     """Sync mailbox data for all users and shared mailboxes in the tenant.
 
@@ -4780,7 +5245,8 @@ async def sync_mailboxes(company_id: int) -> int:
     mailboxes and equipment mailboxes).
 
     For each user mailbox, inbox message rules are queried to count forwarding
-    rules set up by the owner.  This requires the ``MailboxSettings.Read``
+    rules set up by the owner (batched with the group lookups below, see
+    ``_fetch_mailbox_user_details``).  This requires the ``MailboxSettings.Read``
     application permission.  Forwarding rule counts default to 0 for shared
     mailboxes (and for user mailboxes where the rules endpoint is unavailable).
 
@@ -4911,14 +5377,12 @@ async def sync_mailboxes(company_id: int) -> int:
     # shared mailbox UPNs with group members without extra API calls.
     group_member_cache: dict[str, list[tuple[str, str]]] = {}
 
-    # Track whether the messageRules endpoint returned 403, which means the
-    # MailboxSettings.Read permission is missing.  Once detected on the first
-    # user, skip forwarding-rule checks for all remaining users to avoid
-    # repeating N failing API calls (they would all fail identically).
-    rules_permission_denied = False
+    forwarding_counts, user_groups_by_index = await _fetch_mailbox_user_details(
+        access_token, [user for user, _ in users_with_identifiers]
+    )
 
     # --- User mailboxes ---
-    for user, identifiers in users_with_identifiers:
+    for index, (user, identifiers) in enumerate(users_with_identifiers):
         preferred_upn = identifiers[0]
         report_entry = next(
             (
@@ -4942,28 +5406,13 @@ async def sync_mailboxes(company_id: int) -> int:
             user.get("displayName") or report_entry.get("displayName") or preferred_upn
         )
 
-        fw_count = 0
-        if not rules_permission_denied:
-            try:
-                fw_count = await _count_forwarding_rules(access_token, user["id"])
-            except M365Error as exc:
-                if exc.http_status == 403:
-                    rules_permission_denied = True
-                    log_warning(
-                        "Skipping forwarding-rule checks for all mailboxes – "
-                        "the enterprise app is missing the MailboxSettings.Read "
-                        "permission. Re-provision the enterprise app to grant "
-                        "the required permissions.",
-                    )
-                else:
-                    raise
+        fw_count = forwarding_counts[index]
 
         # Sync which mailbox groups this user has access to via group membership.
         # For each mail-enabled group the user belongs to, record a member row
         # so that get_mailbox_permissions() can show who can access a mailbox
         # without a live Graph round-trip.
-        user_groups = await _get_user_mail_enabled_groups(access_token, user["id"])
-        for group in user_groups:
+        for group in user_groups_by_index[index]:
             group_email = (group.get("mail") or "").strip().lower()
             if group_email:
                 await m365_repo.upsert_mailbox_member(
@@ -6,8 +6,6 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Mapping
 from urllib.parse import quote, unquote, urlencode, urlsplit
 
-import httpx
-
 from app.core.database import db
 from app.core.logging import log_error, log_info
 from app.repositories import companies as company_repo
@@ -16,6 +14,7 @@ from app.repositories import m365_mail_accounts as mail_repo
 from app.repositories import scheduled_tasks as scheduled_tasks_repo
 from app.repositories import tickets as tickets_repo
 from app.security.encryption import decrypt_secret, encrypt_secret
+from app.services import http_clients
 from app.services import m365 as m365_service
 from app.services import modules as modules_service
 from app.services import system_state
@@ -188,7 +187,7 @@ async def _acquire_delegated_access_token(account: Mapping[str, Any]) -> str:
         "refresh_token": decrypted_refresh,
         "scope": DELEGATED_MAIL_SCOPE,
     }
-    async with httpx.AsyncClient(timeout=30) as client:
+    async with http_clients.client("m365") as client:
         response = await client.post(token_endpoint, data=data)
 
     if response.status_code != 200:
@@ -601,7 +600,7 @@ _WELL_KNOWN_MAIL_FOLDERS = {
 async def _graph_get(access_token: str, url: str) -> dict[str, Any]:
     """Perform a GET request to Microsoft Graph."""
     headers = {"Authorization": f"Bearer {access_token}"}
-    async with httpx.AsyncClient(timeout=30) as client:
+    async with http_clients.client("m365") as client:
         response = await client.get(url, headers=headers)
     if response.status_code != 200:
         log_error(
@@ -620,7 +619,7 @@ async def _graph_get(access_token: str, url: str) -> dict[str, Any]:
 async def _graph_get_bytes(access_token: str, url: str) -> bytes:
     """Perform a GET request to Microsoft Graph and return raw bytes."""
     headers = {"Authorization": f"Bearer {access_token}"}
-    async with httpx.AsyncClient(timeout=30) as client:
+    async with http_clients.client("m365") as client:
         response = await client.get(url, headers=headers)
     if response.status_code != 200:
         log_error(
@@ -653,7 +652,7 @@ async def _graph_patch(access_token: str, url: str, payload: dict[str, Any]) ->
             f"Expected URL to match base: {_GRAPH_BASE}"
         )
     headers = {"Authorization": f"Bearer {access_token}"}
-    async with httpx.AsyncClient(timeout=30) as client:
+    async with http_clients.client("m365") as client:
         response = await client.patch(url, headers=headers, json=payload)
     if response.status_code not in (200, 204):
         log_error(
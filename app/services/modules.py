@@ -39,6 +39,7 @@ from app.repositories import webhook_events as webhook_repo
 from app.security.encryption import decrypt_secret, encrypt_secret
 from app.services import call_recordings as call_recordings_service
 from app.services import email as email_service, webhook_monitor
+from app.services import http_clients
 from app.services import unifi_talk as unifi_talk_service
 from app.services.realtime import RefreshNotifier, refresh_notifier
 from app.services import tickets as tickets_service
@@ -287,7 +288,7 @@ async def refresh_xero_access_token() -> str:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
+        async with http_clients.client("xero", timeout=REQUEST_TIMEOUT) as client:
             response = await client.post(
                 token_url,
                 data=token_data,
@@ -3054,7 +3055,7 @@ async def _invoke_ollama(
         for k, v in request_headers.items()
     }
     try:
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
+        async with http_clients.client("ollama", timeout=REQUEST_TIMEOUT) as client:
             response = await client.post(endpoint, json=body, headers=request_headers)
         response.raise_for_status()
     except httpx.HTTPStatusError as exc:
@@ -3593,7 +3594,7 @@ async def _invoke_tacticalrmm(
     attempt_number = 1
     try:
         await _throttle_tacticalrmm_request()
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT, verify=True) as client:
+        async with http_clients.client("tacticalrmm", timeout=REQUEST_TIMEOUT) as client:
             response = await client.request(
                 method, url, json=request_body, headers=headers
             )
@@ -3869,7 +3870,7 @@ async def _invoke_ntfy(
         event_future.set_result(event_id)
     attempt_number = 1
     try:
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
+        async with http_clients.client("ntfy", timeout=REQUEST_TIMEOUT) as client:
             response = await client.post(
                 url,
                 data=message.encode("utf-8"),
@@ -4026,7 +4027,7 @@ async def _invoke_sms_gateway(
 
     attempt_number = 1
     try:
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
+        async with http_clients.client("sms_gateway", timeout=REQUEST_TIMEOUT) as client:
             response = await client.post(
                 gateway_url,
                 json=request_body,
@@ -4899,7 +4900,7 @@ async def _discover_xero_tenant_id(
             "refresh_token": refresh_token,
         }
 
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
+        async with http_clients.client("xero", timeout=REQUEST_TIMEOUT) as client:
             token_response = await client.post(
                 token_url,
                 data=token_data,
@@ -7088,7 +7089,7 @@ async def _invoke_password_pusher(
 
     attempt_number = 1
     try:
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
+        async with http_clients.client("password_pusher", timeout=REQUEST_TIMEOUT) as client:
             response = await client.post(target_url, json=request_body, headers=headers)
         response.raise_for_status()
     except httpx.HTTPStatusError as exc:
@@ -7161,7 +7162,7 @@ async def _validate_hudu(
         return {"status": "error", "message": "Hudu API key is not configured"}
 
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
+        async with http_clients.client("hudu", timeout=15.0) as client:
             response = await client.get(
                 f"{base_url}/api/v1/companies",
                 headers={"x-api-key": api_key, "Accept": "application/json"},
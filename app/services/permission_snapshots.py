@@ -0,0 +1,153 @@
+"""Compiled permission snapshots for page rendering.
+
+Rendering a portal page used to ask the database the same questions many
+times: which companies the user can switch to, their membership in the active
+company, and whether any of their roles grants the helpdesk, technician,
+issue tracker, marketing or BCP permissions (each of those checks reloading
+every membership).  A :class:`PermissionSnapshot` answers all of them from one
+compiled record per (user, active company).
+
+Snapshots are kept in the shared reference data cache under the
+``permission_snapshots`` namespace.  Writes to roles, memberships, user
+company assignments, direct user permissions and companies invalidate the
+namespace on every worker, so a role change applies on the user's next
+request.  Within a request the snapshot is also memoised on
+``request.state`` so repeated checks never leave the process.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+from fastapi import Request
+
+from app.core.logging import log_error
+from app.core.reference_cache import PERMISSION_SNAPSHOTS, reference_cache
+from app.repositories import company_memberships as membership_repo
+from app.repositories import user_companies as user_company_repo
+from app.services import company_access
+
+
+@dataclass(slots=True)
+class PermissionSnapshot:
+    """Everything page rendering needs to know about one user's access."""
+
+    user_id: int
+    company_id: int | None
+    is_super_admin: bool
+    permissions: frozenset[str] = frozenset()
+    accessible_companies: list[dict[str, Any]] = field(default_factory=list)
+    membership: dict[str, Any] | None = None
+    has_direct_issue_access: bool = False
+
+    def has_permission(self, permission: str) -> bool:
+        """Mirror ``membership_repo.user_has_permission`` for this user."""
+
+        return self.is_super_admin or permission in self.permissions
+
+
+def _coerce_id(value: Any) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+async def _compile_snapshot(
+    user: Mapping[str, Any], user_id: int, company_id: int | None
+) -> PermissionSnapshot:
+    is_super_admin = bool(user.get("is_super_admin"))
+    accessible = await company_access.list_accessible_companies(user)
+    membership = (
+        await user_company_repo.get_user_company(user_id, company_id)
+        if company_id is not None
+        else None
+    )
+    if is_super_admin:
+        return PermissionSnapshot(
+            user_id=user_id,
+            company_id=company_id,
+            is_super_admin=True,
+            accessible_companies=accessible,
+            membership=membership,
+        )
+    permissions = await membership_repo.list_effective_permissions(user_id)
+    assignments = await user_company_repo.list_companies_for_user(user_id)
+    return PermissionSnapshot(
+        user_id=user_id,
+        company_id=company_id,
+        is_super_admin=False,
+        permissions=frozenset(permissions),
+        accessible_companies=accessible,
+        membership=membership,
+        has_direct_issue_access=any(
+            bool(assignment.get("can_manage_issues")) for assignment in assignments
+        ),
+    )
+
+
+async def load_permission_snapshot(
+    user: Mapping[str, Any], company_id: Any = None
+) -> PermissionSnapshot:
+    """Return the (cached) permission snapshot for ``user`` in ``company_id``."""
+
+    user_id = _coerce_id(user.get("id"))
+    if user_id is None:
+        return PermissionSnapshot(user_id=0, company_id=None, is_super_admin=False)
+    company = _coerce_id(company_id)
+    # The super-admin flag comes from the freshly loaded user record, so
+    # including it in the key makes promotions and demotions take effect
+    # without an explicit invalidation.
+    key = (user_id, company, bool(user.get("is_super_admin")))
+    try:
+        return await reference_cache.get_or_load(
+            PERMISSION_SNAPSHOTS,
+            key,
+            lambda: _compile_snapshot(user, user_id, company),
+        )
+    except Exception as exc:
+        # A failed permission lookup denies the permission, not the page.
+        # The degraded snapshot is not cached.
+        log_error("Failed to compile permission snapshot", user_id=user_id, error=str(exc))
+        return PermissionSnapshot(
+            user_id=user_id,
+            company_id=company,
+            is_super_admin=bool(user.get("is_super_admin")),
+            accessible_companies=await company_access.list_accessible_companies(user),
+            membership=(
+                await user_company_repo.get_user_company(user_id, company)
+                if company is not None
+                else None
+            ),
+        )
+
+
+async def get_request_snapshot(
+    request: Request | None, user: Mapping[str, Any]
+) -> PermissionSnapshot:
+    """Return the snapshot for the request's user and active company.
+
+    The snapshot is memoised on ``request.state`` and also published as
+    ``available_companies``/``active_membership`` for code that reads those
+    attributes directly.
+    """
+
+    if request is None:
+        return await load_permission_snapshot(user, user.get("company_id"))
+    company_id = getattr(request.state, "active_company_id", None)
+    if company_id is None:
+        company_id = user.get("company_id")
+    snapshot: PermissionSnapshot | None = getattr(request.state, "permission_snapshot", None)
+    if (
+        snapshot is not None
+        and snapshot.user_id == _coerce_id(user.get("id"))
+        and snapshot.company_id == _coerce_id(company_id)
+    ):
+        return snapshot
+    snapshot = await load_permission_snapshot(user, company_id)
+    request.state.permission_snapshot = snapshot
+    if getattr(request.state, "available_companies", None) is None:
+        request.state.available_companies = snapshot.accessible_companies
+    if snapshot.company_id is not None and getattr(request.state, "active_membership", None) is None:
+        request.state.active_membership = snapshot.membership
+    return snapshot
@@ -0,0 +1,338 @@
+"""Outbound API rate governor shared by every integration.
+
+Requests sent through :mod:`app.services.http_clients` take a token from a
+bucket per integration and tenant before they leave the process.  Buckets
+live in Redis when it is configured, so every web worker and scheduler
+process draws from the same allowance; otherwise each process keeps its own.
+
+When an API answers ``429`` or ``503`` with ``Retry-After`` (or Graph's
+``x-ms-retry-after-ms``), the bucket is blocked until the server's deadline
+so no other worker sends into the throttle.  Idempotent requests are then
+retried by the transport once the block lifts.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import json
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Mapping
+
+import httpx
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+from app.core.logging import log_info, log_warning
+from app.services import rate_limit_store
+from app.services.redis import get_redis_client
+
+__all__ = [
+    "RatePolicy",
+    "DEFAULT_POLICIES",
+    "parse_limits",
+    "policy_for",
+    "tenant_key",
+    "retry_after_seconds",
+    "acquire",
+    "defer",
+    "governor_stats",
+]
+
+_KEY_PREFIX = "rate-governor"
+# A 429 without Retry-After still pauses the tenant briefly.
+_DEFAULT_THROTTLE_SECONDS = 5.0
+# After a Redis error the governor limits per process for this long, then
+# tries Redis again.
+_REDIS_RETRY_SECONDS = 30.0
+
+
+@dataclass(frozen=True, slots=True)
+class RatePolicy:
+    # ``None`` leaves admission to the integration and only honours Retry-After.
+    per_minute: float | None
+    burst: int = 1
+
+    @property
+    def per_second(self) -> float:
+        return (self.per_minute or 0.0) / 60.0
+
+
+DEFAULT_POLICIES: dict[str, RatePolicy] = {
+    # Xero allows 60 calls a minute per tenant.
+    "xero": RatePolicy(per_minute=55, burst=5),
+    # Huntress allows 60 requests a minute per account.
+    "huntress": RatePolicy(per_minute=55, burst=5),
+    # Hudu allows 300 requests a minute per instance.
+    "hudu": RatePolicy(per_minute=280, burst=20),
+    # Trello allows 100 requests per 10 seconds per token.
+    "trello": RatePolicy(per_minute=540, burst=10),
+    # Graph limits vary by resource; the bucket smooths bursts and
+    # Retry-After covers the rest.
+    "m365": RatePolicy(per_minute=1200, burst=50),
+    # Syncro and Tactical RMM keep their own configurable limiters.
+    "syncro": RatePolicy(per_minute=None),
+    "tacticalrmm": RatePolicy(per_minute=None),
+}
+
+
+def parse_limits(value: str | None) -> dict[str, RatePolicy]:
+    """Parse ``name=per_minute[/burst]`` pairs, ignoring malformed entries.
+
+    A rate of ``0`` turns the bucket off while still honouring Retry-After.
+    """
+
+    policies: dict[str, RatePolicy] = {}
+    for item in (value or "").split(","):
+        name, _, raw = item.partition("=")
+        name = name.strip()
+        if not name or not raw.strip():
+            continue
+        raw_rate, _, raw_burst = raw.partition("/")
+        try:
+            per_minute = float(raw_rate)
+            burst = int(raw_burst) if raw_burst.strip() else None
+        except ValueError:
+            log_warning("Ignoring invalid rate governor limit", entry=item.strip())
+            continue
+        if not math.isfinite(per_minute) or per_minute < 0 or (burst is not None and burst < 1):
+            log_warning("Ignoring invalid rate governor limit", entry=item.strip())
+            continue
+        if per_minute == 0:
+            policies[name] = RatePolicy(per_minute=None)
+            continue
+        if burst is None:
+            default = DEFAULT_POLICIES.get(name)
+            burst = default.burst if default and default.per_minute else max(1, math.ceil(per_minute / 60))
+        policies[name] = RatePolicy(per_minute=per_minute, burst=burst)
+    return policies
+
+
+_policy_cache: tuple[str, dict[str, RatePolicy]] | None = None
+
+
+def _policies() -> dict[str, RatePolicy]:
+    global _policy_cache
+    raw = get_settings().rate_governor_limits or ""
+    if _policy_cache is None or _policy_cache[0] != raw:
+        _policy_cache = (raw, {**DEFAULT_POLICIES, **parse_limits(raw)})
+    return _policy_cache[1]
+
+
+def policy_for(integration: str) -> RatePolicy | None:
+    """Return the policy governing ``integration``, or ``None`` when ungoverned."""
+
+    return _policies().get(integration)
+
+
+def _token_tenant(authorization: str | None) -> str | None:
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer":
+        return None
+    parts = token.strip().split(".")
+    if len(parts) != 3:
+        return None
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except (binascii.Error, ValueError):
+        return None
+    tenant = claims.get("tid") if isinstance(claims, dict) else None
+    return str(tenant) if tenant else None
+
+
+def tenant_key(integration: str, request: httpx.Request) -> str:
+    """Identify the tenant a request counts against.
+
+    Xero names the tenant in a header and Graph tokens carry it as the
+    ``tid`` claim; other integrations are limited per API host.
+    """
+
+    tenant: str | None = None
+    if integration == "xero":
+        tenant = request.headers.get("xero-tenant-id")
+    elif integration == "m365":
+        tenant = _token_tenant(request.headers.get("authorization"))
+    return (tenant or request.url.host or "default").strip().lower()
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> float | None:
+    """Read the server's back-off from ``x-ms-retry-after-ms`` or ``Retry-After``."""
+
+    raw_ms = headers.get("x-ms-retry-after-ms")
+    if raw_ms:
+        try:
+            return max(0.0, float(raw_ms) / 1000.0)
+        except ValueError:
+            pass
+    raw = (headers.get("retry-after") or "").strip()
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        deadline = parsedate_to_datetime(raw)
+    except (TypeError, ValueError):
+        return None
+    if deadline.tzinfo is None:
+        deadline = deadline.replace(tzinfo=timezone.utc)
+    return max(0.0, (deadline - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass(slots=True)
+class _LocalBucket:
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+
+
+@dataclass(slots=True)
+class _GovernorStats:
+    requests: int = 0
+    throttled: int = 0
+    wait_seconds: float = 0.0
+    retry_after: int = 0
+
+    def as_dict(self) -> dict[str, float | int]:
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "retry_after": self.retry_after,
+        }
+
+
+_local: dict[str, _LocalBucket] = {}
+_stats: dict[str, _GovernorStats] = {}
+_redis_retry_at = 0.0
+
+
+def _key(integration: str, tenant: str) -> str:
+    return f"{_KEY_PREFIX}:{integration}:{tenant}"
+
+
+def _redis() -> Redis | None:
+    return None if time.monotonic() < _redis_retry_at else get_redis_client()
+
+
+def _redis_unavailable(exc: Exception) -> None:
+    global _redis_retry_at
+    log_warning(
+        "Redis rate governor unavailable; limiting per process",
+        error=str(exc),
+        retry_seconds=_REDIS_RETRY_SECONDS,
+    )
+    _redis_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+
+
+def _take_local(key: str, policy: RatePolicy | None) -> tuple[bool, float]:
+    now = time.monotonic()
+    burst = policy.burst if policy and policy.per_minute else 1
+    bucket = _local.get(key)
+    if bucket is None:
+        bucket = _local[key] = _LocalBucket(tokens=float(burst), updated=now)
+    if bucket.blocked_until > now:
+        return False, bucket.blocked_until - now
+    if policy is None or policy.per_minute is None:
+        return True, 0.0
+    rate = policy.per_second
+    bucket.tokens = min(float(burst), bucket.tokens + (now - bucket.updated) * rate) - 1
+    bucket.updated = now
+    return True, max(0.0, -bucket.tokens / rate)
+
+
+async def _take(key: str, policy: RatePolicy) -> tuple[bool, float]:
+    redis_client = _redis()
+    if redis_client is not None:
+        try:
+            if policy.per_minute is None:
+                wait = await rate_limit_store.blocked_for(redis_client, key=key)
+                return wait <= 0, wait
+            return await rate_limit_store.acquire_token(
+                redis_client, key=key, rate_per_second=policy.per_second, burst=policy.burst
+            )
+        except RedisError as exc:
+            _redis_unavailable(exc)
+    return _take_local(key, policy)
+
+
+async def acquire(integration: str, tenant: str) -> float:
+    """Wait until ``integration`` may send a request for ``tenant``.
+
+    Returns the seconds spent waiting.  Ungoverned integrations return
+    immediately.
+    """
+
+    policy = policy_for(integration)
+    if policy is None:
+        return 0.0
+    stats = _stats.setdefault(integration, _GovernorStats())
+    stats.requests += 1
+    key = _key(integration, tenant)
+    waited = 0.0
+    while True:
+        taken, wait = await _take(key, policy)
+        if wait > 0:
+            await asyncio.sleep(wait)
+            waited += wait
+        if taken:
+            break
+    if waited:
+        stats.throttled += 1
+        stats.wait_seconds += waited
+    return waited
+
+
+async def defer(integration: str, tenant: str, seconds: float | None) -> float | None:
+    """Block ``integration`` for ``tenant`` after the server asked callers to back off.
+
+    Returns the applied delay, or ``None`` when the integration is ungoverned.
+    """
+
+    policy = policy_for(integration)
+    if policy is None:
+        return None
+    delay = _DEFAULT_THROTTLE_SECONDS if seconds is None else seconds
+    stats = _stats.setdefault(integration, _GovernorStats())
+    stats.retry_after += 1
+    log_info(
+        "Outbound API throttled by server",
+        integration=integration,
+        tenant=tenant,
+        retry_after=round(delay, 3),
+    )
+    if delay <= 0:
+        return delay
+    key = _key(integration, tenant)
+    redis_client = _redis()
+    if redis_client is not None:
+        try:
+            await rate_limit_store.block_key(redis_client, key=key, seconds=delay)
+            return delay
+        except RedisError as exc:
+            _redis_unavailable(exc)
+    now = time.monotonic()
+    bucket = _local.setdefault(key, _LocalBucket(tokens=float(policy.burst), updated=now))
+    bucket.blocked_until = max(bucket.blocked_until, now + delay)
+    return delay
+
+
+def governor_stats() -> dict[str, object]:
+    """Policies and admission counts per integration since the process started."""
+
+    policies = _policies()
+    return {
+        "backend": "redis" if _redis() is not None else "local",
+        "policies": {
+            name: {"per_minute": policy.per_minute, "burst": policy.burst}
+            for name, policy in sorted(policies.items())
+        },
+        "integrations": {name: stats.as_dict() for name, stats in sorted(_stats.items())},
+    }
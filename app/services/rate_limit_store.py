@@ -55,3 +55,92 @@ async def acquire_slot(
     retry_after_raw = float(result[1]) if len(result) > 1 else 0.0
     retry_after = retry_after_raw if retry_after_raw > 0 else None
     return allowed, retry_after
+
+
+# The bucket scripts read the Redis server clock rather than taking the
+# caller's, so workers on hosts whose clocks drift still agree on refills and
+# blocks.  Effects replication (the default from Redis 5) lets a script call
+# TIME before writing.
+_SERVER_NOW_LUA = """
+if redis.replicate_commands then redis.replicate_commands() end
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+"""
+
+# Reserves a token even when the bucket is empty, so callers sleep for the
+# returned wait instead of polling. Waits are returned as strings because
+# Redis truncates Lua numbers to integers.
+_TOKEN_BUCKET_LUA = _SERVER_NOW_LUA + """
+local key = KEYS[1]
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local state = redis.call('HMGET', key, 'tokens', 'ts', 'blocked_until')
+local blocked = tonumber(state[3]) or 0
+if blocked > now then
+    return {0, tostring(blocked - now)}
+end
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate) - 1
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', key, math.ceil((burst - tokens) / rate) + 60)
+if tokens >= 0 then
+    return {1, '0'}
+end
+return {1, tostring(-tokens / rate)}
+"""
+
+_BLOCK_LUA = _SERVER_NOW_LUA + """
+local key = KEYS[1]
+local seconds = tonumber(ARGV[1])
+local until_ts = now + seconds
+local current = tonumber(redis.call('HGET', key, 'blocked_until')) or 0
+if until_ts > current then
+    redis.call('HSET', key, 'blocked_until', tostring(until_ts))
+end
+if redis.call('TTL', key) < seconds + 60 then
+    redis.call('EXPIRE', key, math.ceil(seconds) + 60)
+end
+return 1
+"""
+
+# Seconds left on a block, for buckets that only honour Retry-After.
+_BLOCKED_FOR_LUA = _SERVER_NOW_LUA + """
+local blocked = tonumber(redis.call('HGET', KEYS[1], 'blocked_until')) or 0
+return tostring(math.max(0, blocked - now))
+"""
+
+
+async def acquire_token(
+    redis_client: Redis,
+    *,
+    key: str,
+    rate_per_second: float,
+    burst: int,
+) -> tuple[bool, float]:
+    """Take a token from a shared bucket and return how long to wait before using it.
+
+    While the key is blocked no token is taken and the caller should try
+    again after the returned wait.
+    """
+
+    result = await redis_client.eval(
+        _TOKEN_BUCKET_LUA,
+        1,
+        key,
+        float(rate_per_second),
+        int(burst),
+    )
+    return bool(int(result[0])), max(0.0, float(result[1]))
+
+
+async def block_key(redis_client: Redis, *, key: str, seconds: float) -> None:
+    """Block ``key`` for ``seconds``; an existing longer block is kept."""
+
+    await redis_client.eval(_BLOCK_LUA, 1, key, float(seconds))
+
+
+async def blocked_for(redis_client: Redis, *, key: str) -> float:
+    """Return the seconds until ``key``'s block lifts, or ``0`` when it is not blocked."""
+
+    return max(0.0, float(await redis_client.eval(_BLOCKED_FOR_LUA, 1, key)))
@@ -3,34 +3,98 @@ from __future__ import annotations
 
 import asyncio
 import json
+import re
 import secrets
 from contextlib import suppress
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Iterable, Mapping
+from typing import Any, Collection, Iterable, Mapping
 
 from fastapi import WebSocket
 from redis.asyncio import Redis
 from redis.asyncio.client import PubSub
 from redis.exceptions import RedisError
 
+from app.core.config import get_settings
 from app.core.logging import log_warning
 
 
+# Topics scoped to a single user (``notifications:user:<id>``) may only be
+# subscribed to by a connection authenticated as that user.
+_USER_TOPIC_PATTERN = re.compile(r":user:(\d+)$")
+_MAX_SUBSCRIBED_TOPICS = 64
+_MAX_TOPIC_LENGTH = 200
+_CLOSE_TIMEOUT_SECONDS = 1.0
+# Sent to clients dropped for falling behind ("try again later").
+_SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+def user_topic(user_id: int) -> str:
+    """Return the per-user topic every authenticated connection receives."""
+
+    return f"notifications:user:{int(user_id)}"
+
+
+def _normalise_topics(topics: Iterable[Any]) -> list[str]:
+    topic_list: list[str] = []
+    seen: set[str] = set()
+    for topic in topics:
+        if not isinstance(topic, str):
+            continue
+        normalised = topic.strip()
+        if not normalised:
+            continue
+        lowered = normalised.lower()
+        if lowered in seen:
+            continue
+        seen.add(lowered)
+        topic_list.append(lowered)
+    return topic_list
+
+
 @dataclass(slots=True)
 class BroadcastResult:
-    """Summary of a broadcast operation."""
+    """Summary of a broadcast operation.
+
+    ``delivered`` counts connections the event was queued for; sending happens
+    on each connection's own task.  ``dropped`` counts connections removed
+    because their send queue was full.
+    """
 
     attempted: int
     delivered: int
     dropped: int
 
 
+@dataclass(slots=True, eq=False)
+class _Subscriber:
+    websocket: WebSocket
+    queue: asyncio.Queue[str]
+    user_id: int | None = None
+    # ``None`` until the client subscribes: such connections receive every
+    # event, which keeps clients that predate topic subscriptions working.
+    topics: set[str] | None = None
+    task: asyncio.Task[None] | None = None
+    evicted: bool = False
+
+
 class RefreshNotifier:
-    """Track websocket connections and broadcast refresh instructions."""
+    """Track websocket connections and broadcast refresh instructions.
+
+    Clients subscribe to topics by sending
+    ``{"type": "subscribe", "topics": [...]}`` (and ``"unsubscribe"``) over
+    the socket.  Events carrying topics are only queued for connections
+    subscribed to at least one of them; events without topics go to every
+    connection.  Each connection has a bounded send queue drained by its own
+    task, so a slow client never delays the others and is disconnected once
+    its queue fills up.
+    """
 
-    def __init__(self) -> None:
-        self._connections: set[WebSocket] = set()
+    def __init__(self, *, send_queue_size: int = 32) -> None:
+        self._subscribers: dict[WebSocket, _Subscriber] = {}
+        self._topic_index: dict[str, set[_Subscriber]] = {}
+        self._wildcard: set[_Subscriber] = set()
+        self._send_queue_size = max(1, int(send_queue_size))
         self._lock = asyncio.Lock()
         self._redis: Redis | None = None
         self._pubsub: PubSub | None = None
@@ -68,35 +132,185 @@ class RefreshNotifier:
                 pass
             self._pubsub = None
 
-    async def connect(self, websocket: WebSocket) -> None:
-        """Accept a websocket and track it for future broadcasts."""
+    async def connect(self, websocket: WebSocket, *, user_id: int | None = None) -> None:
+        """Accept a websocket and track it for future broadcasts.
+
+        Authenticated connections pass ``user_id`` so they can receive their
+        own :func:`user_topic` events.
+        """
 
         await websocket.accept()
+        subscriber = _Subscriber(
+            websocket=websocket,
+            queue=asyncio.Queue(maxsize=self._send_queue_size),
+            user_id=user_id,
+        )
         async with self._lock:
-            self._connections.add(websocket)
+            self._subscribers[websocket] = subscriber
+            self._wildcard.add(subscriber)
+        subscriber.task = asyncio.create_task(self._drain(subscriber))
 
     async def disconnect(self, websocket: WebSocket) -> None:
         """Stop tracking the supplied websocket connection."""
 
         async with self._lock:
-            self._connections.discard(websocket)
+            subscriber = self._remove(websocket)
+        if subscriber is not None and subscriber.task is not None:
+            subscriber.task.cancel()
+
+    async def subscribe(self, websocket: WebSocket, topics: Iterable[Any]) -> list[str]:
+        """Add ``topics`` to a connection's subscriptions.
+
+        Returns the topics the connection is now subscribed to.  The first
+        call naming a topic switches the connection from receiving every event
+        to receiving only its subscribed topics (plus untargeted events); an
+        empty subscription leaves it receiving everything.
+        """
+
+        requested = _normalise_topics(topics)
+        async with self._lock:
+            subscriber = self._subscribers.get(websocket)
+            if subscriber is None:
+                return []
+            if subscriber.topics is None:
+                if not requested:
+                    return []
+                self._wildcard.discard(subscriber)
+                subscriber.topics = set()
+                if subscriber.user_id is not None:
+                    self._index(subscriber, user_topic(subscriber.user_id))
+            for topic in requested:
+                if len(subscriber.topics) >= _MAX_SUBSCRIBED_TOPICS:
+                    break
+                if len(topic) > _MAX_TOPIC_LENGTH or not self._may_subscribe(subscriber, topic):
+                    continue
+                self._index(subscriber, topic)
+            return sorted(subscriber.topics)
+
+    async def unsubscribe(self, websocket: WebSocket, topics: Iterable[Any]) -> list[str]:
+        """Remove ``topics`` from a connection's subscriptions."""
+
+        async with self._lock:
+            subscriber = self._subscribers.get(websocket)
+            if subscriber is None or subscriber.topics is None:
+                return []
+            for topic in _normalise_topics(topics):
+                self._unindex(subscriber, topic)
+            return sorted(subscriber.topics)
+
+    async def handle_client_message(self, websocket: WebSocket, message: str) -> None:
+        """Apply a subscription message received from a client.
+
+        Anything that is not a well-formed subscribe/unsubscribe message is
+        ignored so keep-alive pings and older clients need no special casing.
+        """
+
+        try:
+            parsed = json.loads(message)
+        except (TypeError, ValueError):
+            return
+        if not isinstance(parsed, dict):
+            return
+        topics = parsed.get("topics")
+        if not isinstance(topics, list):
+            return
+        action = parsed.get("type")
+        if action == "subscribe":
+            await self.subscribe(websocket, topics)
+        elif action == "unsubscribe":
+            await self.unsubscribe(websocket, topics)
+
+    @staticmethod
+    def _may_subscribe(subscriber: _Subscriber, topic: str) -> bool:
+        match = _USER_TOPIC_PATTERN.search(topic)
+        if match is None:
+            return True
+        return subscriber.user_id is not None and int(match.group(1)) == subscriber.user_id
+
+    def _index(self, subscriber: _Subscriber, topic: str) -> None:
+        if subscriber.topics is None:
+            subscriber.topics = set()
+        subscriber.topics.add(topic)
+        self._topic_index.setdefault(topic, set()).add(subscriber)
+
+    def _unindex(self, subscriber: _Subscriber, topic: str) -> None:
+        if subscriber.topics is not None:
+            subscriber.topics.discard(topic)
+        members = self._topic_index.get(topic)
+        if members is None:
+            return
+        members.discard(subscriber)
+        if not members:
+            del self._topic_index[topic]
+
+    def _remove(self, websocket: WebSocket) -> _Subscriber | None:
+        """Drop a connection from every index.  Caller must hold the lock."""
+
+        subscriber = self._subscribers.pop(websocket, None)
+        if subscriber is None:
+            return None
+        self._wildcard.discard(subscriber)
+        for topic in list(subscriber.topics or ()):
+            self._unindex(subscriber, topic)
+        return subscriber
+
+    async def _drain(self, subscriber: _Subscriber) -> None:
+        websocket = subscriber.websocket
+        try:
+            while True:
+                message = await subscriber.queue.get()
+                await websocket.send_text(message)
+        except asyncio.CancelledError:
+            if subscriber.evicted:
+                with suppress(Exception):
+                    await asyncio.wait_for(
+                        websocket.close(code=_SLOW_CONSUMER_CLOSE_CODE),
+                        timeout=_CLOSE_TIMEOUT_SECONDS,
+                    )
+            raise
+        except Exception:
+            async with self._lock:
+                self._remove(websocket)
+
+    def _collect_targets(self, topics: Any) -> Collection[_Subscriber]:
+        """Return the connections interested in an event.  Caller must hold the lock."""
+
+        if not isinstance(topics, list) or not topics:
+            return list(self._subscribers.values())
+        targets = set(self._wildcard)
+        for topic in topics:
+            members = self._topic_index.get(topic)
+            if members:
+                targets.update(members)
+        return targets
 
     async def _broadcast_payload(self, payload: Mapping[str, Any]) -> BroadcastResult:
         async with self._lock:
-            targets = list(self._connections)
-        if not targets:
-            return BroadcastResult(attempted=0, delivered=0, dropped=0)
-        delivered = 0
-        dropped = 0
-        for websocket in targets:
-            try:
-                await websocket.send_json(payload)
+            targets = self._collect_targets(payload.get("topics"))
+            if not targets:
+                return BroadcastResult(attempted=0, delivered=0, dropped=0)
+            message = json.dumps(payload)
+            delivered = 0
+            evicted: list[_Subscriber] = []
+            for subscriber in targets:
+                try:
+                    subscriber.queue.put_nowait(message)
+                except asyncio.QueueFull:
+                    evicted.append(subscriber)
+                    continue
                 delivered += 1
-            except Exception:
-                dropped += 1
-                async with self._lock:
-                    self._connections.discard(websocket)
-        return BroadcastResult(attempted=len(targets), delivered=delivered, dropped=dropped)
+            for subscriber in evicted:
+                self._remove(subscriber.websocket)
+        for subscriber in evicted:
+            log_warning(
+                "Dropping slow realtime refresh client",
+                user_id=subscriber.user_id,
+                queued=subscriber.queue.qsize(),
+            )
+            subscriber.evicted = True
+            if subscriber.task is not None:
+                subscriber.task.cancel()
+        return BroadcastResult(attempted=len(targets), delivered=delivered, dropped=len(evicted))
 
     async def broadcast_refresh(
         self,
@@ -105,7 +319,10 @@ class RefreshNotifier:
         topics: Iterable[str] | None = None,
         data: Mapping[str, Any] | None = None,
     ) -> BroadcastResult:
-        """Broadcast a refresh signal to all connected clients."""
+        """Broadcast a refresh signal to the clients subscribed to ``topics``.
+
+        Without ``topics`` the signal goes to every connected client.
+        """
 
         payload: dict[str, Any] = {
             "type": "refresh",
@@ -114,19 +331,7 @@ class RefreshNotifier:
         if reason:
             payload["reason"] = reason
         if topics:
-            topic_list = []
-            seen: set[str] = set()
-            for topic in topics:
-                if not isinstance(topic, str):
-                    continue
-                normalised = topic.strip()
-                if not normalised:
-                    continue
-                lowered = normalised.lower()
-                if lowered in seen:
-                    continue
-                seen.add(lowered)
-                topic_list.append(lowered)
+            topic_list = _normalise_topics(topics)
             if topic_list:
                 payload["topics"] = topic_list
         if data:
@@ -181,4 +386,4 @@ class RefreshNotifier:
                 await self._broadcast_payload(payload)
 
 
-refresh_notifier = RefreshNotifier()
+refresh_notifier = RefreshNotifier(send_queue_size=get_settings().refresh_send_queue_size)
@@ -25,15 +25,22 @@ import csv
 import io
 import json
 import re
+import textwrap
 import xml.etree.ElementTree as ET
+from contextlib import aclosing
 from datetime import date, datetime
 from decimal import Decimal
 from html import escape
-from typing import Any, Iterable, Mapping
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Mapping
 
 from app.core.database import db
 
 MAX_RESULT_ROWS = 5000
+# File exports stream rows straight from the database cursor to the client, so
+# they are capped far higher than the on-screen result table.
+MAX_EXPORT_ROWS = 100_000
+# Rows serialised per chunk written to a streaming response.
+_EXPORT_CHUNK_ROWS = 200
 
 _REDACTED = "[REDACTED]"
 
@@ -308,6 +315,34 @@ async def run_query(sql: str, *, max_rows: int = MAX_RESULT_ROWS) -> dict[str, A
     }
 
 
+async def stream_query(
+    sql: str, *, max_rows: int = MAX_EXPORT_ROWS
+) -> AsyncIterator[dict[str, Any]]:
+    """Validate and execute ``sql``, yielding redacted rows in constant memory.
+
+    Validation happens on the first iteration, so callers that need to report
+    errors before committing to a response should pull the first row eagerly.
+    """
+    statement = validate_select_query(sql)
+    sensitive: set[str] | None = None
+    produced = 0
+    async with aclosing(db.stream(statement)) as rows:
+        async for row in rows:
+            if produced >= max_rows:
+                break
+            if sensitive is None:
+                sensitive = {
+                    col for col in row.keys() if _SENSITIVE_COLUMN_PATTERN.search(col)
+                }
+            if sensitive:
+                row = {
+                    key: (_REDACTED if key in sensitive else value)
+                    for key, value in row.items()
+                }
+            yield dict(row)
+            produced += 1
+
+
 async def count_query_rows(sql: str, *, company_id: int | None = None) -> int:
     """Return the number of rows found by a validated reporting query."""
     statement = validate_select_query(
@@ -337,6 +372,19 @@ async def run_query_with_context(
     )
 
 
+def stream_query_with_context(
+    sql: str,
+    *,
+    company_id: int | None = None,
+    max_rows: int = MAX_EXPORT_ROWS,
+) -> AsyncIterator[dict[str, Any]]:
+    """Stream a report query after applying supported context placeholders."""
+    return stream_query(
+        substitute_query_context(sql, company_id=company_id),
+        max_rows=max_rows,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Exporters
 # ---------------------------------------------------------------------------
@@ -388,6 +436,56 @@ def export_json(columns: Iterable[str], rows: Iterable[Mapping[str, Any]]) -> st
     return json.dumps(payload, indent=2, default=str)
 
 
+async def _chunked(
+    rows: AsyncIterable[Mapping[str, Any]],
+) -> AsyncIterator[list[Mapping[str, Any]]]:
+    chunk: list[Mapping[str, Any]] = []
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) >= _EXPORT_CHUNK_ROWS:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def stream_csv(
+    columns: Iterable[str], rows: AsyncIterable[Mapping[str, Any]]
+) -> AsyncIterator[str]:
+    """Streaming counterpart of :func:`export_csv`."""
+    column_list = list(columns)
+    buf = io.StringIO()
+    writer = csv.writer(buf, quoting=csv.QUOTE_MINIMAL)
+    writer.writerow(column_list)
+    yield buf.getvalue()
+    async for chunk in _chunked(rows):
+        buf.seek(0)
+        buf.truncate()
+        for row in chunk:
+            writer.writerow([_coerce_for_export(row.get(col)) for col in column_list])
+        yield buf.getvalue()
+
+
+async def stream_json(
+    columns: Iterable[str], rows: AsyncIterable[Mapping[str, Any]]
+) -> AsyncIterator[str]:
+    """Streaming counterpart of :func:`export_json` with identical output."""
+    column_list = list(columns)
+    separator = "[\n"
+    async for chunk in _chunked(rows):
+        parts: list[str] = []
+        for row in chunk:
+            item = json.dumps(
+                {col: _coerce_for_json(row.get(col)) for col in column_list},
+                indent=2,
+                default=str,
+            )
+            parts.append(separator + textwrap.indent(item, "  "))
+            separator = ",\n"
+        yield "".join(parts)
+    yield "[]" if separator == "[\n" else "\n]"
+
+
 _XML_TAG_RE = re.compile(r"[^A-Za-z0-9_]")
 
 
@@ -413,6 +511,26 @@ def export_xml(columns: Iterable[str], rows: Iterable[Mapping[str, Any]]) -> str
     )
 
 
+async def stream_xml(
+    columns: Iterable[str], rows: AsyncIterable[Mapping[str, Any]]
+) -> AsyncIterator[str]:
+    """Streaming counterpart of :func:`export_xml`."""
+    column_list = list(columns)
+    tag_map = {col: _safe_xml_tag(col) for col in column_list}
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<results>'
+    async for chunk in _chunked(rows):
+        parts: list[str] = []
+        for row in chunk:
+            row_el = ET.Element("row")
+            for col in column_list:
+                cell = ET.SubElement(row_el, tag_map[col])
+                value = row.get(col)
+                cell.text = "" if value is None else str(_coerce_for_export(value))
+            parts.append(ET.tostring(row_el, encoding="unicode"))
+        yield "".join(parts)
+    yield "</results>"
+
+
 def export_html_for_pdf(
     name: str,
     description: str | None,
@@ -0,0 +1,185 @@
+"""Registry of scheduled task commands and their execution limits.
+
+Each command registers a handler together with how many runs of it may
+execute at once in this process, a timeout and an optional resource class
+such as ``m365`` or ``xero``.  Runs of every command in a resource class
+also share that class's semaphore, so per-company tasks for different
+tenants run in parallel while tasks calling the same rate-limited API
+queue behind each other.
+
+Handlers receive a :class:`TaskRun` and report their outcome by setting
+``run.status`` (``succeeded`` unless changed) and ``run.details``.
+"""
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Mapping
+
+from app.core.logging import log_warning
+
+# Generous enough for a full per-company sync; a run past it is cancelled
+# and recorded as failed so it cannot hold its slot indefinitely.
+DEFAULT_TIMEOUT_SECONDS = 3600.0
+
+# Concurrent runs per resource class in one process.  Override with
+# ``SCHEDULER_RESOURCE_LIMITS`` (``m365=6,xero=1``).
+DEFAULT_RESOURCE_LIMITS: dict[str, int] = {
+    "m365": 4,
+    "xero": 2,
+    "tacticalrmm": 2,
+    "syncro": 2,
+    "huntress": 2,
+    "imap": 4,
+}
+
+
+@dataclass(slots=True)
+class TaskRun:
+    task: dict[str, Any]
+    service: Any
+    force_restart: bool = False
+    status: str = "succeeded"
+    details: str | None = None
+
+    @property
+    def task_id(self) -> Any:
+        return self.task.get("id")
+
+    @property
+    def command(self) -> str:
+        return str(self.task.get("command") or "")
+
+
+CommandHandler = Callable[[TaskRun], Awaitable[None]]
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduledCommand:
+    name: str
+    handler: CommandHandler
+    concurrency: int = 1
+    timeout_seconds: float | None = DEFAULT_TIMEOUT_SECONDS
+    resource_class: str | None = None
+
+
+_COMMANDS: dict[str, ScheduledCommand] = {}
+
+
+def scheduled_command(
+    *names: str,
+    concurrency: int = 1,
+    timeout_seconds: float | None = DEFAULT_TIMEOUT_SECONDS,
+    resource_class: str | None = None,
+) -> Callable[[CommandHandler], CommandHandler]:
+    """Register the decorated handler for ``names``.
+
+    A name ending in ``*`` matches every command with that prefix, as in
+    ``imap_sync:*``.
+    """
+
+    def decorator(handler: CommandHandler) -> CommandHandler:
+        for name in names:
+            if name in _COMMANDS:
+                raise ValueError(f"Scheduled command registered twice: {name}")
+            _COMMANDS[name] = ScheduledCommand(
+                name=name,
+                handler=handler,
+                concurrency=max(1, concurrency),
+                timeout_seconds=timeout_seconds,
+                resource_class=resource_class,
+            )
+        return handler
+
+    return decorator
+
+
+def get_command(command: str) -> ScheduledCommand | None:
+    spec = _COMMANDS.get(command)
+    if spec is not None:
+        return spec
+    for name, spec in _COMMANDS.items():
+        if name.endswith("*") and command.startswith(name[:-1]):
+            return spec
+    return None
+
+
+def registered_commands() -> frozenset[str]:
+    return frozenset(_COMMANDS)
+
+
+def parse_resource_limits(value: str | None) -> dict[str, int]:
+    """Parse ``class=limit`` pairs, ignoring malformed entries."""
+
+    limits: dict[str, int] = {}
+    for item in (value or "").split(","):
+        name, _, raw_limit = item.partition("=")
+        name = name.strip()
+        if not name or not raw_limit.strip():
+            continue
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            log_warning("Ignoring invalid scheduler resource limit", entry=item.strip())
+            continue
+        if limit >= 1:
+            limits[name] = limit
+    return limits
+
+
+class _Slot:
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+        self.waiting = 0
+        self.running = 0
+
+    @asynccontextmanager
+    async def hold(self) -> AsyncIterator[None]:
+        self.waiting += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self.semaphore.release()
+
+    def as_dict(self) -> dict[str, int]:
+        return {"limit": self.limit, "running": self.running, "waiting": self.waiting}
+
+
+class CommandLimiter:
+    """Per-command and per-resource-class semaphores for one process."""
+
+    def __init__(self, resource_limits: Mapping[str, int] | None = None) -> None:
+        self._resource_limits = {**DEFAULT_RESOURCE_LIMITS, **(resource_limits or {})}
+        self._commands: dict[str, _Slot] = {}
+        self._resources: dict[str, _Slot] = {}
+
+    @asynccontextmanager
+    async def slot(self, spec: ScheduledCommand) -> AsyncIterator[None]:
+        command_slot = self._commands.get(spec.name)
+        if command_slot is None:
+            command_slot = self._commands[spec.name] = _Slot(spec.concurrency)
+        async with command_slot.hold():
+            if spec.resource_class is None:
+                yield
+                return
+            resource_slot = self._resources.get(spec.resource_class)
+            if resource_slot is None:
+                resource_slot = self._resources[spec.resource_class] = _Slot(
+                    self._resource_limits.get(spec.resource_class, 1)
+                )
+            async with resource_slot.hold():
+                yield
+
+    def stats(self) -> dict[str, dict[str, dict[str, int]]]:
+        return {
+            "commands": {name: slot.as_dict() for name, slot in self._commands.items()},
+            "resources": {name: slot.as_dict() for name, slot in self._resources.items()},
+        }
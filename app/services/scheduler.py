@@ -5,17 +5,21 @@ import json
 import os
 import re
 from asyncio.subprocess import PIPE
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta, timezone
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Awaitable, Callable
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from app.core.config import get_settings
 from app.core.database import db
-from app.core.logging import log_error, log_info
+from app.core.logging import log_error, log_info, log_warning
 from app.repositories import scheduled_tasks as scheduled_tasks_repo
+from app.repositories import scheduler_jobs as scheduler_jobs_repo
 from app.repositories import m365 as m365_repo
 from app.services import asset_importer
 from app.services import automations as automations_service
@@ -26,6 +30,8 @@ from app.services import m365 as m365_service
 from app.services import mac_vendors as mac_vendors_service
 from app.services import modules as modules_service
 from app.services import products as products_service
+from app.services import scheduled_commands
+from app.services.scheduled_commands import CommandLimiter, TaskRun, scheduled_command
 from app.services import staff_importer
 from app.services import (
     staff_onboarding_workflows as staff_onboarding_workflows_service,
@@ -78,6 +84,37 @@ _FEATURE_PACKS_DIR_PREFIX = "app/features/"
 # full-restart upgrade path.
 _PACK_VERSION_RE = re.compile(r"""version\s*=\s*['"]([^'"]+)['"]""")
 
+# Process roles.  ``embedded`` (the default) fires and runs every job in the
+# web process.  With ``SCHEDULER_MODE=external`` web processes run as ``web``
+# and only keep process-local jobs, while ``python -m app.workers.scheduler``
+# runs the ``scheduler`` role, which queues each trigger fire in
+# ``scheduler_jobs`` for the worker processes to claim.
+ROLE_EMBEDDED = "embedded"
+ROLE_WEB = "web"
+ROLE_SCHEDULER = "scheduler"
+
+# System job id -> handler method.  Queued as ``system:<job id>``.
+_SYSTEM_JOB_HANDLERS: dict[str, str] = {
+    "webhook-monitor": "_run_webhook_monitor",
+    "webhook-cleanup": "_run_webhook_cleanup",
+    "automation-runner": "_run_automation_runner",
+    "staff-workflow-due-runner": "_run_staff_workflow_due_runner",
+    "staff-workflow-license-resume-runner": "_run_staff_workflow_license_resume_runner",
+    "service-status-ai-lookup": "_run_service_status_ai_lookup",
+    "ticket-shipment-watch-runner": "_run_ticket_shipment_watch_runner",
+    "subscription-renewals": "_run_subscription_renewals",
+    "m365-credential-renewal": "_run_m365_credential_renewal",
+    "huntress-daily-sync": "_run_huntress_daily_sync",
+    "backup-history-seed": "_run_backup_history_seed",
+    "backup-alert-check": "_run_backup_alert_check",
+    "solidtime-reconcile": "_run_solidtime_reconcile",
+}
+
+_FINISHED_JOB_RETENTION_DAYS = 7
+
+# Set while a worker executes a claimed ``scheduler_jobs`` row.
+_QUEUED_RUN: ContextVar[bool] = ContextVar("scheduler_queued_run", default=False)
+
 # Mapping of module slug -> set of scheduled task commands that require that module.
 # Used to filter available commands in the UI and to disable tasks when a module is disabled.
 def _normalise_upgrade_mode(value: str | None) -> str:
@@ -102,6 +139,10 @@ def _truncate_output(payload: str | bytes | None) -> str | None:
     return text[: _OUTPUT_PREVIEW_LIMIT - 1] + "\u2026"
 
 
+def _task_signature(tasks: list[dict[str, Any]]) -> tuple[tuple[int, str], ...]:
+    return tuple(sorted((int(task["id"]), str(task.get("cron"))) for task in tasks))
+
+
 def _normalise_cron_day_field(day_field: str) -> str:
     parts = [part.strip() for part in day_field.split(",")]
     normalised_parts = ["last" if part.upper() == "L" else part for part in parts]
@@ -114,10 +155,37 @@ class SchedulerService:
         self._scheduler = AsyncIOScheduler(timezone=settings.default_timezone)
         self._started = False
         self._refresh_task: asyncio.Task[None] | None = None
+        self._role = ROLE_EMBEDDED
+        self._task_signature: tuple[tuple[int, str], ...] | None = None
+        self._command_limiter = CommandLimiter(
+            scheduled_commands.parse_resource_limits(
+                settings.scheduler_resource_limits
+            )
+        )
 
-    async def start(self) -> None:
+    @property
+    def role(self) -> str:
+        return self._role
+
+    def command_stats(self) -> dict[str, dict[str, dict[str, int]]]:
+        """Running and waiting scheduled task runs per command and resource class."""
+        return self._command_limiter.stats()
+
+    async def start(self, *, role: str | None = None) -> None:
+        """Start evaluating triggers for this process's ``role``.
+
+        Without an explicit role, web processes run ``embedded`` or, with
+        ``SCHEDULER_MODE=external``, ``web``.
+        """
         if self._started:
             return
+        if role is None:
+            role = (
+                ROLE_WEB
+                if get_settings().scheduler_mode == "external"
+                else ROLE_EMBEDDED
+            )
+        self._role = role
         self._scheduler.start()
         self._started = True
         await self._ensure_monitoring_jobs()
@@ -135,16 +203,21 @@ class SchedulerService:
     async def refresh(self) -> None:
         if not self._started:
             return
+        if self._role == ROLE_WEB:
+            # The scheduler process notices task edits on its next
+            # ``scheduler-task-sync`` poll.
+            return
         for job in list(self._scheduler.get_jobs()):
             if job.id and job.id.startswith("scheduled-task-"):
                 job.remove()
         tasks = await scheduled_tasks_repo.list_active_tasks()
+        self._task_signature = _task_signature(tasks)
         for task in tasks:
             trigger = self._build_trigger(task)
             if not trigger:
                 continue
             self._scheduler.add_job(
-                self._run_task,
+                self._enqueue_task if self._role == ROLE_SCHEDULER else self._run_task,
                 trigger=trigger,
                 args=[task],
                 id=f"scheduled-task-{task['id']}",
@@ -185,9 +258,30 @@ class SchedulerService:
     async def _ensure_monitoring_jobs(self) -> None:
         if not self._started:
             return
+        if self._role != ROLE_WEB:
+            await self._ensure_system_jobs()
+        if self._role == ROLE_SCHEDULER:
+            self._ensure_queue_jobs()
+            return
+        # Poll the feature-pack reload flag written by scripts/upgrade.sh
+        # when it pulls a pack-only diff. Reloads the listed packs
+        # in-process so the running app picks up the new code without
+        # restarting. See ``_consume_feature_pack_reload_flag``.
+        if not self._scheduler.get_job("feature-pack-reload-flag"):
+            self._scheduler.add_job(
+                self._consume_feature_pack_reload_flag,
+                "interval",
+                seconds=30,
+                id="feature-pack-reload-flag",
+                replace_existing=True,
+                coalesce=True,
+                max_instances=1,
+            )
+
+    async def _ensure_system_jobs(self) -> None:
         if not self._scheduler.get_job("webhook-monitor"):
             self._scheduler.add_job(
-                self._run_webhook_monitor,
+                self._system_job("webhook-monitor"),
                 "interval",
                 seconds=60,
                 id="webhook-monitor",
@@ -197,7 +291,7 @@ class SchedulerService:
             )
         if not self._scheduler.get_job("webhook-cleanup"):
             self._scheduler.add_job(
-                self._run_webhook_cleanup,
+                self._system_job("webhook-cleanup"),
                 "interval",
                 hours=1,
                 id="webhook-cleanup",
@@ -207,7 +301,7 @@ class SchedulerService:
             )
         if not self._scheduler.get_job("automation-runner"):
             self._scheduler.add_job(
-                self._run_automation_runner,
+                self._system_job("automation-runner"),
                 "interval",
                 seconds=60,
                 id="automation-runner",
@@ -217,7 +311,7 @@ class SchedulerService:
             )
         if not self._scheduler.get_job("staff-workflow-due-runner"):
             self._scheduler.add_job(
-                self._run_staff_workflow_due_runner,
+                self._system_job("staff-workflow-due-runner"),
                 "interval",
                 seconds=60,
                 id="staff-workflow-due-runner",
@@ -227,7 +321,7 @@ class SchedulerService:
             )
         if not self._scheduler.get_job("staff-workflow-license-resume-runner"):
             self._scheduler.add_job(
-                self._run_staff_workflow_license_resume_runner,
+                self._system_job("staff-workflow-license-resume-runner"),
                 "interval",
                 seconds=60,
                 id="staff-workflow-license-resume-runner",
@@ -237,7 +331,7 @@ class SchedulerService:
             )
         if not self._scheduler.get_job("service-status-ai-lookup"):
             self._scheduler.add_job(
-                self._run_service_status_ai_lookup,
+                self._system_job("service-status-ai-lookup"),
                 "interval",
                 seconds=60,
                 id="service-status-ai-lookup",
@@ -247,7 +341,7 @@ class SchedulerService:
             )
         if not self._scheduler.get_job("ticket-shipment-watch-runner"):
             self._scheduler.add_job(
-                self._run_ticket_shipment_watch_runner,
+                self._system_job("ticket-shipment-watch-runner"),
                 "interval",
                 seconds=60,
                 id="ticket-shipment-watch-runner",
@@ -258,7 +352,7 @@ class SchedulerService:
         # Run subscription renewal job daily at 02:00 (store timezone)
         if not self._scheduler.get_job("subscription-renewals"):
             self._scheduler.add_job(
-                self._run_subscription_renewals,
+                self._system_job("subscription-renewals"),
                 CronTrigger(hour=2, minute=0, timezone=self._scheduler.timezone),
                 id="subscription-renewals",
                 replace_existing=True,
@@ -268,7 +362,7 @@ class SchedulerService:
         # Run M365 credential renewal check daily at 03:00
         if not self._scheduler.get_job("m365-credential-renewal"):
             self._scheduler.add_job(
-                self._run_m365_credential_renewal,
+                self._system_job("m365-credential-renewal"),
                 CronTrigger(hour=3, minute=0, timezone=self._scheduler.timezone),
                 id="m365-credential-renewal",
                 replace_existing=True,
@@ -279,7 +373,7 @@ class SchedulerService:
         # SAT / SIEM / SOC stats for every company linked to a Huntress org.
         if not self._scheduler.get_job("huntress-daily-sync"):
             self._scheduler.add_job(
-                self._run_huntress_daily_sync,
+                self._system_job("huntress-daily-sync"),
                 CronTrigger(hour=4, minute=0, timezone=self._scheduler.timezone),
                 id="huntress-daily-sync",
                 replace_existing=True,
@@ -290,7 +384,7 @@ class SchedulerService:
         # missing reports remain visible. Runs at 00:05 store-local time.
         if not self._scheduler.get_job("backup-history-seed"):
             self._scheduler.add_job(
-                self._run_backup_history_seed,
+                self._system_job("backup-history-seed"),
                 CronTrigger(hour=0, minute=5, timezone=self._scheduler.timezone),
                 id="backup-history-seed",
                 replace_existing=True,
@@ -301,7 +395,7 @@ class SchedulerService:
         # Runs at midnight store-local time (after the seed task at 00:05).
         if not self._scheduler.get_job("backup-alert-check"):
             self._scheduler.add_job(
-                self._run_backup_alert_check,
+                self._system_job("backup-alert-check"),
                 CronTrigger(hour=0, minute=15, timezone=self._scheduler.timezone),
                 id="backup-alert-check",
                 replace_existing=True,
@@ -317,7 +411,7 @@ class SchedulerService:
                 await solidtime_service.get_reconcile_interval_minutes()
             )
             self._scheduler.add_job(
-                self._run_solidtime_reconcile,
+                self._system_job("solidtime-reconcile"),
                 "interval",
                 minutes=solidtime_interval_minutes,
                 id="solidtime-reconcile",
@@ -325,24 +419,123 @@ class SchedulerService:
                 coalesce=True,
                 max_instances=1,
             )
-        # Poll the feature-pack reload flag written by scripts/upgrade.sh
-        # when it pulls a pack-only diff. Reloads the listed packs
-        # in-process so the running app picks up the new code without
-        # restarting. See ``_consume_feature_pack_reload_flag``.
-        if not self._scheduler.get_job("feature-pack-reload-flag"):
+
+    def _ensure_queue_jobs(self) -> None:
+        # Task edits made in web processes cannot call ``refresh()`` here, so
+        # the scheduler process reloads its cron jobs when the set changes.
+        if not self._scheduler.get_job("scheduler-task-sync"):
             self._scheduler.add_job(
-                self._consume_feature_pack_reload_flag,
+                self._sync_task_jobs,
                 "interval",
                 seconds=30,
-                id="feature-pack-reload-flag",
+                id="scheduler-task-sync",
+                replace_existing=True,
+                coalesce=True,
+                max_instances=1,
+            )
+        if not self._scheduler.get_job("scheduler-jobs-prune"):
+            self._scheduler.add_job(
+                self._prune_finished_jobs,
+                "interval",
+                hours=1,
+                id="scheduler-jobs-prune",
                 replace_existing=True,
                 coalesce=True,
                 max_instances=1,
             )
 
+    def _system_job(self, job_id: str) -> Callable[[], Awaitable[None]]:
+        """Return the callable APScheduler fires for system job ``job_id``."""
+        if self._role == ROLE_SCHEDULER:
+            return partial(self._enqueue_system_job, job_id)
+        return getattr(self, _SYSTEM_JOB_HANDLERS[job_id])
+
+    @asynccontextmanager
+    async def _exclusive(self, lock_name: str, *, timeout: int) -> AsyncIterator[bool]:
+        """Hold ``lock_name`` unless this is a queued run.
+
+        A queued run is already exclusive through its ``scheduler_jobs``
+        lease, so it does not pin a connection on ``GET_LOCK`` for its
+        whole duration.
+        """
+        if _QUEUED_RUN.get():
+            yield True
+            return
+        async with db.acquire_lock(lock_name, timeout=timeout) as lock_acquired:
+            yield lock_acquired
+
+    async def _enqueue(
+        self,
+        job_key: str,
+        *,
+        task_id: int | None = None,
+        force_restart: bool = False,
+    ) -> bool:
+        try:
+            queued = await scheduler_jobs_repo.enqueue_job(
+                job_key, task_id=task_id, force_restart=force_restart
+            )
+        except Exception as exc:  # pragma: no cover - defensive logging
+            log_error("Failed to queue scheduler job", job_key=job_key, error=str(exc))
+            return False
+        if not queued:
+            log_info("Scheduler job already queued, skipping", job_key=job_key)
+        return queued
+
+    async def _enqueue_task(self, task: dict[str, Any]) -> None:
+        await self._enqueue(f"task:{task['id']}", task_id=int(task["id"]))
+
+    async def _enqueue_system_job(self, job_id: str) -> None:
+        await self._enqueue(f"system:{job_id}")
+
+    async def _sync_task_jobs(self) -> None:
+        tasks = await scheduled_tasks_repo.list_active_tasks()
+        if _task_signature(tasks) != self._task_signature:
+            await self.refresh()
+
+    async def _prune_finished_jobs(self) -> None:
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+            days=_FINISHED_JOB_RETENTION_DAYS
+        )
+        try:
+            removed = await scheduler_jobs_repo.prune_finished_jobs(older_than=cutoff)
+        except Exception as exc:  # pragma: no cover - defensive logging
+            log_error("Failed to prune scheduler jobs", error=str(exc))
+            return
+        if removed:
+            log_info("Pruned finished scheduler jobs", removed=removed)
+
+    async def run_queued_job(self, job: dict[str, Any]) -> None:
+        """Execute a run claimed from ``scheduler_jobs``.
+
+        Scheduled tasks are re-read so edits made after the run was queued
+        apply.  Errors propagate so the caller can record the run as failed.
+        """
+        job_key = str(job.get("job_key") or "")
+        token = _QUEUED_RUN.set(True)
+        try:
+            if job_key.startswith("task:"):
+                task = await scheduled_tasks_repo.get_task(int(job["task_id"]))
+                force_restart = bool(job.get("force_restart"))
+                if not task or (not task.get("active") and not force_restart):
+                    log_info("Queued scheduled task no longer active", job_key=job_key)
+                    return
+                await self._execute_task(
+                    task, force_restart=force_restart, retry=bool(job.get("resumed"))
+                )
+            elif job_key.startswith("system:"):
+                handler = _SYSTEM_JOB_HANDLERS.get(job_key.removeprefix("system:"))
+                if handler is None:
+                    raise ValueError(f"Unknown system job {job_key}")
+                await getattr(self, handler)()
+            else:
+                raise ValueError(f"Unknown scheduler job {job_key}")
+        finally:
+            _QUEUED_RUN.reset(token)
+
     async def _run_webhook_monitor(self) -> None:
         """Run webhook monitoring with distributed lock to prevent duplicate execution."""
-        async with db.acquire_lock("webhook_monitor", timeout=1) as lock_acquired:
+        async with self._exclusive("webhook_monitor", timeout=1) as lock_acquired:
             if not lock_acquired:
                 log_info("Webhook monitor already running on another worker, skipping")
                 return
@@ -351,7 +544,7 @@ class SchedulerService:
 
     async def _run_webhook_cleanup(self) -> None:
         """Run webhook cleanup with distributed lock to prevent duplicate execution."""
-        async with db.acquire_lock("webhook_cleanup", timeout=1) as lock_acquired:
+        async with self._exclusive("webhook_cleanup", timeout=1) as lock_acquired:
             if not lock_acquired:
                 log_info("Webhook cleanup already running on another worker, skipping")
                 return
@@ -359,7 +552,7 @@ class SchedulerService:
 
     async def _run_automation_runner(self) -> None:
         """Run automation processing with distributed lock to prevent duplicate execution."""
-        async with db.acquire_lock("automation_runner", timeout=1) as lock_acquired:
+        async with self._exclusive("automation_runner", timeout=1) as lock_acquired:
             if not lock_acquired:
                 log_info(
                     "Automation runner already running on another worker, skipping"
@@ -369,7 +562,7 @@ class SchedulerService:
 
     async def _run_staff_workflow_due_runner(self) -> None:
         """Run due approved staff workflow executions with distributed lock."""
-        async with db.acquire_lock(
+        async with self._exclusive(
             "staff_workflow_due_runner", timeout=1
         ) as lock_acquired:
             if not lock_acquired:
@@ -385,7 +578,7 @@ class SchedulerService:
 
     async def _run_staff_workflow_license_resume_runner(self) -> None:
         """Resume paused license-exhausted workflows when capacity becomes available."""
-        async with db.acquire_lock(
+        async with self._exclusive(
             "staff_workflow_license_resume_runner", timeout=1
         ) as lock_acquired:
             if not lock_acquired:
@@ -404,7 +597,7 @@ class SchedulerService:
 
     async def _run_service_status_ai_lookup(self) -> None:
         """Run AI lookups for service status monitors with distributed lock."""
-        async with db.acquire_lock(
+        async with self._exclusive(
             "service_status_ai_lookup", timeout=1
         ) as lock_acquired:
             if not lock_acquired:
@@ -421,7 +614,7 @@ class SchedulerService:
 
     async def _run_ticket_shipment_watch_runner(self) -> None:
         """Poll due ticket shipment watches with distributed lock."""
-        async with db.acquire_lock(
+        async with self._exclusive(
             "ticket_shipment_watch_runner", timeout=1
         ) as lock_acquired:
             if not lock_acquired:
@@ -438,7 +631,7 @@ class SchedulerService:
 
     async def _run_subscription_renewals(self) -> None:
         """Run subscription renewal invoice creation (T-60 job) with distributed lock."""
-        async with db.acquire_lock("subscription_renewals", timeout=5) as lock_acquired:
+        async with self._exclusive("subscription_renewals", timeout=5) as lock_acquired:
             if not lock_acquired:
                 log_info(
                     "Subscription renewals already running on another worker, skipping"
@@ -464,7 +657,7 @@ class SchedulerService:
 
     async def _run_m365_credential_renewal(self) -> None:
         """Renew expiring Microsoft 365 client secrets with distributed lock."""
-        async with db.acquire_lock(
+        async with self._exclusive(
             "m365_credential_renewal", timeout=5
         ) as lock_acquired:
             if not lock_acquired:
@@ -482,7 +675,7 @@ class SchedulerService:
 
     async def _run_huntress_daily_sync(self) -> None:
         """Refresh Huntress snapshots for every linked company."""
-        async with db.acquire_lock("huntress_daily_sync", timeout=5) as lock_acquired:
+        async with self._exclusive("huntress_daily_sync", timeout=5) as lock_acquired:
             if not lock_acquired:
                 log_info(
                     "Huntress daily sync already running on another worker, skipping"
@@ -507,7 +700,7 @@ class SchedulerService:
 
     async def _run_backup_history_seed(self) -> None:
         """Seed daily 'unknown' backup events with distributed lock."""
-        async with db.acquire_lock("backup_history_seed", timeout=5) as lock_acquired:
+        async with self._exclusive("backup_history_seed", timeout=5) as lock_acquired:
             if not lock_acquired:
                 log_info(
                     "Backup history seed already running on another worker, skipping"
@@ -521,7 +714,7 @@ class SchedulerService:
 
     async def _run_backup_alert_check(self) -> None:
         """Check backup alert thresholds and create tickets with distributed lock."""
-        async with db.acquire_lock("backup_alert_check", timeout=5) as lock_acquired:
+        async with self._exclusive("backup_alert_check", timeout=5) as lock_acquired:
             if not lock_acquired:
                 log_info(
                     "Backup alert check already running on another worker, skipping"
@@ -535,7 +728,7 @@ class SchedulerService:
 
     async def _run_solidtime_reconcile(self) -> None:
         """Pull Solidtime project / time entry updates with a distributed lock."""
-        async with db.acquire_lock("solidtime_reconcile", timeout=5) as lock_acquired:
+        async with self._exclusive("solidtime_reconcile", timeout=5) as lock_acquired:
             if not lock_acquired:
                 log_info(
                     "Solidtime reconcile already running on another worker, skipping"
@@ -599,873 +792,106 @@ class SchedulerService:
             if not lock_acquired:
                 # Another worker is already executing this task, skip silently
                 return
+            await self._execute_task(task, force_restart=force_restart)
 
-            # Admission is deliberately inside the execution lock.  A module
-            # can be toggled after scheduler refresh but must never race into
-            # dispatch.
-            for module_slug in modules_for_command(str(command or "")):
-                module = await module_repo.get_module(module_slug)
-                if not module or not module.get("enabled"):
-                    now = datetime.now(timezone.utc)
-                    await scheduled_tasks_repo.record_task_run(
-                        int(task_id), status="skipped", started_at=now,
-                        finished_at=now, duration_ms=0,
-                        details=f"Module '{module_slug}' is disabled",
-                    )
-                    log_info("Scheduled task skipped: module disabled", task_id=task_id, command=command, module=module_slug)
-                    return
+    async def _execute_task(
+        self, task: dict[str, Any], *, force_restart: bool = False, retry: bool = False
+    ) -> None:
+        """Admit, debounce, dispatch and record one run of ``task``.
 
-            if not force_restart:
-                debounce_cutoff = datetime.now(timezone.utc) - timedelta(seconds=55)
-                try:
-                    recently_ran = await scheduled_tasks_repo.has_run_since(
-                        int(task_id), debounce_cutoff
-                    )
-                except Exception as exc:  # pragma: no cover - keep scheduler resilient
-                    recently_ran = False
-                    log_error(
-                        "Scheduled task duplicate-run check failed",
-                        task_id=task_id,
-                        command=command,
-                        error=str(exc),
-                    )
-                if recently_ran:
-                    log_info(
-                        "Skipping duplicate scheduled task fire",
-                        task_id=task_id,
-                        command=command,
-                    )
-                    return
+        Callers provide the exclusivity: :meth:`_run_task` holds the
+        ``scheduled_task_<id>`` lock, and queued runs are exclusive through
+        their ``scheduler_jobs`` lease.  ``retry`` marks a queued run that an
+        earlier worker started but did not finish; it skips the duplicate-fire
+        check, which would otherwise match that worker's recorded attempt.
+        """
+        task_id = task.get("id")
+        command = task.get("command")
 
-            log_info("Running scheduled task", task_id=task_id, command=command)
-            started_at = datetime.now(timezone.utc)
-            status = "succeeded"
-            details: str | None = None
+        # Admission is deliberately checked once the run is exclusive.  A
+        # module can be toggled after scheduler refresh but must never race
+        # into dispatch.
+        for module_slug in modules_for_command(str(command or "")):
+            module = await module_repo.get_module(module_slug)
+            if not module or not module.get("enabled"):
+                now = datetime.now(timezone.utc)
+                await scheduled_tasks_repo.record_task_run(
+                    int(task_id), status="skipped", started_at=now,
+                    finished_at=now, duration_ms=0,
+                    details=f"Module '{module_slug}' is disabled",
+                )
+                log_info("Scheduled task skipped: module disabled", task_id=task_id, command=command, module=module_slug)
+                return
 
+        if not force_restart and not retry:
+            debounce_cutoff = datetime.now(timezone.utc) - timedelta(seconds=55)
             try:
-                if command == "update_mac_vendors":
-                    details = json.dumps(
-                        await mac_vendors_service.update_mac_vendors(), default=str
-                    )
-                elif command == "sync_staff":
-                    company_id = task.get("company_id")
-                    if company_id:
-                        await staff_importer.import_contacts_for_company(
-                            int(company_id)
-                        )
-                elif command == "sync_assets":
-                    company_id = task.get("company_id")
-                    if company_id:
-                        await asset_importer.import_assets_for_company(int(company_id))
-                elif command == "sync_tactical_assets":
-                    company_id = task.get("company_id")
-                    if company_id:
-                        processed = (
-                            await asset_importer.import_tactical_assets_for_company(
-                                int(company_id)
-                            )
-                        )
-                        details = json.dumps(
-                            {"company_id": int(company_id), "processed": processed},
-                            default=str,
-                        )
-                    else:
-                        summary = await asset_importer.import_all_tactical_assets()
-                        details = json.dumps(summary, default=str)
-                elif command == "push_tactical_companies":
-                    summary = await modules_service.push_companies_to_tacticalrmm()
-                    details = json.dumps(summary, default=str)
-                elif command == "pull_tactical_companies":
-                    summary = await modules_service.pull_companies_from_tacticalrmm()
-                    details = json.dumps(summary, default=str)
-                elif command in {"sync_o365", "sync_m365_data"}:
-                    company_id = task.get("company_id")
-                    if company_id:
-                        company_id_int = int(company_id)
-                        licenses_sync_error: str | None = None
-                        staff_summary = None
-                        staff_sync_error: str | None = None
-                        mailboxes_synced = 0
-                        mailbox_sync_error: str | None = None
-                        try:
-                            await m365_service.sync_company_licenses(company_id_int)
-                        except Exception as exc:  # noqa: BLE001
-                            licenses_sync_error = str(exc)
-                        try:
-                            staff_summary = (
-                                await staff_importer.import_m365_contacts_for_company(
-                                    company_id_int
-                                )
-                            )
-                        except Exception as exc:  # noqa: BLE001
-                            staff_sync_error = str(exc)
-                        try:
-                            mailboxes_synced = await m365_service.sync_mailboxes(
-                                company_id_int
-                            )
-                        except Exception as exc:  # noqa: BLE001
-                            mailbox_sync_error = str(exc)
-                        details = json.dumps(
-                            {
-                                "company_id": company_id_int,
-                                "licenses_synced": licenses_sync_error is None,
-                                "licenses_sync_error": licenses_sync_error,
-                                "staff": (
-                                    {
-                                        "created": staff_summary.created,
-                                        "updated": staff_summary.updated,
-                                        "skipped": staff_summary.skipped,
-                                        "removed": staff_summary.removed,
-                                        "total": staff_summary.total,
-                                    }
-                                    if staff_summary is not None
-                                    else None
-                                ),
-                                "staff_sync_error": staff_sync_error,
-                                "mailboxes_synced": mailboxes_synced,
-                                "mailbox_sync_error": mailbox_sync_error,
-                            },
-                            default=str,
-                        )
-                    else:
-                        status = "skipped"
-                        details = "Company context required"
-                elif command == "sync_m365_licenses":
-                    company_id = task.get("company_id")
-                    if company_id:
-                        company_id_int = int(company_id)
-                        try:
-                            await m365_service.sync_company_licenses(company_id_int)
-                            details = json.dumps(
-                                {"company_id": company_id_int, "licenses_synced": True},
-                                default=str,
-                            )
-                        except Exception as exc:  # noqa: BLE001
-                            status = "failed"
-                            details = json.dumps(
-                                {
-                                    "company_id": company_id_int,
-                                    "licenses_synced": False,
-                                    "error": str(exc)
-                                    or f"{type(exc).__name__} (no details)",
-                                },
-                                default=str,
-                            )
-                    else:
-                        status = "skipped"
-                        details = "Company context required"
-                elif command == "sync_m365_contacts":
-                    company_id = task.get("company_id")
-                    if company_id:
-                        company_id_int = int(company_id)
-                        try:
-                            staff_summary = (
-                                await staff_importer.import_m365_contacts_for_company(
-                                    company_id_int
-                                )
-                            )
-                            details = json.dumps(
-                                {
-                                    "company_id": company_id_int,
-                                    "staff": (
-                                        {
-                                            "created": staff_summary.created,
-                                            "updated": staff_summary.updated,
-                                            "skipped": staff_summary.skipped,
-                                            "removed": staff_summary.removed,
-                                            "total": staff_summary.total,
-                                        }
-                                        if staff_summary is not None
-                                        else None
-                                    ),
-                                },
-                                default=str,
-                            )
-                        except Exception as exc:  # noqa: BLE001
-                            status = "failed"
-                            details = json.dumps(
-                                {
-                                    "company_id": company_id_int,
-                                    "staff_sync_error": str(exc)
-                                    or f"{type(exc).__name__} (no details)",
-                                },
-                                default=str,
-                            )
-                    else:
-                        status = "skipped"
-                        details = "Company context required"
-                elif command == "sync_m365_mailboxes":
-                    company_id = task.get("company_id")
-                    if company_id:
-                        company_id_int = int(company_id)
-                        try:
-                            mailboxes_synced = await m365_service.sync_mailboxes(
-                                company_id_int
-                            )
-                            details = json.dumps(
-                                {
-                                    "company_id": company_id_int,
-                                    "mailboxes_synced": mailboxes_synced,
-                                },
-                                default=str,
-                            )
-                        except Exception as exc:  # noqa: BLE001
-                            status = "failed"
-                            error_msg = str(exc) or f"{type(exc).__name__} (no details)"
-                            details = json.dumps(
-                                {
-                                    "company_id": company_id_int,
-                                    "mailboxes_synced": 0,
-                                    "error": error_msg,
-                                },
-                                default=str,
-                            )
-                    else:
-                        status = "skipped"
-                        details = "Company context required"
-                elif command == "sync_m365_email_domains":
-                    company_id = task.get("company_id")
-                    if company_id:
-                        result = await m365_service.sync_email_domains(int(company_id))
-                        details = json.dumps(result, default=str)
-                    else:
-                        status = "skipped"
-                        details = "Company context required"
-                elif command == "sync_to_xero":
-                    company_id = task.get("company_id")
-                    if company_id:
-                        result = await xero_service.sync_company(int(company_id))
-                        if result:
-                            details = json.dumps(result, default=str)
-                            result_status = (
-                                str(
-                                    result.get("status")
-                                    or result.get("event_status")
-                                    or ""
-                                )
-                                .strip()
-                                .lower()
-                            )
-                            if result_status in {"failed", "error", "partial"}:
-                                status = "failed"
-                            elif result_status == "skipped":
-                                status = "skipped"
-                        else:
-                            details = None
-                    else:
-                        status = "skipped"
-                        details = "Company context required"
-                elif command == "sync_to_xero_auto_send":
-                    company_id = task.get("company_id")
-                    if company_id:
-                        result = await xero_service.sync_company(
-                            int(company_id), auto_send=True
-                        )
-                        if result:
-                            details = json.dumps(result, default=str)
-                            result_status = (
-                                str(
-                                    result.get("status")
-                                    or result.get("event_status")
-                                    or ""
-                                )
-                                .strip()
-                                .lower()
-                            )
-                            if result_status in {"failed", "error", "partial"}:
-                                status = "failed"
-                            elif result_status == "skipped":
-                                status = "skipped"
-                        else:
-                            details = None
-                    else:
-                        status = "skipped"
-                        details = "Company context required"
-                elif command == "generate_invoice":
-                    company_id = task.get("company_id")
-                    if company_id:
-                        result = await invoice_generator_service.generate_invoice(
-                            int(company_id)
-                        )
-                        if result:
-                            details = json.dumps(result, default=str)
-                            result_status = (
-                                str(result.get("status") or "").strip().lower()
-                            )
-                            if result_status in {"failed", "error"}:
-                                status = "failed"
-                            elif result_status == "skipped":
-                                status = "skipped"
-                        else:
-                            details = None
-                    else:
-                        status = "skipped"
-                        details = "Company context required"
-                elif command == "unbill_time_entries":
-                    company_id = task.get("company_id")
-                    result = await unbill_time_entries_service.unbill_time_entries(
-                        int(company_id) if company_id else None
-                    )
-                    if result:
-                        details = json.dumps(result, default=str)
-                        result_status = str(result.get("status") or "").strip().lower()
-                        if result_status == "skipped":
-                            status = "skipped"
-                elif command == "refresh_company_ids":
-                    company_id = task.get("company_id")
-                    if company_id:
-                        result = await company_id_lookup.lookup_missing_company_ids(
-                            int(company_id)
-                        )
-                        details = json.dumps(result, default=str) if result else None
-                    else:
-                        result = (
-                            await company_id_lookup.refresh_all_missing_company_ids()
-                        )
-                        details = json.dumps(result, default=str) if result else None
-                elif command == "sync_huntress":
-                    from app.services import huntress as huntress_service
-                    from app.repositories import companies as company_repo
-
-                    company_id = task.get("company_id")
-                    if company_id:
-                        company = await company_repo.get_company_by_id(int(company_id))
-                        if not company:
-                            status = "skipped"
-                            details = "Company not found"
-                        elif not company.get("huntress_organization_id"):
-                            status = "skipped"
-                            details = "Company is not linked to a Huntress organisation"
-                        else:
-                            try:
-                                result = await huntress_service.refresh_company(company)
-                                details = (
-                                    json.dumps(result, default=str) if result else None
-                                )
-                                result_status = str(result.get("status") or "").lower()
-                                if result_status == "failed":
-                                    status = "failed"
-                                elif result_status == "skipped":
-                                    status = "skipped"
-                            except huntress_service.HuntressConfigurationError as exc:
-                                status = "skipped"
-                                details = str(exc)
-                    else:
-                        try:
-                            result = await huntress_service.refresh_all_companies()
-                            details = (
-                                json.dumps(result, default=str) if result else None
-                            )
-                            result_status = str(result.get("status") or "").lower()
-                            if result_status == "skipped":
-                                status = "skipped"
-                            elif result.get("failed"):
-                                # Whole-run is "ok" but individual companies failed; keep ok status
-                                pass
-                        except huntress_service.HuntressConfigurationError as exc:
-                            status = "skipped"
-                            details = str(exc)
-                elif command == "update_products":
-                    await products_service.update_products_from_feed()
-                elif command == "update_stock_feed":
-                    await products_service.update_stock_feed()
-                elif command == "system_update":
-                    output = await self.run_system_update(force_restart=force_restart)
-                    if output:
-                        details = output
-                elif command == "update_tray_icon_installer":
-                    settings = get_settings()
-                    updated_assets = (
-                        await tray_installer_service.fetch_latest_tray_installers(
-                            repo=settings.github_tray_msi_repo,
-                            github_token=settings.github_token,
-                        )
-                    )
-                    details = json.dumps(
-                        {
-                            "repo": settings.github_tray_msi_repo,
-                            "assets": updated_assets,
-                            "updated": any(updated_assets.values()),
-                        },
-                        default=str,
-                    )
-                elif command == "rag_index_start":
-                    active = await rag_index_repo.get_active_job()
-                    if active:
-                        status = "skipped"
-                        details = json.dumps(
-                            {
-                                "active_job_id": active.get("id"),
-                                "active_status": active.get("status"),
-                            },
-                            default=str,
-                        )
-                    else:
-                        job_id = await rag_index_repo.create_job(source_type="all")
-                        await rag_index_repo.update_job(
-                            job_id,
-                            status="running",
-                            message="Indexing started by scheduled task.",
-                            started=True,
-                        )
-                        try:
-                            from app.services import agent as agent_service
-
-                            await agent_service.execute_agent_query(
-                                "",
-                                {"id": 0, "is_super_admin": True},
-                                allow_empty_query=True,
-                                rag_index_job_id=job_id,
-                                cleanup_rag_index=True,
-                            )
-                            final_status = (
-                                "cancelled"
-                                if await rag_index_repo.job_stop_requested(job_id)
-                                else "completed"
-                            )
-                            final_message = (
-                                "Indexing stopped by a scheduled/admin stop request."
-                                if final_status == "cancelled"
-                                else "Indexing completed by scheduled task."
-                            )
-                            await rag_index_repo.update_job(
-                                job_id,
-                                status=final_status,
-                                message=final_message,
-                                finished=True,
-                            )
-                            details = json.dumps(
-                                {"job_id": job_id, "status": final_status}, default=str
-                            )
-                        except Exception as exc:
-                            await rag_index_repo.update_job(
-                                job_id, status="failed", message=str(exc), finished=True
-                            )
-                            raise
-                elif command == "rag_index_stop":
-                    stopped = await rag_index_repo.request_all_active_job_stops()
-                    details = json.dumps({"stop_requests": stopped}, default=str)
-                elif command == "rag_matching_pause":
-                    await rag_relationship_repo.set_matching_paused(True)
-                    details = json.dumps({"paused": True}, default=str)
-                elif command == "rag_matching_resume":
-                    await rag_relationship_repo.set_matching_paused(False)
-                    details = json.dumps({"paused": False}, default=str)
-                elif command == "rag_cleanup_stale_matches":
-                    result = (
-                        await rag_relationship_repo.cleanup_stale_matches_and_decisions()
-                    )
-                    details = json.dumps(result, default=str)
-                elif command == "create_scheduled_ticket":
-                    # Parse JSON payload from task description
-                    task_description = task.get("description") or ""
-                    try:
-                        payload = (
-                            json.loads(task_description) if task_description else {}
-                        )
-                    except json.JSONDecodeError as exc:
-                        status = "failed"
-                        details = f"Invalid JSON payload: {str(exc)}"
-                        log_error(
-                            "Invalid JSON in scheduled ticket creation",
-                            task_id=task_id,
-                            error=str(exc),
-                        )
-                    else:
-                        company_id = task.get("company_id")
-                        render_context: dict[str, Any] = {
-                            "schedule": {
-                                "task_id": task_id,
-                                "task_name": task.get("name"),
-                                "command": command,
-                            }
-                        }
-                        if company_id:
-                            render_context["company_id"] = company_id
-                            render_context["company"] = {"id": company_id}
-
-                        # Render template variables in the payload. Scheduled ticket
-                        # payloads include the task company in context so saved
-                        # report variables such as {{ report.slug.list }} can
-                        # safely use {{current.company}} placeholders.
-                        payload = await value_templates.render_value_async(
-                            payload, context=render_context
-                        )
-
-                        # Extract ticket fields from payload
-                        subject = payload.get("subject", "")
-                        if not subject:
-                            status = "failed"
-                            details = "Missing required field: subject"
-                        else:
-                            try:
-                                company_id = task.get("company_id")
-                                ticket = await tickets_service.create_ticket(
-                                    subject=str(subject),
-                                    description=payload.get("description"),
-                                    company_id=int(company_id) if company_id else None,
-                                    requester_id=(
-                                        int(payload.get("requester_id"))
-                                        if payload.get("requester_id")
-                                        else None
-                                    ),
-                                    assigned_user_id=(
-                                        int(payload.get("assigned_user_id"))
-                                        if payload.get("assigned_user_id")
-                                        else None
-                                    ),
-                                    priority=str(payload.get("priority", "normal")),
-                                    status=(
-                                        str(payload.get("status"))
-                                        if payload.get("status")
-                                        else None
-                                    ),
-                                    category=(
-                                        str(payload.get("category"))
-                                        if payload.get("category")
-                                        else None
-                                    ),
-                                    module_slug=(
-                                        str(payload.get("module_slug"))
-                                        if payload.get("module_slug")
-                                        else None
-                                    ),
-                                    external_reference=(
-                                        str(payload.get("external_reference"))
-                                        if payload.get("external_reference")
-                                        else None
-                                    ),
-                                    trigger_automations=False,  # Prevent automation loops
-                                )
-                                ticket_id = ticket.get("id") if ticket else None
-                                ticket_number = ticket.get("number") if ticket else None
-                                details = json.dumps(
-                                    {
-                                        "ticket_id": ticket_id,
-                                        "ticket_number": ticket_number,
-                                        "subject": subject,
-                                    },
-                                    default=str,
-                                )
-                                log_info(
-                                    "Scheduled ticket created",
-                                    task_id=task_id,
-                                    ticket_id=ticket_id,
-                                    ticket_number=ticket_number,
-                                )
-                            except Exception as ticket_exc:
-                                status = "failed"
-                                details = f"Ticket creation failed: {str(ticket_exc)}"
-                                log_error(
-                                    "Failed to create scheduled ticket",
-                                    task_id=task_id,
-                                    error=str(ticket_exc),
-                                )
-                elif isinstance(command, str) and command.startswith("imap_sync:"):
-                    try:
-                        account_id = int(command.split(":", 1)[1])
-                    except (IndexError, ValueError):
-                        status = "skipped"
-                        details = "Invalid IMAP account reference"
-                        log_error(
-                            "Invalid IMAP sync command",
-                            task_id=task_id,
-                            command=command,
-                        )
-                    else:
-                        result = await imap_service.sync_account(account_id)
-                        details = json.dumps(result, default=str) if result else None
-                elif isinstance(command, str) and command.startswith("m365_mail_sync:"):
-                    try:
-                        account_id = int(command.split(":", 1)[1])
-                    except (IndexError, ValueError):
-                        status = "skipped"
-                        details = "Invalid M365 mail account reference"
-                        log_error(
-                            "Invalid M365 mail sync command",
-                            task_id=task_id,
-                            command=command,
-                        )
-                    else:
-                        from app.services import m365_mail as m365_mail_service
-
-                        result = await m365_mail_service.sync_account(account_id)
-                        details = json.dumps(result, default=str) if result else None
-                elif command == "send_price_change_notifications":
-                    result = (
-                        await subscription_price_changes.send_price_change_notifications()
-                    )
-                    details = json.dumps(result, default=str)
-                    log_info("Price change notifications sent", **result)
-                elif command == "apply_scheduled_price_changes":
-                    result = (
-                        await subscription_price_changes.apply_scheduled_price_changes()
-                    )
-                    details = json.dumps(result, default=str)
-                    log_info("Scheduled price changes applied", **result)
-                elif command == "sync_recordings":
-                    from app.services import call_recordings as call_recordings_service
-                    from app.services import modules as modules_service
-
-                    # Get recordings path from module settings
-                    module = await modules_service.get_module(
-                        "call-recordings", redact=False
-                    )
-                    if module and module.get("settings"):
-                        recordings_path = module["settings"].get("recordings_path")
-                        phone_system_type = module["settings"].get("phone_system_type")
-                        if recordings_path:
-                            result = await call_recordings_service.sync_recordings_from_filesystem(
-                                recordings_path,
-                                phone_system_type=phone_system_type,
-                                trusted_base=recordings_path,
-                            )
-                            details = json.dumps(result, default=str)
-                            log_info("Call recordings synced", **result)
-                        else:
-                            status = "skipped"
-                            details = "No recordings path configured in call-recordings module"
-                            log_info("Call recordings sync skipped", reason=details)
-                    else:
-                        status = "skipped"
-                        details = "Call recordings module not configured"
-                        log_info("Call recordings sync skipped", reason=details)
-                elif command == "queue_transcriptions":
-                    from app.services import call_recordings as call_recordings_service
-
-                    result = (
-                        await call_recordings_service.queue_pending_transcriptions()
-                    )
-                    details = json.dumps(result, default=str)
-                    log_info("Transcriptions queued", **result)
-                elif command == "process_transcription":
-                    from app.services import call_recordings as call_recordings_service
-
-                    result = (
-                        await call_recordings_service.process_queued_transcriptions()
-                    )
-                    details = json.dumps(result, default=str)
-                    if result.get("status") == "error":
-                        status = "failed"
-                    log_info("Transcription processed", **result)
-                elif command == "sync_unifi_talk_recordings":
-                    result = await modules_service.trigger_module(
-                        "unifi-talk", {}, background=False
-                    )
-                    details = json.dumps(result, default=str)
-                    module_status = str(result.get("status") or "").lower()
-                    if module_status == "error":
-                        status = "failed"
-                    elif module_status == "skipped":
-                        status = "skipped"
-                    log_info("Unifi Talk recordings sync completed", **result)
-                elif command == "bcp_notify_upcoming_training":
-                    # Notify about upcoming BCP training sessions
-                    from app.repositories import bcp as bcp_repo
-                    from app.repositories import notifications as notifications_repo
-
-                    # Get training items in the next 7 days (configurable via task description)
-                    task_description = task.get("description") or ""
-                    try:
-                        config = (
-                            json.loads(task_description) if task_description else {}
-                        )
-                        days_ahead = config.get("days_ahead", 7)
-                    except json.JSONDecodeError:
-                        days_ahead = 7
-
-                    upcoming = await bcp_repo.get_upcoming_training_items(
-                        days_ahead=days_ahead
-                    )
+                recently_ran = await scheduled_tasks_repo.has_run_since(
+                    int(task_id), debounce_cutoff
+                )
+            except Exception as exc:  # pragma: no cover - keep scheduler resilient
+                recently_ran = False
+                log_error(
+                    "Scheduled task duplicate-run check failed",
+                    task_id=task_id,
+                    command=command,
+                    error=str(exc),
+                )
+            if recently_ran:
+                log_info(
+                    "Skipping duplicate scheduled task fire",
+                    task_id=task_id,
+                    command=command,
+                )
+                return
 
-                    if upcoming:
-                        for item in upcoming:
-                            plan = item.get("plan", {})
-                            plan_id = plan.get("id")
-
-                            if plan_id:
-                                # Get distribution list for the plan
-                                await bcp_repo.list_distribution_list(plan_id)
-
-                                # Create notification for each distribution list member
-                                message = f"Upcoming BCP training scheduled for {item['training_date'].strftime('%Y-%m-%d %H:%M')}"
-                                if item.get("training_type"):
-                                    message += f" - {item['training_type']}"
-
-                                # Create notification for all users (could be refined to specific users)
-                                await notifications_repo.create_notification(
-                                    event_type="bcp_training_reminder",
-                                    message=message,
-                                    user_id=None,  # Broadcast to all users
-                                    metadata={
-                                        "plan_id": plan_id,
-                                        "plan_title": plan.get("title"),
-                                        "training_id": item["id"],
-                                        "training_date": item[
-                                            "training_date"
-                                        ].isoformat(),
-                                        "training_type": item.get("training_type"),
-                                    },
-                                )
-
-                        details = json.dumps(
-                            {
-                                "upcoming_training_count": len(upcoming),
-                                "days_ahead": days_ahead,
-                            },
-                            default=str,
-                        )
-                        log_info("BCP training reminders sent", count=len(upcoming))
-                    else:
-                        status = "skipped"
-                        details = f"No upcoming training in next {days_ahead} days"
-                        log_info(
-                            "No upcoming BCP training to notify", days_ahead=days_ahead
-                        )
-                elif command == "bcp_notify_upcoming_review":
-                    # Notify about upcoming BCP plan reviews
-                    from app.repositories import bcp as bcp_repo
-                    from app.repositories import notifications as notifications_repo
-
-                    # Get review items in the next 7 days (configurable via task description)
-                    task_description = task.get("description") or ""
-                    try:
-                        config = (
-                            json.loads(task_description) if task_description else {}
-                        )
-                        days_ahead = config.get("days_ahead", 7)
-                    except json.JSONDecodeError:
-                        days_ahead = 7
-
-                    upcoming = await bcp_repo.get_upcoming_review_items(
-                        days_ahead=days_ahead
-                    )
+        spec = scheduled_commands.get_command(str(command or ""))
+        if spec is None:
+            log_info(
+                "Scheduled task has no handler",
+                task_id=task_id,
+                command=command,
+            )
+            now = datetime.now(timezone.utc)
+            await scheduled_tasks_repo.record_task_run(
+                int(task_id),
+                status="skipped",
+                started_at=now,
+                finished_at=now,
+                duration_ms=0,
+                details="No handler registered for command",
+            )
+            return
 
-                    if upcoming:
-                        for item in upcoming:
-                            plan = item.get("plan", {})
-                            plan_id = plan.get("id")
-
-                            if plan_id:
-                                # Get distribution list for the plan
-                                _unused_distribution_list = (
-                                    await bcp_repo.list_distribution_list(plan_id)
-                                )
-
-                                # Create notification
-                                message = f"Upcoming BCP plan review scheduled for {item['review_date'].strftime('%Y-%m-%d %H:%M')}"
-                                if item.get("reason"):
-                                    message += f" - {item['reason']}"
-
-                                # Create notification for all users (could be refined to specific users)
-                                await notifications_repo.create_notification(
-                                    event_type="bcp_review_reminder",
-                                    message=message,
-                                    user_id=None,  # Broadcast to all users
-                                    metadata={
-                                        "plan_id": plan_id,
-                                        "plan_title": plan.get("title"),
-                                        "review_id": item["id"],
-                                        "review_date": item["review_date"].isoformat(),
-                                        "reason": item.get("reason"),
-                                    },
-                                )
-
-                        details = json.dumps(
-                            {
-                                "upcoming_review_count": len(upcoming),
-                                "days_ahead": days_ahead,
-                            },
-                            default=str,
-                        )
-                        log_info("BCP review reminders sent", count=len(upcoming))
-                    else:
-                        status = "skipped"
-                        details = f"No upcoming reviews in next {days_ahead} days"
-                        log_info(
-                            "No upcoming BCP reviews to notify", days_ahead=days_ahead
-                        )
-                elif command == "refresh_m365_consent_status":
-                    company_id = task.get("company_id")
-                    if company_id:
-                        company_id_int = int(company_id)
-                        try:
-                            results = await m365_service.check_enterprise_app_permissions(
-                                company_id_int
-                            )
-                            all_ok = bool(results) and all(
-                                app.get("all_ok") for app in results
-                            )
-                            details = json.dumps(
-                                {
-                                    "company_id": company_id_int,
-                                    "all_ok": all_ok,
-                                    "apps_checked": len(results),
-                                },
-                                default=str,
-                            )
-                        except Exception as exc:  # noqa: BLE001
-                            status = "failed"
-                            details = json.dumps(
-                                {
-                                    "company_id": company_id_int,
-                                    "error": str(exc)
-                                    or f"{exc.__class__.__name__} (no details)",
-                                },
-                                default=str,
-                            )
-                    else:
-                        provisioned_ids = await m365_repo.list_provisioned_company_ids()
-                        if not provisioned_ids:
-                            status = "skipped"
-                            details = "No provisioned M365 companies found"
-                        else:
-                            company_results: list[dict[str, Any]] = []
-                            any_failed = False
-                            for cid in provisioned_ids:
-                                try:
-                                    cid_results = await m365_service.check_enterprise_app_permissions(
-                                        cid
-                                    )
-                                    cid_all_ok = bool(cid_results) and all(
-                                        app.get("all_ok", False) for app in cid_results
-                                    )
-                                    company_results.append(
-                                        {
-                                            "company_id": cid,
-                                            "all_ok": cid_all_ok,
-                                            "apps_checked": len(cid_results),
-                                        }
-                                    )
-                                except Exception as exc:  # noqa: BLE001
-                                    any_failed = True
-                                    company_results.append(
-                                        {
-                                            "company_id": cid,
-                                            "error": str(exc)
-                                            or f"{exc.__class__.__name__} (no details)",
-                                        }
-                                    )
-                            if any_failed:
-                                status = "failed"
-                            details = json.dumps(
-                                {
-                                    "companies_checked": len(provisioned_ids),
-                                    "results": company_results,
-                                },
-                                default=str,
-                            )
+        run = TaskRun(task, service=self, force_restart=force_restart)
+        async with self._command_limiter.slot(spec):
+            log_info("Running scheduled task", task_id=task_id, command=command)
+            started_at = datetime.now(timezone.utc)
+            try:
+                if spec.timeout_seconds is None:
+                    await spec.handler(run)
                 else:
-                    status = "skipped"
-                    details = "No handler registered for command"
-                    log_info(
-                        "Scheduled task has no handler",
-                        task_id=task_id,
-                        command=command,
+                    await asyncio.wait_for(
+                        spec.handler(run), timeout=spec.timeout_seconds
                     )
+            except asyncio.CancelledError:
+                # Shutdown, not success: a queued run is handed back and retried.
+                run.status = "cancelled"
+                run.details = "Interrupted before it finished"
+                log_warning("Scheduled task cancelled", task_id=task_id, command=command)
+                raise
+            except asyncio.TimeoutError:
+                run.status = "failed"
+                run.details = f"Timed out after {spec.timeout_seconds:g} seconds"
+                log_error(
+                    "Scheduled task timed out",
+                    task_id=task_id,
+                    command=command,
+                    timeout_seconds=spec.timeout_seconds,
+                )
             except Exception as exc:  # pragma: no cover - defensive logging
-                status = "failed"
-                details = str(exc)
+                run.status = "failed"
+                run.details = str(exc)
                 log_error(
                     "Scheduled task failed",
                     task_id=task_id,
@@ -1477,17 +903,22 @@ class SchedulerService:
                 duration_ms = int((finished_at - started_at).total_seconds() * 1000)
                 await scheduled_tasks_repo.record_task_run(
                     int(task_id),
-                    status=status,
+                    status=run.status,
                     started_at=started_at,
                     finished_at=finished_at,
                     duration_ms=duration_ms,
-                    details=details,
+                    details=run.details,
                 )
 
     async def run_now(self, task_id: int) -> None:
         task = await scheduled_tasks_repo.get_task(task_id)
         if not task:
             raise ValueError(f"Task {task_id} not found")
+        if self._role != ROLE_EMBEDDED:
+            await self._enqueue(
+                f"task:{task['id']}", task_id=int(task["id"]), force_restart=True
+            )
+            return
         await self._run_task(task, force_restart=True)
 
     async def run_system_update(self, *, force_restart: bool = False) -> str | None:
@@ -1967,4 +1398,934 @@ class SchedulerService:
         return first_line.split()[0] if first_line.split() else None
 
 
+@scheduled_command("update_mac_vendors")
+async def _command_update_mac_vendors(run: TaskRun) -> None:
+    run.details = json.dumps(
+        await mac_vendors_service.update_mac_vendors(), default=str
+    )
+
+
+@scheduled_command("sync_staff", concurrency=4, resource_class="syncro")
+async def _command_sync_staff(run: TaskRun) -> None:
+    company_id = run.task.get("company_id")
+    if company_id:
+        await staff_importer.import_contacts_for_company(
+            int(company_id)
+        )
+
+
+@scheduled_command("sync_assets", concurrency=4, resource_class="syncro")
+async def _command_sync_assets(run: TaskRun) -> None:
+    company_id = run.task.get("company_id")
+    if company_id:
+        await asset_importer.import_assets_for_company(int(company_id))
+
+
+@scheduled_command("sync_tactical_assets", concurrency=4, resource_class="tacticalrmm")
+async def _command_sync_tactical_assets(run: TaskRun) -> None:
+    company_id = run.task.get("company_id")
+    if company_id:
+        processed = (
+            await asset_importer.import_tactical_assets_for_company(
+                int(company_id)
+            )
+        )
+        run.details = json.dumps(
+            {"company_id": int(company_id), "processed": processed},
+            default=str,
+        )
+    else:
+        summary = await asset_importer.import_all_tactical_assets()
+        run.details = json.dumps(summary, default=str)
+
+
+@scheduled_command("push_tactical_companies", resource_class="tacticalrmm")
+async def _command_push_tactical_companies(run: TaskRun) -> None:
+    summary = await modules_service.push_companies_to_tacticalrmm()
+    run.details = json.dumps(summary, default=str)
+
+
+@scheduled_command("pull_tactical_companies", resource_class="tacticalrmm")
+async def _command_pull_tactical_companies(run: TaskRun) -> None:
+    summary = await modules_service.pull_companies_from_tacticalrmm()
+    run.details = json.dumps(summary, default=str)
+
+
+@scheduled_command("sync_o365", "sync_m365_data", concurrency=4, resource_class="m365")
+async def _command_sync_m365_data(run: TaskRun) -> None:
+    company_id = run.task.get("company_id")
+    if company_id:
+        company_id_int = int(company_id)
+        licenses_sync_error: str | None = None
+        staff_summary = None
+        staff_sync_error: str | None = None
+        mailboxes_synced = 0
+        mailbox_sync_error: str | None = None
+        try:
+            await m365_service.sync_company_licenses(
+                company_id_int, incremental=True
+            )
+        except Exception as exc:  # noqa: BLE001
+            licenses_sync_error = str(exc)
+        try:
+            staff_summary = (
+                await staff_importer.import_m365_contacts_for_company(
+                    company_id_int, incremental=True
+                )
+            )
+        except Exception as exc:  # noqa: BLE001
+            staff_sync_error = str(exc)
+        try:
+            mailboxes_synced = await m365_service.sync_mailboxes(
+                company_id_int
+            )
+        except Exception as exc:  # noqa: BLE001
+            mailbox_sync_error = str(exc)
+        run.details = json.dumps(
+            {
+                "company_id": company_id_int,
+                "licenses_synced": licenses_sync_error is None,
+                "licenses_sync_error": licenses_sync_error,
+                "staff": (
+                    {
+                        "created": staff_summary.created,
+                        "updated": staff_summary.updated,
+                        "skipped": staff_summary.skipped,
+                        "removed": staff_summary.removed,
+                        "total": staff_summary.total,
+                    }
+                    if staff_summary is not None
+                    else None
+                ),
+                "staff_sync_error": staff_sync_error,
+                "mailboxes_synced": mailboxes_synced,
+                "mailbox_sync_error": mailbox_sync_error,
+            },
+            default=str,
+        )
+    else:
+        run.status = "skipped"
+        run.details = "Company context required"
+
+
+@scheduled_command("sync_m365_licenses", concurrency=4, resource_class="m365")
+async def _command_sync_m365_licenses(run: TaskRun) -> None:
+    company_id = run.task.get("company_id")
+    if company_id:
+        company_id_int = int(company_id)
+        try:
+            await m365_service.sync_company_licenses(
+                company_id_int, incremental=True
+            )
+            run.details = json.dumps(
+                {"company_id": company_id_int, "licenses_synced": True},
+                default=str,
+            )
+        except Exception as exc:  # noqa: BLE001
+            run.status = "failed"
+            run.details = json.dumps(
+                {
+                    "company_id": company_id_int,
+                    "licenses_synced": False,
+                    "error": str(exc)
+                    or f"{type(exc).__name__} (no details)",
+                },
+                default=str,
+            )
+    else:
+        run.status = "skipped"
+        run.details = "Company context required"
+
+
+@scheduled_command("sync_m365_contacts", concurrency=4, resource_class="m365")
+async def _command_sync_m365_contacts(run: TaskRun) -> None:
+    company_id = run.task.get("company_id")
+    if company_id:
+        company_id_int = int(company_id)
+        try:
+            staff_summary = (
+                await staff_importer.import_m365_contacts_for_company(
+                    company_id_int, incremental=True
+                )
+            )
+            run.details = json.dumps(
+                {
+                    "company_id": company_id_int,
+                    "staff": (
+                        {
+                            "created": staff_summary.created,
+                            "updated": staff_summary.updated,
+                            "skipped": staff_summary.skipped,
+                            "removed": staff_summary.removed,
+                            "total": staff_summary.total,
+                        }
+                        if staff_summary is not None
+                        else None
+                    ),
+                },
+                default=str,
+            )
+        except Exception as exc:  # noqa: BLE001
+            run.status = "failed"
+            run.details = json.dumps(
+                {
+                    "company_id": company_id_int,
+                    "staff_sync_error": str(exc)
+                    or f"{type(exc).__name__} (no details)",
+                },
+                default=str,
+            )
+    else:
+        run.status = "skipped"
+        run.details = "Company context required"
+
+
+@scheduled_command("sync_m365_mailboxes", concurrency=4, resource_class="m365")
+async def _command_sync_m365_mailboxes(run: TaskRun) -> None:
+    company_id = run.task.get("company_id")
+    if company_id:
+        company_id_int = int(company_id)
+        try:
+            mailboxes_synced = await m365_service.sync_mailboxes(
+                company_id_int
+            )
+            run.details = json.dumps(
+                {
+                    "company_id": company_id_int,
+                    "mailboxes_synced": mailboxes_synced,
+                },
+                default=str,
+            )
+        except Exception as exc:  # noqa: BLE001
+            run.status = "failed"
+            error_msg = str(exc) or f"{type(exc).__name__} (no details)"
+            run.details = json.dumps(
+                {
+                    "company_id": company_id_int,
+                    "mailboxes_synced": 0,
+                    "error": error_msg,
+                },
+                default=str,
+            )
+    else:
+        run.status = "skipped"
+        run.details = "Company context required"
+
+
+@scheduled_command("sync_m365_email_domains", concurrency=4, resource_class="m365")
+async def _command_sync_m365_email_domains(run: TaskRun) -> None:
+    company_id = run.task.get("company_id")
+    if company_id:
+        result = await m365_service.sync_email_domains(int(company_id))
+        run.details = json.dumps(result, default=str)
+    else:
+        run.status = "skipped"
+        run.details = "Company context required"
+
+
+@scheduled_command("sync_to_xero", concurrency=2, resource_class="xero")
+async def _command_sync_to_xero(run: TaskRun) -> None:
+    company_id = run.task.get("company_id")
+    if company_id:
+        result = await xero_service.sync_company(int(company_id))
+        if result:
+            run.details = json.dumps(result, default=str)
+            result_status = (
+                str(
+                    result.get("status")
+                    or result.get("event_status")
+                    or ""
+                )
+                .strip()
+                .lower()
+            )
+            if result_status in {"failed", "error", "partial"}:
+                run.status = "failed"
+            elif result_status == "skipped":
+                run.status = "skipped"
+        else:
+            run.details = None
+    else:
+        run.status = "skipped"
+        run.details = "Company context required"
+
+
+@scheduled_command("sync_to_xero_auto_send", concurrency=2, resource_class="xero")
+async def _command_sync_to_xero_auto_send(run: TaskRun) -> None:
+    company_id = run.task.get("company_id")
+    if company_id:
+        result = await xero_service.sync_company(
+            int(company_id), auto_send=True
+        )
+        if result:
+            run.details = json.dumps(result, default=str)
+            result_status = (
+                str(
+                    result.get("status")
+                    or result.get("event_status")
+                    or ""
+                )
+                .strip()
+                .lower()
+            )
+            if result_status in {"failed", "error", "partial"}:
+                run.status = "failed"
+            elif result_status == "skipped":
+                run.status = "skipped"
+        else:
+            run.details = None
+    else:
+        run.status = "skipped"
+        run.details = "Company context required"
+
+
+@scheduled_command("generate_invoice", concurrency=2, resource_class="xero")
+async def _command_generate_invoice(run: TaskRun) -> None:
+    company_id = run.task.get("company_id")
+    if company_id:
+        result = await invoice_generator_service.generate_invoice(
+            int(company_id)
+        )
+        if result:
+            run.details = json.dumps(result, default=str)
+            result_status = (
+                str(result.get("status") or "").strip().lower()
+            )
+            if result_status in {"failed", "error"}:
+                run.status = "failed"
+            elif result_status == "skipped":
+                run.status = "skipped"
+        else:
+            run.details = None
+    else:
+        run.status = "skipped"
+        run.details = "Company context required"
+
+
+@scheduled_command("unbill_time_entries")
+async def _command_unbill_time_entries(run: TaskRun) -> None:
+    company_id = run.task.get("company_id")
+    result = await unbill_time_entries_service.unbill_time_entries(
+        int(company_id) if company_id else None
+    )
+    if result:
+        run.details = json.dumps(result, default=str)
+        result_status = str(result.get("status") or "").strip().lower()
+        if result_status == "skipped":
+            run.status = "skipped"
+
+
+@scheduled_command("refresh_company_ids", concurrency=2)
+async def _command_refresh_company_ids(run: TaskRun) -> None:
+    company_id = run.task.get("company_id")
+    if company_id:
+        result = await company_id_lookup.lookup_missing_company_ids(
+            int(company_id)
+        )
+        run.details = json.dumps(result, default=str) if result else None
+    else:
+        result = (
+            await company_id_lookup.refresh_all_missing_company_ids()
+        )
+        run.details = json.dumps(result, default=str) if result else None
+
+
+@scheduled_command("sync_huntress", concurrency=2, resource_class="huntress")
+async def _command_sync_huntress(run: TaskRun) -> None:
+    from app.services import huntress as huntress_service
+    from app.repositories import companies as company_repo
+
+    company_id = run.task.get("company_id")
+    if company_id:
+        company = await company_repo.get_company_by_id(int(company_id))
+        if not company:
+            run.status = "skipped"
+            run.details = "Company not found"
+        elif not company.get("huntress_organization_id"):
+            run.status = "skipped"
+            run.details = "Company is not linked to a Huntress organisation"
+        else:
+            try:
+                result = await huntress_service.refresh_company(company)
+                run.details = (
+                    json.dumps(result, default=str) if result else None
+                )
+                result_status = str(result.get("status") or "").lower()
+                if result_status == "failed":
+                    run.status = "failed"
+                elif result_status == "skipped":
+                    run.status = "skipped"
+            except huntress_service.HuntressConfigurationError as exc:
+                run.status = "skipped"
+                run.details = str(exc)
+    else:
+        try:
+            result = await huntress_service.refresh_all_companies()
+            run.details = (
+                json.dumps(result, default=str) if result else None
+            )
+            result_status = str(result.get("status") or "").lower()
+            if result_status == "skipped":
+                run.status = "skipped"
+            elif result.get("failed"):
+                # Whole-run is "ok" but individual companies failed; keep ok status
+                pass
+        except huntress_service.HuntressConfigurationError as exc:
+            run.status = "skipped"
+            run.details = str(exc)
+
+
+@scheduled_command("update_products")
+async def _command_update_products(run: TaskRun) -> None:
+    await products_service.update_products_from_feed()
+
+
+@scheduled_command("update_stock_feed")
+async def _command_update_stock_feed(run: TaskRun) -> None:
+    await products_service.update_stock_feed()
+
+
+@scheduled_command("system_update", timeout_seconds=None)
+async def _command_system_update(run: TaskRun) -> None:
+    output = await run.service.run_system_update(force_restart=run.force_restart)
+    if output:
+        run.details = output
+
+
+@scheduled_command("update_tray_icon_installer")
+async def _command_update_tray_icon_installer(run: TaskRun) -> None:
+    settings = get_settings()
+    updated_assets = (
+        await tray_installer_service.fetch_latest_tray_installers(
+            repo=settings.github_tray_msi_repo,
+            github_token=settings.github_token,
+        )
+    )
+    run.details = json.dumps(
+        {
+            "repo": settings.github_tray_msi_repo,
+            "assets": updated_assets,
+            "updated": any(updated_assets.values()),
+        },
+        default=str,
+    )
+
+
+@scheduled_command("rag_index_start", timeout_seconds=None)
+async def _command_rag_index_start(run: TaskRun) -> None:
+    active = await rag_index_repo.get_active_job()
+    if active:
+        run.status = "skipped"
+        run.details = json.dumps(
+            {
+                "active_job_id": active.get("id"),
+                "active_status": active.get("status"),
+            },
+            default=str,
+        )
+    else:
+        job_id = await rag_index_repo.create_job(source_type="all")
+        await rag_index_repo.update_job(
+            job_id,
+            status="running",
+            message="Indexing started by scheduled task.",
+            started=True,
+        )
+        try:
+            from app.services import agent as agent_service
+
+            await agent_service.execute_agent_query(
+                "",
+                {"id": 0, "is_super_admin": True},
+                allow_empty_query=True,
+                rag_index_job_id=job_id,
+                cleanup_rag_index=True,
+            )
+            final_status = (
+                "cancelled"
+                if await rag_index_repo.job_stop_requested(job_id)
+                else "completed"
+            )
+            final_message = (
+                "Indexing stopped by a scheduled/admin stop request."
+                if final_status == "cancelled"
+                else "Indexing completed by scheduled task."
+            )
+            await rag_index_repo.update_job(
+                job_id,
+                status=final_status,
+                message=final_message,
+                finished=True,
+            )
+            run.details = json.dumps(
+                {"job_id": job_id, "status": final_status}, default=str
+            )
+        except Exception as exc:
+            await rag_index_repo.update_job(
+                job_id, status="failed", message=str(exc), finished=True
+            )
+            raise
+
+
+@scheduled_command("rag_index_stop")
+async def _command_rag_index_stop(run: TaskRun) -> None:
+    stopped = await rag_index_repo.request_all_active_job_stops()
+    run.details = json.dumps({"stop_requests": stopped}, default=str)
+
+
+@scheduled_command("rag_matching_pause")
+async def _command_rag_matching_pause(run: TaskRun) -> None:
+    await rag_relationship_repo.set_matching_paused(True)
+    run.details = json.dumps({"paused": True}, default=str)
+
+
+@scheduled_command("rag_matching_resume")
+async def _command_rag_matching_resume(run: TaskRun) -> None:
+    await rag_relationship_repo.set_matching_paused(False)
+    run.details = json.dumps({"paused": False}, default=str)
+
+
+@scheduled_command("rag_cleanup_stale_matches")
+async def _command_rag_cleanup_stale_matches(run: TaskRun) -> None:
+    result = (
+        await rag_relationship_repo.cleanup_stale_matches_and_decisions()
+    )
+    run.details = json.dumps(result, default=str)
+
+
+@scheduled_command("create_scheduled_ticket", concurrency=4)
+async def _command_create_scheduled_ticket(run: TaskRun) -> None:
+    # Parse JSON payload from task description
+    task_description = run.task.get("description") or ""
+    try:
+        payload = (
+            json.loads(task_description) if task_description else {}
+        )
+    except json.JSONDecodeError as exc:
+        run.status = "failed"
+        run.details = f"Invalid JSON payload: {str(exc)}"
+        log_error(
+            "Invalid JSON in scheduled ticket creation",
+            task_id=run.task_id,
+            error=str(exc),
+        )
+    else:
+        company_id = run.task.get("company_id")
+        render_context: dict[str, Any] = {
+            "schedule": {
+                "task_id": run.task_id,
+                "task_name": run.task.get("name"),
+                "command": run.command,
+            }
+        }
+        if company_id:
+            render_context["company_id"] = company_id
+            render_context["company"] = {"id": company_id}
+
+        # Render template variables in the payload. Scheduled ticket
+        # payloads include the task company in context so saved
+        # report variables such as {{ report.slug.list }} can
+        # safely use {{current.company}} placeholders.
+        payload = await value_templates.render_value_async(
+            payload, context=render_context
+        )
+
+        # Extract ticket fields from payload
+        subject = payload.get("subject", "")
+        if not subject:
+            run.status = "failed"
+            run.details = "Missing required field: subject"
+        else:
+            try:
+                company_id = run.task.get("company_id")
+                ticket = await tickets_service.create_ticket(
+                    subject=str(subject),
+                    description=payload.get("description"),
+                    company_id=int(company_id) if company_id else None,
+                    requester_id=(
+                        int(payload.get("requester_id"))
+                        if payload.get("requester_id")
+                        else None
+                    ),
+                    assigned_user_id=(
+                        int(payload.get("assigned_user_id"))
+                        if payload.get("assigned_user_id")
+                        else None
+                    ),
+                    priority=str(payload.get("priority", "normal")),
+                    status=(
+                        str(payload.get("status"))
+                        if payload.get("status")
+                        else None
+                    ),
+                    category=(
+                        str(payload.get("category"))
+                        if payload.get("category")
+                        else None
+                    ),
+                    module_slug=(
+                        str(payload.get("module_slug"))
+                        if payload.get("module_slug")
+                        else None
+                    ),
+                    external_reference=(
+                        str(payload.get("external_reference"))
+                        if payload.get("external_reference")
+                        else None
+                    ),
+                    trigger_automations=False,  # Prevent automation loops
+                )
+                ticket_id = ticket.get("id") if ticket else None
+                ticket_number = ticket.get("number") if ticket else None
+                run.details = json.dumps(
+                    {
+                        "ticket_id": ticket_id,
+                        "ticket_number": ticket_number,
+                        "subject": subject,
+                    },
+                    default=str,
+                )
+                log_info(
+                    "Scheduled ticket created",
+                    task_id=run.task_id,
+                    ticket_id=ticket_id,
+                    ticket_number=ticket_number,
+                )
+            except Exception as ticket_exc:
+                run.status = "failed"
+                run.details = f"Ticket creation failed: {str(ticket_exc)}"
+                log_error(
+                    "Failed to create scheduled ticket",
+                    task_id=run.task_id,
+                    error=str(ticket_exc),
+                )
+
+
+@scheduled_command("imap_sync:*", concurrency=4, resource_class="imap")
+async def _command_imap_sync(run: TaskRun) -> None:
+    try:
+        account_id = int(run.command.split(":", 1)[1])
+    except (IndexError, ValueError):
+        run.status = "skipped"
+        run.details = "Invalid IMAP account reference"
+        log_error(
+            "Invalid IMAP sync command",
+            task_id=run.task_id,
+            command=run.command,
+        )
+    else:
+        result = await imap_service.sync_account(account_id)
+        run.details = json.dumps(result, default=str) if result else None
+
+
+@scheduled_command("m365_mail_sync:*", concurrency=4, resource_class="m365")
+async def _command_m365_mail_sync(run: TaskRun) -> None:
+    try:
+        account_id = int(run.command.split(":", 1)[1])
+    except (IndexError, ValueError):
+        run.status = "skipped"
+        run.details = "Invalid M365 mail account reference"
+        log_error(
+            "Invalid M365 mail sync command",
+            task_id=run.task_id,
+            command=run.command,
+        )
+    else:
+        from app.services import m365_mail as m365_mail_service
+
+        result = await m365_mail_service.sync_account(account_id)
+        run.details = json.dumps(result, default=str) if result else None
+
+
+@scheduled_command("send_price_change_notifications")
+async def _command_send_price_change_notifications(run: TaskRun) -> None:
+    result = (
+        await subscription_price_changes.send_price_change_notifications()
+    )
+    run.details = json.dumps(result, default=str)
+    log_info("Price change notifications sent", **result)
+
+
+@scheduled_command("apply_scheduled_price_changes")
+async def _command_apply_scheduled_price_changes(run: TaskRun) -> None:
+    result = (
+        await subscription_price_changes.apply_scheduled_price_changes()
+    )
+    run.details = json.dumps(result, default=str)
+    log_info("Scheduled price changes applied", **result)
+
+
+@scheduled_command("sync_recordings")
+async def _command_sync_recordings(run: TaskRun) -> None:
+    from app.services import call_recordings as call_recordings_service
+    from app.services import modules as modules_service
+
+    # Get recordings path from module settings
+    module = await modules_service.get_module(
+        "call-recordings", redact=False
+    )
+    if module and module.get("settings"):
+        recordings_path = module["settings"].get("recordings_path")
+        phone_system_type = module["settings"].get("phone_system_type")
+        if recordings_path:
+            result = await call_recordings_service.sync_recordings_from_filesystem(
+                recordings_path,
+                phone_system_type=phone_system_type,
+                trusted_base=recordings_path,
+            )
+            run.details = json.dumps(result, default=str)
+            log_info("Call recordings synced", **result)
+        else:
+            run.status = "skipped"
+            run.details = "No recordings path configured in call-recordings module"
+            log_info("Call recordings sync skipped", reason=details)
+    else:
+        run.status = "skipped"
+        run.details = "Call recordings module not configured"
+        log_info("Call recordings sync skipped", reason=details)
+
+
+@scheduled_command("queue_transcriptions")
+async def _command_queue_transcriptions(run: TaskRun) -> None:
+    from app.services import call_recordings as call_recordings_service
+
+    result = (
+        await call_recordings_service.queue_pending_transcriptions()
+    )
+    run.details = json.dumps(result, default=str)
+    log_info("Transcriptions queued", **result)
+
+
+@scheduled_command("process_transcription")
+async def _command_process_transcription(run: TaskRun) -> None:
+    from app.services import call_recordings as call_recordings_service
+
+    result = (
+        await call_recordings_service.process_queued_transcriptions()
+    )
+    run.details = json.dumps(result, default=str)
+    if result.get("status") == "error":
+        run.status = "failed"
+    log_info("Transcription processed", **result)
+
+
+@scheduled_command("sync_unifi_talk_recordings")
+async def _command_sync_unifi_talk_recordings(run: TaskRun) -> None:
+    result = await modules_service.trigger_module(
+        "unifi-talk", {}, background=False
+    )
+    run.details = json.dumps(result, default=str)
+    module_status = str(result.get("status") or "").lower()
+    if module_status == "error":
+        run.status = "failed"
+    elif module_status == "skipped":
+        run.status = "skipped"
+    log_info("Unifi Talk recordings sync completed", **result)
+
+
+@scheduled_command("bcp_notify_upcoming_training")
+async def _command_bcp_notify_upcoming_training(run: TaskRun) -> None:
+    # Notify about upcoming BCP training sessions
+    from app.repositories import bcp as bcp_repo
+    from app.repositories import notifications as notifications_repo
+
+    # Get training items in the next 7 days (configurable via task description)
+    task_description = run.task.get("description") or ""
+    try:
+        config = (
+            json.loads(task_description) if task_description else {}
+        )
+        days_ahead = config.get("days_ahead", 7)
+    except json.JSONDecodeError:
+        days_ahead = 7
+
+    upcoming = await bcp_repo.get_upcoming_training_items(
+        days_ahead=days_ahead
+    )
+
+    if upcoming:
+        for item in upcoming:
+            plan = item.get("plan", {})
+            plan_id = plan.get("id")
+
+            if plan_id:
+                # Get distribution list for the plan
+                await bcp_repo.list_distribution_list(plan_id)
+
+                # Create notification for each distribution list member
+                message = f"Upcoming BCP training scheduled for {item['training_date'].strftime('%Y-%m-%d %H:%M')}"
+                if item.get("training_type"):
+                    message += f" - {item['training_type']}"
+
+                # Create notification for all users (could be refined to specific users)
+                await notifications_repo.create_notification(
+                    event_type="bcp_training_reminder",
+                    message=message,
+                    user_id=None,  # Broadcast to all users
+                    metadata={
+                        "plan_id": plan_id,
+                        "plan_title": plan.get("title"),
+                        "training_id": item["id"],
+                        "training_date": item[
+                            "training_date"
+                        ].isoformat(),
+                        "training_type": item.get("training_type"),
+                    },
+                )
+
+        run.details = json.dumps(
+            {
+                "upcoming_training_count": len(upcoming),
+                "days_ahead": days_ahead,
+            },
+            default=str,
+        )
+        log_info("BCP training reminders sent", count=len(upcoming))
+    else:
+        run.status = "skipped"
+        run.details = f"No upcoming training in next {days_ahead} days"
+        log_info(
+            "No upcoming BCP training to notify", days_ahead=days_ahead
+        )
+
+
+@scheduled_command("bcp_notify_upcoming_review")
+async def _command_bcp_notify_upcoming_review(run: TaskRun) -> None:
+    # Notify about upcoming BCP plan reviews
+    from app.repositories import bcp as bcp_repo
+    from app.repositories import notifications as notifications_repo
+
+    # Get review items in the next 7 days (configurable via task description)
+    task_description = run.task.get("description") or ""
+    try:
+        config = (
+            json.loads(task_description) if task_description else {}
+        )
+        days_ahead = config.get("days_ahead", 7)
+    except json.JSONDecodeError:
+        days_ahead = 7
+
+    upcoming = await bcp_repo.get_upcoming_review_items(
+        days_ahead=days_ahead
+    )
+
+    if upcoming:
+        for item in upcoming:
+            plan = item.get("plan", {})
+            plan_id = plan.get("id")
+
+            if plan_id:
+                # Get distribution list for the plan
+                _unused_distribution_list = (
+                    await bcp_repo.list_distribution_list(plan_id)
+                )
+
+                # Create notification
+                message = f"Upcoming BCP plan review scheduled for {item['review_date'].strftime('%Y-%m-%d %H:%M')}"
+                if item.get("reason"):
+                    message += f" - {item['reason']}"
+
+                # Create notification for all users (could be refined to specific users)
+                await notifications_repo.create_notification(
+                    event_type="bcp_review_reminder",
+                    message=message,
+                    user_id=None,  # Broadcast to all users
+                    metadata={
+                        "plan_id": plan_id,
+                        "plan_title": plan.get("title"),
+                        "review_id": item["id"],
+                        "review_date": item["review_date"].isoformat(),
+                        "reason": item.get("reason"),
+                    },
+                )
+
+        run.details = json.dumps(
+            {
+                "upcoming_review_count": len(upcoming),
+                "days_ahead": days_ahead,
+            },
+            default=str,
+        )
+        log_info("BCP review reminders sent", count=len(upcoming))
+    else:
+        run.status = "skipped"
+        run.details = f"No upcoming reviews in next {days_ahead} days"
+        log_info(
+            "No upcoming BCP reviews to notify", days_ahead=days_ahead
+        )
+
+
+@scheduled_command("refresh_m365_consent_status", concurrency=4, resource_class="m365")
+async def _command_refresh_m365_consent_status(run: TaskRun) -> None:
+    company_id = run.task.get("company_id")
+    if company_id:
+        company_id_int = int(company_id)
+        try:
+            results = await m365_service.check_enterprise_app_permissions(
+                company_id_int
+            )
+            all_ok = bool(results) and all(
+                app.get("all_ok") for app in results
+            )
+            run.details = json.dumps(
+                {
+                    "company_id": company_id_int,
+                    "all_ok": all_ok,
+                    "apps_checked": len(results),
+                },
+                default=str,
+            )
+        except Exception as exc:  # noqa: BLE001
+            run.status = "failed"
+            run.details = json.dumps(
+                {
+                    "company_id": company_id_int,
+                    "error": str(exc)
+                    or f"{exc.__class__.__name__} (no details)",
+                },
+                default=str,
+            )
+    else:
+        provisioned_ids = await m365_repo.list_provisioned_company_ids()
+        if not provisioned_ids:
+            run.status = "skipped"
+            run.details = "No provisioned M365 companies found"
+        else:
+            company_results: list[dict[str, Any]] = []
+            any_failed = False
+            for cid in provisioned_ids:
+                try:
+                    cid_results = await m365_service.check_enterprise_app_permissions(
+                        cid
+                    )
+                    cid_all_ok = bool(cid_results) and all(
+                        app.get("all_ok", False) for app in cid_results
+                    )
+                    company_results.append(
+                        {
+                            "company_id": cid,
+                            "all_ok": cid_all_ok,
+                            "apps_checked": len(cid_results),
+                        }
+                    )
+                except Exception as exc:  # noqa: BLE001
+                    any_failed = True
+                    company_results.append(
+                        {
+                            "company_id": cid,
+                            "error": str(exc)
+                            or f"{exc.__class__.__name__} (no details)",
+                        }
+                    )
+            if any_failed:
+                run.status = "failed"
+            run.details = json.dumps(
+                {
+                    "companies_checked": len(provisioned_ids),
+                    "results": company_results,
+                },
+                default=str,
+            )
+
+
 scheduler_service = SchedulerService()
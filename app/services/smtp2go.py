@@ -24,6 +24,7 @@ from loguru import logger
 
 from app.core.config import get_settings
 from app.core.database import db
+from app.services import http_clients
 
 
 class SMTP2GoError(Exception):
@@ -520,7 +521,7 @@ async def send_email_via_api(
         api_url = "https://api.smtp2go.com/v3/email/send"
         
         await require_module_enabled("smtp2go")
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.client("smtp2go") as client:
             response = await client.post(api_url, json=payload)
             
             # Log detailed error information for 400 Bad Request
@@ -45,6 +45,7 @@ from app.repositories import companies as company_repo
 from app.repositories import solidtime_links as links_repo
 from app.repositories import tickets as tickets_repo
 from app.repositories import users as user_repo
+from app.services import http_clients
 from app.services import modules as modules_service
 from app.services import rate_limit_store
 from app.services import webhook_monitor
@@ -417,7 +418,7 @@ async def _request(
         "json": json_body,
     }
     response_headers: Any = None
-    async with httpx.AsyncClient(timeout=timeout) as client:
+    async with http_clients.client("solidtime", timeout=timeout) as client:
         try:
             response = await client.request(
                 method,
@@ -189,131 +189,181 @@ async def _import_from_syncro(company_id: int, syncro_id: str) -> ImportSummary:
     return ImportSummary(company_id=company_id, created=created, updated=updated, skipped=skipped)
 
 
-async def _import_from_m365(company_id: int) -> ImportSummary:
+async def _apply_m365_user(
+    company_id: int,
+    user: dict[str, Any],
+    existing_staff: list[dict[str, Any]],
+) -> tuple[str, str | None]:
+    """Create or update the staff record for one Graph user.
+
+    Returns the outcome (``created``, ``updated`` or ``skipped``) and the
+    user's email address.  Users read without ``signInActivity`` keep their
+    stored last sign-in.
+    """
+    first_name = _normalise(user.get("givenName")) or None
+    last_name = _normalise(user.get("surname")) or None
+    display_name = _normalise(user.get("displayName") or None)
+    if not first_name and not last_name:
+        if display_name:
+            parts = display_name.split()
+            first_name = parts[0]
+            last_name = " ".join(parts[1:]) if len(parts) > 1 else None
+        else:
+            return "skipped", None
+
+    email = _normalise(user.get("mail") or user.get("userPrincipalName")) or None
+    phones = user.get("businessPhones") or []
+    phone = _normalise(user.get("mobilePhone") or (phones[0] if phones else None)) or None
+    street = _normalise(user.get("streetAddress")) or None
+    city = _normalise(user.get("city")) or None
+    state = _normalise(user.get("state")) or None
+    postcode = _normalise(user.get("postalCode")) or None
+    country = _normalise(user.get("country")) or None
+    department = _normalise(user.get("department")) or None
+    job_title = _normalise(user.get("jobTitle")) or None
+    sign_in_activity = user.get("signInActivity") or {}
+    m365_last_sign_in = m365_service.parse_graph_datetime(
+        sign_in_activity.get("lastSignInDateTime")
+    )
+    account_enabled = bool(user.get("accountEnabled", True))
+    is_ex_staff = not account_enabled
+
+    existing = _find_existing_staff(
+        existing_staff,
+        first_name=first_name or "Unknown",
+        last_name=last_name or "",
+        email=email,
+    )
+
+    if existing:
+        await staff_repo.update_staff(
+            existing["id"],
+            company_id=company_id,
+            first_name=first_name or existing.get("first_name", ""),
+            last_name=last_name or existing.get("last_name", ""),
+            email=email or existing.get("email", ""),
+            mobile_phone=phone or existing.get("mobile_phone"),
+            date_onboarded=existing.get("date_onboarded"),
+            date_offboarded=existing.get("date_offboarded"),
+            enabled=account_enabled,
+            is_ex_staff=is_ex_staff,
+            street=street or existing.get("street"),
+            city=city or existing.get("city"),
+            state=state or existing.get("state"),
+            postcode=postcode or existing.get("postcode"),
+            country=country or existing.get("country"),
+            department=department or existing.get("department"),
+            job_title=job_title or existing.get("job_title"),
+            org_company=existing.get("org_company"),
+            manager_name=existing.get("manager_name"),
+            account_action=existing.get("account_action")
+            or _default_account_action(account_enabled=account_enabled),
+            syncro_contact_id=existing.get("syncro_contact_id"),
+            m365_last_sign_in=m365_last_sign_in,
+        )
+        return "updated", email
+
+    created_staff = await staff_repo.create_staff(
+        company_id=company_id,
+        first_name=first_name or "Unknown",
+        last_name=last_name or "",
+        email=email or "",
+        mobile_phone=phone,
+        date_onboarded=None,
+        date_offboarded=None,
+        enabled=account_enabled,
+        is_ex_staff=is_ex_staff,
+        street=street,
+        city=city,
+        state=state,
+        postcode=postcode,
+        country=country,
+        department=department,
+        job_title=job_title,
+        org_company=None,
+        manager_name=None,
+        account_action=_default_account_action(account_enabled=account_enabled),
+        syncro_contact_id=None,
+        source="m365",
+        m365_last_sign_in=m365_last_sign_in,
+    )
+    existing_staff.append(created_staff)
+    return "created", email
+
+
+async def _import_from_m365(company_id: int, *, incremental: bool = False) -> ImportSummary:
+    delta_link: str | None = None
+    if incremental:
+        changes = await m365_service.get_changed_users(
+            company_id, m365_service.STAFF_DELTA_RESOURCE
+        )
+        if changes is not None:
+            return await _import_m365_changes(company_id, changes)
+        delta_link = await m365_service.start_directory_delta(
+            company_id, m365_service.STAFF_DELTA_RESOURCE
+        )
+
     log_info("Starting M365 directory staff import", company_id=company_id)
     users = await m365_service.get_all_users(company_id)
     existing_staff = await staff_repo.list_all_staff_for_import(company_id)
 
-    created = 0
-    updated = 0
-    skipped = 0
+    counts = {"created": 0, "updated": 0, "skipped": 0}
     seen_emails: set[str] = set()
 
     for user in users:
-        first_name = _normalise(user.get("givenName")) or None
-        last_name = _normalise(user.get("surname")) or None
-        display_name = _normalise(user.get("displayName") or None)
-        if not first_name and not last_name:
-            if display_name:
-                parts = display_name.split()
-                first_name = parts[0]
-                last_name = " ".join(parts[1:]) if len(parts) > 1 else None
-            else:
-                skipped += 1
-                continue
-
-        email = _normalise(user.get("mail") or user.get("userPrincipalName")) or None
-        phones = user.get("businessPhones") or []
-        phone = _normalise(user.get("mobilePhone") or (phones[0] if phones else None)) or None
-        street = _normalise(user.get("streetAddress")) or None
-        city = _normalise(user.get("city")) or None
-        state = _normalise(user.get("state")) or None
-        postcode = _normalise(user.get("postalCode")) or None
-        country = _normalise(user.get("country")) or None
-        department = _normalise(user.get("department")) or None
-        job_title = _normalise(user.get("jobTitle")) or None
-        sign_in_activity = user.get("signInActivity") or {}
-        m365_last_sign_in = m365_service.parse_graph_datetime(
-            sign_in_activity.get("lastSignInDateTime")
-        )
-        account_enabled = bool(user.get("accountEnabled", True))
-        is_ex_staff = not account_enabled
-
-        existing = _find_existing_staff(
-            existing_staff,
-            first_name=first_name or "Unknown",
-            last_name=last_name or "",
-            email=email,
-        )
-
+        outcome, email = await _apply_m365_user(company_id, user, existing_staff)
+        counts[outcome] += 1
         if email:
             seen_emails.add(email.lower())
 
-        if existing:
-            await staff_repo.update_staff(
-                existing["id"],
-                company_id=company_id,
-                first_name=first_name or existing.get("first_name", ""),
-                last_name=last_name or existing.get("last_name", ""),
-                email=email or existing.get("email", ""),
-                mobile_phone=phone or existing.get("mobile_phone"),
-                date_onboarded=existing.get("date_onboarded"),
-                date_offboarded=existing.get("date_offboarded"),
-                enabled=account_enabled,
-                is_ex_staff=is_ex_staff,
-                street=street or existing.get("street"),
-                city=city or existing.get("city"),
-                state=state or existing.get("state"),
-                postcode=postcode or existing.get("postcode"),
-                country=country or existing.get("country"),
-                department=department or existing.get("department"),
-                job_title=job_title or existing.get("job_title"),
-                org_company=existing.get("org_company"),
-                manager_name=existing.get("manager_name"),
-                account_action=existing.get("account_action")
-                or _default_account_action(account_enabled=account_enabled),
-                syncro_contact_id=existing.get("syncro_contact_id"),
-                m365_last_sign_in=m365_last_sign_in,
-            )
-            updated += 1
-        else:
-            created_staff = await staff_repo.create_staff(
-                company_id=company_id,
-                first_name=first_name or "Unknown",
-                last_name=last_name or "",
-                email=email or "",
-                mobile_phone=phone,
-                date_onboarded=None,
-                date_offboarded=None,
-                enabled=account_enabled,
-                is_ex_staff=is_ex_staff,
-                street=street,
-                city=city,
-                state=state,
-                postcode=postcode,
-                country=country,
-                department=department,
-                job_title=job_title,
-                org_company=None,
-                manager_name=None,
-                account_action=_default_account_action(account_enabled=account_enabled),
-                syncro_contact_id=None,
-                source="m365",
-                m365_last_sign_in=m365_last_sign_in,
-            )
-            existing_staff.append(created_staff)
-            created += 1
-
     removed = await staff_repo.delete_m365_staff_not_in(company_id, seen_emails)
+    if delta_link:
+        await m365_service.save_directory_delta(
+            company_id, m365_service.STAFF_DELTA_RESOURCE, delta_link, full_sync=True
+        )
 
     log_info(
         "Completed M365 directory staff import",
         company_id=company_id,
-        created=created,
-        updated=updated,
-        skipped=skipped,
         removed=removed,
+        **counts,
+    )
+    return ImportSummary(company_id=company_id, removed=removed, **counts)
+
+
+async def _import_m365_changes(
+    company_id: int, changes: m365_service.DirectoryChanges
+) -> ImportSummary:
+    """Apply the users changed since the last scheduled import.
+
+    Staff are only removed by full imports, which run when Graph reports
+    deleted users.
+    """
+    existing_staff = await staff_repo.list_all_staff_for_import(company_id)
+    counts = {"created": 0, "updated": 0, "skipped": 0}
+    for user in changes.users:
+        outcome, _ = await _apply_m365_user(company_id, user, existing_staff)
+        counts[outcome] += 1
+    await m365_service.save_directory_delta(
+        company_id, m365_service.STAFF_DELTA_RESOURCE, changes.delta_link, full_sync=False
     )
-    return ImportSummary(company_id=company_id, created=created, updated=updated, skipped=skipped, removed=removed)
+    log_info("Completed incremental M365 directory staff import", company_id=company_id, **counts)
+    return ImportSummary(company_id=company_id, **counts)
 
 
-async def import_m365_contacts_for_company(company_id: int) -> ImportSummary:
-    """Import staff from Microsoft 365 only, ignoring any Syncro mapping."""
+async def import_m365_contacts_for_company(
+    company_id: int, *, incremental: bool = False
+) -> ImportSummary:
+    """Import staff from Microsoft 365 only, ignoring any Syncro mapping.
+
+    ``incremental`` applies only the directory changes since the previous
+    incremental or full import when Graph can supply them.
+    """
     m365_creds = await m365_service.get_credentials(company_id)
     if not m365_creds:
         log_info("Skipping M365 staff import: no M365 credentials configured", company_id=company_id)
         return ImportSummary(company_id=company_id, created=0, updated=0, skipped=0)
-    return await _import_from_m365(company_id)
+    return await _import_from_m365(company_id, incremental=incremental)
 
 
 async def import_contacts_for_syncro_id(syncro_company_id: str) -> ImportSummary:
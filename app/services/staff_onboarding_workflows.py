@@ -26,6 +26,7 @@ from app.repositories import tickets as tickets_repo
 from app.repositories import users as user_repo
 from app.services import audit as audit_service
 from app.services import email as email_service
+from app.services import http_clients
 from app.services import m365 as m365_service
 from app.services.m365 import M365Error
 from app.services import notifications as notifications_service
@@ -2131,7 +2132,7 @@ async def _execute_policy_step(
             "@odata.id": f"https://graph.microsoft.com/v1.0/directoryObjects/{encoded_manager_id}"
         }
         headers = {"Authorization": f"Bearer {access_token}"}
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with http_clients.client("m365") as client:
             ref_response = await client.put(ref_url, headers=headers, json=ref_payload)
         if ref_response.status_code not in (200, 204):
             raise WorkflowStepError(
@@ -2466,7 +2467,7 @@ async def _graph_patch(
     access_token: str, url: str, payload: dict[str, Any]
 ) -> dict[str, Any]:
     headers = {"Authorization": f"Bearer {access_token}"}
-    async with httpx.AsyncClient(timeout=30) as client:
+    async with http_clients.client("m365") as client:
         response = await client.patch(url, headers=headers, json=payload)
     if response.status_code not in (200, 204):
         log_error(
@@ -2533,7 +2534,7 @@ async def _graph_post_for_location(
     access_token: str, url: str, payload: dict[str, Any]
 ) -> tuple[dict[str, Any], str | None]:
     headers = {"Authorization": f"Bearer {access_token}"}
-    async with httpx.AsyncClient(timeout=30) as client:
+    async with http_clients.client("m365") as client:
         response = await client.post(url, headers=headers, json=payload)
     if response.status_code not in (200, 201, 202, 204):
         log_error(
@@ -2557,7 +2558,7 @@ async def _wait_for_graph_copy(
     deadline = datetime.now(timezone.utc) + timedelta(seconds=max(1, timeout_seconds))
     headers = {"Authorization": f"Bearer {access_token}"}
     last_payload: dict[str, Any] = {}
-    async with httpx.AsyncClient(timeout=30) as client:
+    async with http_clients.client("m365") as client:
         while datetime.now(timezone.utc) < deadline:
             response = await client.get(monitor_url, headers=headers)
             if response.status_code >= 400:
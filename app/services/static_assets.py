@@ -0,0 +1,260 @@
+"""Content-hashed static assets with precompressed variants.
+
+:func:`build_static_manifest` fingerprints every file under ``app/static``
+(except runtime uploads and tray installers) by a hash of its contents and
+copies it into the static build directory as ``<name>.<hash><ext>``, next to
+``.br`` and ``.gz`` siblings for compressible types.  Copies are
+content-addressed, so a rebuild only writes and compresses files that
+changed.  Each rebuild keeps the copies named by the current and the
+previous manifest, so pages rendered before a deploy can still load their
+assets, and deletes older ones.  :func:`load_static_manifest` returns the
+existing manifest while no source file is newer than it, letting workers
+skip the rebuild after ``scripts/build_static_assets.py`` has run.
+
+``static_url`` in the templates resolves asset paths through the manifest and
+:class:`FingerprintedStaticFiles` serves the hashed copies with
+``Cache-Control: immutable``, picking the precompressed sibling the client
+accepts.  Paths that are not in the manifest are served from ``app/static``
+unchanged.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from app.core.logging import log_info, log_warning
+from app.security.compression import accepted_encodings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional runtime dependency fallback
+    brotli = None
+
+MANIFEST_FILENAME = "manifest.json"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Top-level directories whose contents change at runtime or are served by
+# stable URL (document uploads, tray installers).
+_EXCLUDED_DIRECTORIES = frozenset({"uploads", "tray"})
+# Files that must keep a stable URL.
+_EXCLUDED_FILES = frozenset({"service-worker.js"})
+_COMPRESSIBLE_SUFFIXES = frozenset(
+    {".css", ".js", ".json", ".map", ".svg", ".txt", ".html", ".xml", ".webmanifest"}
+)
+_MIN_COMPRESS_SIZE = 256
+_HASH_LENGTH = 12
+_ENCODING_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+# ``<name>.<hash><ext>`` plus an optional precompressed suffix.
+_FINGERPRINTED_NAME = re.compile(
+    rf"^.+\.[0-9a-f]{{{_HASH_LENGTH}}}(?:\.[^.]+)?(?:\.br|\.gz)?$"
+)
+
+
+@dataclass(slots=True)
+class StaticManifest:
+    """Mapping of source asset paths to their fingerprinted copies."""
+
+    assets: dict[str, str] = field(default_factory=dict)
+
+    def hashed_path(self, path: str) -> str | None:
+        """Return the fingerprinted path for ``path`` (relative to ``/static``)."""
+
+        return self.assets.get(path.lstrip("/"))
+
+
+def _fingerprint(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:_HASH_LENGTH]
+
+
+def _iter_assets(static_path: Path):
+    for root, directories, files in os.walk(static_path):
+        relative_root = Path(root).relative_to(static_path)
+        if relative_root == Path("."):
+            directories[:] = [
+                name for name in directories if name not in _EXCLUDED_DIRECTORIES
+            ]
+        directories[:] = [name for name in directories if not name.startswith(".")]
+        for name in files:
+            if name.startswith(".") or name in _EXCLUDED_FILES:
+                continue
+            yield Path(root) / name, PurePosixPath(*relative_root.parts, name)
+
+
+def _write_compressed(target: Path) -> None:
+    variants = [(target.with_name(target.name + ".gz"), _gzip)]
+    if brotli is not None:
+        variants.append((target.with_name(target.name + ".br"), _brotli))
+    missing = [(variant, compress) for variant, compress in variants if not variant.exists()]
+    if not missing:
+        return
+    data = target.read_bytes()
+    for variant, compress in missing:
+        _atomic_write(variant, compress(data))
+
+
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=11)
+
+
+def _temporary_path(target: Path) -> Path:
+    # Per-process name so workers building at the same time never share a file.
+    return target.with_name(f".{target.name}.{os.getpid()}.tmp")
+
+
+def _atomic_write(target: Path, data: bytes) -> None:
+    temporary = _temporary_path(target)
+    temporary.write_bytes(data)
+    os.replace(temporary, target)
+
+
+def _read_manifest(build_path: Path) -> dict[str, str] | None:
+    try:
+        assets = json.loads((build_path / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(assets, dict):
+        return None
+    return {str(key): str(value) for key, value in assets.items()}
+
+
+def load_static_manifest(static_path: Path, build_path: Path) -> StaticManifest | None:
+    """Return the built manifest if it still matches ``static_path``.
+
+    The manifest is current when it lists exactly the assets present and
+    none of them was modified after it was written.  Returns ``None`` when it
+    is missing or stale and :func:`build_static_manifest` has to run.
+    """
+
+    manifest_path = build_path / MANIFEST_FILENAME
+    assets = _read_manifest(build_path)
+    if assets is None:
+        return None
+    try:
+        built_at = manifest_path.stat().st_mtime
+        sources = {str(relative): source for source, relative in _iter_assets(static_path)}
+        if set(sources) != set(assets):
+            return None
+        if any(source.stat().st_mtime > built_at for source in sources.values()):
+            return None
+        if not all(build_path.joinpath(*PurePosixPath(hashed).parts).is_file() for hashed in assets.values()):
+            return None
+    except OSError:
+        return None
+    return StaticManifest(assets=assets)
+
+
+def _prune_build(build_path: Path, keep: set[str]) -> int:
+    """Delete fingerprinted copies under ``build_path`` not named in ``keep``."""
+
+    removed = 0
+    for root, _directories, files in os.walk(build_path):
+        relative_root = PurePosixPath(*Path(root).relative_to(build_path).parts)
+        for name in files:
+            if not _FINGERPRINTED_NAME.match(name):
+                continue
+            relative = str(relative_root / name)
+            if relative in keep or any(
+                relative.endswith(suffix) and relative[: -len(suffix)] in keep
+                for _encoding, suffix in _ENCODING_SUFFIXES
+            ):
+                continue
+            try:
+                (Path(root) / name).unlink()
+            except FileNotFoundError:
+                # Another worker pruned it first.
+                continue
+            removed += 1
+    return removed
+
+
+def build_static_manifest(static_path: Path, build_path: Path) -> StaticManifest:
+    """Fingerprint the assets under ``static_path`` into ``build_path``.
+
+    Runs synchronously; call it from a worker thread when the event loop is
+    already running.
+    """
+
+    build_path.mkdir(parents=True, exist_ok=True)
+    previous = _read_manifest(build_path) or {}
+    manifest = StaticManifest()
+    written = 0
+    for source, relative in _iter_assets(static_path):
+        fingerprint = _fingerprint(source)
+        hashed = relative.with_name(f"{relative.stem}.{fingerprint}{relative.suffix}")
+        target = build_path.joinpath(*hashed.parts)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            temporary = _temporary_path(target)
+            shutil.copyfile(source, temporary)
+            os.replace(temporary, target)
+            written += 1
+        if relative.suffix.lower() in _COMPRESSIBLE_SUFFIXES and source.stat().st_size >= _MIN_COMPRESS_SIZE:
+            _write_compressed(target)
+        manifest.assets[str(relative)] = str(hashed)
+    _atomic_write(
+        build_path / MANIFEST_FILENAME,
+        json.dumps(manifest.assets, indent=2, sort_keys=True).encode("utf-8"),
+    )
+    pruned = _prune_build(build_path, set(manifest.assets.values()) | set(previous.values()))
+    log_info(
+        "Static asset manifest built",
+        assets=len(manifest.assets),
+        written=written,
+        pruned=pruned,
+        build_path=str(build_path),
+    )
+    return manifest
+
+
+class FingerprintedStaticFiles(StaticFiles):
+    """Serve fingerprinted assets immutably, falling back to the source directory."""
+
+    def __init__(self, *, directory: str | os.PathLike[str], build_directory: str | os.PathLike[str]) -> None:
+        super().__init__(directory=directory)
+        self.build_directory = Path(build_directory).resolve()
+
+    def _resolve_build_file(self, path: str) -> Path | None:
+        if not path or path == MANIFEST_FILENAME or path.endswith((".br", ".gz")):
+            return None
+        candidate = (self.build_directory / path).resolve()
+        if not candidate.is_relative_to(self.build_directory) or not candidate.is_file():
+            return None
+        return candidate
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        build_file = self._resolve_build_file(path) if scope["method"] in ("GET", "HEAD") else None
+        if build_file is None:
+            return await super().get_response(path, scope)
+
+        headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+        encodings = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        served = build_file
+        for encoding, suffix in _ENCODING_SUFFIXES:
+            variant = build_file.with_name(build_file.name + suffix)
+            if encoding in encodings and variant.is_file():
+                served = variant
+                headers["Content-Encoding"] = encoding
+                break
+        # Name the original type rather than the ``.br``/``.gz`` container.
+        media_type, _ = mimetypes.guess_type(build_file.name)
+        return FileResponse(served, headers=headers, media_type=media_type or "application/octet-stream")
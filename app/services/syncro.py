@@ -14,6 +14,7 @@ from redis.asyncio import Redis
 from redis.exceptions import RedisError
 
 from app.core.logging import log_error, log_info, log_warning
+from app.services import http_clients
 from app.services import webhook_monitor
 from app.services import modules as modules_service
 from app.services import rate_limit_store
@@ -284,7 +285,7 @@ async def _request(
     }
 
     response_headers: Any = None
-    async with httpx.AsyncClient(timeout=timeout) as client:
+    async with http_clients.client("syncro", timeout=timeout) as client:
         try:
             response = await client.request(
                 method,
@@ -589,7 +590,7 @@ async def download_file(
         is_relative or urlparse(url).netloc == urlparse(base_url).netloc
     ):
         headers["Authorization"] = f"Bearer {settings['api_key']}"
-    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
+    async with http_clients.client("syncro", timeout=timeout, follow_redirects=True) as client:
         try:
             response = await client.get(url, headers=headers)
         except httpx.HTTPError as exc:
@@ -1849,6 +1849,7 @@ async def broadcast_ticket_event(
     resolved_notifier = notifier or refresh_notifier
     data: dict[str, Any] = {"action": normalised_action}
     reason_parts = ["tickets", normalised_action]
+    topics = ["tickets"]
 
     try:
         numeric_id = int(ticket_id) if ticket_id is not None else None
@@ -1858,12 +1859,14 @@ async def broadcast_ticket_event(
     if numeric_id and numeric_id > 0:
         data["ticketId"] = numeric_id
         reason_parts.append(str(numeric_id))
+        # Ticket pages subscribe to their own ticket rather than every ticket.
+        topics.append(f"ticket:{numeric_id}")
 
     reason = ":".join(reason_parts)
 
     await resolved_notifier.broadcast_refresh(
         reason=reason,
-        topics=("tickets",),
+        topics=topics,
         data=data,
     )
 
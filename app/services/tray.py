@@ -23,11 +23,12 @@ from datetime import datetime, timezone
 from typing import Any, Iterable
 
 from app.core.config import get_settings
-from app.core.logging import log_error, log_info, log_warning
+from app.core.logging import log_error, log_info
 from app.repositories import assets as assets_repo
 from app.repositories import companies as companies_repo
 from app.repositories import site_settings as site_settings_repo
 from app.repositories import tray as tray_repo
+from app.services.tray_relay import TrayDelivery, tray_relay
 
 _settings = get_settings()
 
@@ -560,44 +561,35 @@ def normalise_device_uid(value: str | None) -> str:
 # ---------------------------------------------------------------------------
 
 
-_active_connections: dict[str, Any] = {}
+async def register_connection(device_uid: str, websocket: Any) -> None:
+    await tray_relay.register(device_uid, websocket)
 
 
-def register_connection(device_uid: str, websocket: Any) -> None:
-    _active_connections[device_uid] = websocket
-
-
-def unregister_connection(device_uid: str, websocket: Any) -> None:
-    current = _active_connections.get(device_uid)
-    if current is websocket:
-        _active_connections.pop(device_uid, None)
+async def unregister_connection(device_uid: str, websocket: Any) -> None:
+    await tray_relay.unregister(device_uid, websocket)
 
 
 def is_device_connected(device_uid: str) -> bool:
-    return device_uid in _active_connections
+    """Return whether the device's websocket is held by this worker."""
+
+    return tray_relay.is_connected_locally(device_uid)
 
 
 async def send_to_device(
     device_uid: str,
     payload: dict[str, Any],
-) -> bool:
+) -> TrayDelivery:
     """Best-effort send to a connected tray device.
 
-    Returns ``True`` when the message reached the local websocket. Cross-node
-    fan-out (Redis pub/sub) is left for a follow-up — for the MVP we deliver
-    only when the device's WS is on this app instance.
+    Returns :attr:`TrayDelivery.DELIVERED` when the message reached the
+    device's websocket; its value is the status to log the command with.
+    Devices connected to another worker are reached through
+    :mod:`app.services.tray_relay` when Redis is configured; otherwise only
+    local connections are delivered.  Only :attr:`TrayDelivery.QUEUED`
+    commands are safe to send again.
     """
 
-    websocket = _active_connections.get(device_uid)
-    if websocket is None:
-        return False
-    try:
-        await websocket.send_json(payload)
-        return True
-    except Exception as exc:  # pragma: no cover - defensive
-        log_warning("Tray websocket send failed", device_uid=device_uid, error=str(exc))
-        unregister_connection(device_uid, websocket)
-        return False
+    return await tray_relay.send(device_uid, payload)
 
 
 async def deliver_queued_commands(device: dict[str, Any]) -> dict[str, int]:
@@ -605,7 +597,7 @@ async def deliver_queued_commands(device: dict[str, Any]) -> dict[str, int]:
 
     The admin device page logs commands as ``queued`` before attempting live
     websocket delivery.  If live delivery is impossible (for example the tray
-    is offline or connected to another web worker), this reconnect drain is
+    is offline or its worker could not be reached), this reconnect drain is
     the reliable path that ensures the tray service eventually receives the
     command.
     """
@@ -631,12 +623,16 @@ async def deliver_queued_commands(device: dict[str, Any]) -> dict[str, int]:
         payload.setdefault("type", command.get("command"))
         payload.setdefault("command_id", command.get("id"))
 
-        if await send_to_device(device_uid, payload):
+        result = await send_to_device(device_uid, payload)
+        if result is TrayDelivery.DELIVERED:
             await tray_repo.mark_command_delivered(int(command["id"]))
             delivered += 1
-        else:
-            failed += 1
-            break
+            continue
+        if result is TrayDelivery.UNCONFIRMED:
+            # Keep it out of the queue so the next reconnect does not repeat it.
+            await tray_repo.mark_command_unconfirmed(int(command["id"]))
+        failed += 1
+        break
 
     if delivered or failed:
         log_info(
@@ -658,7 +654,8 @@ async def push_notification_to_company_devices(
 ) -> dict[str, int]:
     """Push a tray notification to active company devices.
 
-    Returns a delivery summary ``{"targeted": n, "delivered": n, "queued": n}``.
+    Returns a delivery summary ``{"targeted": n, "delivered": n, "queued": n}``
+    plus ``"unconfirmed"`` when relayed sends went unacknowledged.
     """
 
     if company_id is None:
@@ -693,30 +690,29 @@ async def push_notification_to_company_devices(
     }
     payload_json = json.dumps(payload)
 
-    delivered_count = 0
-    queued_count = 0
+    counts = {result: 0 for result in TrayDelivery}
     for device in target_devices:
         device_uid = str(device.get("device_uid") or "").strip()
         if not device_uid:
             continue
-        delivered = await send_to_device(device_uid, payload)
+        result = await send_to_device(device_uid, payload)
         await tray_repo.log_command(
             device_id=int(device["id"]),
             command="show_notification",
             payload_json=payload_json,
             initiated_by_user_id=initiated_by_user_id,
-            status="delivered" if delivered else "queued",
+            status=result.value,
         )
-        if delivered:
-            delivered_count += 1
-        else:
-            queued_count += 1
+        counts[result] += 1
 
-    return {
-        "targeted": delivered_count + queued_count,
-        "delivered": delivered_count,
-        "queued": queued_count,
+    summary = {
+        "targeted": sum(counts.values()),
+        "delivered": counts[TrayDelivery.DELIVERED],
+        "queued": counts[TrayDelivery.QUEUED],
     }
+    if counts[TrayDelivery.UNCONFIRMED]:
+        summary["unconfirmed"] = counts[TrayDelivery.UNCONFIRMED]
+    return summary
 
 
 # ---------------------------------------------------------------------------
@@ -7,6 +7,7 @@ from typing import Any, Mapping
 from app.core.logging import log_error
 from app.repositories import tray as tray_repo
 from app.services import tray as tray_service
+from app.services.tray_relay import TrayDelivery
 
 
 def _serialize(value: Any) -> Any:
@@ -74,14 +75,14 @@ async def notify_tray_device_of_chat_message(
         "matrix_event_id": str(message.get("matrix_event_id") or ""),
         "sent_at": message.get("sent_at"),
     }
-    delivered = await tray_service.send_to_device(device_uid, _serialize(payload))
+    result = await tray_service.send_to_device(device_uid, _serialize(payload))
     try:
         await tray_repo.log_command(
             device_id=tray_device_id,
             command="chat_message",
             payload_json=json.dumps(_serialize({"room_id": room_id, "message_id": message.get("id")})),
             initiated_by_user_id=None,
-            status="delivered" if delivered else "queued",
+            status=result.value,
         )
     except Exception as exc:  # pragma: no cover - command logging must not block chat delivery
         log_error(
@@ -90,4 +91,4 @@ async def notify_tray_device_of_chat_message(
             device_id=tray_device_id,
             error=str(exc),
         )
-    return delivered
+    return result is TrayDelivery.DELIVERED
@@ -0,0 +1,135 @@
+"""Coalesced tray device heartbeat persistence.
+
+Tray agents send a heartbeat every minute or so over the websocket and the
+``POST /api/tray/heartbeat`` endpoint, and each used to cost a single-row
+``UPDATE tray_devices``.  :class:`TrayHeartbeatRecorder` keeps the latest
+heartbeat per device in memory and writes them with multi-row updates every
+``TRAY_HEARTBEAT_FLUSH_SECONDS``, so ``last_seen_utc`` in the admin device
+views lags by at most one flush interval.
+
+Each worker flushes the heartbeats it received; a device only heartbeats
+through one connection at a time, so workers do not overwrite each other.
+The recorder is inactive until :meth:`TrayHeartbeatRecorder.start` runs at
+application startup; before then (and in scripts) heartbeats are written
+inline.
+"""
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from app.core.logging import log_error
+from app.repositories import tray as tray_repo
+
+
+@dataclass(slots=True)
+class _Heartbeat:
+    last_seen_utc: datetime
+    console_user: str | None
+    last_ip: str | None
+    agent_version: str | None
+
+    def merge(self, newer: "_Heartbeat") -> None:
+        # ``None`` means "unchanged", as in the single-row update.
+        self.last_seen_utc = max(self.last_seen_utc, newer.last_seen_utc)
+        self.console_user = newer.console_user or self.console_user
+        self.last_ip = newer.last_ip or self.last_ip
+        self.agent_version = newer.agent_version or self.agent_version
+
+
+class TrayHeartbeatRecorder:
+    """Keep the latest heartbeat per device and flush them periodically."""
+
+    def __init__(self) -> None:
+        self._pending: dict[int, _Heartbeat] = {}
+        self._flush_interval = 0.0
+        self._task: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self, *, flush_interval_seconds: float) -> None:
+        if self._task is not None or flush_interval_seconds <= 0:
+            return
+        self._flush_interval = float(flush_interval_seconds)
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write any heartbeats still pending."""
+
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    async def record(
+        self,
+        device_id: int,
+        *,
+        console_user: str | None,
+        last_ip: str | None,
+        agent_version: str | None,
+    ) -> None:
+        """Record a heartbeat from ``device_id``."""
+
+        if self._task is None:
+            await tray_repo.update_device_heartbeat(
+                device_id,
+                console_user=console_user,
+                last_ip=last_ip,
+                agent_version=agent_version,
+            )
+            return
+        heartbeat = _Heartbeat(
+            last_seen_utc=datetime.now(timezone.utc).replace(tzinfo=None),
+            console_user=console_user,
+            last_ip=last_ip,
+            agent_version=agent_version,
+        )
+        current = self._pending.get(device_id)
+        if current is None:
+            self._pending[device_id] = heartbeat
+        else:
+            current.merge(heartbeat)
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            entries = [
+                (
+                    device_id,
+                    heartbeat.last_seen_utc,
+                    heartbeat.console_user,
+                    heartbeat.last_ip,
+                    heartbeat.agent_version,
+                )
+                for device_id, heartbeat in pending.items()
+            ]
+            try:
+                await tray_repo.apply_device_heartbeats(entries)
+            except Exception as exc:  # pragma: no cover - depends on database availability
+                log_error("Failed to flush tray heartbeats", error=str(exc), devices=len(entries))
+                # Keep the heartbeats for the next attempt; newer ones win.
+                for device_id, heartbeat in pending.items():
+                    current = self._pending.get(device_id)
+                    if current is None:
+                        self._pending[device_id] = heartbeat
+                    else:
+                        heartbeat.merge(current)
+                        self._pending[device_id] = heartbeat
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
+
+
+tray_heartbeat_recorder = TrayHeartbeatRecorder()
@@ -0,0 +1,377 @@
+"""Cross-node delivery of server-initiated tray device messages.
+
+Each tray device keeps a single websocket open to whichever worker accepted
+it.  :class:`TrayRelay` tracks those connections for this process and, when
+Redis is configured, shares two things with the other workers:
+
+* a presence record per device (``tray:presence:<device_uid>`` → node id)
+  written when the device connects, refreshed while it stays connected and
+  expiring shortly after a worker dies without cleaning up, and
+* a command channel per node (``tray:node:<node_id>``).
+
+A send to a device connected elsewhere is published on the owning node's
+channel.  That node writes it to the websocket and acknowledges on the
+sender's channel, so callers still learn whether the device received the
+message and can fall back to the queued-command path when it did not.  A
+relayed send that is not acknowledged in time may still have reached the
+device, so it is reported as :attr:`TrayDelivery.UNCONFIRMED` rather than
+queued for a second delivery.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import secrets
+from contextlib import suppress
+from enum import Enum
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from redis.exceptions import RedisError
+
+from app.core.logging import log_warning
+
+_PRESENCE_KEY_PREFIX = "tray:presence:"
+_NODE_CHANNEL_PREFIX = "tray:node:"
+
+# Only the node that owns a presence record may delete it, so a device that
+# reconnected to another worker is not marked offline by the old one.
+_RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class TrayDelivery(str, Enum):
+    """Outcome of :meth:`TrayRelay.send`, named after the command log status."""
+
+    DELIVERED = "delivered"
+    # The device never got the message; queue it for the reconnect drain.
+    QUEUED = "queued"
+    # Handed to the owning worker without an acknowledgement in time.  The
+    # device may have it, so it must not be queued and sent again.
+    UNCONFIRMED = "unconfirmed"
+
+
+class TrayRelay:
+    """Route tray device messages to the worker holding the device's socket."""
+
+    def __init__(self) -> None:
+        self._connections: dict[str, Any] = {}
+        self._redis: Redis | None = None
+        self._pubsub: PubSub | None = None
+        self._listener_task: asyncio.Task[None] | None = None
+        self._presence_task: asyncio.Task[None] | None = None
+        self._handler_tasks: set[asyncio.Task[None]] = set()
+        # Resolved with the owner's answer, or ``None`` when this node stops
+        # before it arrives.
+        self._pending: dict[str, asyncio.Future[bool | None]] = {}
+        self._node_id = secrets.token_hex(8)
+        self._channel = _NODE_CHANNEL_PREFIX + self._node_id
+        self._presence_ttl_seconds = 90
+        self._ack_timeout_seconds = 2.0
+        self._counters: dict[str, int] = {
+            "local_delivered": 0,
+            "local_failed": 0,
+            "relayed": 0,
+            "relayed_delivered": 0,
+            "relayed_failed": 0,
+            "relayed_timeouts": 0,
+            "relayed_unconfirmed": 0,
+            "unreachable": 0,
+            "received": 0,
+        }
+
+    @property
+    def shared(self) -> bool:
+        return self._redis is not None and self._listener_task is not None
+
+    async def start(
+        self,
+        *,
+        redis_client: Redis | None = None,
+        presence_ttl_seconds: int = 90,
+        ack_timeout_seconds: float = 2.0,
+    ) -> None:
+        """Subscribe to this node's command channel when Redis is available."""
+
+        self._presence_ttl_seconds = max(1, int(presence_ttl_seconds))
+        self._ack_timeout_seconds = float(ack_timeout_seconds)
+        if redis_client is None or self._listener_task is not None:
+            return
+        self._redis = redis_client
+        self._pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self._channel)
+        self._listener_task = asyncio.create_task(self._listen_for_commands())
+        self._presence_task = asyncio.create_task(self._refresh_presence())
+        # Devices that connected before startup finished.
+        for device_uid in list(self._connections):
+            await self._claim(device_uid)
+
+    async def stop(self) -> None:
+        """Release this node's presence records and its subscription."""
+
+        for task in (self._presence_task, self._listener_task, *self._handler_tasks):
+            if task is not None:
+                task.cancel()
+        for task in (self._presence_task, self._listener_task, *self._handler_tasks):
+            if task is not None:
+                with suppress(asyncio.CancelledError):
+                    await task
+        self._presence_task = None
+        self._listener_task = None
+        self._handler_tasks.clear()
+        for future in self._pending.values():
+            if not future.done():
+                future.set_result(None)
+        self._pending.clear()
+        if self._redis is not None:
+            for device_uid in list(self._connections):
+                await self._release(device_uid)
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe(self._channel)
+            except Exception:  # pragma: no cover - defensive cleanup
+                pass
+            try:
+                await self._pubsub.close()
+            except Exception:  # pragma: no cover - defensive cleanup
+                pass
+            self._pubsub = None
+        self._redis = None
+
+    async def register(self, device_uid: str, websocket: Any) -> None:
+        """Track a device connected to this worker and announce its presence."""
+
+        self._connections[device_uid] = websocket
+        await self._claim(device_uid)
+
+    async def unregister(self, device_uid: str, websocket: Any) -> None:
+        """Forget ``websocket`` unless the device has already reconnected."""
+
+        if self._connections.get(device_uid) is not websocket:
+            return
+        self._connections.pop(device_uid, None)
+        await self._release(device_uid)
+
+    def is_connected_locally(self, device_uid: str) -> bool:
+        return device_uid in self._connections
+
+    async def send(self, device_uid: str, payload: dict[str, Any]) -> TrayDelivery:
+        """Deliver ``payload`` to a device connected to any worker.
+
+        Returns :attr:`TrayDelivery.DELIVERED` once the device's websocket
+        accepted the message, either here or on the worker that acknowledged
+        the relayed command, and :attr:`TrayDelivery.UNCONFIRMED` when the
+        relayed command was published but not acknowledged.
+        """
+
+        if device_uid in self._connections:
+            if await self._send_local(device_uid, payload):
+                return TrayDelivery.DELIVERED
+            return TrayDelivery.QUEUED
+        if self._redis is None:
+            self._counters["unreachable"] += 1
+            return TrayDelivery.QUEUED
+        return await self._send_remote(device_uid, payload)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "node_id": self._node_id,
+            "shared": self.shared,
+            "local_connections": len(self._connections),
+            "pending_acks": len(self._pending),
+            **self._counters,
+        }
+
+    async def _send_local(self, device_uid: str, payload: dict[str, Any]) -> bool:
+        websocket = self._connections.get(device_uid)
+        if websocket is None:
+            self._counters["local_failed"] += 1
+            return False
+        try:
+            await websocket.send_json(payload)
+        except Exception as exc:
+            log_warning("Tray websocket send failed", device_uid=device_uid, error=str(exc))
+            self._counters["local_failed"] += 1
+            await self.unregister(device_uid, websocket)
+            return False
+        self._counters["local_delivered"] += 1
+        return True
+
+    async def _send_remote(self, device_uid: str, payload: dict[str, Any]) -> TrayDelivery:
+        assert self._redis is not None
+        presence_key = _PRESENCE_KEY_PREFIX + device_uid
+        try:
+            owner = await self._redis.get(presence_key)
+        except RedisError as exc:
+            log_warning("Failed to look up tray device presence", device_uid=device_uid, error=str(exc))
+            self._counters["unreachable"] += 1
+            return TrayDelivery.QUEUED
+        if isinstance(owner, bytes):
+            owner = owner.decode("utf-8", "replace")
+        if not owner or owner == self._node_id:
+            # Our own record without a local socket is stale; the device is
+            # between connections.
+            self._counters["unreachable"] += 1
+            return TrayDelivery.QUEUED
+
+        message_id = secrets.token_hex(8)
+        future: asyncio.Future[bool | None] = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        envelope = {
+            "kind": "send",
+            "id": message_id,
+            "reply_to": self._channel,
+            "device_uid": device_uid,
+            "payload": payload,
+        }
+        self._counters["relayed"] += 1
+        try:
+            receivers = await self._redis.publish(
+                _NODE_CHANNEL_PREFIX + owner, json.dumps(envelope)
+            )
+            if not receivers:
+                # The owning worker is gone; its record has not expired yet.
+                self._counters["unreachable"] += 1
+                with suppress(RedisError):
+                    await self._redis.eval(_RELEASE_LUA, 1, presence_key, owner)
+                return TrayDelivery.QUEUED
+            delivered = await asyncio.wait_for(future, timeout=self._ack_timeout_seconds)
+        except asyncio.TimeoutError:
+            self._counters["relayed_timeouts"] += 1
+            self._counters["relayed_unconfirmed"] += 1
+            log_warning(
+                "Timed out waiting for tray command acknowledgement",
+                device_uid=device_uid,
+                node_id=owner,
+            )
+            return TrayDelivery.UNCONFIRMED
+        except RedisError as exc:
+            log_warning("Failed to relay tray command", device_uid=device_uid, error=str(exc))
+            self._counters["unreachable"] += 1
+            return TrayDelivery.QUEUED
+        finally:
+            self._pending.pop(message_id, None)
+        if delivered is None:
+            # Stopped before the owner answered.
+            self._counters["relayed_unconfirmed"] += 1
+            return TrayDelivery.UNCONFIRMED
+        self._counters["relayed_delivered" if delivered else "relayed_failed"] += 1
+        return TrayDelivery.DELIVERED if delivered else TrayDelivery.QUEUED
+
+    async def _claim(self, device_uid: str) -> None:
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(
+                _PRESENCE_KEY_PREFIX + device_uid,
+                self._node_id,
+                ex=self._presence_ttl_seconds,
+            )
+        except RedisError as exc:
+            log_warning("Failed to record tray device presence", device_uid=device_uid, error=str(exc))
+
+    async def _release(self, device_uid: str) -> None:
+        if self._redis is None:
+            return
+        try:
+            await self._redis.eval(
+                _RELEASE_LUA, 1, _PRESENCE_KEY_PREFIX + device_uid, self._node_id
+            )
+        except RedisError as exc:
+            log_warning("Failed to clear tray device presence", device_uid=device_uid, error=str(exc))
+
+    async def _refresh_presence(self) -> None:
+        interval = max(1.0, self._presence_ttl_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            if self._redis is None or not self._connections:
+                continue
+            try:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for device_uid in list(self._connections):
+                        pipe.set(
+                            _PRESENCE_KEY_PREFIX + device_uid,
+                            self._node_id,
+                            ex=self._presence_ttl_seconds,
+                        )
+                    await pipe.execute()
+            except RedisError as exc:
+                log_warning("Failed to refresh tray device presence", error=str(exc))
+
+    async def _handle_message(self, data: Any) -> None:
+        if isinstance(data, bytes):
+            try:
+                data = data.decode("utf-8")
+            except UnicodeDecodeError:
+                return
+        try:
+            envelope = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if not isinstance(envelope, dict):
+            return
+        kind = envelope.get("kind")
+        if kind == "ack":
+            future = self._pending.get(str(envelope.get("id")))
+            if future is not None and not future.done():
+                future.set_result(bool(envelope.get("delivered")))
+            return
+        if kind != "send":
+            return
+        device_uid = envelope.get("device_uid")
+        payload = envelope.get("payload")
+        reply_to = envelope.get("reply_to")
+        if not isinstance(device_uid, str) or not isinstance(payload, dict):
+            return
+        self._counters["received"] += 1
+        # Sent from a task so one slow device never holds up the channel.
+        task = asyncio.create_task(
+            self._deliver_relayed(envelope.get("id"), reply_to, device_uid, payload)
+        )
+        self._handler_tasks.add(task)
+        task.add_done_callback(self._handler_tasks.discard)
+
+    async def _deliver_relayed(
+        self,
+        message_id: Any,
+        reply_to: Any,
+        device_uid: str,
+        payload: dict[str, Any],
+    ) -> None:
+        delivered = False
+        if device_uid in self._connections:
+            delivered = await self._send_local(device_uid, payload)
+        if self._redis is None or not isinstance(reply_to, str):
+            return
+        ack = {"kind": "ack", "id": message_id, "delivered": delivered}
+        try:
+            await self._redis.publish(reply_to, json.dumps(ack))
+        except RedisError as exc:
+            log_warning("Failed to acknowledge relayed tray command", error=str(exc))
+
+    async def _listen_for_commands(self) -> None:
+        if self._pubsub is None:
+            return
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                break
+            except Exception as exc:  # pragma: no cover - defensive logging
+                log_warning("Tray relay subscriber error", error=str(exc))
+                await asyncio.sleep(1.0)
+                continue
+            if not message:
+                await asyncio.sleep(0.05)
+                continue
+            data = message.get("data")
+            if data:
+                await self._handle_message(data)
+
+
+tray_relay = TrayRelay()
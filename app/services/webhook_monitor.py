@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
-from typing import Any, Mapping
+from typing import Any, AsyncIterator, Mapping
 from urllib.parse import urlsplit, urlunsplit
 
 import httpx
 
+from app.core.config import get_settings
 from app.core.logging import log_error, log_info
 from app.repositories import webhook_events as webhook_repo
+from app.services import http_clients
 
 _STAFF_WORKFLOW_RESUME_SOURCE = "staff_workflow_http_post"
 
@@ -21,6 +27,95 @@ _SENSITIVE_HEADERS = {
     "x-access-token",
 }
 _SENSITIVE_RESPONSE_HEADERS = {"set-cookie", "set-cookie2"}
+_DELIVERY_TIMEOUT_SECONDS = 10.0
+_LATENCY_SAMPLES = 500
+
+
+class _DeliveryPool:
+    """Keep-alive client and delivery slots shared by one event loop.
+
+    The client's connections come from the ``webhooks`` pool in
+    :mod:`app.services.http_clients`.  Clients and asyncio semaphores belong
+    to the loop they were first used on, so a new loop (a test or the
+    scheduler worker process) gets its own pool.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, *, concurrency: int, per_host: int) -> None:
+        self.loop = loop
+        self.per_host = per_host
+        self.client = http_clients.client(
+            "webhooks", timeout=_DELIVERY_TIMEOUT_SECONDS, follow_redirects=True
+        )
+        self._slots = asyncio.Semaphore(concurrency)
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+        self.in_flight: dict[str, int] = {}
+        # Claimed events per host that a monitor run has not finished yet.
+        self.held: dict[str, int] = {}
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[None]:
+        host_slots = self._hosts.get(host)
+        if host_slots is None:
+            host_slots = self._hosts[host] = asyncio.Semaphore(self.per_host)
+        async with host_slots, self._slots:
+            self.in_flight[host] = self.in_flight.get(host, 0) + 1
+            try:
+                yield
+            finally:
+                self.in_flight[host] -= 1
+                if not self.in_flight[host]:
+                    del self.in_flight[host]
+
+
+_pool: _DeliveryPool | None = None
+_request_ms: deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+_queue_lag_seconds: deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+_outcomes = {"succeeded": 0, "failed": 0}
+
+
+def _delivery_pool() -> _DeliveryPool:
+    global _pool
+    loop = asyncio.get_running_loop()
+    if _pool is None or _pool.loop is not loop:
+        settings = get_settings()
+        _pool = _DeliveryPool(
+            loop,
+            concurrency=settings.webhook_delivery_concurrency,
+            per_host=settings.webhook_delivery_per_host,
+        )
+    return _pool
+
+
+async def close_delivery_pool() -> None:
+    """Drop this loop's delivery client; its connections close with the pool."""
+
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None and pool.loop is asyncio.get_running_loop():
+        await pool.client.aclose()
+
+
+def _summarise(samples: deque[float]) -> dict[str, float] | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return {
+        "p50": round(ordered[len(ordered) // 2], 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def delivery_stats() -> dict[str, Any]:
+    """Outcomes and latency of recent deliveries from this process."""
+
+    return {
+        "in_flight": dict(_pool.in_flight) if _pool is not None else {},
+        "delivered": _outcomes["succeeded"],
+        "failed_attempts": _outcomes["failed"],
+        "request_ms": _summarise(_request_ms),
+        "queue_lag_seconds": _summarise(_queue_lag_seconds),
+    }
 
 
 def _truncate(value: str | None, *, limit: int = 4000) -> str | None:
@@ -314,14 +409,54 @@ async def log_incoming_webhook(
     return refreshed or event
 
 
-async def process_pending_events(limit: int = 10) -> None:
-    events = await webhook_repo.list_due_events(limit=limit)
-    for event in events:
-        try:
-            await webhook_repo.mark_in_progress(int(event["id"]))
+async def process_pending_events(limit: int | None = None) -> int:
+    """Deliver due outgoing events, claiming more as deliveries finish.
+
+    A run holds at most ``limit`` claimed events at once and never more per
+    target host than that host's delivery slots, so a slow receiver's
+    backlog stays pending instead of filling the batch.  Each finished
+    delivery frees room for another claim; the run ends once nothing due is
+    left and its deliveries are done.  Returns the number of events claimed.
+    """
+
+    batch = limit or get_settings().webhook_delivery_batch_size
+    pool = _delivery_pool()
+    running: set[asyncio.Task[None]] = set()
+    claimed = 0
+    try:
+        while True:
+            events: list[dict[str, Any]] = []
+            if len(running) < batch:
+                events = await webhook_repo.claim_due_events(
+                    limit=batch - len(running), per_host=pool.per_host, held=pool.held
+                )
+            for event in events:
+                host = webhook_repo.target_host(event.get("target_url"))
+                pool.held[host] = pool.held.get(host, 0) + 1
+                running.add(asyncio.create_task(_deliver_claimed(pool, host, event)))
+            claimed += len(events)
+            if not running:
+                return claimed
+            _, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in running:
+            task.cancel()
+
+
+async def _deliver_claimed(pool: _DeliveryPool, host: str, event: dict[str, Any]) -> None:
+    try:
+        async with pool.slot(host):
+            due_at = event.get("next_attempt_at") or event.get("created_at")
+            if isinstance(due_at, datetime):
+                lag = (datetime.now(timezone.utc) - due_at).total_seconds()
+                _queue_lag_seconds.append(max(0.0, lag))
             await _attempt_event(event)
-        except Exception as exc:  # pragma: no cover - defensive logging
-            log_error("Failed to process webhook event", event_id=event.get("id"), error=str(exc))
+    except Exception as exc:  # pragma: no cover - defensive logging
+        log_error("Failed to process webhook event", event_id=event.get("id"), error=str(exc))
+    finally:
+        pool.held[host] -= 1
+        if not pool.held[host]:
+            del pool.held[host]
 
 
 async def purge_completed_events(*, retention: timedelta = timedelta(hours=24)) -> int:
@@ -413,17 +548,20 @@ async def _attempt_event(event: dict[str, Any]) -> None:
     response_headers: dict[str, Any] | None = None
     error_message: str | None = None
     try:
-        async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-            response = await client.post(
-                str(event["target_url"]),
-                json=payload,
-                headers=headers,
-            )
+        client = _delivery_pool().client
+        started = time.monotonic()
+        response = await client.post(
+            str(event["target_url"]),
+            json=payload,
+            headers=headers,
+        )
+        _request_ms.append((time.monotonic() - started) * 1000)
         response_status = response.status_code
         response_body = _truncate(response.text)
         response_headers = _redact_headers(response.headers, sensitive=_SENSITIVE_RESPONSE_HEADERS)
         success = 200 <= response.status_code < 300
         status_text = "succeeded" if success else "failed"
+        _outcomes[status_text] += 1
         await webhook_repo.record_attempt(
             event_id=event_id,
             attempt_number=attempt,
@@ -448,6 +586,7 @@ async def _attempt_event(event: dict[str, Any]) -> None:
         error_message = f"Unexpected status {response.status_code}"
     except Exception as exc:  # pragma: no cover - network safety
         error_message = str(exc)
+        _outcomes["failed"] += 1
         await webhook_repo.record_attempt(
             event_id=event_id,
             attempt_number=attempt,
@@ -25,6 +25,7 @@ from app.repositories import ticket_statuses as ticket_status_repo
 from app.repositories import tickets as tickets_repo
 from app.repositories import users as users_repo
 from app.services.billing_time import format_billable_minutes
+from app.services import http_clients
 from app.services import modules as modules_service
 from app.services import value_templates, webhook_monitor
 
@@ -930,7 +931,7 @@ async def fetch_xero_item_rates(
     # Xero's Items endpoint expects a filter query when looking up by code.
     # We request each item individually to avoid large where clauses and so we
     # can gracefully handle per-item failures without aborting the full batch.
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with http_clients.client("xero") as client:
         for item_code in item_codes:
             if not item_code or not str(item_code).strip():
                 logger.debug("Skipping empty item code")
@@ -1994,7 +1995,7 @@ async def sync_billable_tickets(
     }
 
     if not contact_payload.get("ContactID"):
-        async with httpx.AsyncClient(timeout=30.0) as resolve_client:
+        async with http_clients.client("xero") as resolve_client:
             contact_payload = await _resolve_xero_contact_payload(
                 contact_payload,
                 client=resolve_client,
@@ -2048,7 +2049,7 @@ async def sync_billable_tickets(
     xero_request_payload = {"Invoices": [invoice_payload]}
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.client("xero") as client:
             response, _item_ensure_result = await _post_xero_invoice_with_product_retry(
                 client=client,
                 api_url=api_url,
@@ -2369,7 +2370,7 @@ async def sync_company(
     }
     contact_payload = _build_xero_contact_payload(company, company_id)
     if not contact_payload.get("ContactID"):
-        async with httpx.AsyncClient(timeout=30.0) as resolve_client:
+        async with http_clients.client("xero") as resolve_client:
             contact_payload = await _resolve_xero_contact_payload(
                 contact_payload,
                 client=resolve_client,
@@ -2422,7 +2423,7 @@ async def sync_company(
         response_headers: dict[str, Any] | None = None
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with http_clients.client("xero") as client:
                 webhook_payload = {"Invoices": [invoice_payload]}
                 try:
                     event = await webhook_monitor.create_manual_event(
@@ -2733,7 +2734,7 @@ async def send_order_to_xero(
         }
     
     if not invoice_data["contact"].get("ContactID"):
-        async with httpx.AsyncClient(timeout=30.0) as resolve_client:
+        async with http_clients.client("xero") as resolve_client:
             invoice_data["contact"] = await _resolve_xero_contact_payload(
                 invoice_data["contact"],
                 client=resolve_client,
@@ -2792,7 +2793,7 @@ async def send_order_to_xero(
     xero_request_payload = {"Invoices": [xero_payload]}
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.client("xero") as client:
             response, _item_ensure_result = await _post_xero_invoice_with_product_retry(
                 client=client,
                 api_url=api_url,
@@ -3033,7 +3034,7 @@ async def send_quote_to_xero(
         }
 
     if not invoice_data["contact"].get("ContactID"):
-        async with httpx.AsyncClient(timeout=30.0) as resolve_client:
+        async with http_clients.client("xero") as resolve_client:
             invoice_data["contact"] = await _resolve_xero_contact_payload(
                 invoice_data["contact"],
                 client=resolve_client,
@@ -3086,7 +3087,7 @@ async def send_quote_to_xero(
     xero_request_payload = {"Quotes": [xero_payload]}
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.client("xero") as client:
             response, _item_ensure_result = await _post_xero_invoice_with_product_retry(
                 client=client,
                 api_url=api_url,
@@ -3332,7 +3333,7 @@ async def send_subscription_charge_to_xero(
         contact_payload["ContactID"] = xero_id
 
     if not contact_payload.get("ContactID"):
-        async with httpx.AsyncClient(timeout=30.0) as resolve_client:
+        async with http_clients.client("xero") as resolve_client:
             contact_payload = await _resolve_xero_contact_payload(
                 contact_payload,
                 client=resolve_client,
@@ -3404,7 +3405,7 @@ async def send_subscription_charge_to_xero(
     xero_request_payload = {"Invoices": [xero_payload]}
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.client("xero") as client:
             response = await client.post(
                 api_url,
                 json=xero_request_payload,
@@ -128,6 +128,17 @@
       return;
     }
     button.addEventListener('click', () => {
+      const exportUrl = button.dataset.exportUrl;
+      const filter = document.querySelector('[data-table-filter="assets-table"]');
+      const isFiltered = Boolean(filter && filter.value.trim());
+      const columns = getVisibleTableColumns(table);
+      if (exportUrl && columns.length && !isFiltered) {
+        // Unfiltered exports are streamed by the server so large asset lists
+        // are not rebuilt in the browser.
+        const params = new URLSearchParams({ columns: columns.map((column) => column.key).join(',') });
+        window.location.href = `${exportUrl}?${params.toString()}`;
+        return;
+      }
       const csv = buildAssetsCsv(table);
       if (!csv) {
         if (window.__portalToast && typeof window.__portalToast.show === 'function') {
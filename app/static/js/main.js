@@ -243,6 +243,40 @@
       }, 1500);
     }
 
+    function collectRefreshTopics() {
+      const topics = new Set();
+      document
+        .querySelectorAll('[data-refresh-topics], [data-table-refresh-topics]')
+        .forEach((element) => {
+          const value =
+            element.getAttribute('data-refresh-topics') ||
+            element.getAttribute('data-table-refresh-topics') ||
+            '';
+          value.split(',').forEach((topic) => {
+            const normalised = topic.trim().toLowerCase();
+            if (normalised) {
+              topics.add(normalised);
+            }
+          });
+        });
+      return Array.from(topics);
+    }
+
+    function sendSubscription(instance) {
+      // Subscribing limits this tab to events for the topics the page shows
+      // (plus untargeted events and the signed-in user's own topic).  Pages
+      // without refresh topics stay unsubscribed and receive every event.
+      const topics = collectRefreshTopics();
+      if (!topics.length) {
+        return;
+      }
+      try {
+        instance.send(JSON.stringify({ type: 'subscribe', topics }));
+      } catch (error) {
+        // The server falls back to sending every event.
+      }
+    }
+
     function scheduleReconnect() {
       if (stop) {
         return;
@@ -289,6 +323,7 @@
 
       instance.addEventListener('open', () => {
         reconnectAttempts = 0;
+        sendSubscription(instance);
       });
 
       instance.addEventListener('message', (event) => {
@@ -0,0 +1,203 @@
+"""Scheduler process entry point for ``SCHEDULER_MODE=external``.
+
+``--role=scheduler`` evaluates scheduled-task and system-job triggers and
+queues each fire in ``scheduler_jobs``.  ``--role=worker`` claims queued
+runs under a lease and executes them.  ``--role=all`` does both in one
+process.  Web workers then do no scheduling work and a long job holds a
+lease row instead of a pooled connection.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+
+from app.core.config import Settings, get_settings
+from app.core.database import db
+from app.core.logging import log_error, log_info, log_warning
+from app.core.reference_cache import reference_cache
+from app.repositories import scheduler_jobs as repository
+from app.services import http_clients, webhook_monitor
+from app.services.realtime import refresh_notifier
+from app.services.redis import close_redis_client, get_redis_client
+from app.services.scheduler import ROLE_SCHEDULER, SchedulerService, scheduler_service
+from app.services.tray_relay import tray_relay
+
+_ROLES = ("scheduler", "worker", "all")
+
+
+class SchedulerJobWorker:
+    def __init__(self, service: SchedulerService, *, concurrency: int = 4,
+                 lease_seconds: int = 300, poll_seconds: float = 2.0,
+                 max_attempts: int = 3, identity: str | None = None) -> None:
+        self.service = service
+        self.concurrency = max(1, concurrency)
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.identity = identity or f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = asyncio.Event()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def run(self) -> None:
+        while not self.stopping.is_set():
+            capacity = self.concurrency - len(self._tasks)
+            if capacity > 0:
+                try:
+                    jobs = await repository.claim_jobs(
+                        worker_identity=self.identity, limit=capacity,
+                        lease_seconds=self.lease_seconds, max_attempts=self.max_attempts,
+                    )
+                except Exception as exc:  # pragma: no cover - depends on database availability
+                    log_error("Failed to claim scheduler jobs", error=str(exc))
+                    jobs = []
+                for job in jobs:
+                    task = asyncio.create_task(self._execute(job))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+            try:
+                await asyncio.wait_for(self.stopping.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def stop(self, *, grace_seconds: float = 25) -> None:
+        """Stop claiming, then hand back every run that exceeds the grace."""
+        self.stopping.set()
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(self._tasks, timeout=grace_seconds)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _execute(self, job: dict[str, Any]) -> None:
+        job_id = int(job["id"])
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        status = repository.STATUS_SUCCEEDED
+        error: str | None = None
+        try:
+            await self.service.run_queued_job(job)
+        except asyncio.CancelledError:
+            # Shutdown, not failure: another worker picks the run up.
+            await repository.release_job(job_id, self.identity)
+            raise
+        except Exception as exc:
+            status = repository.STATUS_FAILED
+            error = str(exc) or type(exc).__name__
+            log_error("Scheduler job failed", job_id=job_id, job_key=job.get("job_key"), error=error)
+        finally:
+            heartbeat.cancel()
+            with suppress(asyncio.CancelledError):
+                await heartbeat
+        if not await repository.finish_job(job_id, self.identity, status=status, error=error):
+            log_warning("Scheduler job lease lost before it finished", job_id=job_id,
+                        job_key=job.get("job_key"))
+
+    async def _heartbeat(self, job_id: int) -> None:
+        while True:
+            await asyncio.sleep(max(self.lease_seconds / 3, 1))
+            try:
+                extended = await repository.extend_lease(
+                    job_id, self.identity, lease_seconds=self.lease_seconds
+                )
+            except Exception as exc:  # pragma: no cover - depends on database availability
+                log_warning("Failed to extend scheduler job lease", job_id=job_id, error=str(exc))
+                continue
+            if not extended:
+                return
+
+
+async def _start_shared_services(settings: Settings) -> None:
+    """Join the Redis channels the web workers use, as their startup hooks do.
+
+    Jobs run here invalidate cached reference data, broadcast refresh events
+    and send tray commands; without these the web workers never see them.
+    """
+
+    try:
+        await refresh_notifier.start(redis_client=get_redis_client())
+    except Exception as exc:  # pragma: no cover - defensive logging
+        log_error("Failed to initialise refresh notifier", error=str(exc))
+    try:
+        await tray_relay.start(
+            redis_client=get_redis_client(),
+            presence_ttl_seconds=settings.tray_presence_ttl_seconds,
+            ack_timeout_seconds=settings.tray_relay_ack_timeout_seconds,
+        )
+    except Exception as exc:  # pragma: no cover - defensive logging
+        log_error("Failed to initialise tray relay", error=str(exc))
+    if settings.reference_cache_enabled:
+        try:
+            await reference_cache.start(
+                redis_client=get_redis_client(),
+                ttl_seconds=settings.reference_cache_ttl_seconds,
+            )
+        except Exception as exc:  # pragma: no cover - defensive logging
+            log_error("Failed to initialise reference data cache", error=str(exc))
+
+
+async def _stop_shared_services() -> None:
+    await refresh_notifier.stop()
+    await tray_relay.stop()
+    await reference_cache.stop()
+
+
+async def _main(role: str, health_file: Path) -> None:
+    settings = get_settings()
+    await db.connect()
+    await _start_shared_services(settings)
+    worker: SchedulerJobWorker | None = None
+    if role in ("worker", "all"):
+        worker = SchedulerJobWorker(
+            scheduler_service,
+            concurrency=settings.scheduler_worker_concurrency,
+            lease_seconds=settings.scheduler_job_lease_seconds,
+            poll_seconds=settings.scheduler_poll_seconds,
+            max_attempts=settings.scheduler_job_max_attempts,
+        )
+    stopping = asyncio.Event()
+
+    def _request_stop() -> None:
+        stopping.set()
+        if worker is not None:
+            asyncio.create_task(worker.stop())
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, _request_stop)
+    health_file.parent.mkdir(parents=True, exist_ok=True)
+    health_file.write_text(f"{role}:{socket.gethostname()}:{os.getpid()}")
+    try:
+        if role in ("scheduler", "all"):
+            await scheduler_service.start(role=ROLE_SCHEDULER)
+        log_info("Scheduler process started", role=role)
+        if worker is not None:
+            await worker.run()
+        else:
+            await stopping.wait()
+    finally:
+        health_file.unlink(missing_ok=True)
+        await scheduler_service.stop()
+        await _stop_shared_services()
+        await webhook_monitor.close_delivery_pool()
+        await http_clients.close_clients()
+        await close_redis_client()
+        await db.disconnect()
+        log_info("Scheduler process stopped", role=role)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--role", choices=_ROLES, default="all")
+    parser.add_argument("--health-file", type=Path, default=None)
+    args = parser.parse_args()
+    health_file = args.health_file or Path(f"/run/myportal/scheduler-{args.role}.health")
+    asyncio.run(_main(args.role, health_file))
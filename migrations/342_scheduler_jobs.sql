@@ -0,0 +1,32 @@
+-- Durable queue of scheduled-task and system-job runs.
+-- In SCHEDULER_MODE=external deployments the scheduler process
+-- (``python -m app.workers.scheduler --role=scheduler``) inserts a row per
+-- trigger fire and worker processes claim rows under a lease (see
+-- app/repositories/scheduler_jobs.py).  ``pending_key`` equals ``job_key``
+-- while a run is queued or running and is cleared when it finishes, so the
+-- unique index allows at most one outstanding run per task or system job.
+--
+-- All timestamps stored UTC.
+CREATE TABLE IF NOT EXISTS scheduler_jobs (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    job_key VARCHAR(191) NOT NULL,
+    pending_key VARCHAR(191) NULL,
+    task_id INT NULL,
+    force_restart TINYINT(1) NOT NULL DEFAULT 0,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    attempts INT NOT NULL DEFAULT 0,
+    available_at DATETIME NOT NULL COMMENT 'UTC',
+    lease_owner VARCHAR(191) NULL,
+    lease_until DATETIME NULL COMMENT 'UTC',
+    created_at DATETIME NOT NULL COMMENT 'UTC',
+    started_at DATETIME NULL COMMENT 'UTC',
+    finished_at DATETIME NULL COMMENT 'UTC',
+    error TEXT NULL,
+    UNIQUE (pending_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_scheduler_jobs_claim
+    ON scheduler_jobs (status, available_at);
+
+CREATE INDEX IF NOT EXISTS idx_scheduler_jobs_finished
+    ON scheduler_jobs (finished_at);
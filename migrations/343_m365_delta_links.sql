@@ -0,0 +1,16 @@
+-- Microsoft Graph delta links per company and scheduled sync.
+-- ``resource`` names the consumer (e.g. ``users:staff``, ``users:licenses``)
+-- because each scheduled sync replays changes from its own position.
+-- ``full_synced_at`` records the last full reconcile; scheduled runs fall back
+-- to a full sync once it is older than M365_DELTA_FULL_SYNC_HOURS.
+--
+-- All timestamps stored UTC.
+CREATE TABLE IF NOT EXISTS m365_delta_links (
+    company_id INT NOT NULL,
+    resource VARCHAR(64) NOT NULL,
+    delta_link TEXT NOT NULL,
+    full_synced_at DATETIME NOT NULL COMMENT 'UTC',
+    updated_at DATETIME NOT NULL COMMENT 'UTC',
+    PRIMARY KEY (company_id, resource),
+    FOREIGN KEY (company_id) REFERENCES companies(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
@@ -0,0 +1,242 @@
+-- Generated by scripts/generate_migration_baseline.py; do not edit.
+BEGIN TRANSACTION;
+CREATE TABLE chat_ticket_reply_links (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    room_id INT NOT NULL,
+    ticket_id INT NOT NULL,
+    chat_message_id INT NULL,
+    ticket_reply_id INT NULL,
+    sync_direction VARCHAR(32) NOT NULL,
+    created_at TEXT NULL
+);
+CREATE TABLE company_app_prices (
+  company_id INT NOT NULL,
+  app_id INT NOT NULL,
+  price DECIMAL(10,2) NOT NULL,
+  PRIMARY KEY (company_id, app_id),
+  FOREIGN KEY (company_id) REFERENCES companies(id),
+  FOREIGN KEY (app_id) REFERENCES apps(id)
+);
+CREATE TABLE defender_exclusion_list_companies (
+  exclusion_list_id INT NOT NULL,
+  company_id INT NOT NULL,
+  PRIMARY KEY (exclusion_list_id, company_id),
+  CONSTRAINT fk_defender_exclusion_list_assignment FOREIGN KEY (exclusion_list_id) REFERENCES defender_exclusion_lists(id) ON DELETE CASCADE,
+  CONSTRAINT fk_defender_exclusion_list_company FOREIGN KEY (company_id) REFERENCES companies(id) ON DELETE CASCADE
+);
+CREATE TABLE defender_exclusion_list_items (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  exclusion_list_id INT NOT NULL,
+  exclusion_type VARCHAR(16) NOT NULL,
+  value VARCHAR(1000) NOT NULL,
+  CONSTRAINT fk_defender_exclusion_list_item FOREIGN KEY (exclusion_list_id) REFERENCES defender_exclusion_lists(id) ON DELETE CASCADE
+);
+CREATE TABLE external_api_settings (
+  company_id INTEGER PRIMARY KEY,
+  xero_endpoint VARCHAR(255),
+  xero_api_key VARCHAR(255),
+  syncro_endpoint VARCHAR(255),
+  syncro_api_key VARCHAR(255),
+  FOREIGN KEY (company_id) REFERENCES companies(id)
+);
+CREATE TABLE form_permissions (
+  form_id INT NOT NULL,
+  user_id INT NOT NULL,
+  PRIMARY KEY (form_id, user_id),
+  FOREIGN KEY (form_id) REFERENCES forms(id) ON DELETE CASCADE,
+  FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+CREATE TABLE group_licenses (
+  group_id INT NOT NULL,
+  license_id INT NOT NULL,
+  PRIMARY KEY (group_id, license_id),
+  FOREIGN KEY (group_id) REFERENCES office_groups(id) ON DELETE CASCADE,
+  FOREIGN KEY (license_id) REFERENCES licenses(id) ON DELETE CASCADE
+);
+CREATE TABLE knowledge_base_article_companies (
+    article_id INT NOT NULL,
+    company_id INT NOT NULL,
+    require_admin TINYINT(1) NOT NULL DEFAULT 0,
+    PRIMARY KEY (article_id, company_id, require_admin),
+    CONSTRAINT fk_kb_article_companies_article FOREIGN KEY (article_id) REFERENCES knowledge_base_articles(id) ON DELETE CASCADE,
+    CONSTRAINT fk_kb_article_companies_company FOREIGN KEY (company_id) REFERENCES companies(id) ON DELETE CASCADE
+);
+CREATE TABLE knowledge_base_article_users (
+    article_id INT NOT NULL,
+    user_id INT NOT NULL,
+    PRIMARY KEY (article_id, user_id),
+    CONSTRAINT fk_kb_article_users_article FOREIGN KEY (article_id) REFERENCES knowledge_base_articles(id) ON DELETE CASCADE,
+    CONSTRAINT fk_kb_article_users_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+CREATE TABLE knowledge_base_section_companies (
+    section_id INT NOT NULL,
+    company_id INT NOT NULL,
+    PRIMARY KEY (section_id, company_id),
+    CONSTRAINT fk_kb_section_companies_section FOREIGN KEY (section_id) REFERENCES knowledge_base_sections(id) ON DELETE CASCADE,
+    CONSTRAINT fk_kb_section_companies_company FOREIGN KEY (company_id) REFERENCES companies(id) ON DELETE CASCADE
+);
+CREATE TABLE m365_best_practice_company_exclusions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    company_id INT NOT NULL,
+    check_id VARCHAR(100) NOT NULL
+);
+CREATE TABLE m365_best_practice_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    company_id INT NOT NULL,
+    check_id VARCHAR(100) NOT NULL,
+    check_name VARCHAR(255) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'unknown',
+    details TEXT,
+    run_at TEXT NOT NULL,
+    CONSTRAINT chk_m365_bp_status CHECK (status IN ('pass', 'fail', 'unknown', 'not_applicable'))
+);
+CREATE TABLE m365_best_practice_settings (
+    check_id VARCHAR(100) NOT NULL PRIMARY KEY,
+    enabled TINYINT(1) NOT NULL DEFAULT 1,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE "m365_permission_check_results" (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    company_id INT NOT NULL,
+    app_id VARCHAR(100) NOT NULL,
+    app_name VARCHAR(255) NOT NULL,
+    role_id VARCHAR(100) NOT NULL,
+    role_name VARCHAR(255) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'unknown',
+    checked_at TEXT NOT NULL,
+    CONSTRAINT chk_m365_perm_status CHECK (status IN ('pass', 'fail', 'unknown', 'not_supported'))
+);
+CREATE TABLE matrix_sync_state (
+  id INT NOT NULL DEFAULT 1 PRIMARY KEY,
+  next_batch TEXT NULL,
+  updated_at TEXT NULL
+);
+CREATE TABLE office_group_members (
+  group_id INT NOT NULL,
+  staff_id INT NOT NULL,
+  PRIMARY KEY (group_id, staff_id),
+  FOREIGN KEY (group_id) REFERENCES office_groups(id) ON DELETE CASCADE,
+  FOREIGN KEY (staff_id) REFERENCES staff(id) ON DELETE CASCADE
+);
+CREATE TABLE order_sms_subscriptions (
+  order_number VARCHAR(20) NOT NULL,
+  user_id INT NOT NULL,
+  PRIMARY KEY (order_number, user_id),
+  FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+CREATE TABLE password_tokens (
+  token VARCHAR(64) PRIMARY KEY,
+  user_id INT NOT NULL,
+  expires_at TEXT NOT NULL,
+  used TINYINT(1) NOT NULL DEFAULT 0,
+  FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+CREATE TABLE shop_product_exclusions (
+  product_id INT NOT NULL,
+  company_id INT NOT NULL,
+  PRIMARY KEY (product_id, company_id),
+  FOREIGN KEY (product_id) REFERENCES shop_products(id) ON DELETE CASCADE,
+  FOREIGN KEY (company_id) REFERENCES companies(id) ON DELETE CASCADE
+);
+CREATE TABLE shop_product_featured_companies (
+  product_id INT NOT NULL,
+  company_id INT NOT NULL,
+  PRIMARY KEY (product_id, company_id),
+  FOREIGN KEY (product_id) REFERENCES shop_products(id) ON DELETE CASCADE,
+  FOREIGN KEY (company_id) REFERENCES companies(id) ON DELETE CASCADE
+);
+CREATE TABLE singleton_jobs (
+    job_name VARCHAR(191) NOT NULL PRIMARY KEY,
+    owner_id VARCHAR(191) NOT NULL,
+    expires_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE site_settings (
+  id INTEGER PRIMARY KEY,
+  company_name VARCHAR(255),
+  login_logo LONGTEXT,
+  sidebar_logo LONGTEXT
+, favicon LONGTEXT, pdf_cover_image VARCHAR(500) DEFAULT NULL);
+INSERT INTO "site_settings" VALUES(1,NULL,NULL,NULL,NULL,NULL);
+CREATE TABLE staff_licenses (
+  staff_id INT NOT NULL,
+  license_id INT NOT NULL,
+  PRIMARY KEY (staff_id, license_id),
+  FOREIGN KEY (staff_id) REFERENCES staff(id),
+  FOREIGN KEY (license_id) REFERENCES licenses(id)
+);
+CREATE TABLE staff_verification_codes (
+  staff_id INTEGER PRIMARY KEY,
+  code VARCHAR(6) NOT NULL,
+  created_at TEXT NOT NULL, admin_name VARCHAR(255) NULL,
+  FOREIGN KEY (staff_id) REFERENCES staff(id) ON DELETE CASCADE
+);
+CREATE TABLE stock_feed (
+  sku VARCHAR(255) PRIMARY KEY,
+  product_name VARCHAR(255) NOT NULL,
+  product_name2 VARCHAR(255) NULL,
+  rrp DECIMAL(10,2) NULL,
+  category_name VARCHAR(255) NULL,
+  on_hand_nsw INT NOT NULL DEFAULT 0,
+  on_hand_qld INT NOT NULL DEFAULT 0,
+  on_hand_vic INT NOT NULL DEFAULT 0,
+  on_hand_sa INT NOT NULL DEFAULT 0,
+  dbp DECIMAL(10,2) NULL,
+  weight DECIMAL(10,2) NULL,
+  length DECIMAL(10,2) NULL,
+  width DECIMAL(10,2) NULL,
+  height DECIMAL(10,2) NULL,
+  pub_date DATE NULL,
+  warranty_length VARCHAR(255) NULL,
+  manufacturer VARCHAR(255) NULL,
+  image_url VARCHAR(2048) NULL
+);
+CREATE TABLE tray_ticket_question_conditions (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  question_id INT NOT NULL,
+  parent_question_id INT NOT NULL,
+  operator VARCHAR(16) NOT NULL DEFAULT 'equals',
+  expected_value VARCHAR(255) NOT NULL DEFAULT '',
+  CONSTRAINT fk_ttqc_question FOREIGN KEY (question_id)
+    REFERENCES tray_ticket_questions (id) ON DELETE CASCADE,
+  CONSTRAINT fk_ttqc_parent FOREIGN KEY (parent_question_id)
+    REFERENCES tray_ticket_questions (id) ON DELETE CASCADE
+);
+CREATE TABLE user_companies (
+  user_id INT NOT NULL,
+  company_id INT NOT NULL,
+  can_manage_licenses TINYINT(1) DEFAULT 0,
+  can_manage_staff TINYINT(1) DEFAULT 0,
+  PRIMARY KEY (user_id, company_id),
+  FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+  FOREIGN KEY (company_id) REFERENCES companies(id)
+);
+CREATE INDEX idx_kb_section_companies_section ON knowledge_base_section_companies (section_id);
+CREATE INDEX idx_kb_section_companies_company ON knowledge_base_section_companies (company_id);
+CREATE INDEX idx_shop_product_exclusions_company_product
+    ON shop_product_exclusions (company_id, product_id);
+CREATE UNIQUE INDEX uq_m365_bp_check
+    ON m365_best_practice_results (company_id, check_id);
+CREATE INDEX idx_m365_bp_company
+    ON m365_best_practice_results (company_id);
+CREATE INDEX idx_m365_bp_run_at
+    ON m365_best_practice_results (company_id, run_at);
+CREATE UNIQUE INDEX uq_m365_bp_company_excl
+    ON m365_best_practice_company_exclusions (company_id, check_id);
+CREATE INDEX idx_m365_bp_excl_company
+    ON m365_best_practice_company_exclusions (company_id);
+CREATE UNIQUE INDEX uq_m365_perm_check
+    ON m365_permission_check_results (company_id, app_id, role_id);
+CREATE INDEX idx_m365_perm_company
+    ON m365_permission_check_results (company_id);
+CREATE INDEX idx_singleton_jobs_expires
+    ON singleton_jobs (expires_at);
+CREATE INDEX idx_tray_ticket_question_conditions_question
+  ON tray_ticket_question_conditions (question_id);
+CREATE UNIQUE INDEX uq_chat_ticket_link_message ON chat_ticket_reply_links (chat_message_id);
+CREATE UNIQUE INDEX uq_chat_ticket_link_reply ON chat_ticket_reply_links (ticket_reply_id);
+CREATE INDEX idx_chat_ticket_link_room ON chat_ticket_reply_links (room_id);
+CREATE INDEX idx_chat_ticket_link_ticket ON chat_ticket_reply_links (ticket_id);
+DELETE FROM "sqlite_sequence";
+INSERT INTO "sqlite_sequence" VALUES('m365_permission_check_results',0);
+COMMIT;
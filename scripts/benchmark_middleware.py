@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: per-request overhead of the HTTP middleware stack.
+
+Usage:
+    SESSION_SECRET=x python scripts/benchmark_middleware.py [requests]
+
+Why: every middleware in ``app.security`` runs on every request, so a few
+microseconds of wrapping overhead in each one adds up across the stack.  This
+script mounts the same middlewares ``app.main`` installs (with settings that
+keep them hermetic: in-memory rate limits, no database, no outbound calls) in
+front of a trivial route and compares the time per request against the bare
+route.  Requests are driven directly through the ASGI interface so no HTTP
+client or socket cost is included.
+
+Run it on two checkouts to compare implementations of the middlewares.
+"""
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import FastAPI  # noqa: E402
+from loguru import logger  # noqa: E402
+
+from app.security.cache_control import CacheControlMiddleware  # noqa: E402
+from app.security.csrf import CSRFMiddleware  # noqa: E402
+from app.security.ip_whitelist import IPWhitelistMiddleware  # noqa: E402
+from app.security.plausible_tracking import PlausibleTrackingMiddleware  # noqa: E402
+from app.security.rate_limiter import (  # noqa: E402
+    EndpointRateLimiter,
+    EndpointRateLimiterMiddleware,
+    RateLimiterMiddleware,
+    SimpleRateLimiter,
+)
+from app.security.request_logger import RequestLoggingMiddleware  # noqa: E402
+from app.security.security_headers import SecurityHeadersMiddleware  # noqa: E402
+
+ROUNDS = 5
+
+
+def build_app(*, with_middleware: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    if not with_middleware:
+        return app
+
+    # Same order as app.main: the last middleware added runs first.
+    app.add_middleware(
+        IPWhitelistMiddleware,
+        whitelist=["127.0.0.0/8"],
+        protected_paths=["/"],
+    )
+    app.add_middleware(SecurityHeadersMiddleware, exempt_paths=("/static",))
+    app.add_middleware(RequestLoggingMiddleware, exempt_paths=("/static",), profile_queries=False)
+    endpoint_limiter = EndpointRateLimiter()
+    endpoint_limiter.add_limit("/api/auth/login", "POST", limit=5, window_seconds=900)
+    app.add_middleware(EndpointRateLimiterMiddleware, endpoint_limiter=endpoint_limiter)
+    app.add_middleware(
+        RateLimiterMiddleware,
+        rate_limiter=SimpleRateLimiter(limit=10**9, window_seconds=1),
+    )
+    app.add_middleware(CacheControlMiddleware, exempt_paths=("/static",))
+    app.add_middleware(CSRFMiddleware)
+    app.add_middleware(PlausibleTrackingMiddleware, exempt_paths=("/static",))
+    return app
+
+
+async def _request(app: FastAPI) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"benchmark"), (b"user-agent", b"benchmark")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+        "state": {},
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"Unexpected status {message['status']}")
+
+    await app(scope, receive, send)
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    """Return the median time per request, in microseconds, over ``ROUNDS`` runs."""
+
+    for _ in range(min(requests, 200)):
+        await _request(app)
+    samples = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for _ in range(requests):
+            await _request(app)
+        samples.append((time.perf_counter() - started) / requests * 1_000_000)
+    return statistics.median(samples)
+
+
+async def run(requests: int) -> None:
+    bare = await measure(build_app(with_middleware=False), requests)
+    stacked = await measure(build_app(with_middleware=True), requests)
+    print(f"requests per round:   {requests}")
+    print(f"bare route:           {bare:8.1f} us/request")
+    print(f"with middleware:      {stacked:8.1f} us/request")
+    print(f"middleware overhead:  {stacked - bare:8.1f} us/request")
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = argv or sys.argv[1:]
+    requests = int(args[0]) if args else 2000
+    # Drop log sinks so the request log lines are formatted but not written.
+    logger.remove()
+    asyncio.run(run(requests))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Build the content-hashed static asset manifest ahead of a restart.
+
+Usage:
+    python scripts/build_static_assets.py
+
+Why: the application builds the manifest in the background at startup, but
+the first build brotli-compresses every asset and takes a while.  Running
+this during an upgrade means workers start with the hashed copies and their
+``.br``/``.gz`` siblings already in place; only files that changed since the
+previous build are copied and compressed.
+
+Exit code: 0 = manifest written; 1 = build failed.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.config import get_templates_config  # noqa: E402
+from app.services.static_assets import build_static_manifest  # noqa: E402
+
+
+def main() -> int:
+    templates_config = get_templates_config()
+    try:
+        manifest = build_static_manifest(
+            templates_config.static_path,
+            templates_config.static_build_path,
+        )
+    except OSError as exc:
+        print(f"ERROR: failed to build static assets: {exc}", file=sys.stderr)
+        return 1
+    print(f"Built {len(manifest.assets)} static assets into {templates_config.static_build_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Regenerate the squashed migration baseline loaded into empty databases.
+
+The script applies every file in migrations/ to a scratch database, dumps the
+resulting schema and seed data to migrations/baseline/<backend>.sql and writes
+the list of migrations it covers to migrations/baseline/<backend>.json.
+
+  sqlite  Uses a temporary database file; no configuration needed.
+  mysql   Uses the DB_* settings from the environment/.env and a scratch
+          database (default: <DB_NAME>_baseline) that is dropped and recreated.
+
+Usage:
+  python scripts/generate_migration_baseline.py [--backend sqlite|mysql]
+                                                [--scratch-database NAME]
+  python scripts/generate_migration_baseline.py --check
+
+--check reports, for each committed baseline, how many migrations have been
+added since it was generated, and exits non-zero if a baseline is unusable.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Settings insists on these secrets; generating a baseline never uses them.
+os.environ.setdefault("SESSION_SECRET", "migration-baseline")
+os.environ.setdefault("TOTP_ENCRYPTION_KEY", "A" * 64)
+
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import Database  # noqa: E402
+from app.core.migration_baseline import (  # noqa: E402
+    baseline_paths,
+    dump_mysql,
+    dump_sqlite,
+    load_baseline,
+    write_baseline,
+)
+
+BACKENDS = ("sqlite", "mysql")
+
+
+def _migration_names(database: Database) -> list[str]:
+    return sorted(path.name for path in database._get_migrations_dir().glob("*.sql"))
+
+
+async def _generate_sqlite() -> tuple[list[str], str]:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = Database()
+        database._use_sqlite = True
+        database._get_sqlite_path = lambda: Path(tmpdir) / "baseline.db"
+        try:
+            await database.run_migrations(use_baseline=False)
+            async with database.acquire() as conn:
+                sql = await dump_sqlite(conn)
+        finally:
+            await database.disconnect()
+    return _migration_names(database), sql
+
+
+async def _generate_mysql(scratch_database: str | None) -> tuple[list[str], str]:
+    import aiomysql
+
+    settings = get_settings()
+    if not (settings.database_host and settings.database_user and settings.database_name):
+        raise SystemExit("MySQL baseline generation needs DB_HOST, DB_USER and DB_NAME.")
+    scratch = scratch_database or f"{settings.database_name}_baseline"
+    if scratch == settings.database_name:
+        raise SystemExit("The scratch database must not be the application database.")
+
+    admin_conn = await aiomysql.connect(
+        host=settings.database_host,
+        user=settings.database_user,
+        password=settings.database_password,
+        autocommit=True,
+    )
+    try:
+        async with admin_conn.cursor() as cursor:
+            await cursor.execute(f"DROP DATABASE IF EXISTS `{scratch}`")
+
+        database = Database()
+        database._settings = settings.model_copy(update={"database_name": scratch})
+        database._use_sqlite = False
+        try:
+            await database.run_migrations(use_baseline=False)
+            async with database.acquire() as conn:
+                sql = await dump_mysql(conn)
+        finally:
+            await database.disconnect()
+
+        async with admin_conn.cursor() as cursor:
+            await cursor.execute(f"DROP DATABASE IF EXISTS `{scratch}`")
+    finally:
+        admin_conn.close()
+    return _migration_names(database), sql
+
+
+def _check() -> int:
+    database = Database()
+    migrations_dir = database._get_migrations_dir()
+    names = set(_migration_names(database))
+    status = 0
+    for backend in BACKENDS:
+        sql_path, _ = baseline_paths(migrations_dir, backend)
+        baseline = load_baseline(migrations_dir, backend)
+        if baseline is None:
+            if sql_path.exists():
+                print(f"[ERROR] {backend}: baseline manifest is missing or corrupt")
+                status = 1
+            else:
+                print(f"[INFO] {backend}: no baseline committed")
+            continue
+        missing = sorted(set(baseline.migrations) - names)
+        if missing:
+            print(
+                f"[ERROR] {backend}: baseline references migrations that no longer exist: "
+                + ", ".join(missing)
+            )
+            status = 1
+            continue
+        newer = len(names - set(baseline.migrations))
+        print(
+            f"[INFO] {backend}: baseline covers {len(baseline.migrations)} migrations; "
+            f"{newer} newer migration(s) replay on fresh databases"
+        )
+    return status
+
+
+async def _main(args: argparse.Namespace) -> int:
+    if args.check:
+        return _check()
+    if args.backend == "sqlite":
+        names, sql = await _generate_sqlite()
+    else:
+        names, sql = await _generate_mysql(args.scratch_database)
+    sql_path, manifest_path = write_baseline(
+        Database()._get_migrations_dir(), args.backend, names, sql
+    )
+    print(f"[INFO] Wrote {sql_path.relative_to(ROOT)} ({len(names)} migrations)")
+    print(f"[INFO] Wrote {manifest_path.relative_to(ROOT)}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backend", choices=BACKENDS, default="sqlite")
+    parser.add_argument("--scratch-database", help="MySQL scratch database name")
+    parser.add_argument("--check", action="store_true", help="Report baseline freshness")
+    return asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
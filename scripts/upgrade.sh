@@ -571,6 +571,16 @@ install_dependencies() {
   fi
 }
 
+build_static_assets() {
+  if [[ -z "$PYTHON_INTERPRETER" ]]; then
+    return 0
+  fi
+  # Pre-build hashed, precompressed static assets so workers start with them.
+  if ! "$PYTHON_INTERPRETER" "${SCRIPT_DIR}/build_static_assets.py"; then
+    echo "Warning: Static asset build failed; the application will build it at startup." >&2
+  fi
+}
+
 run_restart_helper() {
   case "$RESTART_MODE" in
     graceful)
@@ -1085,6 +1095,7 @@ if [[ "$PRE_PULL_HEAD" != "$POST_PULL_HEAD" ]]; then
     RESTART_MODE=$(resolve_effective_upgrade_mode "$REQUESTED_UPGRADE_MODE" "$changed_files")
     echo "Applying upgrade using ${RESTART_MODE} mode (requested: ${REQUESTED_UPGRADE_MODE}; reason: ${UPGRADE_REASON})."
     install_dependencies
+    build_static_assets
     build_tray_app
     if [[ "$AUTO_FALLBACK" -eq 0 ]]; then
       run_restart_helper
@@ -1102,6 +1113,7 @@ elif [[ "$FORCE_RESTART" == "1" ]]; then
   echo "No repository changes detected but FORCE_RESTART=1; reinstalling dependencies and restarting service."
   update_version_file
   install_dependencies
+  build_static_assets
   build_tray_app
   if [[ "$AUTO_FALLBACK" -eq 0 ]]; then
     run_restart_helper
@@ -13,6 +13,8 @@ os.environ.setdefault("DB_HOST", "localhost")
 os.environ.setdefault("DB_USER", "user")
 os.environ.setdefault("DB_PASSWORD", "password")
 os.environ.setdefault("DB_NAME", "testdb")
+# Keep app startup from fingerprinting app/static into the build directory.
+os.environ.setdefault("STATIC_FINGERPRINTING_ENABLED", "false")
 
 
 async def drain_provision_background_tasks() -> None:
@@ -1,3 +1,6 @@
+import asyncio
+import json
+
 import pytest
 
 from app.services.realtime import RefreshNotifier
@@ -12,18 +15,31 @@ def anyio_backend() -> str:
 
 
 class StubWebSocket:
-    def __init__(self, *, fail: bool = False) -> None:
+    def __init__(self, *, fail: bool = False, stall: bool = False) -> None:
         self.accepted = False
+        self.closed_with: int | None = None
         self.sent_messages: list[dict] = []
         self._fail = fail
+        self._stall = stall
 
     async def accept(self) -> None:
         self.accepted = True
 
-    async def send_json(self, payload: dict) -> None:
+    async def send_text(self, message: str) -> None:
         if self._fail:
             raise RuntimeError("socket closed")
-        self.sent_messages.append(payload)
+        if self._stall:
+            await asyncio.Event().wait()
+        self.sent_messages.append(json.loads(message))
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+
+
+async def _settle() -> None:
+    # Let the per-connection sender tasks drain their queues.
+    for _ in range(5):
+        await asyncio.sleep(0)
 
 
 async def test_broadcast_refresh_delivers_payload() -> None:
@@ -33,6 +49,7 @@ async def test_broadcast_refresh_delivers_payload() -> None:
     await notifier.connect(websocket)  # type: ignore[arg-type]
 
     result = await notifier.broadcast_refresh(reason="test")
+    await _settle()
 
     assert websocket.accepted is True
     assert len(websocket.sent_messages) == 1
@@ -54,12 +71,90 @@ async def test_broadcast_refresh_cleans_up_failed_sockets() -> None:
     await notifier.connect(failing_websocket)  # type: ignore[arg-type]
 
     result = await notifier.broadcast_refresh()
+    await _settle()
 
     assert result.attempted == 1
-    assert result.delivered == 0
-    assert result.dropped == 1
+    assert failing_websocket.sent_messages == []
 
     # A second broadcast should no longer attempt to use the failed websocket.
     second = await notifier.broadcast_refresh()
     assert second.attempted == 0
 
+
+async def test_topic_events_only_reach_subscribed_connections() -> None:
+    notifier = RefreshNotifier()
+    tickets_tab = StubWebSocket()
+    chat_tab = StubWebSocket()
+    legacy_tab = StubWebSocket()
+    for websocket in (tickets_tab, chat_tab, legacy_tab):
+        await notifier.connect(websocket)  # type: ignore[arg-type]
+
+    await notifier.handle_client_message(
+        tickets_tab, json.dumps({"type": "subscribe", "topics": ["Tickets"]})  # type: ignore[arg-type]
+    )
+    await notifier.handle_client_message(
+        chat_tab, json.dumps({"type": "subscribe", "topics": ["chat:room:7"]})  # type: ignore[arg-type]
+    )
+
+    ticket_result = await notifier.broadcast_refresh(topics=["tickets", "ticket:5"])
+    everyone_result = await notifier.broadcast_refresh(reason="modules:updated")
+    await _settle()
+
+    # The legacy tab never subscribed, so it still receives everything.
+    assert ticket_result.attempted == 2
+    assert everyone_result.attempted == 3
+    assert [message.get("topics") for message in tickets_tab.sent_messages] == [
+        ["tickets", "ticket:5"],
+        None,
+    ]
+    assert [message.get("reason") for message in chat_tab.sent_messages] == ["modules:updated"]
+    assert len(legacy_tab.sent_messages) == 2
+
+    await notifier.handle_client_message(
+        tickets_tab, json.dumps({"type": "unsubscribe", "topics": ["tickets"]})  # type: ignore[arg-type]
+    )
+    assert (await notifier.broadcast_refresh(topics=["tickets"])).attempted == 1
+
+
+async def test_empty_subscription_keeps_receiving_every_event() -> None:
+    notifier = RefreshNotifier()
+    websocket = StubWebSocket()
+    await notifier.connect(websocket, user_id=3)  # type: ignore[arg-type]
+
+    await notifier.handle_client_message(
+        websocket, json.dumps({"type": "subscribe", "topics": []})  # type: ignore[arg-type]
+    )
+
+    assert (await notifier.broadcast_refresh(topics=["tickets"])).attempted == 1
+
+
+async def test_user_topics_are_limited_to_the_owning_user() -> None:
+    notifier = RefreshNotifier()
+    websocket = StubWebSocket()
+    await notifier.connect(websocket, user_id=3)  # type: ignore[arg-type]
+
+    subscribed = await notifier.subscribe(
+        websocket, ["notifications:user:4", "tickets"]  # type: ignore[arg-type]
+    )
+
+    assert subscribed == ["notifications:user:3", "tickets"]
+    assert (await notifier.broadcast_refresh(topics=["notifications:user:4"])).attempted == 0
+    assert (await notifier.broadcast_refresh(topics=["notifications:user:3"])).attempted == 1
+
+
+async def test_slow_consumers_are_dropped_without_delaying_others() -> None:
+    notifier = RefreshNotifier(send_queue_size=2)
+    slow = StubWebSocket(stall=True)
+    fast = StubWebSocket()
+    await notifier.connect(slow)  # type: ignore[arg-type]
+    await notifier.connect(fast)  # type: ignore[arg-type]
+
+    results = []
+    for index in range(4):
+        results.append(await notifier.broadcast_refresh(reason=f"event-{index}"))
+        await _settle()
+
+    assert len(fast.sent_messages) == 4
+    assert sum(result.dropped for result in results) == 1
+    assert slow.closed_with == 1013
+    assert (await notifier.broadcast_refresh()).attempted == 1
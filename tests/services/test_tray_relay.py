@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+
+from app.services.tray_relay import TrayDelivery, TrayRelay
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+class FakePubSub:
+    def __init__(self, broker: "FakeRedis") -> None:
+        self._broker = broker
+        self.messages: asyncio.Queue[dict] = asyncio.Queue()
+        self.channels: set[str] = set()
+
+    async def subscribe(self, channel: str) -> None:
+        self.channels.add(channel)
+        self._broker.subscribers.append(self)
+
+    async def unsubscribe(self, channel: str) -> None:
+        self.channels.discard(channel)
+
+    async def close(self) -> None:
+        self._broker.subscribers.remove(self)
+
+    async def get_message(self, *, ignore_subscribe_messages: bool, timeout: float):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+        self.subscribers: list[FakePubSub] = []
+
+    def pubsub(self, *, ignore_subscribe_messages: bool) -> FakePubSub:
+        return FakePubSub(self)
+
+    async def get(self, key: str):
+        return self.values.get(key)
+
+    async def set(self, key: str, value: str, *, ex: int) -> None:
+        self.values[key] = value
+
+    async def eval(self, script: str, numkeys: int, key: str, owner: str) -> int:
+        if self.values.get(key) == owner:
+            del self.values[key]
+            return 1
+        return 0
+
+    async def publish(self, channel: str, message: str) -> int:
+        receivers = [sub for sub in self.subscribers if channel in sub.channels]
+        for subscriber in receivers:
+            subscriber.messages.put_nowait({"data": message})
+        return len(receivers)
+
+
+class StubWebSocket:
+    def __init__(self, *, fail: bool = False) -> None:
+        self.sent: list[dict] = []
+        self._fail = fail
+
+    async def send_json(self, payload: dict) -> None:
+        if self._fail:
+            raise RuntimeError("socket closed")
+        self.sent.append(payload)
+
+
+async def test_local_delivery_without_redis() -> None:
+    relay = TrayRelay()
+    websocket = StubWebSocket()
+    await relay.register("device-1", websocket)
+
+    assert await relay.send("device-1", {"type": "ping"}) is TrayDelivery.DELIVERED
+    assert await relay.send("device-2", {"type": "ping"}) is TrayDelivery.QUEUED
+    assert websocket.sent == [{"type": "ping"}]
+    assert relay.stats()["local_delivered"] == 1
+    assert relay.stats()["unreachable"] == 1
+
+
+async def test_commands_reach_devices_on_other_nodes() -> None:
+    redis = FakeRedis()
+    sender = TrayRelay()
+    owner = TrayRelay()
+    await sender.start(redis_client=redis)  # type: ignore[arg-type]
+    await owner.start(redis_client=redis)  # type: ignore[arg-type]
+    websocket = StubWebSocket()
+    await owner.register("device-1", websocket)
+
+    try:
+        delivered = await sender.send("device-1", {"type": "show_notification"})
+    finally:
+        await sender.stop()
+        await owner.stop()
+
+    assert delivered is TrayDelivery.DELIVERED
+    assert websocket.sent == [{"type": "show_notification"}]
+    assert sender.stats()["relayed_delivered"] == 1
+    assert owner.stats()["received"] == 1
+    # Stopping releases the owner's presence record.
+    assert redis.values == {}
+
+
+async def test_failed_remote_send_is_reported_and_stale_presence_cleared() -> None:
+    redis = FakeRedis()
+    sender = TrayRelay()
+    owner = TrayRelay()
+    await sender.start(redis_client=redis)  # type: ignore[arg-type]
+    await owner.start(redis_client=redis)  # type: ignore[arg-type]
+    await owner.register("device-1", StubWebSocket(fail=True))
+
+    try:
+        assert await sender.send("device-1", {"type": "ping"}) is TrayDelivery.QUEUED
+        assert sender.stats()["relayed_failed"] == 1
+
+        # A node that disappeared without releasing its devices.
+        redis.values["tray:presence:device-2"] = "gone"
+        assert await sender.send("device-2", {"type": "ping"}) is TrayDelivery.QUEUED
+        assert "tray:presence:device-2" not in redis.values
+    finally:
+        await sender.stop()
+        await owner.stop()
+
+
+async def test_unregister_ignores_replaced_connections() -> None:
+    redis = FakeRedis()
+    relay = TrayRelay()
+    await relay.start(redis_client=redis)  # type: ignore[arg-type]
+    first = StubWebSocket()
+    second = StubWebSocket()
+    await relay.register("device-1", first)
+    await relay.register("device-1", second)
+
+    try:
+        await relay.unregister("device-1", first)
+        assert relay.is_connected_locally("device-1")
+        assert "tray:presence:device-1" in redis.values
+    finally:
+        await relay.stop()
+
+
+async def test_unacknowledged_remote_send_is_unconfirmed_not_queued() -> None:
+    redis = FakeRedis()
+    sender = TrayRelay()
+    owner = TrayRelay()
+    await sender.start(redis_client=redis, ack_timeout_seconds=0.05)  # type: ignore[arg-type]
+    await owner.start(redis_client=redis)  # type: ignore[arg-type]
+    websocket = StubWebSocket()
+    await owner.register("device-1", websocket)
+    # The owner delivers but its acknowledgement never arrives in time.
+    owner._redis = None
+
+    try:
+        result = await sender.send("device-1", {"type": "ping"})
+        await asyncio.sleep(0.05)
+    finally:
+        owner._redis = redis
+        await sender.stop()
+        await owner.stop()
+
+    assert result is TrayDelivery.UNCONFIRMED
+    assert websocket.sent == [{"type": "ping"}]
+    assert sender.stats()["relayed_timeouts"] == 1
+    assert sender.stats()["relayed_unconfirmed"] == 1
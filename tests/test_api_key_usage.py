@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core.reference_cache import ReferenceCache
+from app.repositories import api_keys as api_key_repo
+from app.services.api_key_usage import ApiKeyUsageRecorder
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_inactive_recorder_writes_inline(monkeypatch):
+    calls: list[tuple[int, str]] = []
+
+    async def fake_record(api_key_id: int, ip_address: str) -> None:
+        calls.append((api_key_id, ip_address))
+
+    monkeypatch.setattr(api_key_repo, "record_api_key_usage", fake_record)
+
+    await ApiKeyUsageRecorder().record(3, "203.0.113.9")
+
+    assert calls == [(3, "203.0.113.9")]
+
+
+@pytest.mark.anyio
+async def test_usage_is_aggregated_and_flushed_in_bulk(monkeypatch):
+    flushed: list[list[tuple]] = []
+
+    async def fake_apply(entries):
+        flushed.append(list(entries))
+
+    async def fail_record(*_args):
+        raise AssertionError("usage must not be written inline")
+
+    monkeypatch.setattr(api_key_repo, "apply_api_key_usage", fake_apply)
+    monkeypatch.setattr(api_key_repo, "record_api_key_usage", fail_record)
+    recorder = ApiKeyUsageRecorder()
+    recorder.start(flush_interval_seconds=3600)
+
+    for _ in range(3):
+        await recorder.record(3, "203.0.113.9")
+    await recorder.record(3, "198.51.100.1")
+    await recorder.record(4, "203.0.113.9")
+    await recorder.stop()
+
+    assert len(flushed) == 1
+    counts = {(key_id, ip): count for key_id, ip, count, _ in flushed[0]}
+    assert counts == {(3, "203.0.113.9"): 3, (3, "198.51.100.1"): 1, (4, "203.0.113.9"): 1}
+
+
+@pytest.mark.anyio
+async def test_failed_flush_keeps_counts(monkeypatch):
+    attempts: list[list[tuple]] = []
+
+    async def flaky_apply(entries):
+        attempts.append(list(entries))
+        if len(attempts) == 1:
+            raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(api_key_repo, "apply_api_key_usage", flaky_apply)
+    recorder = ApiKeyUsageRecorder()
+    recorder.start(flush_interval_seconds=3600)
+
+    await recorder.record(3, "203.0.113.9")
+    await recorder.flush()
+    await recorder.record(3, "203.0.113.9")
+    await recorder.stop()
+
+    assert [entry[2] for entry in attempts[-1]] == [2]
+
+
+@pytest.mark.anyio
+async def test_key_records_are_cached_until_edited(monkeypatch):
+    cache = ReferenceCache()
+    await cache.start()
+    monkeypatch.setattr(api_key_repo, "reference_cache", cache)
+    lookups: list[tuple] = []
+
+    async def fake_fetch_one(sql, params=None):
+        lookups.append(params)
+        return {"id": 3, "is_enabled": 1}
+
+    async def fake_fetch_all(sql, params=None):
+        return []
+
+    async def fake_execute(sql, params=None):
+        return None
+
+    monkeypatch.setattr(api_key_repo.db, "fetch_one", fake_fetch_one)
+    monkeypatch.setattr(api_key_repo.db, "fetch_all", fake_fetch_all)
+    monkeypatch.setattr(api_key_repo.db, "execute", fake_execute)
+
+    first = await api_key_repo.get_api_key_record("secret")
+    await api_key_repo.get_api_key_record("secret")
+    assert len(lookups) == 1
+    assert first["permissions"] == [] and first["ip_restrictions"] == []
+
+    await api_key_repo.update_api_key_expiry(3, None)
+    await api_key_repo.get_api_key_record("secret")
+    assert len(lookups) == 2
+    await cache.stop()
+
+
+@pytest.mark.anyio
+async def test_unknown_keys_are_not_cached(monkeypatch):
+    cache = ReferenceCache()
+    await cache.start()
+    monkeypatch.setattr(api_key_repo, "reference_cache", cache)
+    lookups: list[tuple] = []
+
+    async def fake_fetch_one(sql, params=None):
+        lookups.append(params)
+        return None
+
+    monkeypatch.setattr(api_key_repo.db, "fetch_one", fake_fetch_one)
+
+    assert await api_key_repo.get_api_key_record("random-1") is None
+    assert await api_key_repo.get_api_key_record("random-1") is None
+    assert len(lookups) == 2
+    assert cache.stats()["entries"].get(api_key_repo._CACHE_NAMESPACE, 0) == 0
+    await cache.stop()
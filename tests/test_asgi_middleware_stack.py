@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from app.security.cache_control import CacheControlMiddleware
+from app.security.csrf import CSRFMiddleware
+from app.security.request_logger import RequestLoggingMiddleware
+from app.security.security_headers import SecurityHeadersMiddleware
+
+
+def _build_streaming_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CacheControlMiddleware)
+    app.add_middleware(RequestLoggingMiddleware, profile_queries=False)
+    app.add_middleware(SecurityHeadersMiddleware)
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for index in range(3):
+                yield f"chunk-{index};".encode()
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+def _scope(method: str, path: str, headers: list[tuple[bytes, bytes]]) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"host", b"testserver"), *headers],
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+
+
+def test_streamed_chunks_pass_through_with_headers():
+    app = _build_streaming_app()
+    messages: list[dict] = []
+    scope = _scope("GET", "/stream", [(b"x-request-id", b"req-stream")])
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+
+    start = messages[0]
+    headers = {key.decode().lower(): value.decode() for key, value in start["headers"]}
+    assert start["status"] == 200
+    assert headers["x-request-id"] == "req-stream"
+    assert headers["x-frame-options"] == "DENY"
+    bodies = [message["body"] for message in messages[1:] if message.get("body")]
+    # Each chunk is forwarded as it is produced rather than buffered by a middleware.
+    assert bodies == [b"chunk-0;", b"chunk-1;", b"chunk-2;"]
+
+
+@dataclass
+class _Session:
+    csrf_token: str
+    user_id: int | None = 1
+
+
+class _SessionManager:
+    async def load_session(self, request, allow_inactive: bool = False):
+        return _Session(csrf_token="form-token")
+
+
+def test_csrf_form_body_is_replayed_to_the_handler():
+    app = FastAPI()
+    app.add_middleware(CSRFMiddleware, manager=_SessionManager())
+    received: list[bytes] = []
+
+    @app.post("/tickets/reply")
+    async def reply(request: Request):
+        received.append(await request.body())
+        form = await request.form()
+        return {"message": form["message"]}
+
+    body = b"_csrf=form-token&message=" + b"x" * 70000
+    # Sent in several chunks, as a server delivers a large form.
+    chunks = [body[index:index + 16384] for index in range(0, len(body), 16384)]
+    incoming = [
+        {"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1}
+        for index, chunk in enumerate(chunks)
+    ]
+    messages: list[dict] = []
+
+    async def receive():
+        if incoming:
+            return incoming.pop(0)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = _scope(
+        "POST",
+        "/tickets/reply",
+        [
+            (b"content-type", b"application/x-www-form-urlencoded"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    )
+    asyncio.run(app(scope, receive, send))
+
+    assert messages[0]["status"] == 200
+    assert received == [body]
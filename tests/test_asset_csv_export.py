@@ -57,3 +57,90 @@ def test_assets_page_export_option_requires_write_menu_permission(monkeypatch, m
 
     assert response.extra["can_export_assets"] is expected
     assert captured["template_name"] == "assets/index.html"
+
+
+def _patch_export_context(monkeypatch, *, user, membership, batches, field_definitions=(), cf_values=None):
+    async def fake_require_authenticated_user(request):
+        return user, None
+
+    async def fake_get_user_company(user_id, company_id):
+        return membership
+
+    async def fake_get_company_by_id(company_id):
+        return {"id": company_id, "name": "Example Co"}
+
+    async def fake_list_field_definitions():
+        return list(field_definitions)
+
+    streamed: list[int] = []
+
+    async def fake_stream_company_assets(company_id, *, batch_size=500):
+        streamed.append(company_id)
+        for batch in batches:
+            yield batch
+
+    async def fake_get_all_asset_field_values(asset_ids):
+        return {asset_id: (cf_values or {}).get(asset_id, {}) for asset_id in asset_ids}
+
+    monkeypatch.setattr(main_module, "_require_authenticated_user", fake_require_authenticated_user)
+    monkeypatch.setattr(assets_routes.user_company_repo, "get_user_company", fake_get_user_company)
+    monkeypatch.setattr(assets_routes.company_repo, "get_company_by_id", fake_get_company_by_id)
+    monkeypatch.setattr(assets_routes.asset_custom_fields_repo, "list_field_definitions", fake_list_field_definitions)
+    monkeypatch.setattr(assets_routes.asset_custom_fields_repo, "get_all_asset_field_values", fake_get_all_asset_field_values)
+    monkeypatch.setattr(assets_routes.asset_repo, "stream_company_assets", fake_stream_company_assets)
+    return streamed
+
+
+async def _read_body(response) -> str:
+    return "".join([chunk async for chunk in response.body_iterator])
+
+
+def test_assets_csv_export_streams_selected_columns(monkeypatch):
+    import asyncio
+    from decimal import Decimal
+
+    streamed = _patch_export_context(
+        monkeypatch,
+        user={"id": 7, "company_id": 11, "is_super_admin": False},
+        membership={"menu_permissions": {"menu.assets": "write"}},
+        batches=[
+            [{"id": 1, "name": "=cmd", "ram_gb": Decimal("16.00"), "status": "Online"}],
+            [{"id": 2, "name": "Laptop", "ram_gb": None, "status": None}],
+        ],
+        field_definitions=[{"id": 5, "name": "managed", "display_name": "Managed", "field_type": "checkbox"}],
+        cf_values={1: {5: True}},
+    )
+
+    async def run():
+        response = await assets_routes.export_assets_csv(
+            SimpleNamespace(), columns="name,ram_gb,cf_5,unknown"
+        )
+        return response, await _read_body(response)
+
+    response, body = asyncio.run(run())
+
+    assert streamed == [11]
+    assert response.media_type.startswith("text/csv")
+    lines = body.lstrip("﻿").splitlines()
+    assert lines == [
+        '"Name","RAM (GB)","Managed"',
+        '"\'=cmd","16","Yes"',
+        '"Laptop","",""',
+    ]
+
+
+def test_assets_csv_export_requires_write_permission(monkeypatch):
+    import asyncio
+
+    from fastapi import HTTPException
+
+    _patch_export_context(
+        monkeypatch,
+        user={"id": 7, "company_id": 11, "is_super_admin": False},
+        membership={"menu_permissions": {"menu.assets": "read"}},
+        batches=[],
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(assets_routes.export_assets_csv(SimpleNamespace(), columns=None))
+    assert exc_info.value.status_code == 403
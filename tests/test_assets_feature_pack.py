@@ -19,6 +19,7 @@ EXPECTED = {
     ("GET", "/assets"),
     ("GET", "/assets/{asset_id}"),
     ("GET", "/assets/settings"),
+    ("GET", "/assets/export.csv"),
     ("GET", "/devices"),
     ("POST", "/devices/discovered/{device_id}"),
     ("POST", "/devices/alerts"),
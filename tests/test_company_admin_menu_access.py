@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timedelta
 from decimal import Decimal
 from unittest.mock import AsyncMock
@@ -96,3 +97,112 @@ async def test_company_management_scope_denies_explicit_no_access_company_admin(
         await company_handlers._get_company_management_scope(request, user)
 
     assert exc_info.value.status_code == 403
+
+
+@pytest.mark.anyio("asyncio")
+async def test_base_context_runs_independent_lookups_concurrently(monkeypatch):
+    request = _make_request("/")
+    session = SessionData(
+        id=1,
+        user_id=5,
+        session_token="token",
+        csrf_token="csrf",
+        created_at=datetime.utcnow(),
+        expires_at=datetime.utcnow() + timedelta(hours=1),
+        last_seen_at=datetime.utcnow(),
+        ip_address="127.0.0.1",
+        user_agent="pytest",
+        active_company_id=7,
+    )
+    started: dict[str, asyncio.Event] = {
+        name: asyncio.Event() for name in ("companies", "modules", "cart", "notifications")
+    }
+
+    def _waits_for_all(name: str, result):
+        async def lookup(*_args, **_kwargs):
+            started[name].set()
+            # Completes only if every other lookup is already in flight.
+            await asyncio.wait_for(
+                asyncio.gather(*(event.wait() for event in started.values())), timeout=2
+            )
+            return result
+
+        return lookup
+
+    async def fake_load_session(req):
+        req.state.session = session
+        req.state.active_company_id = session.active_company_id
+        return session
+
+    monkeypatch.setattr(main.session_manager, "load_session", fake_load_session)
+    monkeypatch.setattr(
+        main.company_access,
+        "list_accessible_companies",
+        _waits_for_all("companies", [{"company_id": 7, "company_name": "Example"}]),
+    )
+    monkeypatch.setattr(main.user_company_repo, "get_user_company", AsyncMock(return_value={}))
+    monkeypatch.setattr(main.membership_repo, "list_effective_permissions", AsyncMock(return_value=set()))
+    monkeypatch.setattr(main.user_company_repo, "list_companies_for_user", AsyncMock(return_value=[]))
+    monkeypatch.setattr(main.modules_service, "list_modules", _waits_for_all("modules", []))
+    monkeypatch.setattr(
+        main.cart_repo,
+        "summarise_cart",
+        _waits_for_all("cart", {"item_count": 2, "total_quantity": 3, "subtotal": Decimal("9")}),
+    )
+    monkeypatch.setattr(main.notifications_repo, "count_notifications", _waits_for_all("notifications", 4))
+
+    user = {"id": 5, "email": "user@example.com", "is_super_admin": False}
+    context = await main._build_base_context(request, user)
+
+    assert context["cart_summary"]["item_count"] == 2
+    assert context["notification_unread_count"] == 4
+    assert context["available_companies"] == [{"company_id": 7, "company_name": "Example"}]
+
+
+@pytest.mark.anyio("asyncio")
+async def test_base_context_cancels_lookups_when_the_snapshot_fails(monkeypatch):
+    request = _make_request("/")
+    session = SessionData(
+        id=1,
+        user_id=5,
+        session_token="token",
+        csrf_token="csrf",
+        created_at=datetime.utcnow(),
+        expires_at=datetime.utcnow() + timedelta(hours=1),
+        last_seen_at=datetime.utcnow(),
+        ip_address="127.0.0.1",
+        user_agent="pytest",
+        active_company_id=7,
+    )
+    cancelled: list[str] = []
+
+    def _never_finishes(name: str):
+        async def lookup(*_args, **_kwargs):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(name)
+                raise
+
+        return lookup
+
+    async def fake_load_session(req):
+        req.state.active_company_id = session.active_company_id
+        return session
+
+    monkeypatch.setattr(main.session_manager, "load_session", fake_load_session)
+    async def failing_snapshot(*_args, **_kwargs):
+        # Let the lookups start before the snapshot fails.
+        await asyncio.sleep(0)
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(main, "get_request_snapshot", failing_snapshot)
+    monkeypatch.setattr(main.modules_service, "list_modules", _never_finishes("modules"))
+    monkeypatch.setattr(main.cart_repo, "summarise_cart", _never_finishes("cart"))
+    monkeypatch.setattr(main.notifications_repo, "count_notifications", _never_finishes("notifications"))
+
+    user = {"id": 5, "email": "user@example.com", "is_super_admin": False}
+    with pytest.raises(RuntimeError, match="db down"):
+        await main._build_base_context(request, user)
+
+    assert sorted(cancelled) == ["cart", "modules", "notifications"]
@@ -69,3 +69,28 @@ def test_adapt_params_for_mysql_preserves_question_in_comments():
     )
     assert "ticket_id = %s -- what about ?" in sql
     assert params == (11,)
+
+
+def test_adapt_params_for_mysql_memoises_rewritten_sql():
+    db = Database()
+    sql = "SELECT * FROM api_keys WHERE id = ? AND description = ? -- memo test"
+    before = db.sql_cache_stats()
+
+    first, _ = db._adapt_params_for_mysql(sql, (1, "a"))
+    second, _ = db._adapt_params_for_mysql(sql, [2, "b"])
+
+    after = db.sql_cache_stats()
+    assert first == second == "SELECT * FROM api_keys WHERE id = %s AND description = %s -- memo test"
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+
+
+def test_adapt_params_for_mysql_caches_named_and_positional_separately():
+    db = Database()
+    sql = "SELECT ? AS marker, :value AS named_value"
+
+    positional, _ = db._adapt_params_for_mysql(sql, (1,))
+    named, _ = db._adapt_params_for_mysql(sql, {"value": 1})
+
+    assert positional == "SELECT %s AS marker, :value AS named_value"
+    assert named == "SELECT ? AS marker, %(value)s AS named_value"
@@ -0,0 +1,147 @@
+"""Tests for the SQLite WAL backend: pooled readers and the batching writer."""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app.core.config import Settings
+from app.core.database import Database
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _sqlite_settings(**overrides) -> Settings:
+    return Settings(
+        SESSION_SECRET="test-secret",
+        TOTP_ENCRYPTION_KEY="A" * 64,
+        DB_HOST=None,
+        DB_USER=None,
+        DB_PASSWORD=None,
+        DB_NAME=None,
+        **overrides,
+    )
+
+
+def _make_db(db_path: Path, **overrides) -> Database:
+    test_db = Database()
+    test_db._settings = _sqlite_settings(**overrides)
+    test_db._use_sqlite = True
+    test_db._get_sqlite_path = lambda: db_path
+    return test_db
+
+
+@pytest.mark.anyio
+async def test_sqlite_connect_enables_wal_and_read_pool(tmp_path):
+    test_db = _make_db(tmp_path / "wal.db", SQLITE_READ_POOL_SIZE=3)
+    await test_db.connect()
+    try:
+        row = await test_db.fetch_one("PRAGMA journal_mode")
+        assert row is not None
+        assert str(next(iter(row.values()))).lower() == "wal"
+        assert len(test_db._sqlite_readers) == 3
+
+        await test_db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        with pytest.raises(Exception):
+            async with test_db._sqlite_reader() as reader:
+                await reader.execute("INSERT INTO items (name) VALUES ('nope')")
+    finally:
+        await test_db.disconnect()
+
+
+@pytest.mark.anyio
+async def test_sqlite_concurrent_writes_share_commits(tmp_path):
+    test_db = _make_db(tmp_path / "batch.db")
+    await test_db.connect()
+    try:
+        await test_db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+
+        commits = 0
+        original_commit = test_db._sqlite_conn.commit
+
+        async def counting_commit():
+            nonlocal commits
+            commits += 1
+            await original_commit()
+
+        test_db._sqlite_conn.commit = counting_commit  # type: ignore[method-assign]
+
+        row_ids = await asyncio.gather(
+            *(
+                test_db.execute_returning_lastrowid(
+                    "INSERT INTO items (name) VALUES (?)", (f"item-{index}",)
+                )
+                for index in range(50)
+            )
+        )
+
+        assert sorted(row_ids) == list(range(1, 51))
+        assert commits < 50
+        rows = await test_db.fetch_all("SELECT COUNT(*) AS total FROM items")
+        assert rows[0]["total"] == 50
+    finally:
+        await test_db.disconnect()
+
+
+@pytest.mark.anyio
+async def test_sqlite_failed_write_does_not_roll_back_batch(tmp_path):
+    test_db = _make_db(tmp_path / "isolation.db")
+    await test_db.connect()
+    try:
+        await test_db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+
+        results = await asyncio.gather(
+            test_db.execute("INSERT INTO items (name) VALUES (?)", ("first",)),
+            test_db.execute("INSERT INTO items (name) VALUES (?)", ("first",)),
+            test_db.execute_rowcount("INSERT INTO items (name) VALUES (?)", ("second",)),
+            return_exceptions=True,
+        )
+
+        assert results[0] is None
+        assert isinstance(results[1], Exception)
+        assert results[2] == 1
+        rows = await test_db.fetch_all("SELECT name FROM items ORDER BY name")
+        assert [row["name"] for row in rows] == ["first", "second"]
+    finally:
+        await test_db.disconnect()
+
+
+@pytest.mark.anyio
+async def test_sqlite_execute_inside_acquire_runs_inline(tmp_path):
+    test_db = _make_db(tmp_path / "acquire.db")
+    await test_db.connect()
+    try:
+        await test_db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        async with test_db.acquire() as conn:
+            await conn.execute("INSERT INTO items (name) VALUES ('direct')")
+            await asyncio.wait_for(
+                test_db.execute("INSERT INTO items (name) VALUES (?)", ("nested",)),
+                timeout=5,
+            )
+        rows = await test_db.fetch_all("SELECT name FROM items ORDER BY id")
+        assert [row["name"] for row in rows] == ["direct", "nested"]
+    finally:
+        await test_db.disconnect()
+
+
+def test_sqlite_runtime_survives_event_loop_changes(tmp_path):
+    test_db = _make_db(tmp_path / "loops.db")
+
+    async def setup() -> None:
+        await test_db.connect()
+        await test_db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+
+    async def write_and_read() -> list[dict]:
+        await test_db.execute("INSERT INTO items (name) VALUES (?)", ("later",))
+        return await test_db.fetch_all("SELECT name FROM items")
+
+    asyncio.run(setup())
+    rows = asyncio.run(write_and_read())
+    asyncio.run(test_db.disconnect())
+
+    assert rows == [{"name": "later"}]
+    assert not test_db.is_connected()
@@ -0,0 +1,170 @@
+"""Tests for ``Database.stream`` / ``Database.stream_batches``."""
+from __future__ import annotations
+
+from contextlib import aclosing
+from pathlib import Path
+
+import pytest
+
+from app.core.config import Settings
+from app.core.database import Database
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _sqlite_db(db_path: Path) -> Database:
+    test_db = Database()
+    test_db._settings = Settings(
+        SESSION_SECRET="test-secret",
+        TOTP_ENCRYPTION_KEY="A" * 64,
+        DB_HOST=None,
+        DB_USER=None,
+        DB_PASSWORD=None,
+        DB_NAME=None,
+        SQLITE_READ_POOL_SIZE=1,
+    )
+    test_db._use_sqlite = True
+    test_db._get_sqlite_path = lambda: db_path
+    return test_db
+
+
+@pytest.mark.anyio
+async def test_sqlite_stream_batches_and_rows(tmp_path):
+    test_db = _sqlite_db(tmp_path / "stream.db")
+    await test_db.connect()
+    try:
+        await test_db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        for index in range(7):
+            await test_db.execute("INSERT INTO items (name) VALUES (?)", (f"item-{index}",))
+
+        sizes = [
+            len(batch)
+            async for batch in test_db.stream_batches(
+                "SELECT id, name FROM items ORDER BY id", batch_size=3
+            )
+        ]
+        assert sizes == [3, 3, 1]
+
+        names = [
+            row["name"]
+            async for row in test_db.stream(
+                "SELECT name FROM items WHERE id > ? ORDER BY id", (5,), batch_size=2
+            )
+        ]
+        assert names == ["item-5", "item-6"]
+    finally:
+        await test_db.disconnect()
+
+
+@pytest.mark.anyio
+async def test_sqlite_stream_returns_reader_when_closed_early(tmp_path):
+    test_db = _sqlite_db(tmp_path / "early.db")
+    await test_db.connect()
+    try:
+        await test_db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        for _ in range(5):
+            await test_db.execute("INSERT INTO items DEFAULT VALUES")
+
+        async with aclosing(test_db.stream("SELECT id FROM items", batch_size=2)) as rows:
+            async for row in rows:
+                assert row["id"] == 1
+                break
+
+        # The single pooled reader must be available again.
+        assert await test_db.fetch_one("SELECT COUNT(*) AS total FROM items") == {"total": 5}
+    finally:
+        await test_db.disconnect()
+
+
+@pytest.mark.anyio
+async def test_stream_rejects_non_positive_batch_size(tmp_path):
+    test_db = _sqlite_db(tmp_path / "invalid.db")
+    with pytest.raises(ValueError):
+        async for _ in test_db.stream_batches("SELECT 1", batch_size=0):
+            pass
+
+
+class FakeSSCursor:
+    def __init__(self, rows):
+        self._rows = list(rows)
+        self.closed = False
+        self.executed = None
+
+    async def execute(self, sql, params=None):
+        self.executed = (sql, params)
+
+    async def fetchmany(self, size):
+        batch, self._rows = self._rows[:size], self._rows[size:]
+        return batch
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.closed = False
+        self.cursor_class = None
+
+    async def cursor(self, cursor_class=None):
+        self.cursor_class = cursor_class
+        return self._cursor
+
+    def close(self):
+        self.closed = True
+
+
+class FakePool:
+    minsize = maxsize = size = freesize = 1
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.released = []
+
+    async def acquire(self):
+        return self.conn
+
+    def release(self, conn):
+        self.released.append(conn)
+
+
+def _mysql_db(rows) -> tuple[Database, FakePool, FakeSSCursor]:
+    cursor = FakeSSCursor(rows)
+    pool = FakePool(FakeConnection(cursor))
+    test_db = Database()
+    test_db._use_sqlite = False
+    test_db._pool = pool
+    return test_db, pool, cursor
+
+
+@pytest.mark.anyio
+async def test_mysql_stream_uses_unbuffered_cursor():
+    import aiomysql
+
+    test_db, pool, cursor = _mysql_db([{"id": n} for n in range(5)])
+
+    rows = [row async for row in test_db.stream("SELECT id FROM t WHERE a = ?", (1,), batch_size=2)]
+
+    assert [row["id"] for row in rows] == [0, 1, 2, 3, 4]
+    assert pool.conn.cursor_class is aiomysql.SSDictCursor
+    assert cursor.executed == ("SELECT id FROM t WHERE a = %s", (1,))
+    assert cursor.closed and not pool.conn.closed
+    assert pool.released == [pool.conn]
+
+
+@pytest.mark.anyio
+async def test_mysql_stream_drops_connection_when_abandoned():
+    test_db, pool, cursor = _mysql_db([{"id": n} for n in range(10)])
+
+    async with aclosing(test_db.stream("SELECT id FROM t", batch_size=2)) as rows:
+        async for _ in rows:
+            break
+
+    # The unread result set is discarded with the connection rather than drained.
+    assert pool.conn.closed
+    assert not cursor.closed
+    assert pool.released == [pool.conn]
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from app.services import http_clients
+
+
+def test_clients_share_one_pool_per_integration(monkeypatch):
+    built: list[httpx.MockTransport] = []
+    opened: set[str] = set()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        # Simulate httpcore: the first request to a host opens a connection.
+        host = request.url.host
+        if host not in opened:
+            opened.add(host)
+            await request.extensions["trace"]("connection.connect_tcp.complete", {})
+        return httpx.Response(200, json={"host": host})
+
+    def build_pool(profile: http_clients.ClientProfile) -> httpx.MockTransport:
+        pool = httpx.MockTransport(handler)
+        built.append(pool)
+        return pool
+
+    monkeypatch.setattr(http_clients, "_build_pool", build_pool)
+    monkeypatch.setattr(http_clients, "_stats", {})
+
+    async def _run() -> None:
+        for _ in range(3):
+            async with http_clients.client("hudu") as client:
+                response = await client.get("https://hudu.example.com/api/v1/companies")
+                assert response.json() == {"host": "hudu.example.com"}
+        async with http_clients.client("xero", timeout=5.0) as client:
+            assert client.timeout == httpx.Timeout(5.0)
+            await client.get("https://api.xero.com/connections")
+        await http_clients.close_clients()
+
+    asyncio.run(_run())
+
+    # Closing each client left the pool open for the next one.
+    assert len(built) == 2
+    assert http_clients.client_stats() == {
+        "hudu": {"requests": 3, "connections_opened": 1, "tls_handshakes": 0, "reused": 2},
+        "xero": {"requests": 1, "connections_opened": 1, "tls_handshakes": 0, "reused": 0},
+    }
+
+
+def test_each_event_loop_gets_its_own_pool(monkeypatch):
+    built: list[object] = []
+
+    def build_pool(profile: http_clients.ClientProfile) -> httpx.MockTransport:
+        built.append(profile)
+        return httpx.MockTransport(lambda request: httpx.Response(204))
+
+    monkeypatch.setattr(http_clients, "_build_pool", build_pool)
+
+    async def _request() -> None:
+        async with http_clients.client("m365") as client:
+            await client.get("https://graph.microsoft.com/v1.0/users")
+
+    asyncio.run(_request())
+    asyncio.run(_request())
+
+    assert built == [http_clients.PROFILES["m365"]] * 2
@@ -0,0 +1,184 @@
+"""Tests for incremental Microsoft 365 syncs driven by Graph delta queries.
+
+Covers:
+- get_changed_users reads the delta pages and re-reads changed users in full
+- get_changed_users asks for a full sync when one is due or users were removed
+- scheduled staff imports apply only changed users and never remove staff
+- scheduled staff imports fall back to a full import and store a fresh link
+- changed users are relinked to licences by their assigned SKUs
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services import m365 as m365_service
+from app.services import staff_importer
+from app.services.m365 import DirectoryChanges
+
+_DELTA_LINK = "https://graph.microsoft.com/v1.0/users/delta?$deltatoken=old"
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+def _link_record(hours_ago: float) -> dict[str, Any]:
+    return {
+        "delta_link": _DELTA_LINK,
+        "full_synced_at": datetime.utcnow() - timedelta(hours=hours_ago),
+    }
+
+
+def _settings(hours: int = 24) -> SimpleNamespace:
+    return SimpleNamespace(m365_delta_full_sync_hours=hours)
+
+
+@pytest.mark.anyio
+async def test_get_changed_users_follows_pages_and_rereads_changed_users():
+    pages = {
+        _DELTA_LINK: {
+            "value": [{"id": "u1", "jobTitle": "Engineer"}],
+            "@odata.nextLink": "https://graph.microsoft.com/v1.0/users/delta?$skiptoken=p2",
+        },
+        "https://graph.microsoft.com/v1.0/users/delta?$skiptoken=p2": {
+            "value": [{"id": "u2", "accountEnabled": False}, {"id": "u1", "city": "Perth"}],
+            "@odata.deltaLink": "https://graph.microsoft.com/v1.0/users/delta?$deltatoken=new",
+        },
+    }
+
+    async def fake_graph_get(access_token: str, url: str, **_: Any) -> dict[str, Any]:
+        return pages[url]
+
+    async def fake_batch_post(access_token: str, url: str, payload: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "responses": [
+                {"id": request["id"], "status": 200, "body": {"id": request["url"].split("/")[2].split("?")[0]}}
+                for request in payload["requests"]
+            ]
+        }
+
+    with (
+        patch.object(m365_service, "get_settings", return_value=_settings()),
+        patch.object(m365_service.m365_repo, "get_delta_link", AsyncMock(return_value=_link_record(1))),
+        patch.object(m365_service, "acquire_access_token", AsyncMock(return_value="tok")),
+        patch.object(m365_service, "_graph_get", side_effect=fake_graph_get),
+        patch.object(m365_service, "_graph_post", side_effect=fake_batch_post) as mock_post,
+    ):
+        changes = await m365_service.get_changed_users(1, m365_service.STAFF_DELTA_RESOURCE)
+
+    assert changes == DirectoryChanges(
+        users=[{"id": "u1"}, {"id": "u2"}],
+        delta_link="https://graph.microsoft.com/v1.0/users/delta?$deltatoken=new",
+    )
+    requested = mock_post.await_args.args[2]["requests"]
+    assert [request["url"].split("?")[0] for request in requested] == ["/users/u1", "/users/u2"]
+    assert "accountEnabled" in requested[0]["url"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("record", "page"),
+    [
+        (None, None),
+        (_link_record(25), None),
+        (_link_record(1), {"value": [{"id": "u1", "@removed": {"reason": "deleted"}}]}),
+    ],
+    ids=["no-link", "full-sync-due", "users-removed"],
+)
+async def test_get_changed_users_requests_full_sync(record, page):
+    with (
+        patch.object(m365_service, "get_settings", return_value=_settings()),
+        patch.object(m365_service.m365_repo, "get_delta_link", AsyncMock(return_value=record)),
+        patch.object(m365_service, "acquire_access_token", AsyncMock(return_value="tok")),
+        patch.object(m365_service, "_graph_get", AsyncMock(return_value=page)),
+    ):
+        assert await m365_service.get_changed_users(1, m365_service.STAFF_DELTA_RESOURCE) is None
+
+
+@pytest.mark.anyio
+async def test_incremental_staff_import_applies_changes_without_removing_staff(monkeypatch):
+    changes = DirectoryChanges(
+        users=[{"id": "u1", "givenName": "Ada", "surname": "Lovelace", "mail": "ada@example.com"}],
+        delta_link="https://graph.microsoft.com/v1.0/users/delta?$deltatoken=new",
+    )
+    monkeypatch.setattr(m365_service, "get_credentials", AsyncMock(return_value={"tenant_id": "t"}))
+    monkeypatch.setattr(m365_service, "get_changed_users", AsyncMock(return_value=changes))
+    monkeypatch.setattr(m365_service, "get_all_users", AsyncMock())
+    save_link = AsyncMock()
+    monkeypatch.setattr(m365_service.m365_repo, "save_delta_link", save_link)
+    monkeypatch.setattr(staff_importer.staff_repo, "list_all_staff_for_import", AsyncMock(return_value=[]))
+    create = AsyncMock(return_value={"id": 9})
+    delete = AsyncMock()
+    monkeypatch.setattr(staff_importer.staff_repo, "create_staff", create)
+    monkeypatch.setattr(staff_importer.staff_repo, "delete_m365_staff_not_in", delete)
+
+    summary = await staff_importer.import_m365_contacts_for_company(1, incremental=True)
+
+    assert (summary.created, summary.updated, summary.removed) == (1, 0, 0)
+    assert create.await_args.kwargs["email"] == "ada@example.com"
+    assert create.await_args.kwargs["m365_last_sign_in"] is None
+    m365_service.get_all_users.assert_not_awaited()
+    delete.assert_not_awaited()
+    save_link.assert_awaited_once_with(
+        company_id=1,
+        resource=m365_service.STAFF_DELTA_RESOURCE,
+        delta_link=changes.delta_link,
+        full_sync=False,
+    )
+
+
+@pytest.mark.anyio
+async def test_incremental_staff_import_falls_back_to_full_import(monkeypatch):
+    monkeypatch.setattr(m365_service, "get_credentials", AsyncMock(return_value={"tenant_id": "t"}))
+    monkeypatch.setattr(m365_service, "get_changed_users", AsyncMock(return_value=None))
+    monkeypatch.setattr(m365_service, "start_directory_delta", AsyncMock(return_value="latest-link"))
+    monkeypatch.setattr(m365_service, "get_all_users", AsyncMock(return_value=[]))
+    save_link = AsyncMock()
+    monkeypatch.setattr(m365_service.m365_repo, "save_delta_link", save_link)
+    monkeypatch.setattr(staff_importer.staff_repo, "list_all_staff_for_import", AsyncMock(return_value=[]))
+    monkeypatch.setattr(staff_importer.staff_repo, "delete_m365_staff_not_in", AsyncMock(return_value=2))
+
+    summary = await staff_importer.import_m365_contacts_for_company(1, incremental=True)
+
+    assert summary.removed == 2
+    m365_service.get_all_users.assert_awaited_once_with(1)
+    save_link.assert_awaited_once_with(
+        company_id=1,
+        resource=m365_service.STAFF_DELTA_RESOURCE,
+        delta_link="latest-link",
+        full_sync=True,
+    )
+
+
+@pytest.mark.anyio
+async def test_license_changes_link_and_unlink_by_assigned_skus():
+    users = [
+        {"id": "u1", "mail": "ada@example.com", "assignedLicenses": [{"skuId": "SKU-A"}]},
+        {"id": "u2", "mail": "new@example.com", "assignedLicenses": []},
+    ]
+    staff_by_email = {"ada@example.com": {"id": 5}}
+
+    with (
+        patch.object(
+            m365_service.staff_repo,
+            "get_staff_by_company_and_email",
+            AsyncMock(side_effect=lambda company_id, email: staff_by_email.get(email)),
+        ),
+        patch.object(m365_service.staff_repo, "create_staff", AsyncMock()) as create,
+        patch.object(m365_service.license_repo, "link_staff_to_license", AsyncMock()) as link,
+        patch.object(m365_service.license_repo, "bulk_unlink_staff", AsyncMock()) as unlink,
+    ):
+        await m365_service._apply_license_changes(
+            company_id=1, users=users, assignments=[(10, "sku-a"), (11, "sku-b")]
+        )
+
+    link.assert_awaited_once_with(5, 10)
+    unlink.assert_awaited_once_with(11, [5])
+    # An unknown user holding none of the synced SKUs is not created.
+    create.assert_not_awaited()
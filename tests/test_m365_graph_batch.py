@@ -0,0 +1,113 @@
+"""Tests for Microsoft Graph JSON batching in the M365 service.
+
+Covers:
+- concurrent GETs are coalesced into $batch requests of at most 20
+- throttled batch items are retried on their own and failures stay per caller
+- mailbox user details are batched and skip forwarding rules after a 403
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from app.services import m365 as m365_service
+from app.services.m365 import M365Error
+
+
+class _FakeBatchEndpoint:
+    def __init__(self, respond) -> None:
+        self.respond = respond
+        self.batches: list[list[dict[str, Any]]] = []
+
+    async def post(self, access_token: str, url: str, payload: dict[str, Any]) -> dict[str, Any]:
+        assert url == "https://graph.microsoft.com/v1.0/$batch"
+        requests = payload["requests"]
+        self.batches.append(requests)
+        return {"responses": [dict(self.respond(request), id=request["id"]) for request in requests]}
+
+
+@pytest.mark.anyio("asyncio")
+async def test_graph_batch_coalesces_concurrent_requests():
+    endpoint = _FakeBatchEndpoint(lambda request: {"status": 200, "body": {"url": request["url"]}})
+
+    with patch.object(m365_service, "_graph_post", side_effect=endpoint.post):
+        async with m365_service._GraphBatch("tok") as batch:
+            results = await asyncio.gather(
+                *(
+                    batch.get(
+                        f"https://graph.microsoft.com/v1.0/users/u{index}/memberOf?$select=id",
+                        headers={"ConsistencyLevel": "eventual"},
+                    )
+                    for index in range(25)
+                )
+            )
+
+    assert [len(requests) for requests in endpoint.batches] == [20, 5]
+    assert results[7] == {"url": "/users/u7/memberOf?$select=id"}
+    assert endpoint.batches[0][0]["headers"] == {"ConsistencyLevel": "eventual"}
+    assert endpoint.batches[0][0]["method"] == "GET"
+
+
+@pytest.mark.anyio("asyncio")
+async def test_graph_batch_retries_throttled_items_and_isolates_failures():
+    throttled_once: set[str] = set()
+
+    def respond(request: dict[str, Any]) -> dict[str, Any]:
+        url = request["url"]
+        if url == "/users/slow" and url not in throttled_once:
+            throttled_once.add(url)
+            return {"status": 429, "headers": {"Retry-After": "0"}, "body": {}}
+        if url == "/users/missing":
+            return {"status": 404, "body": {"error": {"code": "Request_ResourceNotFound"}}}
+        return {"status": 200, "body": {"id": url}}
+
+    endpoint = _FakeBatchEndpoint(respond)
+
+    with patch.object(m365_service, "_graph_post", side_effect=endpoint.post):
+        async with m365_service._GraphBatch("tok") as batch:
+            results = await asyncio.gather(
+                batch.get("https://graph.microsoft.com/v1.0/users/ok"),
+                batch.get("https://graph.microsoft.com/v1.0/users/slow"),
+                batch.get("https://graph.microsoft.com/v1.0/users/missing"),
+                return_exceptions=True,
+            )
+
+    assert results[0] == {"id": "/users/ok"}
+    assert results[1] == {"id": "/users/slow"}
+    assert isinstance(results[2], M365Error)
+    assert results[2].http_status == 404
+    assert results[2].graph_error_code == "Request_ResourceNotFound"
+    assert [[request["url"] for request in requests] for requests in endpoint.batches] == [
+        ["/users/ok", "/users/slow", "/users/missing"],
+        ["/users/slow"],
+    ]
+
+
+@pytest.mark.anyio("asyncio")
+async def test_mailbox_user_details_skip_forwarding_rules_after_permission_denied():
+    def respond(request: dict[str, Any]) -> dict[str, Any]:
+        if request["url"].endswith("/messageRules"):
+            return {"status": 403, "body": {"error": {"code": "ErrorAccessDenied"}}}
+        user_id = request["url"].split("/")[2]
+        return {
+            "status": 200,
+            "body": {"value": [{"id": f"g-{user_id}", "mail": f"{user_id}@example.com", "mailEnabled": True}]},
+        }
+
+    endpoint = _FakeBatchEndpoint(respond)
+    users = [{"id": "u1"}, {"id": "u2"}, {"id": "u3"}]
+
+    with patch.object(m365_service, "_graph_post", side_effect=endpoint.post):
+        counts, groups = await m365_service._fetch_mailbox_user_details("tok", users)
+
+    assert counts == [0, 0, 0]
+    assert [[group["id"] for group in user_groups] for user_groups in groups] == [["g-u1"], ["g-u2"], ["g-u3"]]
+    requested = [request["url"] for requests in endpoint.batches for request in requests]
+    # Only the first user's rules were requested; every group lookup shared one batch.
+    assert [url for url in requested if url.endswith("/messageRules")] == [
+        "/users/u1/mailFolders/inbox/messageRules"
+    ]
+    assert len(endpoint.batches) == 2
@@ -0,0 +1,169 @@
+"""Tests for the migration baseline and the manifest-hash fast path."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app.core.config import Settings
+from app.core.database import Database
+from app.core.migration_baseline import (
+    dump_sqlite,
+    load_baseline,
+    manifest_hash,
+    write_baseline,
+)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _make_db(tmp_path: Path, migrations_dir: Path, name: str = "app.db") -> Database:
+    test_db = Database()
+    test_db._settings = Settings(
+        SESSION_SECRET="test-secret",
+        TOTP_ENCRYPTION_KEY="A" * 64,
+        DB_HOST=None,
+        DB_USER=None,
+        DB_PASSWORD=None,
+        DB_NAME=None,
+    )
+    test_db._use_sqlite = True
+    test_db._get_sqlite_path = lambda: tmp_path / name
+    test_db._get_migrations_dir = lambda: migrations_dir
+    return test_db
+
+
+@pytest.fixture
+def migrations_dir(tmp_path: Path) -> Path:
+    directory = tmp_path / "migrations"
+    directory.mkdir()
+    (directory / "001_widgets.sql").write_text(
+        "CREATE TABLE widgets (id INTEGER PRIMARY KEY, name TEXT);"
+        "INSERT INTO widgets (name) VALUES ('seeded');"
+    )
+    (directory / "002_gadgets.sql").write_text(
+        "CREATE TABLE gadgets (id INTEGER PRIMARY KEY);"
+    )
+    return directory
+
+
+async def _table_names(test_db: Database) -> set[str]:
+    rows = await test_db.fetch_all("SELECT name FROM sqlite_master WHERE type = 'table'")
+    return {row["name"] for row in rows}
+
+
+@pytest.mark.anyio
+async def test_unchanged_manifest_skips_migration_walk(tmp_path, migrations_dir):
+    test_db = _make_db(tmp_path, migrations_dir)
+    try:
+        await test_db.run_migrations()
+        row = await test_db.fetch_one("SELECT manifest_hash, applied_count FROM migration_manifest")
+        assert row == {
+            "manifest_hash": manifest_hash(["001_widgets.sql", "002_gadgets.sql"]),
+            "applied_count": 2,
+        }
+
+        def fail_acquire():  # pragma: no cover - must not be reached
+            raise AssertionError("fast path should not take the migration connection")
+
+        test_db.acquire = fail_acquire  # type: ignore[method-assign]
+        await test_db.run_migrations()
+    finally:
+        await test_db.disconnect()
+
+
+@pytest.mark.anyio
+async def test_new_or_deleted_migrations_trigger_walk(tmp_path, migrations_dir):
+    test_db = _make_db(tmp_path, migrations_dir)
+    try:
+        await test_db.run_migrations()
+
+        (migrations_dir / "003_sprockets.sql").write_text(
+            "CREATE TABLE sprockets (id INTEGER PRIMARY KEY);"
+        )
+        await test_db.run_migrations()
+        assert "sprockets" in await _table_names(test_db)
+
+        # Deleting a row by hand to force a re-run must defeat the fast path.
+        await test_db.execute("DROP TABLE gadgets")
+        await test_db.execute("DELETE FROM migrations WHERE name = ?", ("002_gadgets.sql",))
+        await test_db.run_migrations()
+        assert "gadgets" in await _table_names(test_db)
+    finally:
+        await test_db.disconnect()
+
+
+@pytest.mark.anyio
+async def test_empty_database_loads_baseline_then_newer_migrations(tmp_path, migrations_dir):
+    source_db = _make_db(tmp_path, migrations_dir, name="source.db")
+    try:
+        await source_db.run_migrations(use_baseline=False)
+        async with source_db.acquire() as conn:
+            dump = await dump_sqlite(conn)
+    finally:
+        await source_db.disconnect()
+
+    assert "migrations" not in dump.replace("Generated by scripts/generate_migration_baseline.py", "")
+    # Mark the baseline so the test can tell it was loaded instead of replayed.
+    dump += "CREATE TABLE from_baseline (id INTEGER);\n"
+    write_baseline(migrations_dir, "sqlite", ["001_widgets.sql", "002_gadgets.sql"], dump)
+    (migrations_dir / "003_sprockets.sql").write_text(
+        "CREATE TABLE sprockets (id INTEGER PRIMARY KEY);"
+    )
+
+    fresh_db = _make_db(tmp_path, migrations_dir, name="fresh.db")
+    try:
+        await fresh_db.run_migrations()
+        tables = await _table_names(fresh_db)
+        assert {"widgets", "gadgets", "from_baseline", "sprockets"} <= tables
+        assert await fresh_db.fetch_all("SELECT name FROM widgets") == [{"name": "seeded"}]
+        applied = await fresh_db.fetch_all("SELECT name FROM migrations ORDER BY name")
+        assert [row["name"] for row in applied] == [
+            "001_widgets.sql",
+            "002_gadgets.sql",
+            "003_sprockets.sql",
+        ]
+    finally:
+        await fresh_db.disconnect()
+
+
+@pytest.mark.anyio
+async def test_baseline_ignored_when_it_covers_unknown_migrations(tmp_path, migrations_dir):
+    write_baseline(
+        migrations_dir,
+        "sqlite",
+        ["001_widgets.sql", "099_removed.sql"],
+        "CREATE TABLE from_baseline (id INTEGER);\n",
+    )
+    test_db = _make_db(tmp_path, migrations_dir)
+    try:
+        await test_db.run_migrations()
+        tables = await _table_names(test_db)
+        assert "from_baseline" not in tables
+        assert {"widgets", "gadgets"} <= tables
+    finally:
+        await test_db.disconnect()
+
+
+def test_load_baseline_rejects_tampered_manifest(migrations_dir):
+    _, manifest_path = write_baseline(migrations_dir, "sqlite", ["001_widgets.sql"], "SELECT 1;\n")
+    assert load_baseline(migrations_dir, "sqlite").migrations == ("001_widgets.sql",)
+
+    manifest = json.loads(manifest_path.read_text())
+    manifest["migrations"].append("002_gadgets.sql")
+    manifest_path.write_text(json.dumps(manifest))
+    assert load_baseline(migrations_dir, "sqlite") is None
+    assert load_baseline(migrations_dir, "mysql") is None
+
+
+def test_committed_baselines_only_reference_existing_migrations():
+    migrations_dir = Path(__file__).resolve().parent.parent / "migrations"
+    names = {path.name for path in migrations_dir.glob("*.sql")}
+    for backend in ("sqlite", "mysql"):
+        baseline = load_baseline(migrations_dir, backend)
+        if baseline is not None:
+            assert set(baseline.migrations) <= names
@@ -0,0 +1,163 @@
+"""Tests for compiled per-user permission snapshots."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.reference_cache import ReferenceCache
+from app.repositories import company_memberships as membership_repo
+from app.repositories import roles as role_repo
+from app.repositories import user_permissions as user_permissions_repo
+from app.services import permission_snapshots
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def cache(monkeypatch):
+    cache = ReferenceCache()
+    await cache.start()
+    monkeypatch.setattr(permission_snapshots, "reference_cache", cache)
+    monkeypatch.setattr(role_repo, "reference_cache", cache)
+    monkeypatch.setattr(user_permissions_repo, "reference_cache", cache)
+    yield cache
+    await cache.stop()
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    mocks = SimpleNamespace(
+        companies=AsyncMock(return_value=[{"company_id": 7, "company_name": "Example"}]),
+        membership=AsyncMock(return_value={"company_id": 7, "can_manage_issues": False}),
+        permissions=AsyncMock(return_value={"helpdesk.technician", "bcp:edit"}),
+        assignments=AsyncMock(return_value=[{"company_id": 7, "can_manage_issues": True}]),
+    )
+    monkeypatch.setattr(
+        permission_snapshots.company_access, "list_accessible_companies", mocks.companies
+    )
+    monkeypatch.setattr(
+        permission_snapshots.user_company_repo, "get_user_company", mocks.membership
+    )
+    monkeypatch.setattr(
+        permission_snapshots.membership_repo, "list_effective_permissions", mocks.permissions
+    )
+    monkeypatch.setattr(
+        permission_snapshots.user_company_repo, "list_companies_for_user", mocks.assignments
+    )
+    return mocks
+
+
+def _request(**state):
+    return SimpleNamespace(state=SimpleNamespace(**state))
+
+
+@pytest.mark.anyio
+async def test_snapshot_answers_every_check_from_one_compile(cache, sources):
+    request = _request(active_company_id=7)
+    user = {"id": 5, "is_super_admin": False}
+
+    snapshot = await permission_snapshots.get_request_snapshot(request, user)
+    again = await permission_snapshots.get_request_snapshot(request, user)
+
+    assert again is snapshot
+    assert snapshot.has_permission("helpdesk.technician")
+    assert snapshot.has_permission("bcp:edit")
+    assert not snapshot.has_permission("company.switch_all")
+    assert snapshot.has_direct_issue_access is True
+    assert request.state.available_companies == [{"company_id": 7, "company_name": "Example"}]
+    assert request.state.active_membership == {"company_id": 7, "can_manage_issues": False}
+    assert sources.permissions.await_count == 1
+    sources.membership.assert_awaited_once_with(5, 7)
+
+
+@pytest.mark.anyio
+async def test_snapshots_are_shared_across_requests_until_role_write(cache, sources, monkeypatch):
+    user = {"id": 5, "is_super_admin": False}
+    await permission_snapshots.get_request_snapshot(_request(active_company_id=7), user)
+    await permission_snapshots.get_request_snapshot(_request(active_company_id=7), user)
+    assert sources.permissions.await_count == 1
+
+    monkeypatch.setattr(role_repo.db, "execute", AsyncMock())
+    await role_repo.delete_role(3)
+
+    await permission_snapshots.get_request_snapshot(_request(active_company_id=7), user)
+    assert sources.permissions.await_count == 2
+
+
+@pytest.mark.anyio
+async def test_revoked_user_permission_leaves_next_snapshot(cache, sources, monkeypatch):
+    granted = {"helpdesk.technician", "bcp:edit"}
+    sources.permissions.side_effect = lambda user_id: set(granted)
+
+    async def delete_permission(query, params):
+        granted.discard(params[2])
+
+    monkeypatch.setattr(
+        user_permissions_repo.db,
+        "fetch_all",
+        AsyncMock(return_value=[{"permission": "bcp:edit"}]),
+    )
+    monkeypatch.setattr(user_permissions_repo.db, "execute", AsyncMock(side_effect=delete_permission))
+    user = {"id": 5, "is_super_admin": False}
+    before = await permission_snapshots.get_request_snapshot(_request(active_company_id=7), user)
+
+    await user_permissions_repo.set_user_permissions(5, 7, [])
+
+    after = await permission_snapshots.get_request_snapshot(_request(active_company_id=7), user)
+    assert before.has_permission("bcp:edit")
+    assert not after.has_permission("bcp:edit")
+    assert after.has_permission("helpdesk.technician")
+
+
+@pytest.mark.anyio
+async def test_snapshot_key_includes_company_and_super_admin_flag(cache, sources):
+    await permission_snapshots.get_request_snapshot(_request(active_company_id=7), {"id": 5})
+    await permission_snapshots.get_request_snapshot(_request(active_company_id=8), {"id": 5})
+    admin = await permission_snapshots.get_request_snapshot(
+        _request(active_company_id=7), {"id": 5, "is_super_admin": True}
+    )
+
+    assert sources.membership.await_count == 3
+    # Super admins skip the permission queries entirely.
+    assert sources.permissions.await_count == 2
+    assert admin.has_permission("anything")
+
+
+@pytest.mark.anyio
+async def test_failed_permission_lookup_denies_without_caching(cache, sources):
+    sources.permissions.side_effect = RuntimeError("database unavailable")
+
+    snapshot = await permission_snapshots.load_permission_snapshot({"id": 5}, 7)
+
+    assert not snapshot.has_permission("helpdesk.technician")
+    assert snapshot.accessible_companies == [{"company_id": 7, "company_name": "Example"}]
+    assert cache.stats()["entries"] == {}
+
+
+@pytest.mark.anyio
+async def test_list_effective_permissions_merges_roles_and_user_permissions(monkeypatch):
+    monkeypatch.setattr(
+        membership_repo,
+        "list_memberships_for_user",
+        AsyncMock(
+            return_value=[
+                {"company_id": 1, "permissions": ["portal.access"]},
+                {"company_id": 2, "permissions": '["helpdesk.technician"]'},
+            ]
+        ),
+    )
+    direct = {1: ["bcp:edit"], 2: []}
+    monkeypatch.setattr(
+        membership_repo.user_permissions_repo,
+        "list_user_permissions",
+        AsyncMock(side_effect=lambda user_id, company_id: direct[company_id]),
+    )
+
+    permissions = await membership_repo.list_effective_permissions(5)
+
+    assert {"portal.access", "helpdesk.technician", "bcp:edit"} <= permissions
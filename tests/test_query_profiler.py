@@ -0,0 +1,135 @@
+"""Tests for per-request query profiling and repeated-statement detection."""
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import query_profiler
+from app.core.config import Settings
+from app.core.database import Database
+from app.core.query_profiler import normalise_sql, profile_queries, record_query
+from app.security.request_logger import RequestLoggingMiddleware
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def test_normalise_sql_collapses_literals_and_placeholder_lists():
+    assert normalise_sql("SELECT * FROM tickets WHERE id = 42") == normalise_sql(
+        "SELECT *\n  FROM tickets WHERE id = %s"
+    )
+    assert normalise_sql("SELECT name FROM users WHERE email = 'a@b.c'") == (
+        "SELECT name FROM users WHERE email = ?"
+    )
+    assert normalise_sql("SELECT * FROM t WHERE id IN (?, ?, ?)") == normalise_sql(
+        "SELECT * FROM t WHERE id IN (%s, %s)"
+    )
+
+
+def test_record_query_without_profile_is_noop():
+    assert query_profiler.current_profile() is None
+    record_query("SELECT 1", 0.0)
+
+
+def test_profile_groups_statements_and_flags_repeats():
+    with profile_queries("/tickets", request_id="req-1") as profile:
+        for ticket_id in range(12):
+            profile.record(f"SELECT * FROM ticket_replies WHERE ticket_id = {ticket_id}", 0.001)
+        profile.record("SELECT * FROM tickets", 0.002)
+
+    assert profile.query_count == 13
+    assert len(profile.statements) == 2
+    repeated = profile.repeated_statements(10)
+    assert repeated == [
+        {
+            "sql": "SELECT * FROM ticket_replies WHERE ticket_id = ?",
+            "count": 12,
+            "total_ms": 12.0,
+        }
+    ]
+    assert profile.repeated_statements(12) == []
+
+    # Statements issued after the block closes are not attributed to it.
+    profile.record("SELECT 1", 0.0)
+    assert profile.query_count == 13
+
+
+@pytest.mark.anyio
+async def test_database_reports_statements_to_active_profile(tmp_path):
+    test_db = Database()
+    test_db._settings = Settings(
+        SESSION_SECRET="test-secret",
+        TOTP_ENCRYPTION_KEY="A" * 64,
+        DB_HOST=None,
+        DB_USER=None,
+        DB_PASSWORD=None,
+        DB_NAME=None,
+    )
+    test_db._use_sqlite = True
+    test_db._get_sqlite_path = lambda: tmp_path / "profile.db"
+    await test_db.connect()
+    try:
+        await test_db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        with profile_queries("job") as profile:
+            for index in range(3):
+                await test_db.execute("INSERT INTO items (name) VALUES (?)", (f"item-{index}",))
+            await test_db.fetch_all("SELECT name FROM items")
+            await test_db.fetch_one("SELECT name FROM items WHERE id = ?", (1,))
+    finally:
+        await test_db.disconnect()
+
+    assert profile.query_count == 5
+    assert profile.statements["INSERT INTO items (name) VALUES (?)"].count == 3
+
+
+def test_middleware_flags_repeated_statements(monkeypatch):
+    monkeypatch.setattr(query_profiler, "_recent_flagged", query_profiler.deque(maxlen=5))
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware, profile_queries=True, repeat_threshold=3)
+
+    @app.get("/api/n-plus-one")
+    async def n_plus_one():
+        for ticket_id in range(5):
+            record_query(f"SELECT * FROM tickets WHERE id = {ticket_id}", 0.0)
+        return {"status": "ok"}
+
+    infos: list[dict] = []
+    warnings: list[tuple[str, dict]] = []
+    monkeypatch.setattr(
+        "app.security.request_logger.log_info", lambda message, **meta: infos.append(meta)
+    )
+    monkeypatch.setattr(
+        "app.security.request_logger.log_warning",
+        lambda message, **meta: warnings.append((message, meta)),
+    )
+
+    response = TestClient(app).get("/api/n-plus-one", headers={"X-Request-ID": "req-n1"})
+
+    assert response.status_code == 200
+    assert infos[-1]["db_queries"] == 5
+    assert warnings and warnings[0][1]["repeat_count"] == 5
+    flagged = query_profiler.recent_flagged_profiles()
+    assert flagged[0]["request_id"] == "req-n1"
+    assert flagged[0]["method"] == "GET"
+    assert flagged[0]["repeated"][0]["sql"] == "SELECT * FROM tickets WHERE id = ?"
+
+
+def test_middleware_profiling_can_be_disabled(monkeypatch):
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware, profile_queries=False)
+
+    @app.get("/api/ping")
+    async def ping():
+        assert query_profiler.current_profile() is None
+        return {"status": "ok"}
+
+    infos: list[dict] = []
+    monkeypatch.setattr(
+        "app.security.request_logger.log_info", lambda message, **meta: infos.append(meta)
+    )
+
+    assert TestClient(app).get("/api/ping").status_code == 200
+    assert "db_queries" not in infos[-1]
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import time
+from types import SimpleNamespace
+
+import httpx
+from redis.exceptions import RedisError
+
+from app.services import http_clients, rate_governor, rate_limit_store
+
+
+def _use_local_governor(monkeypatch, limits: str = "") -> None:
+    monkeypatch.setattr(rate_governor, "get_settings", lambda: SimpleNamespace(rate_governor_limits=limits))
+    monkeypatch.setattr(rate_governor, "get_redis_client", lambda: None)
+    monkeypatch.setattr(rate_governor, "_policy_cache", None)
+    monkeypatch.setattr(rate_governor, "_local", {})
+    monkeypatch.setattr(rate_governor, "_stats", {})
+
+
+def test_parse_limits_accepts_rates_and_bursts():
+    policies = rate_governor.parse_limits("xero=50/3, hudu=250,syncro=0,bad=fast,trello=-1")
+
+    assert policies == {
+        "xero": rate_governor.RatePolicy(per_minute=50, burst=3),
+        "hudu": rate_governor.RatePolicy(per_minute=250, burst=20),
+        "syncro": rate_governor.RatePolicy(per_minute=None),
+    }
+
+
+def test_retry_after_reads_graph_milliseconds_seconds_and_dates():
+    assert rate_governor.retry_after_seconds({"x-ms-retry-after-ms": "1500", "retry-after": "9"}) == 1.5
+    assert rate_governor.retry_after_seconds({"retry-after": "12"}) == 12.0
+    assert rate_governor.retry_after_seconds({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert rate_governor.retry_after_seconds({}) is None
+
+
+def test_tenant_key_uses_xero_tenant_and_graph_token_tenant():
+    claims = base64.urlsafe_b64encode(json.dumps({"tid": "Tenant-A"}).encode()).decode().rstrip("=")
+    graph = httpx.Request(
+        "GET",
+        "https://graph.microsoft.com/v1.0/users",
+        headers={"Authorization": f"Bearer header.{claims}.signature"},
+    )
+    xero = httpx.Request("GET", "https://api.xero.com/api.xro/2.0/Invoices", headers={"xero-tenant-id": "T1"})
+    hudu = httpx.Request("GET", "https://docs.example.com/api/v1/companies")
+
+    assert rate_governor.tenant_key("m365", graph) == "tenant-a"
+    assert rate_governor.tenant_key("xero", xero) == "t1"
+    assert rate_governor.tenant_key("hudu", hudu) == "docs.example.com"
+
+
+def test_redis_is_retried_after_a_failure_backs_off(monkeypatch):
+    _use_local_governor(monkeypatch, "hudu=600/2")
+    redis_client = object()
+    monkeypatch.setattr(rate_governor, "get_redis_client", lambda: redis_client)
+    monkeypatch.setattr(rate_governor, "_redis_retry_at", 0.0)
+    monkeypatch.setattr(rate_governor, "_REDIS_RETRY_SECONDS", 0.05)
+    blocked: list[str] = []
+
+    async def fake_block_key(client, *, key: str, seconds: float) -> None:
+        if not blocked:
+            blocked.append("failed")
+            raise RedisError("connection refused")
+        blocked.append(key)
+
+    monkeypatch.setattr(rate_governor.rate_limit_store, "block_key", fake_block_key)
+
+    assert asyncio.run(rate_governor.defer("hudu", "docs.example.com", 1.0)) == 1.0
+    # The failed write fell back to this process's bucket.
+    assert rate_governor._local["rate-governor:hudu:docs.example.com"].blocked_until > 0
+    assert rate_governor._redis() is None
+
+    time.sleep(0.06)
+    assert rate_governor._redis() is redis_client
+    asyncio.run(rate_governor.defer("hudu", "docs.example.com", 1.0))
+    assert blocked == ["failed", "rate-governor:hudu:docs.example.com"]
+
+
+def test_acquire_spaces_requests_beyond_the_burst(monkeypatch):
+    _use_local_governor(monkeypatch, "hudu=600/2")
+
+    async def _run() -> list[float]:
+        return [await rate_governor.acquire("hudu", "docs.example.com") for _ in range(3)]
+
+    waits = asyncio.run(_run())
+
+    assert waits[:2] == [0.0, 0.0]
+    assert 0.05 < waits[2] <= 0.1
+    assert asyncio.run(rate_governor.acquire("matrix", "matrix.example.com")) == 0.0
+    stats = rate_governor.governor_stats()
+    assert stats["backend"] == "local"
+    assert stats["integrations"] == {
+        "hudu": {"requests": 3, "throttled": 1, "wait_seconds": round(waits[2], 3), "retry_after": 0},
+    }
+
+
+def test_throttled_reads_are_resent_after_retry_after(monkeypatch):
+    _use_local_governor(monkeypatch)
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        if len(calls) in (1, 3):
+            return httpx.Response(429, headers={"Retry-After": "0.05"})
+        return httpx.Response(200, json={"ok": True})
+
+    monkeypatch.setattr(http_clients, "_build_pool", lambda profile: httpx.MockTransport(handler))
+
+    async def _run() -> tuple[int, int]:
+        try:
+            async with http_clients.client("xero", headers={"xero-tenant-id": "T1"}) as client:
+                read = await client.get("https://api.xero.com/connections")
+                write = await client.post("https://api.xero.com/api.xro/2.0/Invoices", json={})
+            return read.status_code, write.status_code
+        finally:
+            await http_clients.close_clients()
+
+    assert asyncio.run(_run()) == (200, 429)
+    assert calls == ["GET", "GET", "POST"]
+    assert rate_governor.governor_stats()["integrations"]["xero"]["retry_after"] == 2
+    # The back-off from the rejected POST still holds the tenant.
+    assert rate_governor._local["rate-governor:xero:t1"].blocked_until > 0
+
+
+def test_shared_buckets_use_the_redis_server_clock():
+    calls: list[tuple[str, tuple]] = []
+
+    class RecordingRedis:
+        async def eval(self, script: str, numkeys: int, *args):
+            calls.append((script, args))
+            return [1, "0.25"] if "burst" in script else "1.5"
+
+    async def _run() -> tuple[tuple[bool, float], float]:
+        redis_client = RecordingRedis()
+        taken = await rate_limit_store.acquire_token(
+            redis_client, key="rate-governor:hudu:docs", rate_per_second=10.0, burst=2
+        )
+        await rate_limit_store.block_key(redis_client, key="rate-governor:hudu:docs", seconds=3.0)
+        blocked = await rate_limit_store.blocked_for(redis_client, key="rate-governor:hudu:docs")
+        return taken, blocked
+
+    taken, blocked = asyncio.run(_run())
+
+    assert taken == (True, 0.25)
+    assert blocked == 1.5
+    assert [args for _script, args in calls] == [
+        ("rate-governor:hudu:docs", 10.0, 2),
+        ("rate-governor:hudu:docs", 3.0),
+        ("rate-governor:hudu:docs",),
+    ]
+    assert all("redis.call('TIME')" in script for script, _args in calls)
@@ -0,0 +1,208 @@
+"""Tests for the shared reference data cache and its invalidation."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.core import reference_cache as reference_cache_module
+from app.core.reference_cache import ReferenceCache
+from app.repositories import labour_types as labour_types_repo
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, int] = {}
+        self.published: list[tuple[str, str]] = []
+
+    async def incr(self, key: str) -> int:
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+    async def publish(self, channel: str, message: str) -> None:
+        self.published.append((channel, message))
+
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+
+def _counting_loader(results: list[str]):
+    calls = {"count": 0}
+
+    async def loader():
+        calls["count"] += 1
+        return {"value": results[min(calls["count"], len(results)) - 1]}
+
+    return loader, calls
+
+
+@pytest.mark.anyio
+async def test_inactive_cache_always_loads():
+    cache = ReferenceCache()
+    loader, calls = _counting_loader(["a"])
+
+    await cache.get_or_load("statuses", "all", loader)
+    await cache.get_or_load("statuses", "all", loader)
+
+    assert calls["count"] == 2
+
+
+@pytest.mark.anyio
+async def test_hits_return_copies_until_invalidated():
+    cache = ReferenceCache()
+    await cache.start()
+    loader, calls = _counting_loader(["a", "b"])
+
+    first = await cache.get_or_load("statuses", "all", loader)
+    first["value"] = "mutated"
+    second = await cache.get_or_load("statuses", "all", loader)
+    assert second == {"value": "a"}
+    assert calls["count"] == 1
+
+    await cache.invalidate("statuses")
+    assert await cache.get_or_load("statuses", "all", loader) == {"value": "b"}
+    assert cache.stats()["hits"] == 1
+    await cache.stop()
+
+
+@pytest.mark.anyio
+async def test_expired_entries_are_dropped_and_namespaces_capped(monkeypatch):
+    monkeypatch.setattr(reference_cache_module, "_MAX_ENTRIES_PER_NAMESPACE", 3)
+    clock = {"now": 100.0}
+    monkeypatch.setattr(reference_cache_module.time, "monotonic", lambda: clock["now"])
+    cache = ReferenceCache()
+    await cache.start()
+    loader, _ = _counting_loader(["a"])
+
+    await cache.get_or_load("sessions", "expired", loader, ttl_seconds=5)
+    await cache.get_or_load("sessions", "old", loader, ttl_seconds=60)
+    clock["now"] += 10
+    await cache.get_or_load("sessions", "recent", loader, ttl_seconds=60)
+    await cache.get_or_load("sessions", "old", loader, ttl_seconds=60)
+
+    # Storing past the cap purges the expired entry before evicting anything.
+    await cache.get_or_load("sessions", "new", loader, ttl_seconds=60)
+    assert list(cache._entries["sessions"]) == ["recent", "old", "new"]
+
+    # With nothing expired the least recently used entry goes.
+    await cache.get_or_load("sessions", "newest", loader, ttl_seconds=60)
+    assert list(cache._entries["sessions"]) == ["old", "new", "newest"]
+
+    # An expired entry is dropped when it is next read.
+    clock["now"] += 120
+    await cache.get_or_load("sessions", "old", loader, ttl_seconds=60)
+    assert list(cache._entries["sessions"]) == ["new", "newest", "old"]
+    await cache.stop()
+
+
+@pytest.mark.anyio
+async def test_none_results_can_skip_the_cache():
+    cache = ReferenceCache()
+    await cache.start()
+    calls = {"count": 0}
+
+    async def loader():
+        calls["count"] += 1
+        return None
+
+    await cache.get_or_load("sessions", "unknown", loader, cache_none=False)
+    await cache.get_or_load("sessions", "unknown", loader, cache_none=False)
+
+    assert calls["count"] == 2
+    assert "unknown" not in cache._entries.get("sessions", {})
+    await cache.stop()
+
+
+@pytest.mark.anyio
+async def test_invalidation_during_load_is_not_cached():
+    cache = ReferenceCache()
+    await cache.start()
+    calls = {"count": 0}
+
+    async def loader():
+        calls["count"] += 1
+        if calls["count"] == 1:
+            # A write lands while the first read is in flight.
+            await cache.invalidate("modules")
+        return calls["count"]
+
+    assert await cache.get_or_load("modules", "all", loader) == 1
+    assert await cache.get_or_load("modules", "all", loader) == 2
+    await cache.stop()
+
+
+@pytest.mark.anyio
+async def test_invalidate_bumps_version_and_publishes():
+    cache = ReferenceCache()
+    redis = FakeRedis()
+    cache._redis = redis
+    cache._enabled = True
+
+    await cache.invalidate("labour_types")
+
+    assert redis.values["reference-cache:version:labour_types"] == 1
+    channel, message = redis.published[0]
+    assert channel == "reference-cache:invalidate"
+    assert json.loads(message)["namespace"] == "labour_types"
+    assert json.loads(message)["version"] == 1
+
+
+@pytest.mark.anyio
+async def test_remote_invalidation_and_missed_messages_drop_entries():
+    cache = ReferenceCache()
+    redis = FakeRedis()
+    cache._redis = redis
+    cache._enabled = True
+    loader, calls = _counting_loader(["a", "b", "c"])
+
+    await cache.get_or_load("site_settings", "tray_icon_path", loader)
+    cache._handle_message(
+        json.dumps({"source": "other-node", "namespace": "site_settings", "version": 4})
+    )
+    await cache.get_or_load("site_settings", "tray_icon_path", loader)
+    assert calls["count"] == 2
+
+    # Own messages are ignored.
+    cache._handle_message(
+        json.dumps({"source": cache._node_id, "namespace": "site_settings", "version": 5})
+    )
+    await cache.get_or_load("site_settings", "tray_icon_path", loader)
+    assert calls["count"] == 2
+
+    # A bump whose message never arrived is caught by the version check.
+    redis.values["reference-cache:version:site_settings"] = 6
+    await cache._check_versions()
+    await cache.get_or_load("site_settings", "tray_icon_path", loader)
+    assert calls["count"] == 3
+
+
+@pytest.mark.anyio
+async def test_repository_writes_invalidate_namespace(monkeypatch):
+    cache = ReferenceCache()
+    await cache.start()
+    monkeypatch.setattr(labour_types_repo, "reference_cache", cache)
+    rows = [[{"id": 1, "code": "STD", "is_default": 1}], []]
+
+    async def fake_fetch_all(sql, params=None):
+        return rows.pop(0)
+
+    async def fake_execute(sql, params=None):
+        return None
+
+    monkeypatch.setattr(labour_types_repo.db, "fetch_all", fake_fetch_all)
+    monkeypatch.setattr(labour_types_repo.db, "execute", fake_execute)
+
+    assert len(await labour_types_repo.list_labour_types()) == 1
+    assert len(await labour_types_repo.list_labour_types()) == 1
+    await labour_types_repo.delete_labour_type(1)
+    assert await labour_types_repo.list_labour_types() == []
+    await cache.stop()
+
+
+def test_module_exports_shared_instance():
+    assert isinstance(reference_cache_module.reference_cache, ReferenceCache)
@@ -217,3 +217,78 @@ def test_redact_sensitive_rows_redacts_none_values_in_sensitive_columns():
     assert result[0]["password_hash"] == reporting._REDACTED
     assert result[0]["name"] == "Bob"
 
+
+
+# ---------------------------------------------------------------------------
+# Streaming exports
+# ---------------------------------------------------------------------------
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+async def _collect(chunks) -> str:
+    return "".join([chunk async for chunk in chunks])
+
+
+_STREAM_ROWS = [
+    {"a": 1, "b": "x,y", "c": datetime(2025, 1, 2, 3, 4, 5)},
+    {"a": 2, "b": None, "c": None},
+]
+
+
+@pytest.mark.parametrize(
+    "rows", [_STREAM_ROWS, [], [{"a": n, "b": "v", "c": None} for n in range(450)]]
+)
+@pytest.mark.parametrize(
+    ("streamer", "exporter"),
+    [("stream_csv", "export_csv"), ("stream_json", "export_json"), ("stream_xml", "export_xml")],
+)
+def test_streaming_exporters_match_buffered_output(rows, streamer, exporter):
+    columns = ["a", "b", "c"]
+    streamed = asyncio.run(_collect(getattr(reporting, streamer)(columns, _aiter(rows))))
+    expected = getattr(reporting, exporter)(columns, rows)
+    if streamer == "stream_xml" and not rows:
+        expected = expected.replace("<results />", "<results></results>")
+    assert streamed == expected
+
+
+def test_stream_query_redacts_and_caps_rows(monkeypatch):
+    requested: list[tuple[str, int]] = []
+
+    async def fake_stream(sql, params=None, *, batch_size=500):
+        requested.append((sql, batch_size))
+        for n in range(10):
+            yield {"id": n, "api_key": f"secret-{n}"}
+
+    monkeypatch.setattr(reporting.db, "stream", fake_stream)
+
+    async def run():
+        return [
+            row
+            async for row in reporting.stream_query_with_context(
+                "SELECT id, api_key FROM t WHERE company_id = {{current.company}}",
+                company_id=4,
+                max_rows=3,
+            )
+        ]
+
+    rows = asyncio.run(run())
+    assert rows == [{"id": n, "api_key": "[REDACTED]"} for n in range(3)]
+    assert requested[0][0] == "SELECT id, api_key FROM t WHERE company_id = 4"
+
+
+def test_stream_query_validates_before_executing(monkeypatch):
+    def fail_stream(*args, **kwargs):  # pragma: no cover - must not be reached
+        raise AssertionError("query should not run")
+
+    monkeypatch.setattr(reporting.db, "stream", fail_stream)
+
+    async def run():
+        async for _ in reporting.stream_query("DELETE FROM users"):
+            pass
+
+    with pytest.raises(reporting.ReportingQueryError):
+        asyncio.run(run())
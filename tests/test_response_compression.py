@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import gzip
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse
+from fastapi.testclient import TestClient
+
+from app.core import responses
+from app.core.responses import FastJSONResponse
+from app.security.compression import CompressionMiddleware, accepted_encodings
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=100, session_cookie="myportal_session")
+
+    @app.get("/large")
+    async def large():
+        return {"rows": ["ticket"] * 200}
+
+    @app.get("/page", response_class=HTMLResponse)
+    async def page():
+        return '<input type="hidden" name="_csrf" value="secret" />' + "<p>ticket</p>" * 50
+
+    @app.get("/small")
+    async def small():
+        return {"status": "ok"}
+
+    return app
+
+
+def _get(path: str, accept_encoding: str, cookies: dict[str, str] | None = None):
+    client = TestClient(_build_app(), cookies=cookies)
+    # Read the raw bytes so httpx does not decode the body for us.
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_brotli_is_preferred_when_accepted():
+    brotli = pytest.importorskip("brotli")
+    response, body = _get("/large", "gzip, deflate, br")
+
+    assert response.headers["content-encoding"] == "br"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert brotli.decompress(body).startswith(b'{"rows":["ticket"')
+
+
+def test_gzip_is_used_when_brotli_is_refused():
+    response, body = _get("/large", "gzip, br;q=0")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body).startswith(b'{"rows":["ticket"')
+
+
+def test_small_and_unnegotiated_responses_are_not_compressed():
+    small, _ = _get("/small", "br, gzip")
+    identity, body = _get("/large", "identity")
+
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in identity.headers
+    assert body.startswith(b'{"rows":')
+
+
+def test_wildcard_accepts_compression():
+    response, body = _get("/large", "*")
+
+    assert response.headers["content-encoding"] in {"br", "gzip"}
+
+
+def test_signed_in_html_is_not_compressed():
+    signed_in, body = _get("/page", "gzip", cookies={"myportal_session": "token"})
+    anonymous, _ = _get("/page", "gzip")
+    json_response, _ = _get("/large", "gzip", cookies={"myportal_session": "token"})
+
+    assert "content-encoding" not in signed_in.headers
+    assert body.startswith(b'<input type="hidden"')
+    assert anonymous.headers["content-encoding"] == "gzip"
+    assert json_response.headers["content-encoding"] == "gzip"
+
+
+def test_accepted_encodings_honours_quality_values():
+    assert accepted_encodings("gzip;q=0.5, br;q=0, deflate") == {"gzip", "deflate"}
+    assert accepted_encodings("") == set()
+    assert accepted_encodings("*") == {"br", "gzip"}
+    assert accepted_encodings("br;q=0, *") == {"gzip"}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_fast_json_response_handles_datetimes_and_decimals(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(responses, "orjson", None)
+    elif responses.orjson is None:
+        pytest.skip("orjson is not installed")
+
+    response = FastJSONResponse(
+        {
+            "created_at": datetime(2024, 5, 1, 12, 30),
+            "closed_at": datetime(2024, 5, 2, 8, 0, tzinfo=timezone.utc),
+            "hours": Decimal("1.50"),
+            "count": Decimal("3"),
+            "name": "Café",
+        }
+    )
+
+    assert response.body.decode("utf-8") == (
+        '{"created_at":"2024-05-01T12:30:00+00:00",'
+        '"closed_at":"2024-05-02T08:00:00+00:00",'
+        '"hours":1.5,"count":3,"name":"Café"}'
+    )
@@ -0,0 +1,95 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from app.services.scheduled_commands import (
+    CommandLimiter,
+    ScheduledCommand,
+    TaskRun,
+    parse_resource_limits,
+)
+
+
+async def _noop(run: TaskRun) -> None:
+    return None
+
+
+def test_every_scheduler_command_is_registered():
+    from app.services import scheduled_commands
+    from app.services import scheduler  # noqa: F401 - registers the handlers
+
+    assert scheduled_commands.get_command("sync_o365").handler is (
+        scheduled_commands.get_command("sync_m365_data").handler
+    )
+    assert scheduled_commands.get_command("imap_sync:12").name == "imap_sync:*"
+    assert scheduled_commands.get_command("m365_mail_sync:3").resource_class == "m365"
+    assert scheduled_commands.get_command("system_update").timeout_seconds is None
+    assert scheduled_commands.get_command("not_a_command") is None
+
+
+def test_parse_resource_limits_skips_malformed_entries():
+    assert parse_resource_limits("m365=6, xero=1,broken,tacticalrmm=x,huntress=0") == {
+        "m365": 6,
+        "xero": 1,
+    }
+
+
+def test_resource_class_is_shared_across_commands():
+    asyncio.run(_resource_class_case())
+
+
+async def _resource_class_case():
+    limiter = CommandLimiter({"m365": 2})
+    specs = [
+        ScheduledCommand("sync_m365_licenses", _noop, concurrency=4, resource_class="m365"),
+        ScheduledCommand("sync_m365_contacts", _noop, concurrency=4, resource_class="m365"),
+    ]
+    running = 0
+    peak = 0
+    release = asyncio.Event()
+
+    async def _run(spec: ScheduledCommand) -> None:
+        nonlocal running, peak
+        async with limiter.slot(spec):
+            running += 1
+            peak = max(peak, running)
+            await release.wait()
+            running -= 1
+
+    tasks = [asyncio.create_task(_run(specs[index % 2])) for index in range(6)]
+    await asyncio.sleep(0)
+    stats = limiter.stats()
+    assert stats["resources"]["m365"] == {"limit": 2, "running": 2, "waiting": 4}
+    release.set()
+    await asyncio.gather(*tasks)
+    assert peak == 2
+
+
+def test_timed_out_task_is_recorded_as_failed():
+    asyncio.run(_timeout_case())
+
+
+async def _timeout_case():
+    from app.services import scheduled_commands
+    from app.services.scheduler import SchedulerService
+
+    scheduler = SchedulerService()
+    task = {"id": 7, "command": "update_products", "company_id": None}
+    spec = scheduled_commands.get_command("update_products")
+
+    async def _slow(*args, **kwargs):
+        await asyncio.sleep(1)
+
+    with (
+        patch.object(
+            scheduled_commands,
+            "get_command",
+            return_value=ScheduledCommand(spec.name, spec.handler, timeout_seconds=0.01),
+        ),
+        patch("app.services.scheduler.modules_for_command", return_value=frozenset()),
+        patch("app.services.scheduler.products_service.update_products_from_feed", side_effect=_slow),
+        patch("app.services.scheduler.scheduled_tasks_repo.record_task_run", new_callable=AsyncMock) as mock_record,
+    ):
+        await scheduler._execute_task(task, force_restart=True)
+
+    assert mock_record.await_args.kwargs["status"] == "failed"
+    assert mock_record.await_args.kwargs["details"] == "Timed out after 0.01 seconds"
@@ -0,0 +1,263 @@
+"""Tests for the ``SCHEDULER_MODE=external`` job queue.
+
+The repository tests run against a temp SQLite database built from
+``migrations/342_scheduler_jobs.sql``; the service tests mock the queue.
+"""
+from __future__ import annotations
+
+import asyncio
+import tempfile
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+
+@pytest.fixture()
+def queue_db():
+    loop = asyncio.new_event_loop()
+    tmp = tempfile.TemporaryDirectory()
+    sqlite_path = Path(tmp.name) / "scheduler-jobs.db"
+
+    from app.core.database import db
+
+    original_use_sqlite = db._use_sqlite
+    original_get_path = db._get_sqlite_path
+    db._use_sqlite = True
+    db._get_sqlite_path = lambda: sqlite_path  # type: ignore[assignment]
+
+    migration = (
+        Path(__file__).resolve().parents[1] / "migrations" / "342_scheduler_jobs.sql"
+    ).read_text()
+
+    async def _bootstrap():
+        await db.connect()
+        for statement in db._split_sql_statements(migration):
+            await db.execute(db._adapt_sql_for_sqlite(statement))
+
+    loop.run_until_complete(_bootstrap())
+
+    yield loop.run_until_complete
+
+    loop.run_until_complete(db.disconnect())
+    loop.close()
+    db._use_sqlite = original_use_sqlite
+    db._get_sqlite_path = original_get_path  # type: ignore[assignment]
+    tmp.cleanup()
+
+
+def test_queue_keeps_one_outstanding_run_per_key(queue_db):
+    from app.repositories import scheduler_jobs as repo
+
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    assert queue_db(repo.enqueue_job("task:5", task_id=5, now=now)) is True
+    assert queue_db(repo.enqueue_job("task:5", task_id=5, now=now)) is False
+
+    [job] = queue_db(
+        repo.claim_jobs(worker_identity="worker-a", limit=5, lease_seconds=60, now=now)
+    )
+    assert job["job_key"] == "task:5"
+    assert job["task_id"] == 5
+    assert job["attempts"] == 1
+    # Still outstanding while it runs.
+    assert queue_db(repo.enqueue_job("task:5", task_id=5, now=now)) is False
+
+    assert queue_db(repo.finish_job(job["id"], "worker-a", status="succeeded", now=now))
+    assert queue_db(repo.enqueue_job("task:5", task_id=5, now=now)) is True
+
+
+def test_expired_leases_are_reclaimed_until_attempts_run_out(queue_db):
+    from app.repositories import scheduler_jobs as repo
+
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    queue_db(repo.enqueue_job("system:webhook-monitor", now=now))
+    [job] = queue_db(
+        repo.claim_jobs(worker_identity="worker-a", limit=5, lease_seconds=60, max_attempts=2, now=now)
+    )
+    assert queue_db(
+        repo.claim_jobs(worker_identity="worker-b", limit=5, lease_seconds=60, max_attempts=2, now=now)
+    ) == []
+
+    later = now + timedelta(seconds=120)
+    [reclaimed] = queue_db(
+        repo.claim_jobs(worker_identity="worker-b", limit=5, lease_seconds=60, max_attempts=2, now=later)
+    )
+    assert reclaimed["id"] == job["id"]
+    assert reclaimed["attempts"] == 2
+    # The first worker lost its lease and cannot record an outcome.
+    assert not queue_db(repo.finish_job(job["id"], "worker-a", status="succeeded", now=later))
+
+    much_later = later + timedelta(seconds=120)
+    assert queue_db(
+        repo.claim_jobs(worker_identity="worker-c", limit=5, lease_seconds=60, max_attempts=2, now=much_later)
+    ) == []
+    assert queue_db(repo.count_jobs_by_status()) == {"failed": 1}
+
+
+def test_released_jobs_are_reclaimed_as_resumed(queue_db):
+    from app.repositories import scheduler_jobs as repo
+
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    queue_db(repo.enqueue_job("task:5", task_id=5, now=now))
+    [job] = queue_db(repo.claim_jobs(worker_identity="worker-a", limit=5, lease_seconds=60, now=now))
+    assert job["resumed"] is False
+
+    assert queue_db(repo.release_job(job["id"], "worker-a", now=now))
+    [again] = queue_db(repo.claim_jobs(worker_identity="worker-b", limit=5, lease_seconds=60, now=now))
+    assert again["id"] == job["id"]
+    assert again["resumed"] is True
+    assert again["attempts"] == 1
+
+
+def test_outstanding_jobs_are_counted_per_command(queue_db):
+    from app.core.database import db
+    from app.repositories import scheduler_jobs as repo
+
+    queue_db(db.execute("CREATE TABLE scheduled_tasks (id INTEGER PRIMARY KEY, command TEXT)"))
+    queue_db(db.execute("INSERT INTO scheduled_tasks (id, command) VALUES (5, 'sync_staff'), (6, 'sync_staff')"))
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    queue_db(repo.enqueue_job("task:5", task_id=5, now=now))
+    queue_db(repo.claim_jobs(worker_identity="worker-a", limit=1, lease_seconds=60, now=now))
+    queue_db(repo.enqueue_job("task:6", task_id=6, now=now))
+    queue_db(repo.enqueue_job("system:webhook-monitor", now=now))
+
+    assert queue_db(repo.count_outstanding_jobs_by_command()) == {
+        "sync_staff": {"queued": 1, "running": 1},
+        "system:webhook-monitor": {"queued": 1, "running": 0},
+    }
+
+
+def test_cancelled_run_is_recorded_as_cancelled_and_its_retry_runs():
+    asyncio.run(_cancelled_run_case())
+
+
+async def _cancelled_run_case():
+    from app.services.scheduled_commands import ScheduledCommand
+    from app.services.scheduler import SchedulerService
+
+    scheduler = SchedulerService()
+    task = {"id": 42, "command": "example_command", "active": True}
+    started = asyncio.Event()
+    calls: list[str] = []
+
+    async def handler(run):
+        calls.append("run")
+        if len(calls) == 1:
+            started.set()
+            await asyncio.Event().wait()
+
+    spec = ScheduledCommand(name="example_command", handler=handler, timeout_seconds=None)
+    with (
+        patch("app.services.scheduler.scheduled_commands.get_command", return_value=spec),
+        patch("app.services.scheduler.scheduled_tasks_repo.record_task_run", new_callable=AsyncMock) as mock_record,
+        patch("app.services.scheduler.scheduled_tasks_repo.has_run_since", new_callable=AsyncMock, return_value=False) as mock_recent,
+    ):
+        running = asyncio.create_task(scheduler._execute_task(task))
+        await asyncio.wait_for(started.wait(), timeout=5)
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+        assert mock_record.await_args.kwargs["status"] == "cancelled"
+
+        # The interrupted attempt now falls inside the duplicate-fire window.
+        mock_recent.return_value = True
+        await asyncio.wait_for(scheduler._execute_task(task, retry=True), timeout=5)
+
+    assert calls == ["run", "run"]
+    assert mock_record.await_args.kwargs["status"] == "succeeded"
+
+
+def test_scheduler_role_queues_system_jobs_instead_of_running_them():
+    from app.services.scheduler import ROLE_SCHEDULER, SchedulerService
+
+    scheduler = SchedulerService()
+    assert scheduler._system_job("webhook-monitor") == scheduler._run_webhook_monitor
+
+    scheduler._role = ROLE_SCHEDULER
+    target = scheduler._system_job("webhook-monitor")
+    assert isinstance(target, partial)
+    assert target.args == ("webhook-monitor",)
+
+
+def test_run_now_queues_forced_run_outside_embedded_mode():
+    asyncio.run(_run_now_queues_case())
+
+
+async def _run_now_queues_case():
+    from app.services.scheduler import ROLE_WEB, SchedulerService
+
+    scheduler = SchedulerService()
+    scheduler._role = ROLE_WEB
+    task = {"id": 42, "command": "sync_staff", "company_id": 7, "cron": "0 * * * *"}
+
+    with (
+        patch("app.services.scheduler.scheduled_tasks_repo.get_task", new_callable=AsyncMock, return_value=task),
+        patch("app.services.scheduler.scheduler_jobs_repo.enqueue_job", new_callable=AsyncMock, return_value=True) as mock_enqueue,
+        patch.object(scheduler, "_run_task", new_callable=AsyncMock) as mock_run,
+    ):
+        await scheduler.run_now(42)
+
+    mock_enqueue.assert_awaited_once_with("task:42", task_id=42, force_restart=True)
+    mock_run.assert_not_awaited()
+
+
+def test_queued_runs_do_not_hold_named_locks():
+    asyncio.run(_queued_runs_case())
+
+
+async def _queued_runs_case():
+    from app.services.scheduler import SchedulerService
+
+    scheduler = SchedulerService()
+    task = {"id": 42, "command": "sync_staff", "company_id": 7, "active": True}
+
+    with (
+        patch("app.services.scheduler.db.acquire_lock") as mock_lock,
+        patch("app.services.scheduler.scheduled_tasks_repo.get_task", new_callable=AsyncMock, return_value=task),
+        patch.object(scheduler, "_execute_task", new_callable=AsyncMock) as mock_execute,
+        patch("app.services.scheduler.webhook_monitor.fail_stalled_events", new_callable=AsyncMock),
+        patch("app.services.scheduler.webhook_monitor.process_pending_events", new_callable=AsyncMock) as mock_process,
+    ):
+        await scheduler.run_queued_job({"job_key": "task:42", "task_id": 42, "force_restart": True})
+        await scheduler.run_queued_job({"job_key": "system:webhook-monitor", "task_id": None})
+
+    mock_lock.assert_not_called()
+    mock_execute.assert_awaited_once_with(task, force_restart=True, retry=False)
+    mock_process.assert_awaited_once()
+
+
+def test_worker_process_joins_the_shared_redis_channels():
+    asyncio.run(_shared_services_case())
+
+
+async def _shared_services_case():
+    from types import SimpleNamespace
+
+    from app.workers import scheduler as worker_module
+
+    redis_client = object()
+    settings = SimpleNamespace(
+        tray_presence_ttl_seconds=90,
+        tray_relay_ack_timeout_seconds=2.0,
+        reference_cache_enabled=True,
+        reference_cache_ttl_seconds=300,
+    )
+    with (
+        patch.object(worker_module, "get_redis_client", return_value=redis_client),
+        patch.object(worker_module.refresh_notifier, "start", new_callable=AsyncMock) as notifier_start,
+        patch.object(worker_module.tray_relay, "start", new_callable=AsyncMock) as relay_start,
+        patch.object(worker_module.reference_cache, "start", new_callable=AsyncMock) as cache_start,
+        patch.object(worker_module.refresh_notifier, "stop", new_callable=AsyncMock) as notifier_stop,
+        patch.object(worker_module.tray_relay, "stop", new_callable=AsyncMock) as relay_stop,
+        patch.object(worker_module.reference_cache, "stop", new_callable=AsyncMock) as cache_stop,
+    ):
+        await worker_module._start_shared_services(settings)
+        await worker_module._stop_shared_services()
+
+    notifier_start.assert_awaited_once_with(redis_client=redis_client)
+    assert relay_start.await_args.kwargs["redis_client"] is redis_client
+    cache_start.assert_awaited_once_with(redis_client=redis_client, ttl_seconds=300)
+    for stop in (notifier_stop, relay_stop, cache_stop):
+        stop.assert_awaited_once()
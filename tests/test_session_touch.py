@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import sys
+from types import SimpleNamespace
+
+import pytest
+from starlette.requests import Request
+
+sys.modules.setdefault(
+    "magic",
+    SimpleNamespace(
+        Magic=lambda *args, **kwargs: None,
+        from_buffer=lambda *args, **kwargs: "application/octet-stream",
+    ),
+)
+
+from app.core.reference_cache import ReferenceCache
+from app.repositories import auth as auth_repo
+from app.security.session import SessionManager
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _request(manager: SessionManager) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [(b"cookie", f"{manager.session_cookie_name}=token".encode())],
+            "client": ("127.0.0.1", 12345),
+            "server": ("testserver", 80),
+            "scheme": "http",
+        }
+    )
+
+
+def _record(last_seen_at: datetime) -> dict:
+    return {
+        "id": 1,
+        "user_id": 2,
+        "session_token": "token",
+        "csrf_token": "csrf-token",
+        "created_at": last_seen_at,
+        "expires_at": last_seen_at + timedelta(hours=12),
+        "last_seen_at": last_seen_at,
+        "ip_address": "203.0.113.10",
+        "user_agent": "pytest",
+        "is_active": 1,
+        "active_company_id": None,
+    }
+
+
+@pytest.fixture
+def session_store(monkeypatch):
+    store = {"record": _record(datetime.utcnow()), "touches": []}
+
+    async def fake_get_session_by_token(token: str):
+        # Simulates a cached record: the stored row is not updated by touches.
+        return dict(store["record"])
+
+    async def fake_update_session(session_id, **kwargs):
+        store["touches"].append(kwargs)
+
+    monkeypatch.setattr("app.security.session.auth_repo.get_session_by_token", fake_get_session_by_token)
+    monkeypatch.setattr("app.security.session.auth_repo.update_session", fake_update_session)
+    return store
+
+
+@pytest.mark.anyio
+async def test_recent_session_is_not_touched(session_store):
+    manager = SessionManager()
+    manager.touch_interval = timedelta(seconds=60)
+
+    session = await manager.load_session(_request(manager))
+
+    assert session is not None
+    assert session_store["touches"] == []
+    assert session.expires_at == session_store["record"]["last_seen_at"] + manager.session_ttl
+
+
+@pytest.mark.anyio
+async def test_stale_session_is_touched_once_per_interval(session_store):
+    manager = SessionManager()
+    manager.touch_interval = timedelta(seconds=60)
+    session_store["record"] = _record(datetime.utcnow() - timedelta(minutes=5))
+
+    for _ in range(3):
+        session = await manager.load_session(_request(manager))
+
+    assert len(session_store["touches"]) == 1
+    assert session.last_seen_at == session_store["touches"][0]["last_seen_at"]
+
+
+@pytest.mark.anyio
+async def test_zero_interval_touches_every_request(session_store):
+    manager = SessionManager()
+    manager.touch_interval = timedelta(0)
+
+    await manager.load_session(_request(manager))
+    await manager.load_session(_request(manager))
+
+    assert len(session_store["touches"]) == 2
+
+
+@pytest.mark.anyio
+async def test_session_cache_survives_touches_but_not_other_writes(monkeypatch):
+    cache = ReferenceCache()
+    await cache.start()
+    monkeypatch.setattr(auth_repo, "reference_cache", cache)
+    reads: list[tuple] = []
+
+    async def fake_fetch_one(sql, params=None):
+        reads.append(params)
+        return _record(datetime.utcnow())
+
+    async def fake_execute(sql, params=None):
+        return None
+
+    monkeypatch.setattr(auth_repo.db, "fetch_one", fake_fetch_one)
+    monkeypatch.setattr(auth_repo.db, "execute", fake_execute)
+
+    await auth_repo.get_session_by_token("token")
+    await auth_repo.update_session(1, last_seen_at=datetime.utcnow(), expires_at=datetime.utcnow())
+    await auth_repo.get_session_by_token("token")
+    assert len(reads) == 1
+
+    await auth_repo.deactivate_session(1)
+    await auth_repo.get_session_by_token("token")
+    assert len(reads) == 2
+    await cache.stop()
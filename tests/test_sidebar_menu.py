@@ -1,6 +1,7 @@
 import pytest
 from pathlib import Path
 from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock
 
 import app.main as main_module
 from app.core.database import db
@@ -688,13 +689,19 @@ def test_tickets_role_ui_labels_are_no_access_own_all():
 
 @pytest.mark.anyio
 async def test_admin_ticket_access_requires_technician_admin_permission(monkeypatch):
-    async def fake_user_has_permission(user_id: int, permission: str) -> bool:
-        return permission == "helpdesk.technician"
+    async def fake_list_effective_permissions(user_id: int) -> set[str]:
+        return {"helpdesk.technician"}
 
     monkeypatch.setattr(
         main_module.membership_repo,
-        "user_has_permission",
-        fake_user_has_permission,
+        "list_effective_permissions",
+        fake_list_effective_permissions,
+    )
+    monkeypatch.setattr(
+        main_module.company_access, "list_accessible_companies", AsyncMock(return_value=[])
+    )
+    monkeypatch.setattr(
+        main_module.user_company_repo, "list_companies_for_user", AsyncMock(return_value=[])
     )
 
     user = {"id": 42, "is_super_admin": False}
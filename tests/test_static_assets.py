@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.main as main_module
+from app.services.static_assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    FingerprintedStaticFiles,
+    StaticManifest,
+    build_static_manifest,
+    load_static_manifest,
+)
+
+_SCRIPT = "console.log('portal');\n" * 40
+
+
+@pytest.fixture
+def static_tree(tmp_path):
+    source = tmp_path / "static"
+    (source / "js").mkdir(parents=True)
+    (source / "uploads").mkdir()
+    (source / "js" / "app.js").write_text(_SCRIPT)
+    (source / "logo.png").write_bytes(b"\x89PNG" + b"\x00" * 400)
+    (source / "uploads" / "report.pdf").write_bytes(b"%PDF")
+    (source / "service-worker.js").write_text("self.addEventListener('fetch', () => {});")
+    return source, tmp_path / "build"
+
+
+def test_manifest_fingerprints_assets_and_precompresses_text(static_tree):
+    source, build = static_tree
+
+    manifest = build_static_manifest(source, build)
+
+    hashed = manifest.hashed_path("/js/app.js")
+    assert hashed.startswith("js/app.") and hashed.endswith(".js") and hashed != "js/app.js"
+    assert (build / hashed).read_text() == _SCRIPT
+    assert gzip.decompress((build / f"{hashed}.gz").read_bytes()).decode() == _SCRIPT
+    assert not (build / f"{manifest.hashed_path('logo.png')}.gz").exists()
+    assert set(manifest.assets) == {"js/app.js", "logo.png"}
+    assert json.loads((build / "manifest.json").read_text()) == manifest.assets
+
+
+def test_rebuild_only_adds_changed_files(static_tree):
+    source, build = static_tree
+    first = build_static_manifest(source, build)
+
+    (source / "js" / "app.js").write_text(_SCRIPT + "console.log('v2');\n")
+    second = build_static_manifest(source, build)
+
+    assert second.hashed_path("logo.png") == first.hashed_path("logo.png")
+    assert second.hashed_path("js/app.js") != first.hashed_path("js/app.js")
+    # Pages rendered before the change can still load the previous copy.
+    assert (build / first.hashed_path("js/app.js")).exists()
+
+
+def test_hashed_assets_are_served_immutable_and_precompressed(static_tree):
+    source, build = static_tree
+    manifest = build_static_manifest(source, build)
+    app = FastAPI()
+    app.mount("/static", FingerprintedStaticFiles(directory=source, build_directory=build), name="static")
+    client = TestClient(app)
+
+    with client.stream(
+        "GET", f"/static/{manifest.hashed_path('js/app.js')}", headers={"Accept-Encoding": "gzip"}
+    ) as hashed:
+        body = b"".join(hashed.iter_raw())
+    plain = client.get("/static/js/app.js")
+
+    assert hashed.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert hashed.headers["content-encoding"] == "gzip"
+    assert hashed.headers["content-type"].startswith("text/javascript")
+    assert gzip.decompress(body).decode() == _SCRIPT
+    assert plain.status_code == 200
+    assert "immutable" not in plain.headers.get("cache-control", "")
+    assert client.get("/static/manifest.json").status_code == 404
+
+
+def test_static_url_resolves_through_manifest(monkeypatch):
+    monkeypatch.setattr(
+        main_module, "_static_manifest", StaticManifest(assets={"js/tables.js": "js/tables.0123456789ab.js"})
+    )
+
+    assert main_module._static_url("/static/js/tables.js") == "/static/js/tables.0123456789ab.js"
+    # Files outside the manifest keep the version query string.
+    assert main_module._static_url("/static/js/unknown.js").startswith("/static/js/unknown.js")
+
+
+def test_rebuild_prunes_copies_older_than_the_previous_manifest(static_tree):
+    source, build = static_tree
+    first = build_static_manifest(source, build)
+    (source / "js" / "app.js").write_text(_SCRIPT + "console.log('v2');\n")
+    second = build_static_manifest(source, build)
+    (source / "js" / "app.js").write_text(_SCRIPT + "console.log('v3');\n")
+    third = build_static_manifest(source, build)
+
+    assert not (build / first.hashed_path("js/app.js")).exists()
+    assert not (build / f"{first.hashed_path('js/app.js')}.gz").exists()
+    assert (build / second.hashed_path("js/app.js")).exists()
+    assert (build / f"{second.hashed_path('js/app.js')}.gz").exists()
+    assert (build / third.hashed_path("js/app.js")).exists()
+    assert (build / third.hashed_path("logo.png")).exists()
+
+
+def test_existing_manifest_is_reused_until_a_source_changes(static_tree):
+    source, build = static_tree
+    assert load_static_manifest(source, build) is None
+    built = build_static_manifest(source, build)
+
+    assert load_static_manifest(source, build).assets == built.assets
+
+    script = source / "js" / "app.js"
+    script.write_text(_SCRIPT + "console.log('v2');\n")
+    later = (build / "manifest.json").stat().st_mtime + 5
+    os.utime(script, (later, later))
+    assert load_static_manifest(source, build) is None
+
+    build_static_manifest(source, build)
+    (source / "extra.css").write_text("body {}")
+    assert load_static_manifest(source, build) is None
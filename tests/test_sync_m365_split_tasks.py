@@ -32,10 +32,10 @@ async def test_sync_m365_licenses_calls_service():
     from app.services.scheduler import SchedulerService
 
     scheduler = SchedulerService()
-    calls: list[int] = []
+    calls: list[tuple[int, bool]] = []
 
-    async def fake_sync_licenses(cid: int) -> None:
-        calls.append(cid)
+    async def fake_sync_licenses(cid: int, *, incremental: bool = False) -> None:
+        calls.append((cid, incremental))
 
     with (
         patch("app.services.scheduler.m365_service.sync_company_licenses", side_effect=fake_sync_licenses),
@@ -45,7 +45,8 @@ async def test_sync_m365_licenses_calls_service():
         mock_lock.return_value.__aenter__.return_value = True
         await scheduler._run_task(_make_task("sync_m365_licenses", company_id=42))
 
-    assert calls == [42]
+    # Scheduled runs sync only the directory changes since the previous run.
+    assert calls == [(42, True)]
 
 
 @pytest.mark.asyncio
@@ -133,10 +134,10 @@ async def test_sync_m365_contacts_calls_importer():
     from app.services.scheduler import SchedulerService
 
     scheduler = SchedulerService()
-    calls: list[int] = []
+    calls: list[tuple[int, bool]] = []
 
-    async def fake_import(cid: int):
-        calls.append(cid)
+    async def fake_import(cid: int, *, incremental: bool = False):
+        calls.append((cid, incremental))
         return _make_staff_summary()
 
     with (
@@ -147,7 +148,7 @@ async def test_sync_m365_contacts_calls_importer():
         mock_lock.return_value.__aenter__.return_value = True
         await scheduler._run_task(_make_task("sync_m365_contacts", company_id=7))
 
-    assert calls == [7]
+    assert calls == [(7, True)]
 
 
 @pytest.mark.asyncio
@@ -9,6 +9,7 @@ from __future__ import annotations
 import asyncio
 import os
 import tempfile
+from datetime import datetime
 from pathlib import Path
 
 import pytest
@@ -276,6 +277,7 @@ def test_push_notification_to_company_devices_requires_company_toggle(run, monke
 
 def test_push_notification_to_company_devices_targets_linked_assets(run, monkeypatch):
     from app.services import tray as svc
+    from app.services.tray_relay import TrayDelivery
 
     logged: list[dict[str, object]] = []
 
@@ -289,7 +291,7 @@ def test_push_notification_to_company_devices_targets_linked_assets(run, monkeyp
         ]
 
     async def fake_send_to_device(device_uid: str, payload: dict[str, object]):
-        return device_uid == "device-1"
+        return TrayDelivery.DELIVERED if device_uid == "device-1" else TrayDelivery.QUEUED
 
     async def fake_log_command(**kwargs):
         logged.append(kwargs)
@@ -315,6 +317,38 @@ def test_push_notification_to_company_devices_targets_linked_assets(run, monkeyp
     assert logged[0]["initiated_by_user_id"] == 99
 
 
+def test_unconfirmed_queued_command_is_not_sent_again(tray_db, run, monkeypatch):
+    from app.repositories import tray as repo
+    from app.services import tray as svc
+    from app.services.tray_relay import TrayDelivery
+
+    command_id = run(
+        repo.log_command(
+            device_id=4242,
+            command="show_notification",
+            payload_json='{"payload": {"title": "Hi"}}',
+            initiated_by_user_id=None,
+        )
+    )
+    sent: list[dict[str, object]] = []
+
+    async def fake_send_to_device(device_uid: str, payload: dict[str, object]):
+        sent.append(payload)
+        return TrayDelivery.UNCONFIRMED
+
+    monkeypatch.setattr(svc, "send_to_device", fake_send_to_device)
+
+    summary = run(svc.deliver_queued_commands({"id": 4242, "device_uid": "device-1"}))
+    assert summary == {"delivered": 0, "failed": 1}
+    assert sent[0]["command_id"] == command_id
+    assert run(repo.get_queued_commands_for_device(4242)) == []
+    assert run(svc.deliver_queued_commands({"id": 4242, "device_uid": "device-1"})) == {
+        "delivered": 0,
+        "failed": 0,
+    }
+    assert len(sent) == 1
+
+
 # ---------------------------------------------------------------------------
 # Repository / config resolution
 # ---------------------------------------------------------------------------
@@ -425,6 +459,16 @@ def test_device_create_update_revoke(tray_db, run):
     assert updated["console_user"] == "bob"
     assert updated["last_ip"] == "10.0.0.5"
 
+    seen_at = datetime(2030, 1, 1, 12, 0, 0)
+    run(repo.apply_device_heartbeats([
+        (int(device["id"]), seen_at, None, "10.0.0.6", "2.0.0"),
+    ]))
+    updated = run(repo.get_device_by_uid("dev-1"))
+    assert updated["console_user"] == "bob"
+    assert updated["last_ip"] == "10.0.0.6"
+    assert updated["agent_version"] == "2.0.0"
+    assert str(updated["last_seen_utc"]).startswith("2030-01-01")
+
     run(repo.revoke_device(int(device["id"])))
     assert run(repo.get_device_by_auth_hash(svc.hash_token(new_raw))) is None
     run(repo.reactivate_device(int(device["id"])))
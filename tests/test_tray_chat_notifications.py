@@ -5,6 +5,7 @@ from datetime import datetime
 import pytest
 
 from app.services import tray_chat_notifications
+from app.services.tray_relay import TrayDelivery
 
 
 @pytest.mark.anyio("asyncio")
@@ -16,9 +17,9 @@ async def test_notify_tray_device_of_chat_message_sends_incoming_technician_repl
         assert device_id == 7
         return {"id": 7, "device_uid": "device-uid-7"}
 
-    async def fake_send_to_device(device_uid: str, payload: dict[str, object]) -> bool:
+    async def fake_send_to_device(device_uid: str, payload: dict[str, object]) -> TrayDelivery:
         sent_payloads.append((device_uid, payload))
-        return True
+        return TrayDelivery.DELIVERED
 
     async def fake_log_command(**kwargs):
         logged.append(kwargs)
@@ -7,6 +7,7 @@ import pytest
 from starlette.requests import Request
 
 from app import main
+from app.services.tray_relay import TrayDelivery
 
 
 async def _dummy_receive() -> dict[str, Any]:
@@ -149,7 +150,7 @@ async def test_start_device_chat_reuses_existing_open_tray_room(monkeypatch):
     monkeypatch.setattr(matrix_service, "create_room", create_matrix_mock)
     monkeypatch.setattr(chat_repo, "create_room", create_room_mock)
     monkeypatch.setattr(tray_routes, "_attach_room_to_device", attach_mock)
-    monkeypatch.setattr(tray_service, "send_to_device", AsyncMock(return_value=True))
+    monkeypatch.setattr(tray_service, "send_to_device", AsyncMock(return_value=TrayDelivery.DELIVERED))
     monkeypatch.setattr(tray_repo, "log_command", AsyncMock())
     monkeypatch.setattr(audit_service, "log_action", AsyncMock())
 
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import pytest
+
+from app.repositories import tray as tray_repo
+from app.services.tray_heartbeats import TrayHeartbeatRecorder
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_inactive_recorder_writes_inline(monkeypatch):
+    calls: list[tuple] = []
+
+    async def fake_update(device_id, *, console_user, last_ip, agent_version):
+        calls.append((device_id, console_user, last_ip, agent_version))
+
+    monkeypatch.setattr(tray_repo, "update_device_heartbeat", fake_update)
+
+    await TrayHeartbeatRecorder().record(
+        7, console_user="bob", last_ip="10.0.0.5", agent_version="1.2.0"
+    )
+
+    assert calls == [(7, "bob", "10.0.0.5", "1.2.0")]
+
+
+@pytest.mark.anyio
+async def test_heartbeats_are_coalesced_per_device(monkeypatch):
+    flushed: list[list[tuple]] = []
+
+    async def fake_apply(entries):
+        flushed.append(list(entries))
+
+    async def fail_update(*_args, **_kwargs):
+        raise AssertionError("heartbeats must not be written inline")
+
+    monkeypatch.setattr(tray_repo, "apply_device_heartbeats", fake_apply)
+    monkeypatch.setattr(tray_repo, "update_device_heartbeat", fail_update)
+    recorder = TrayHeartbeatRecorder()
+    recorder.start(flush_interval_seconds=3600)
+
+    await recorder.record(7, console_user="bob", last_ip="10.0.0.5", agent_version="1.2.0")
+    await recorder.record(7, console_user=None, last_ip="10.0.0.6", agent_version=None)
+    await recorder.record(8, console_user="alice", last_ip=None, agent_version=None)
+    await recorder.stop()
+
+    assert len(flushed) == 1
+    by_device = {entry[0]: entry[2:] for entry in flushed[0]}
+    assert by_device == {
+        7: ("bob", "10.0.0.6", "1.2.0"),
+        8: ("alice", None, None),
+    }
+
+
+@pytest.mark.anyio
+async def test_failed_flush_keeps_newest_heartbeat(monkeypatch):
+    attempts: list[list[tuple]] = []
+
+    async def flaky_apply(entries):
+        attempts.append(list(entries))
+        if len(attempts) == 1:
+            raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(tray_repo, "apply_device_heartbeats", flaky_apply)
+    recorder = TrayHeartbeatRecorder()
+    recorder.start(flush_interval_seconds=3600)
+
+    await recorder.record(7, console_user="bob", last_ip="10.0.0.5", agent_version=None)
+    await recorder.flush()
+    await recorder.record(7, console_user=None, last_ip="10.0.0.6", agent_version=None)
+    await recorder.stop()
+
+    assert [entry[2:4] for entry in attempts[-1]] == [("bob", "10.0.0.6")]
@@ -52,9 +52,9 @@ async def test_lookup_phones_reads_the_authenticated_technicians_contacts(monkey
         }]})
 
     monkeypatch.setattr(
-        user_m365_contacts.httpx,
-        "AsyncClient",
-        lambda **kwargs: async_client(transport=httpx.MockTransport(graph_contacts), **kwargs),
+        user_m365_contacts.http_clients,
+        "client",
+        lambda name, **kwargs: async_client(transport=httpx.MockTransport(graph_contacts), **kwargs),
     )
 
     phones = await user_m365_contacts.lookup_phones(42, "Ada Lovelace")
@@ -87,9 +87,9 @@ async def test_lookup_phones_follows_graph_contact_pages(monkeypatch):
         }]})
 
     monkeypatch.setattr(
-        user_m365_contacts.httpx,
-        "AsyncClient",
-        lambda **kwargs: async_client(transport=httpx.MockTransport(graph_contacts), **kwargs),
+        user_m365_contacts.http_clients,
+        "client",
+        lambda name, **kwargs: async_client(transport=httpx.MockTransport(graph_contacts), **kwargs),
     )
 
     phones = await user_m365_contacts.lookup_phones(42, "Ada Lovelace")
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.repositories import webhook_events as repo
+from app.services import webhook_monitor
+
+
+def _event(event_id: int, url: str) -> dict:
+    return {
+        "id": event_id,
+        "target_url": url,
+        "attempt_count": 0,
+        "max_attempts": 3,
+        "backoff_seconds": 300,
+        "created_at": datetime.now(timezone.utc),
+        "next_attempt_at": None,
+    }
+
+
+def test_process_pending_events_claims_per_host_as_deliveries_finish(monkeypatch):
+    queue = [_event(index, "https://slow.example.com/hook") for index in range(1, 5)]
+    queue.append(_event(5, "https://fast.example.com/hook"))
+    late = _event(6, "https://fast.example.com/hook")
+    claims: list[list[int]] = []
+    running: dict[str, int] = {}
+    peak: dict[str, int] = {}
+    delivered: list[int] = []
+
+    async def fake_claim(limit: int, *, per_host: int, held: dict[str, int]) -> list[dict]:
+        assert limit <= 20
+        counts = dict(held)
+        taken = []
+        for event in list(queue):
+            host = repo.target_host(event["target_url"])
+            if len(taken) < limit and counts.get(host, 0) < per_host:
+                counts[host] = counts.get(host, 0) + 1
+                taken.append(event)
+                queue.remove(event)
+        claims.append([event["id"] for event in taken])
+        if len(claims) == 1:
+            # Becomes due while the first claim is still being delivered.
+            queue.append(late)
+        return taken
+
+    async def fake_attempt(event: dict) -> None:
+        host = event["target_url"].split("/")[2]
+        running[host] = running.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), running[host])
+        await asyncio.sleep(0.05 if host == "slow.example.com" else 0.001)
+        running[host] -= 1
+        delivered.append(event["id"])
+
+    settings = SimpleNamespace(
+        webhook_delivery_batch_size=20,
+        webhook_delivery_concurrency=10,
+        webhook_delivery_per_host=2,
+    )
+    monkeypatch.setattr(webhook_monitor, "get_settings", lambda: settings)
+    monkeypatch.setattr(webhook_monitor, "_pool", None)
+    monkeypatch.setattr(webhook_monitor.webhook_repo, "claim_due_events", fake_claim)
+    monkeypatch.setattr(webhook_monitor, "_attempt_event", fake_attempt)
+
+    async def _run() -> int:
+        try:
+            return await webhook_monitor.process_pending_events()
+        finally:
+            await webhook_monitor.close_delivery_pool()
+
+    assert asyncio.run(_run()) == 6
+    assert sorted(delivered) == [1, 2, 3, 4, 5, 6]
+    assert peak == {"slow.example.com": 2, "fast.example.com": 1}
+    # The slow host's backlog stayed pending, and the event that became due
+    # later was claimed and sent while the slow host was still busy.
+    assert claims[:2] == [[1, 2, 5], [6]]
+    assert delivered[:2] == [5, 6]
+
+
+class _ClaimDatabase:
+    def __init__(self, rows: list[dict], claimable: set[int]) -> None:
+        self.rows = rows
+        self.claimable = claimable
+        self.updates: list[tuple] = []
+
+    def is_sqlite(self) -> bool:
+        return True
+
+    async def fetch_all(self, sql: str, params: tuple) -> list[dict]:
+        return self.rows
+
+    async def execute_rowcount(self, sql: str, params: tuple) -> int:
+        self.updates.append(params)
+        return 1 if params[1] in self.claimable else 0
+
+
+def test_claim_due_events_skips_rows_claimed_elsewhere(monkeypatch):
+    rows = [
+        {"id": 1, "status": "pending", "attempt_count": 0, "max_attempts": 3, "backoff_seconds": 300},
+        {"id": 2, "status": "pending", "attempt_count": 0, "max_attempts": 3, "backoff_seconds": 300},
+    ]
+    dummy_db = _ClaimDatabase(rows, claimable={2})
+    monkeypatch.setattr(repo, "db", dummy_db)
+
+    claimed = asyncio.run(repo.claim_due_events(limit=5))
+
+    assert [event["id"] for event in claimed] == [2]
+    assert claimed[0]["status"] == "in_progress"
+    assert [params[1] for params in dummy_db.updates] == [1, 2]
+
+
+def test_claim_due_events_caps_claims_per_host(monkeypatch):
+    rows = [
+        {"id": index, "status": "pending", "target_url": url, "attempt_count": 0}
+        for index, url in enumerate(
+            [
+                "https://slow.example.com/a",
+                "https://SLOW.example.com/b",
+                "https://fast.example.com/a",
+                "https://slow.example.com/c",
+                "https://other.example.com/a",
+            ],
+            start=1,
+        )
+    ]
+    dummy_db = _ClaimDatabase(rows, claimable={1, 2, 3, 4, 5})
+    monkeypatch.setattr(repo, "db", dummy_db)
+
+    claimed = asyncio.run(
+        repo.claim_due_events(limit=3, per_host=2, held={"slow.example.com": 1})
+    )
+
+    assert [event["id"] for event in claimed] == [1, 3, 5]